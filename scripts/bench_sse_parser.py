@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: legacy iter_lines SSE loop vs incremental byte parser (call_llm streaming).
+
+Usage:
+  python scripts/bench_sse_parser.py                 # synthetic transcripts
+  python scripts/bench_sse_parser.py dump1.sse ...   # recorded SSE transcripts (raw bytes)
+"""
+import argparse, base64, json, os, sys, time
+from pathlib import Path
+
+# Allow imports from src/
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from tools._call_llm.streaming import process_streaming_chunks, process_tool_calls_stream
+from tools._call_llm.streaming_parser import iter_sse_payloads
+from tools._call_llm.streaming_sse import extract_data_str, stats_init
+
+
+class FakeResponse:
+    """Minimal requests.Response stand-in replaying a transcript in network-sized chunks."""
+    def __init__(self, body: bytes, net_chunk: int = 16 * 1024):
+        self.headers = {"Content-Type": "text/event-stream"}
+        self._body = body
+        self._net = net_chunk
+
+    def iter_content(self, chunk_size=1):
+        body, step = self._body, self._net
+        for i in range(0, len(body), step):
+            yield body[i:i + step]
+
+    def iter_lines(self):
+        # requests re-buffers iter_content(512) and splits: emulate that cost
+        pending = b""
+        for chunk in self.iter_content():
+            for i in range(0, len(chunk), 512):
+                pending += chunk[i:i + 512]
+                lines = pending.split(b"\n")
+                pending = lines.pop()
+                yield from lines
+        if pending:
+            yield pending
+
+    def close(self):
+        pass
+
+
+def legacy_parse(response):
+    # Former line loop: iter_lines + decode + strip every line, then json.loads(str)
+    n = 0
+    for line_b in response.iter_lines():
+        if not line_b:
+            continue
+        data_str = extract_data_str(line_b.decode("utf-8").strip())
+        if data_str is None:
+            continue
+        if data_str == "[DONE]":
+            break
+        json.loads(data_str)
+        n += 1
+    return n
+
+
+def new_parse(response):
+    n = 0
+    for payload in iter_sse_payloads(response, stats_init()):
+        json.loads(payload)
+        n += 1
+    return n
+
+
+def _sse(objs) -> bytes:
+    return b"".join(b"data: " + json.dumps(o).encode() + b"\n\n" for o in objs) + b"data: [DONE]\n\n"
+
+
+def synth_text(n=20000) -> bytes:
+    return _sse({"id": "m1", "choices": [{"delta": {"content": f"tok{i} "}}]} for i in range(n))
+
+
+def synth_tool_args(n=20000) -> bytes:
+    head = [{"choices": [{"delta": {"tool_calls": [{"index": 0, "id": "c1", "function": {"name": "f", "arguments": ""}}]}}]}]
+    body = ({"choices": [{"delta": {"tool_calls": [{"index": 0, "function": {"arguments": f'"k{i}":1,'}}]}}]} for i in range(n))
+    return _sse(list(head) + list(body))
+
+
+def synth_media(mb=2) -> bytes:
+    blob = base64.b64encode(os.urandom(mb * 1024 * 1024 * 3 // 4)).decode()
+    return _sse([{"choices": [{"delta": {}, "message": {"content": [{"type": "image_url", "image_url": {"url": "data:image/png;base64," + blob}}]}}]}])
+
+
+def bench(name, body, repeat):
+    def run(fn):
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn(FakeResponse(body))
+            best = min(best, time.perf_counter() - t0)
+        return best
+    t_old = run(legacy_parse)
+    t_new = run(new_parse)
+    t_full = run(process_tool_calls_stream if b"tool_calls" in body else process_streaming_chunks)
+    mb = len(body) / 1e6
+    print(f"{name:<28} {mb:7.2f} MB  parse: legacy {t_old*1000:9.1f} ms  new {t_new*1000:8.1f} ms"
+          f"  x{t_old / max(t_new, 1e-9):7.2f}  | full process_*: {t_full*1000:8.1f} ms")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("transcripts", nargs="*", help="Recorded SSE transcripts (raw response bodies)")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+    os.environ.pop("LLM_STREAM_DUMP", None)
+    if args.transcripts:
+        cases = [(Path(p).name, Path(p).read_bytes()) for p in args.transcripts]
+    else:
+        cases = [("text deltas", synth_text()), ("tool-call argument deltas", synth_tool_args()), ("inline media (2 MB line)", synth_media())]
+    for name, body in cases:
+        bench(name, body, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
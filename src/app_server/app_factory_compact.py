@@ -98,6 +98,12 @@ def create_app() -> FastAPI:
             logger.exception("Failed to save config")
             raise HTTPException(status_code=500, detail=str(e))
 
+    # ----- Shared HTTP cache (external data tools) -----
+    @app.get("/http_cache/stats")
+    async def http_cache_stats():
+        from tools._http_cache import stats
+        return SafeJSONResponse(content=stats())
+
     # ----- UI -----
     @app.get("/control", response_class=HTMLResponse)
     async def control_dashboard(request: Request):
@@ -24,6 +24,7 @@ logger = logging.getLogger(__name__)
 AUTO_RELOAD_TOOLS = True
 RELOAD_ENV = False
 EXECUTE_TIMEOUT_SEC = 180
+_STREAM_END = object()
 
 class ExecuteRequest(BaseModel):
     tool_reg: Optional[str] = None
@@ -33,6 +34,39 @@ class ExecuteRequest(BaseModel):
     def get_tool_name(self) -> str:
         return self.tool_reg or self.tool or ''
 
+def _close_iterator(it: Iterator) -> None:
+    close = getattr(it, "close", None)
+    if close is None:
+        return
+    try:
+        close()
+    except Exception as e:
+        logger.debug(f"Stream close failed: {e}")
+
+async def _iterate_in_executor(it: Iterator, step_timeout: float):
+    """Advance a sync iterator in the thread pool so a slow next() never blocks the event loop.
+
+    Each step must produce a chunk within step_timeout seconds (asyncio.TimeoutError otherwise).
+    The iterator is closed once it is no longer running, including after a timeout or a
+    client disconnect, so generator cleanup (temp files, worker pools) still happens.
+    """
+    loop = asyncio.get_running_loop()
+    pending = None
+    try:
+        while True:
+            pending = loop.run_in_executor(None, next, it, _STREAM_END)
+            # shield: on timeout the step keeps running in its thread; it cannot be interrupted
+            chunk = await asyncio.wait_for(asyncio.shield(pending), timeout=step_timeout)
+            pending = None
+            if chunk is _STREAM_END:
+                return
+            yield chunk
+    finally:
+        if pending is not None and not pending.done():
+            pending.add_done_callback(lambda _f: loop.run_in_executor(None, _close_iterator, it))
+        else:
+            await loop.run_in_executor(None, _close_iterator, it)
+
 async def head_tools(request: Request):
     registry = get_registry()
     if should_reload_tools(request, AUTO_RELOAD_TOOLS, RELOAD_ENV, len(registry)):
@@ -117,13 +151,18 @@ async def post_execute(request: ExecuteRequest, auto_reload: bool, reload_env: b
             
             async def event_stream():
                 try:
-                    for chunk in result:
+                    # Each chunk is produced in the thread pool; execute_timeout bounds every step
+                    async for chunk in _iterate_in_executor(result, execute_timeout):
                         # ✅ FORMAT SSE STANDARD : {json}\n\n
                         chunk_json = json.dumps(sanitize_for_json(chunk), ensure_ascii=False)
                         yield f"data: {chunk_json}\n\n"
+                except asyncio.TimeoutError:
+                    logger.error(f"⏱️ '{display_name}' stream stalled for more than {execute_timeout}s")
+                    error_chunk = {"chunk_type": "error", "error": {"message": "Tool stream timed out"}, "terminal": True}
+                    yield f"data: {json.dumps(error_chunk)}\n\n"
                 except Exception as e:
                     error_chunk = {"chunk_type": "error", "error": {"message": str(e)[:200]}, "terminal": True}
-                    yield f"{json.dumps(error_chunk)}\n\n"
+                    yield f"data: {json.dumps(error_chunk)}\n\n"
             
             return StreamingResponse(
                 event_stream(), 
@@ -123,7 +123,7 @@ def execute_call_llm(
         LOG.info(f"LLM phase 1: streaming with tools (tools_count={len(payload.get('tools', []))})")
 
     resp = post_stream(endpoint, headers, payload, timeout_sec)
-    tc_data = process_tool_calls_stream(resp)
+    tc_data = process_tool_calls_stream(resp, debug=debug_enabled)
     tool_calls = tc_data.get("tool_calls") or []
     streamed_text = (tc_data.get("text") or "").strip()
     media = tc_data.get("media") or []
@@ -221,7 +221,7 @@ def execute_call_llm(
         LOG.info(f"LLM phase 2: streaming without tools (messages_count={len(final_payload['messages'])})")
 
     resp2 = post_stream(endpoint, headers, final_payload, timeout_sec)
-    final_result = process_streaming_chunks(resp2)
+    final_result = process_streaming_chunks(resp2, debug=debug_enabled)
 
     # Aggregate usage from second stream
     final_usage = final_result.get("usage")
@@ -1,9 +1,11 @@
 from __future__ import annotations
 import os
-import requests
-from typing import Any, Dict
+import threading
+from typing import Any, Dict, Optional
 import urllib3
 
+from .http_pool import get_session, release_response
+
 
 # Disable SSL warnings only when SSL verification is disabled
 def _should_verify_ssl() -> bool:
@@ -12,6 +14,11 @@ def _should_verify_ssl() -> bool:
     return verify in ("true", "1", "yes", "on")
 
 
+def _http2_enabled() -> bool:
+    """Opt-in HTTP/2 for LLM streaming (LLM_HTTP2=1, requires httpx[http2])."""
+    return os.getenv("LLM_HTTP2", "false").lower() in ("true", "1", "yes", "on")
+
+
 # Suppress warnings only when SSL verification is disabled
 if not _should_verify_ssl():
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -20,26 +27,86 @@ if not _should_verify_ssl():
 def build_headers(token: str) -> Dict[str, str]:
     """Build HTTP headers with authorization token."""
     return {
-        "Authorization": f"Bearer {token}", 
+        "Authorization": f"Bearer {token}",
         "Content-Type": "application/json"
     }
 
 
+class _H2StreamResponse:
+    """Minimal requests.Response facade over a streamed httpx.Response (used by streaming parsers)."""
+
+    def __init__(self, resp):
+        self._resp = resp
+        self.status_code = resp.status_code
+        self.headers = resp.headers
+        self.http_version = resp.http_version
+
+    def iter_lines(self):
+        for line in self._resp.iter_lines():
+            yield line.encode("utf-8")
+
+    def iter_content(self, chunk_size: Optional[int] = None):
+        return self._resp.iter_bytes(chunk_size)
+
+    def json(self):
+        self._resp.read()
+        return self._resp.json()
+
+    @property
+    def text(self) -> str:
+        self._resp.read()
+        return self._resp.text
+
+    def close(self) -> None:
+        self._resp.close()
+
+
+_h2_lock = threading.Lock()
+_h2_clients: Dict[bool, Any] = {}
+
+
+def _get_h2_client(verify_ssl: bool) -> Optional[Any]:
+    client = _h2_clients.get(verify_ssl)
+    if client is not None:
+        return client
+    try:
+        import httpx
+        import h2  # noqa: F401  (httpx needs it for http2=True)
+    except ImportError:
+        return None
+    with _h2_lock:
+        if verify_ssl not in _h2_clients:
+            limits = httpx.Limits(
+                max_connections=int(os.getenv("LLM_HTTP_POOL_MAXSIZE", "16")),
+                max_keepalive_connections=int(os.getenv("LLM_HTTP_POOL_MAXSIZE", "16")),
+            )
+            _h2_clients[verify_ssl] = httpx.Client(http2=True, verify=verify_ssl, limits=limits)
+    return _h2_clients[verify_ssl]
+
+
 def post_stream(endpoint: str, headers: Dict[str, str], json_payload: Dict[str, Any], timeout_sec: int):
     """
     POST request with streaming support and configurable SSL verification.
-    
+    Uses the shared pooled session (keep-alive); HTTP/2 via httpx when LLM_HTTP2=1.
+
     SSL verification controlled by LLM_VERIFY_SSL environment variable:
     - "true" (default): Verify SSL certificates (recommended for production)
     - "false": Disable SSL verification (dev/testing only)
     """
     verify_ssl = _should_verify_ssl()
-    
-    return requests.post(
-        endpoint, 
-        headers=headers, 
-        json=json_payload, 
-        stream=True, 
-        timeout=timeout_sec, 
+
+    if _http2_enabled():
+        client = _get_h2_client(verify_ssl)
+        if client is not None:
+            req = client.build_request("POST", endpoint, headers=headers, json=json_payload, timeout=timeout_sec)
+            return _H2StreamResponse(client.send(req, stream=True))
+
+    return get_session().post(
+        endpoint,
+        headers=headers,
+        json=json_payload,
+        stream=True,
+        timeout=timeout_sec,
         verify=verify_ssl
     )
+
@@ -0,0 +1,123 @@
+"""
+Shared pooled HTTP session for LLM and MCP calls (call_llm, call_llm_agent, chat_agent)
+- One requests.Session per process (re-created after fork), keep-alive across calls
+- Per-host connection limit (LLM_HTTP_POOL_MAXSIZE), number of host pools (LLM_HTTP_POOL_HOSTS)
+- No auth/cookies stored on the session: headers are passed per request (thread-safe use)
+- Metrics: requests sent, connections opened, connections reused (process-wide counters,
+  and per call inside track_connections(), so concurrent calls never see each other's)
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+_POOL_HOSTS = max(1, int(os.getenv("LLM_HTTP_POOL_HOSTS", "8")))
+_POOL_MAXSIZE = max(1, int(os.getenv("LLM_HTTP_POOL_MAXSIZE", "16")))
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_counters = {"requests": 0, "connections_opened": 0}
+# Counters of the current call (set by track_connections; copied into worker threads by callers)
+_call_counters: ContextVar[Optional[Dict[str, int]]] = ContextVar("llm_http_call_counters", default=None)
+
+
+def _count(key: str) -> None:
+    scoped = _call_counters.get()
+    with _lock:
+        _counters[key] += 1
+        if scoped is not None:
+            scoped[key] += 1
+
+
+class _CountingHTTPPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _count("connections_opened")
+        return super()._new_conn()
+
+
+class _CountingHTTPSPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _count("connections_opened")
+        return super()._new_conn()
+
+
+class _PooledAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _CountingHTTPPool, "https": _CountingHTTPSPool}
+
+    def send(self, request, **kwargs):
+        _count("requests")
+        return super().send(request, **kwargs)
+
+
+def get_session() -> requests.Session:
+    """Process-wide pooled session (lazy, fork-safe)."""
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is not None and _session_pid == pid:
+        return _session
+    with _lock:
+        if _session is None or _session_pid != pid:
+            s = requests.Session()
+            adapter = _PooledAdapter(pool_connections=_POOL_HOSTS, pool_maxsize=_POOL_MAXSIZE, pool_block=False)
+            s.mount("http://", adapter)
+            s.mount("https://", adapter)
+            # Environment proxies/CA bundles are still honoured (trust_env=True by default)
+            _session, _session_pid = s, pid
+    return _session
+
+
+def release_response(resp: Any, drain_bytes: int = 4096) -> None:
+    """Return a streamed response's connection to the pool.
+    Drains a small tail first (e.g. bytes after [DONE]) so keep-alive survives. A larger
+    unread body is not read: closing drops the connection, cheaper than draining it."""
+    try:
+        raw = getattr(resp, "raw", None)
+        if raw is not None and not getattr(raw, "closed", True):
+            remaining = getattr(raw, "length_remaining", None)  # None when unknown (chunked)
+            if remaining is None or remaining <= drain_bytes:
+                raw.read(drain_bytes)
+    except Exception:
+        pass
+    try:
+        resp.close()
+    except Exception:
+        pass
+
+
+def pool_stats() -> Dict[str, int]:
+    with _lock:
+        out = dict(_counters)
+    out["connections_reused"] = max(0, out["requests"] - out["connections_opened"])
+    return out
+
+
+@contextmanager
+def track_connections() -> Iterator[Dict[str, int]]:
+    """Count the requests/connections made by this call only (this thread, plus worker
+    threads that run in a copy of its context)."""
+    counts = {"requests": 0, "connections_opened": 0}
+    token = _call_counters.set(counts)
+    try:
+        yield counts
+    finally:
+        _call_counters.reset(token)
+
+
+def attach_connection_stats(result: Any, counts: Dict[str, int]) -> Any:
+    """Expose connection metrics under result['usage']['connections'] when usage is present."""
+    if isinstance(result, dict) and isinstance(result.get("usage"), dict):
+        with _lock:
+            out = dict(counts)
+        out["connections_reused"] = max(0, out["requests"] - out["connections_opened"])
+        result["usage"]["connections"] = out
+    return result
@@ -0,0 +1,111 @@
+from __future__ import annotations
+"""
+Incremental SSE parser working on raw byte chunks
+- Reads response.iter_content() in large chunks (no 512-byte iter_lines re-buffering)
+- \\r\\n, \\n and bare \\r line endings (SSE) become \\n, also when a \\r\\n straddles two chunks
+- Splits each chunk on b"\\n" in C; partial lines are kept as a list of parts (linear, even for MB-sized media lines)
+- Decodes complete lines once per chunk (not per line); chunks holding only data lines are
+  handled with list-level operations, so many small events (tool-argument deltas) stay cheap
+- Stops at [DONE]; updates the same sse_stats counters as the legacy line loop
+"""
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+CHUNK_SIZE = 64 * 1024
+
+
+def want_preview(debug: Optional[bool]) -> bool:
+    """Preview/dump collection only when debug is on (explicit flag, or env when unspecified)."""
+    if debug is not None:
+        return bool(debug)
+    for name in ("LLM_RETURN_DEBUG", "LLM_STREAM_TRACE", "LLM_STREAM_DUMP"):
+        if os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on", "debug", "all"):
+            return True
+    return False
+
+
+def _iter_chunks(response) -> Iterator[bytes]:
+    iter_content = getattr(response, "iter_content", None)
+    if iter_content is not None:
+        return iter_content(chunk_size=CHUNK_SIZE)
+    # Minimal response objects (tests/benchmarks): fall back to lines
+    return (line + b"\n" for line in response.iter_lines())
+
+
+def iter_sse_payloads(response, stats: Dict[str, Any]) -> Iterator[str]:
+    """Yield 'data:' payloads (stripped str) until [DONE] or end of stream."""
+    pending: List[bytes] = []
+    total = empty = non_data = 0
+    cr_tail = False
+    try:
+        for chunk in _iter_chunks(response):
+            if not chunk:
+                continue
+            if cr_tail and chunk[:1] == b"\n":
+                chunk = chunk[1:]  # second half of a \r\n split across chunks
+            cr_tail = chunk[-1:] == b"\r"
+            if b"\r" in chunk:
+                chunk = chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+            if not chunk:
+                continue
+            if b"\n" not in chunk:
+                # Long line (inline media): keep parts, join once when the line ends
+                pending.append(chunk)
+                continue
+            if pending:
+                pending.append(chunk)
+                chunk = b"".join(pending)
+                pending.clear()
+            # Complete lines end at the last newline: one decode per chunk (never splits a UTF-8 sequence)
+            cut = chunk.rfind(b"\n") + 1
+            if cut < len(chunk):
+                pending.append(chunk[cut:])
+                chunk = chunk[:cut]
+            lines = chunk.decode("utf-8", errors="replace").split("\n")
+            lines.pop()
+            n_empty = lines.count("")
+            payloads = [line[5:].strip() for line in lines if line[:5] == "data:"]
+            if len(payloads) + n_empty == len(lines) and "[DONE]" not in payloads:
+                # Common case: only data lines and separators, counted with list operations
+                empty += n_empty
+                total += len(lines) - n_empty
+                yield from payloads
+                continue
+            # Other fields (event:, id:, comments), indented lines or the final [DONE]: line by line
+            for line in lines:
+                if not line.startswith("data:"):
+                    if not line:
+                        empty += 1
+                        continue
+                    line = line.lstrip()
+                    if not line.startswith("data:"):
+                        total += 1
+                        non_data += 1
+                        continue
+                total += 1
+                payload = line[5:].strip()
+                if payload == "[DONE]":
+                    stats["done"] = True
+                    return
+                yield payload
+        if pending:
+            line = b"".join(pending).decode("utf-8", errors="replace").strip()
+            if line:
+                total += 1
+                if not line.startswith("data:"):
+                    non_data += 1
+                elif line[5:].strip() == "[DONE]":
+                    stats["done"] = True
+                else:
+                    yield line[5:].strip()
+    finally:
+        stats["total_lines"] += total
+        stats["empty_lines"] += empty
+        stats["non_data_lines"] += non_data
+
+
+def preview_str(payload: str, limit: int = 4000) -> str:
+    """Trimmed copy of a payload (only called when preview/dump is enabled)."""
+    if len(payload) > limit:
+        return payload[:limit] + f"... (+{len(payload) - limit} bytes)"
+    return payload
@@ -0,0 +1,96 @@
+from __future__ import annotations
+"""
+Tool-call reconstruction for streamed LLM responses
+Supports OpenAI delta.tool_calls, provider-specific (tool_calls_index/function_name/arguments),
+legacy function_call, and full message.tool_calls / message.function_call.
+Argument deltas are accumulated as lists of parts and joined once at the end.
+"""
+import json
+from typing import Any, Dict, List
+
+
+def _args_str(args: Any) -> str:
+    if isinstance(args, dict):
+        try:
+            return json.dumps(args, separators=(",", ":"))
+        except Exception:
+            return str(args)
+    return args
+
+
+class ToolCallAccumulator:
+    def __init__(self):
+        self._calls: Dict[int, Dict[str, Any]] = {}
+        self._args: Dict[int, List[str]] = {}
+
+    def _entry(self, idx: int) -> Dict[str, Any]:
+        entry = self._calls.get(idx)
+        if entry is None:
+            entry = self._calls[idx] = {"id": None, "function": {"name": None, "arguments": ""}}
+            self._args[idx] = []
+        return entry
+
+    def _set_full(self, idx: int, args: Any) -> None:
+        # Full arguments from a message only apply when no delta was streamed
+        parts = self._args[idx]
+        if not any(parts):
+            parts[:] = [_args_str(args)]
+
+    def add_choice(self, delta: Dict[str, Any], msg: Any) -> None:
+        # Hot path (one call per streamed event): plain lookups, argument parts appended as-is
+        for item in delta.get("tool_calls") or ():
+            idx = item.get("index", 0)
+            parts = self._args.get(idx)
+            if parts is None:
+                self._entry(idx)
+                parts = self._args[idx]
+            fn = item.get("function")
+            if fn:
+                args = fn.get("arguments")
+                if args:
+                    parts.append(args if isinstance(args, str) else _args_str(args))
+                if fn.get("name"):
+                    self._calls[idx]["function"]["name"] = fn["name"]
+            if item.get("id"):
+                self._calls[idx]["id"] = item["id"]
+        if ("tool_calls_index" in delta) or ("function_name" in delta) or ("arguments" in delta):
+            idx = delta.get("tool_calls_index", 0)
+            entry = self._entry(idx)
+            if delta.get("function_name"):
+                entry["function"]["name"] = delta.get("function_name")
+            if delta.get("arguments") is not None:
+                self._args[idx].append(delta.get("arguments"))
+        fnc = delta.get("function_call")
+        if fnc:
+            entry = self._entry(0)
+            if fnc.get("name"):
+                entry["function"]["name"] = fnc["name"]
+            if fnc.get("arguments"):
+                self._args[0].append(fnc["arguments"])
+        if not msg or not isinstance(msg, dict):
+            return
+        for item in msg.get("tool_calls") if isinstance(msg.get("tool_calls"), list) else []:
+            idx = item.get("index", 0)
+            entry = self._entry(idx)
+            if item.get("id"):
+                entry["id"] = item["id"]
+            fn = item.get("function") or {}
+            if fn.get("name"):
+                entry["function"]["name"] = fn["name"]
+            if fn.get("arguments"):
+                self._set_full(idx, fn["arguments"])
+        fnc_msg = msg.get("function_call") or {}
+        if fnc_msg:
+            entry = self._entry(0)
+            if fnc_msg.get("name"):
+                entry["function"]["name"] = fnc_msg["name"]
+            if fnc_msg.get("arguments"):
+                self._set_full(0, fnc_msg["arguments"])
+
+    def result(self) -> List[Dict[str, Any]]:
+        out = []
+        for idx in sorted(self._calls.keys()):
+            entry = self._calls[idx]
+            entry["function"]["arguments"] = "".join(self._args[idx])
+            out.append(entry)
+        return out
@@ -0,0 +1,137 @@
+from __future__ import annotations
+"""
+MCP tool catalog cache (call_llm, call_llm_agent, chat_agent)
+- In-process (server registry loaded + local MCP_URL): read app_core.tool_discovery registry directly
+- Otherwise: GET {mcp_url}/tools revalidated with If-None-Match (server emits ETags), 304 -> cache
+- Prepared OpenAI tool schemas cached per (source, etag, requested names)
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import json
+import logging
+import os
+import sys
+import threading
+
+from .http_pool import get_session
+
+LOG = logging.getLogger(__name__)
+
+_LOCAL_HOSTS = {"127.0.0.1", "localhost", "::1", "0.0.0.0"}
+
+_lock = threading.Lock()
+# mcp_url -> {"etag": str, "items": {name: item}, "prepared": {names_key: prepared}}
+_http_cache: Dict[str, Dict[str, Any]] = {}
+# spec JSON string -> parsed function spec (in-process registry path)
+_spec_cache: Dict[str, Optional[Dict[str, Any]]] = {}
+_stats = {"inprocess": 0, "http_200": 0, "http_304": 0, "prepared_hits": 0}
+
+
+def _inprocess_registry(mcp_url: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    if os.getenv("LLM_TOOLS_INPROCESS", "1").lower() not in ("1", "true", "yes", "on"):
+        return None
+    mod = sys.modules.get("app_core.tool_discovery")
+    if mod is None:
+        return None
+    try:
+        if (urlparse(mcp_url).hostname or "") not in _LOCAL_HOSTS:
+            return None
+        # Snapshot (one atomic copy): discover_tools() may reload the live dict concurrently
+        reg = dict(mod.get_registry())
+    except Exception:
+        return None
+    return reg or None
+
+
+def _func_spec(spec_str: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not spec_str:
+        return None
+    if spec_str in _spec_cache:
+        return _spec_cache[spec_str]
+    try:
+        spec = json.loads(spec_str)
+        func = spec.get("function") if isinstance(spec, dict) else None
+        func = func if isinstance(func, dict) else None
+    except Exception:
+        func = None
+    if len(_spec_cache) > 512:
+        _spec_cache.clear()
+    _spec_cache[spec_str] = func
+    return func
+
+
+def _prepare(items: Dict[str, Dict[str, Any]], tool_names: List[str]) -> Dict[str, Any]:
+    tools: List[Dict[str, Any]] = []
+    name_to_reg: Dict[str, str] = {}
+    found_tools: List[str] = []
+    # Preserve catalog order (sorted by name, as served by /tools)
+    wanted = set(tool_names)
+    for item_name in sorted(n for n in items if n in wanted):
+        item = items[item_name]
+        func_spec = _func_spec(item.get("json"))
+        if not func_spec:
+            continue
+        tools.append({"type": "function", "function": func_spec})
+        fname = func_spec.get("name")
+        if fname:
+            name_to_reg[fname] = item.get("regName", item_name)
+            found_tools.append(fname)
+    return {"tools": tools, "name_to_reg": name_to_reg, "found_tools": found_tools}
+
+
+def _copy(prepared: Dict[str, Any]) -> Dict[str, Any]:
+    # Callers append/delete on these containers; never hand out the cached ones
+    return {
+        "tools": list(prepared["tools"]),
+        "name_to_reg": dict(prepared["name_to_reg"]),
+        "found_tools": list(prepared["found_tools"]),
+    }
+
+
+def _fetch_http(mcp_url: str) -> Tuple[Dict[str, Any], bool]:
+    """Return (cache entry, revalidated_304)."""
+    entry = _http_cache.get(mcp_url)
+    headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else {}
+    resp = get_session().get(f"{mcp_url}/tools", headers=headers, timeout=10)
+    if resp.status_code == 304 and entry:
+        _stats["http_304"] += 1
+        return entry, True
+    resp.raise_for_status()
+    all_tools = resp.json()
+    items = {it.get("name"): it for it in (all_tools or []) if isinstance(it, dict) and it.get("name")}
+    entry = {"etag": resp.headers.get("ETag"), "items": items, "prepared": {}}
+    with _lock:
+        _http_cache[mcp_url] = entry
+    _stats["http_200"] += 1
+    return entry, False
+
+
+def get_prepared_tools(tool_names, mcp_url: str) -> Dict[str, Any]:
+    """OpenAI tool schemas for tool_names: {"tools", "name_to_reg", "found_tools"}."""
+    names_key = tuple(sorted(set(tool_names or [])))
+    reg = _inprocess_registry(mcp_url)
+    if reg is not None:
+        _stats["inprocess"] += 1
+        return _prepare(reg, list(names_key))
+
+    entry, _ = _fetch_http(mcp_url)
+    prepared = entry["prepared"].get(names_key)
+    if prepared is None:
+        prepared = _prepare(entry["items"], list(names_key))
+        entry["prepared"][names_key] = prepared
+    else:
+        _stats["prepared_hits"] += 1
+    return _copy(prepared)
+
+
+def catalog_stats() -> Dict[str, int]:
+    return dict(_stats, cached_urls=len(_http_cache))
+
+
+def invalidate_catalog(mcp_url: Optional[str] = None) -> None:
+    with _lock:
+        if mcp_url is None:
+            _http_cache.clear()
+        else:
+            _http_cache.pop(mcp_url, None)
+        _spec_cache.clear()
@@ -1,7 +1,8 @@
 from __future__ import annotations
 from typing import Any, Dict, Tuple
 import json
-import requests
+from .http_pool import get_session
+from .tools_catalog import get_prepared_tools
 import os
 import uuid
 import logging
@@ -13,33 +14,12 @@ LOG = logging.getLogger(__name__)
 EXECUTE_TIMEOUT_SEC = int(os.getenv("EXECUTE_TIMEOUT_SEC", "180"))
 
 def fetch_and_prepare_tools(tool_names, mcp_url):
-    resp = requests.get(f"{mcp_url}/tools", timeout=10)
-    resp.raise_for_status()
-    all_tools = resp.json()
-
-    tools = []
-    name_to_reg: Dict[str, str] = {}
-    found_tools = []
-    for item in all_tools:
-        item_name = item.get("name")
-        if item_name in tool_names:
-            spec_str = item.get("json")
-            reg_name = item.get("regName", item_name)
-            if spec_str:
-                try:
-                    spec = json.loads(spec_str)
-                    if "function" in spec:
-                        func_spec = spec["function"]
-                        tools.append({"type": "function", "function": func_spec})
-                        fname = func_spec.get("name")
-                        if fname:
-                            name_to_reg[fname] = reg_name
-                            found_tools.append(fname)
-                except Exception:
-                    continue
+    # Cached catalog: in-process registry or ETag-revalidated GET /tools
+    prepared = get_prepared_tools(tool_names, mcp_url)
+    found_tools = prepared["found_tools"]
     if LOG.isEnabledFor(logging.INFO):
         LOG.info(f"MCP tools prepared: {len(found_tools)} tools ({', '.join(found_tools)})")
-    return {"tools": tools, "name_to_reg": name_to_reg, "found_tools": found_tools}
+    return prepared
 
 def execute_mcp_tool(fname: str, args: Dict[str, Any], name_to_reg: Dict[str, str], mcp_url: str, dbg: bool = False) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     reg_name = name_to_reg.get(fname, fname)
@@ -49,7 +29,7 @@ def execute_mcp_tool(fname: str, args: Dict[str, Any], name_to_reg: Dict[str, st
     try:
         if LOG.isEnabledFor(logging.INFO):
             LOG.info(f"Executing MCP tool: {fname} (reg: {reg_name})")
-        mcp_resp = requests.post(
+        mcp_resp = get_session().post(
             mcp_url_exec,
             json=mcp_payload,
             headers={"Content-Type": "application/json"},
@@ -4,6 +4,7 @@ Parallel and sequential execution of MCP tools.
 """
 from typing import Any, Dict, List
 import asyncio
+import contextvars
 import json
 import logging
 import sys
@@ -64,10 +65,12 @@ def execute_tools_parallel(
         except Exception:
             args = {}
         
-        # execute_mcp_tool is sync, wrap in executor
+        # execute_mcp_tool is sync, wrap in executor (in a copy of the context, so the
+        # call's connection counters follow it)
         loop = asyncio.get_event_loop()
         result, _ = await loop.run_in_executor(
             None,
+            contextvars.copy_context().run,
             execute_mcp_tool,
             fname, args, name_to_reg, mcp_url, False
         )
@@ -198,7 +198,8 @@ def execute_chat_agent(
         operations=result.get("operations", []),
         messages=messages,
         usage=result.get("usage", {}),
-        error=result.get("error")
+        error=result.get("error"),
+        context=result.get("context")
     )
     
     return output
@@ -0,0 +1,160 @@
+"""Incremental context accounting and history compaction for chat_agent.
+
+The agent loop used to rescan every message (estimate_tokens) on each iteration
+and resend full tool outputs every turn: long sessions grew quadratically.
+
+ContextWindow wraps the loop's message list:
+- Token estimate maintained incrementally on append (same formula as estimate_tokens)
+- Past a threshold (CHAT_AGENT_COMPACT_RATIO of the context limit), old tool results
+  are replaced by a short reference stub (tool name, call id, size, preview).
+  The most recent CHAT_AGENT_KEEP_TOOL_RESULTS results are kept unless still over the
+  threshold; results of the latest tool round are never compacted.
+- Full results stay persisted in the Platform thread (saved on the turn they were produced).
+  Compacted copies are sent without their Platform message id, so the save=True calls of
+  later iterations can never overwrite a stored full result with its stub.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from .thread_utils import message_chars, tokens_from_chars
+
+LOG = logging.getLogger(__name__)
+
+_COMPACT_RATIO = float(os.getenv("CHAT_AGENT_COMPACT_RATIO", "0.6"))
+_KEEP_TOOL_RESULTS = max(0, int(os.getenv("CHAT_AGENT_KEEP_TOOL_RESULTS", "4")))
+_PREVIEW_CHARS = max(0, int(os.getenv("CHAT_AGENT_COMPACT_PREVIEW", "400")))
+# Compact down to this fraction of the threshold (avoids re-compacting every turn)
+_TARGET_FRACTION = 0.75
+
+
+def _stub(text: str, tool_call_id: Any, tool_name: Optional[str]) -> str:
+    return json.dumps({
+        "compacted": True,
+        "tool": tool_name,
+        "tool_call_id": tool_call_id,
+        "original_chars": len(text),
+        "preview": text[:_PREVIEW_CHARS],
+        "note": "Older tool result truncated to save context; full output is stored in the thread history",
+    }, ensure_ascii=False)
+
+
+def _unpersisted(msg: Dict[str, Any]) -> Dict[str, Any]:
+    # Without "id", call_llm_streaming sends a fresh message id: the Platform stores the
+    # stub as a new message instead of overwriting the full result saved under the old id
+    msg.pop("id", None)
+    return msg
+
+
+class ContextWindow:
+    """Message list with incremental token estimate and tool-result compaction."""
+
+    def __init__(self, messages: List[Dict[str, Any]], context_limit: int):
+        """Wrap an existing message list (mutated in place).
+
+        Args:
+            messages: Conversation messages (history + new user message)
+            context_limit: Model context length in tokens
+        """
+        self.messages = messages
+        self.context_limit = int(context_limit)
+        self._chars = sum(message_chars(m) for m in messages)
+        # Message indices already compacted (the list only grows, so indices are stable)
+        self._compacted: set = set()
+        self.stats = {"compactions": 0, "compacted_results": 0, "chars_saved": 0}
+
+    @property
+    def tokens(self) -> int:
+        return tokens_from_chars(self._chars, len(self.messages))
+
+    def append(self, msg: Dict[str, Any]) -> None:
+        self.messages.append(msg)
+        self._chars += message_chars(msg)
+
+    def _replace(self, idx: int, new_msg: Dict[str, Any]) -> None:
+        old = message_chars(self.messages[idx])
+        new = message_chars(new_msg)
+        self.messages[idx] = new_msg
+        self._chars += new - old
+        self.stats["chars_saved"] += old - new
+
+    def maybe_compact(self) -> int:
+        """Compact old tool results once the estimate crosses the threshold.
+
+        Returns:
+            Number of tool results compacted by this call
+        """
+        threshold = self.context_limit * _COMPACT_RATIO
+        if self.tokens <= threshold:
+            return 0
+        target = threshold * _TARGET_FRACTION
+
+        tool_idx = [i for i, m in enumerate(self.messages) if m.get("role") == "tool"]
+        # Results of the latest tool round are never compacted (the LLM has not seen them yet)
+        last_call = max((i for i, m in enumerate(self.messages) if m.get("tool_calls")), default=-1)
+        older = [i for i in tool_idx if i < last_call]
+        recent = older[-_KEEP_TOOL_RESULTS:] if _KEEP_TOOL_RESULTS else []
+
+        # tool_call_id -> (assistant message index, tool name) for functionOutput copies
+        owners: Dict[Any, Any] = {}
+        for i, m in enumerate(self.messages):
+            for tc in m.get("tool_calls") or []:
+                if isinstance(tc, dict):
+                    owners[tc.get("id")] = (i, (tc.get("function") or {}).get("name"))
+
+        count = self._compact_range(older[:len(older) - len(recent)], owners, target)
+        if self.tokens > threshold:
+            # Still above threshold: the kept recent results go too
+            count += self._compact_range(recent, owners, target)
+
+        if count:
+            self.stats["compactions"] += 1
+            self.stats["compacted_results"] += count
+            LOG.info(f"Context compacted: {count} tool results, estimate now {self.tokens} tokens (threshold {int(threshold)})")
+        return count
+
+    def _compact_range(self, indices: List[int], owners: Dict[Any, Any], target: float) -> int:
+        count = 0
+        for i in indices:
+            if self.tokens <= target:
+                break
+            if i in self._compacted:
+                continue
+            msg = self.messages[i]
+            call_id = msg.get("tool_call_id")
+            content = msg.get("content")
+            if isinstance(content, list):
+                text = "".join(p.get("text", "") for p in content if isinstance(p, dict))
+            else:
+                text = str(content or "")
+            owner_idx, tool_name = owners.get(call_id, (None, None)) if call_id is not None else (None, None)
+            stub = _stub(text, call_id, tool_name)
+            self._compacted.add(i)
+            if len(stub) >= len(text):
+                continue
+            self._replace(i, _unpersisted(dict(msg, content=[{"type": "text", "text": stub}])))
+            if owner_idx is not None:
+                self._compact_function_output(owner_idx, call_id, stub)
+            count += 1
+        return count
+
+    def _compact_function_output(self, idx: int, call_id: Any, stub: str) -> None:
+        # Assistant messages built in this loop carry a functionOutput copy of the result
+        msg = self.messages[idx]
+        new_calls = []
+        changed = False
+        for tc in msg.get("tool_calls") or []:
+            fn = tc.get("function") if isinstance(tc, dict) else None
+            if isinstance(fn, dict) and tc.get("id") == call_id and "functionOutput" in fn:
+                tc = dict(tc, function=dict(fn, functionOutput=stub))
+                changed = True
+            new_calls.append(tc)
+        if changed:
+            self._replace(idx, _unpersisted(dict(msg, tool_calls=new_calls)))
+
+    def summary(self) -> Dict[str, Any]:
+        return {"estimated_tokens": self.tokens, "context_limit": self.context_limit, **self.stats}
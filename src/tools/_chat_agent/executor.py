@@ -1,18 +1,34 @@
 """Tool execution for chat_agent (parallel and sequential).
 
 Adapted from _call_llm/tools_exec.py for consistency.
+Parallel calls run on a shared bounded thread pool (CHAT_AGENT_TOOL_WORKERS), no event loop:
+works the same when called from the server's executor threads.
 """
 
 from __future__ import annotations
 
+import contextvars
 import json
-import asyncio
 import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
 import requests
-from typing import Any, Dict, List, Tuple
+
+from .._call_llm.http_pool import get_session
 
 LOG = logging.getLogger(__name__)
 
+_POOL_WORKERS = max(1, int(os.getenv("CHAT_AGENT_TOOL_WORKERS", "8")))
+_TOOL_TIMEOUT = max(1, int(os.getenv("CHAT_AGENT_TOOL_TIMEOUT", "60")))
+
+_pool_lock = threading.Lock()
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_pid: Optional[int] = None
+
 
 def _trim_val(x: Any, limit: int = 2000) -> Any:
     """Trim large values for debug output."""
@@ -30,10 +46,47 @@ def _trim_val(x: Any, limit: int = 2000) -> Any:
     return x
 
 
+def _get_pool() -> ThreadPoolExecutor:
+    """Shared bounded pool for agent tool calls (lazy, re-created after fork)."""
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            _pool = ThreadPoolExecutor(max_workers=_POOL_WORKERS, thread_name_prefix="chat_agent_tool")
+            _pool_pid = pid
+    return _pool
+
+
+def _parse_call(tc: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    fname = tc.get("function", {}).get("name")
+    args_str = tc.get("function", {}).get("arguments", "{}")
+    try:
+        args = json.loads(args_str)
+    except Exception:
+        args = {}
+    return fname, args
+
+
+def _call_timeout(deadline: Optional[float]) -> float:
+    if deadline is None:
+        return float(_TOOL_TIMEOUT)
+    return max(0.0, min(float(_TOOL_TIMEOUT), deadline - time.time()))
+
+
+def _cancelled(fname: str, reason: str) -> Dict[str, Any]:
+    return {
+        "result": {"error": f"Tool '{fname}' cancelled: {reason}"},
+        "debug": {"cancelled": True, "reason": reason}
+    }
+
+
 def execute_tools(
     tool_calls: List[Dict[str, Any]],
     mcp_url: str,
-    parallel: bool = True
+    parallel: bool = True,
+    deadline: Optional[float] = None
 ) -> List[Dict[str, Any]]:
     """Execute tool calls (parallel or sequential).
     
@@ -41,119 +94,106 @@ def execute_tools(
         tool_calls: OpenAI-format tool_calls
         mcp_url: MCP server URL
         parallel: Execute in parallel if True
+        deadline: Absolute time (time.time()) of the agent timeout; pending calls are cancelled past it
     
     Returns:
-        List of results with structure:
+        List of results (same order as tool_calls) with structure:
         {
             "result": <actual tool result>,
             "debug": {"url": ..., "status_code": ..., ...}
         }
     """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(tool_calls)
+    for idx, res in iter_tool_results(tool_calls, mcp_url, parallel, deadline):
+        results[idx] = res
+    return results
+
+
+def iter_tool_results(
+    tool_calls: List[Dict[str, Any]],
+    mcp_url: str,
+    parallel: bool = True,
+    deadline: Optional[float] = None
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (index, result) as each tool finishes (completion order when parallel)."""
     if parallel and len(tool_calls) > 1:
-        return _execute_parallel(tool_calls, mcp_url)
+        yield from _execute_parallel(tool_calls, mcp_url, deadline)
     else:
-        return _execute_sequential(tool_calls, mcp_url)
+        yield from _execute_sequential(tool_calls, mcp_url, deadline)
 
 
 def _execute_sequential(
     tool_calls: List[Dict[str, Any]],
-    mcp_url: str
-) -> List[Dict[str, Any]]:
+    mcp_url: str,
+    deadline: Optional[float] = None
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
     """Execute tools one by one."""
-    results = []
-    
-    for tc in tool_calls:
-        fname = tc.get("function", {}).get("name")
-        args_str = tc.get("function", {}).get("arguments", "{}")
+    for idx, tc in enumerate(tool_calls):
+        fname, args = _parse_call(tc)
+        timeout = _call_timeout(deadline)
+        if timeout <= 0:
+            yield idx, _cancelled(fname, "agent timeout reached")
+            continue
         
-        try:
-            args = json.loads(args_str)
-        except Exception:
-            args = {}
-        
-        result, debug_info = _execute_single_tool(fname, args, mcp_url)
-        results.append({
+        result, debug_info = _execute_single_tool(fname, args, mcp_url, timeout)
+        yield idx, {
             "result": result,
             "debug": debug_info
-        })
-    
-    return results
+        }
 
 
 def _execute_parallel(
     tool_calls: List[Dict[str, Any]],
-    mcp_url: str
-) -> List[Dict[str, Any]]:
-    """Execute tools in parallel using asyncio."""
+    mcp_url: str,
+    deadline: Optional[float] = None
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Execute tools on the shared pool, yielding results as they complete.
     
-    async def execute_one(tc):
-        fname = tc.get("function", {}).get("name")
-        args_str = tc.get("function", {}).get("arguments", "{}")
-        
-        try:
-            args = json.loads(args_str)
-        except Exception:
-            args = {}
-        
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _execute_single_tool, fname, args, mcp_url)
+    Per-call timeout applies to the HTTP request and bounds the wait; calls still
+    queued or running past the agent deadline are cancelled (reported as errors).
+    """
+    timeout = _call_timeout(deadline)
+    if timeout <= 0:
+        for idx, tc in enumerate(tool_calls):
+            yield idx, _cancelled(_parse_call(tc)[0], "agent timeout reached")
+        return
+    
+    pool = _get_pool()
+    fut_map: Dict[Future, int] = {}
+    for idx, tc in enumerate(tool_calls):
+        fname, args = _parse_call(tc)
+        # Copied context: the call's connection counters (http_pool.track_connections) follow the task
+        fut_map[pool.submit(contextvars.copy_context().run, _execute_single_tool, fname, args, mcp_url, timeout)] = idx
     
-    async def execute_all():
-        tasks = [execute_one(tc) for tc in tool_calls]
-        return await asyncio.gather(*tasks, return_exceptions=True)
+    # Grace period covers connect + JSON decode on top of the request timeout
+    wait_until = time.time() + timeout + 5
+    if deadline is not None:
+        wait_until = min(wait_until, deadline)
     
+    pending = set(fut_map)
     try:
-        # Handle event loop
-        try:
-            loop = asyncio.get_running_loop()
-            # Nested loop (Jupyter, etc.)
+        for fut in as_completed(fut_map, timeout=max(0.0, wait_until - time.time())):
+            pending.discard(fut)
+            idx = fut_map[fut]
             try:
-                import nest_asyncio
-                nest_asyncio.apply()
-            except ImportError:
-                LOG.warning("nest_asyncio not available, falling back to sequential")
-                return _execute_sequential(tool_calls, mcp_url)
-            raw_results = loop.run_until_complete(execute_all())
-        except RuntimeError:
-            # No running loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            raw_results = loop.run_until_complete(execute_all())
-            loop.close()
-    
-    except Exception as e:
-        LOG.error(f"Parallel execution failed: {e}, falling back to sequential")
-        return _execute_sequential(tool_calls, mcp_url)
-    
-    # Convert results to standard format
-    final_results = []
-    for res in raw_results:
-        if isinstance(res, Exception):
-            final_results.append({
-                "result": {"error": str(res)},
-                "debug": {"exception": str(res)}
-            })
-        elif isinstance(res, tuple) and len(res) == 2:
-            # Normal return from _execute_single_tool
-            result, debug_info = res
-            final_results.append({
-                "result": result,
-                "debug": debug_info
-            })
-        else:
-            # Unexpected format
-            final_results.append({
-                "result": res,
-                "debug": {}
-            })
-    
-    return final_results
+                result, debug_info = fut.result()
+                yield idx, {"result": result, "debug": debug_info}
+            except Exception as e:
+                yield idx, {"result": {"error": str(e)}, "debug": {"exception": str(e)}}
+    except FuturesTimeout:
+        reason = "agent timeout reached" if deadline is not None and time.time() >= deadline else f"timeout after {round(timeout, 1):g}s"
+        LOG.warning(f"{len(pending)} tool call(s) cancelled: {reason}")
+        for fut in pending:
+            fut.cancel()  # queued calls never start; running ones end on their HTTP timeout
+            fname, _ = _parse_call(tool_calls[fut_map[fut]])
+            yield fut_map[fut], _cancelled(fname, reason)
 
 
 def _execute_single_tool(
     tool_name: str, 
     args: Dict[str, Any], 
-    mcp_url: str
+    mcp_url: str,
+    timeout: float = 60
 ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """Execute a single MCP tool.
     
@@ -177,7 +217,7 @@ def _execute_single_tool(
         if LOG.isEnabledFor(logging.INFO):
             LOG.info(f"Executing MCP tool: {tool_name}")
         
-        resp = requests.post(url, json=payload, timeout=60)
+        resp = get_session().post(url, json=payload, timeout=timeout)
         debug_info["status_code"] = resp.status_code
         
         if resp.status_code == 200:
@@ -202,7 +242,7 @@ def _execute_single_tool(
     
     except requests.exceptions.Timeout:
         debug_info["timeout"] = True
-        return {"error": f"Tool '{tool_name}' timeout after 60s"}, debug_info
+        return {"error": f"Tool '{tool_name}' timeout after {round(timeout, 1):g}s"}, debug_info
     except requests.exceptions.HTTPError as e:
         debug_info["http_error"] = str(e)
         return {"error": f"Tool '{tool_name}' HTTP error: {e}"}, debug_info
@@ -20,8 +20,8 @@ import uuid
 from typing import Any, Dict, List, Optional
 
 from .platform_api import call_llm_streaming
-from .executor import execute_tools, _trim_val
-from .thread_utils import estimate_tokens
+from .executor import iter_tool_results, _trim_val
+from .context import ContextWindow
 
 LOG = logging.getLogger(__name__)
 
@@ -104,6 +104,7 @@ def execute_agent_loop(
     """
     operations = []
     cumulative_usage = {}
+    ctx = ContextWindow(messages, context_limit)
     iteration = 0
     returned_thread_id = thread_id
     
@@ -117,14 +118,16 @@ def execute_agent_loop(
                 "thread_id": returned_thread_id,
                 "iterations": iteration,
                 "operations": operations,
-                "usage": cumulative_usage
+                "usage": cumulative_usage,
+                "context": ctx.summary()
             }
         
         iteration += 1
         remaining_timeout = max(10, int(timeout - elapsed))
         
-        # Check context size before each call (preventive)
-        estimated = estimate_tokens(messages)
+        # Check context size before each call (preventive): compact old tool results first
+        ctx.maybe_compact()
+        estimated = ctx.tokens
         if estimated > context_limit * 0.95:  # 95% threshold (emergency)
             return {
                 "success": False,
@@ -134,7 +137,8 @@ def execute_agent_loop(
                 "thread_id": returned_thread_id,
                 "iterations": iteration,
                 "operations": operations,
-                "usage": cumulative_usage
+                "usage": cumulative_usage,
+                "context": ctx.summary()
             }
         
         # Save strategy v2: Always save to persist tool results
@@ -162,7 +166,8 @@ def execute_agent_loop(
                 "thread_id": returned_thread_id,
                 "iterations": iteration,
                 "operations": operations,
-                "usage": cumulative_usage
+                "usage": cumulative_usage,
+                "context": ctx.summary()
             }
         
         # Update thread_id if returned (new thread created)
@@ -185,7 +190,7 @@ def execute_agent_loop(
         if not tool_calls:
             # Add final assistant message to history
             if content:
-                messages.append({
+                ctx.append({
                     "role": "assistant",
                     "content": [{"type": "text", "text": content}],
                 })
@@ -206,16 +211,25 @@ def execute_agent_loop(
                 "thread_id": returned_thread_id,
                 "iterations": iteration,
                 "operations": operations,
-                "usage": cumulative_usage
+                "usage": cumulative_usage,
+                "context": ctx.summary()
             }
         
-        # Tool calls present → execute
+        # Tool calls present → execute; each result is serialized and formatted as soon as
+        # its tool finishes (completion order), while the other calls are still running
+        tool_contents: List[Optional[str]] = [None] * len(tool_calls)
+        tool_ops: List[Optional[Dict[str, Any]]] = [None] * len(tool_calls)
         try:
-            tool_results = execute_tools(
+            for idx, tool_res in iter_tool_results(
                 tool_calls=tool_calls,
                 mcp_url=mcp_url,
-                parallel=parallel_execution
-            )
+                parallel=parallel_execution,
+                deadline=start_time + timeout
+            ):
+                tool_contents[idx] = json.dumps(tool_res.get("result", tool_res), ensure_ascii=False)
+                tool_ops[idx] = _format_tool_call_for_operations(tool_calls[idx], tool_res)
+                if LOG.isEnabledFor(logging.DEBUG):
+                    LOG.debug(f"Tool {idx + 1}/{len(tool_calls)} done: {tool_ops[idx]['name']}")
         except Exception as e:
             return {
                 "success": False,
@@ -223,15 +237,13 @@ def execute_agent_loop(
                 "thread_id": returned_thread_id,
                 "iterations": iteration,
                 "operations": operations,
-                "usage": cumulative_usage
+                "usage": cumulative_usage,
+                "context": ctx.summary()
             }
         
         # Build tool_calls with functionOutput for Platform storage
         tool_calls_with_output = []
-        for tc, tool_res in zip(tool_calls, tool_results):
-            actual_result = tool_res.get("result", tool_res)
-            tool_content = json.dumps(actual_result, ensure_ascii=False)
-            
+        for tc, tool_content in zip(tool_calls, tool_contents):
             tool_calls_with_output.append({
                 "id": tc.get("id"),
                 "type": tc.get("type", "function"),
@@ -243,7 +255,7 @@ def execute_agent_loop(
             })
         
         # Add assistant message with tool_calls (including functionOutput)
-        messages.append({
+        ctx.append({
             "role": "assistant",
             "content": [],
             "tool_calls": tool_calls_with_output,
@@ -253,11 +265,8 @@ def execute_agent_loop(
         thread_chain.new_assistant_tool_calls(tool_calls)
         
         # Add tool result messages (Platform format)
-        for tc, tool_res in zip(tool_calls, tool_results):
-            actual_result = tool_res.get("result", tool_res)
-            tool_content = json.dumps(actual_result, ensure_ascii=False)
-            
-            messages.append({
+        for tc, tool_content in zip(tool_calls, tool_contents):
+            ctx.append({
                 "role": "tool",
                 "content": [{"type": "text", "text": tool_content}],
                 "tool_call_id": tc.get("id"),
@@ -268,7 +277,7 @@ def execute_agent_loop(
         # Record operation
         op = {
             "iteration": iteration,
-            "tool_calls": _format_tool_calls_for_operations(tool_calls, tool_results)
+            "tool_calls": tool_ops
         }
         operations.append(op)
     
@@ -280,7 +289,8 @@ def execute_agent_loop(
         "thread_id": returned_thread_id,
         "iterations": iteration,
         "operations": operations,
-        "usage": cumulative_usage
+        "usage": cumulative_usage,
+        "context": ctx.summary()
     }
 
 
@@ -296,24 +306,18 @@ def _merge_usage(cumulative: Dict[str, Any], new_usage: Dict[str, Any]) -> None:
             cumulative[key] = value
 
 
-def _format_tool_calls_for_operations(
-    tool_calls: List[Dict[str, Any]],
-    tool_results: List[Dict[str, Any]]
-) -> List[Dict[str, Any]]:
-    """Format tool_calls with results for operations list."""
-    formatted = []
-    
-    for tc, tool_res in zip(tool_calls, tool_results):
-        fn = tc.get("function", {})
-        actual_result = tool_res.get("result", tool_res)
-        debug_info = tool_res.get("debug", {})
-        
-        item = {
-            "name": fn.get("name"),
-            "arguments": fn.get("arguments"),
-            "result_excerpt": _trim_val(actual_result, 2000),
-            "mcp_debug": debug_info
-        }
-        formatted.append(item)
+def _format_tool_call_for_operations(
+    tc: Dict[str, Any],
+    tool_res: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Format one tool_call with its result for the operations list."""
+    fn = tc.get("function", {})
+    actual_result = tool_res.get("result", tool_res)
+    debug_info = tool_res.get("debug", {})
     
-    return formatted
+    return {
+        "name": fn.get("name"),
+        "arguments": fn.get("arguments"),
+        "result_excerpt": _trim_val(actual_result, 2000),
+        "mcp_debug": debug_info
+    }
@@ -5,6 +5,8 @@ import requests
 import logging
 import time
 
+from .._call_llm.http_pool import get_session
+
 LOG = logging.getLogger(__name__)
 
 # Cache (in-memory)
@@ -40,7 +42,7 @@ def fetch_models(api_base: str, token: str) -> List[Dict[str, Any]]:
         if LOG.isEnabledFor(logging.DEBUG):
             LOG.debug(f"Fetching models from: {url}")
         
-        resp = requests.get(url, headers=headers, timeout=10)
+        resp = get_session().get(url, headers=headers, timeout=10)
         resp.raise_for_status()
         data = resp.json()
         
@@ -12,7 +12,8 @@ def build_output(
     operations: List[Dict[str, Any]],
     messages: List[Dict[str, Any]],
     usage: Dict[str, Any],
-    error: str = None
+    error: str = None,
+    context: Dict[str, Any] = None
 ) -> Dict[str, Any]:
     """Build output based on mode.
     
@@ -26,6 +27,7 @@ def build_output(
         messages: Full message history
         usage: Token usage dict
         error: Error message if failed
+        context: Context accounting/compaction stats (debug mode only)
     
     Returns:
         Formatted output dict
@@ -37,7 +39,7 @@ def build_output(
         return _build_intermediate(success, response, thread_id, operations, messages, error)
     
     else:  # debug
-        return _build_debug(success, response, thread_id, iterations, operations, messages, usage, error)
+        return _build_debug(success, response, thread_id, iterations, operations, messages, usage, error, context)
 
 
 def _build_minimal(
@@ -131,7 +133,8 @@ def _build_debug(
     operations: List[Dict[str, Any]],
     messages: List[Dict[str, Any]],
     usage: Dict[str, Any],
-    error: str = None
+    error: str = None,
+    context: Dict[str, Any] = None
 ) -> Dict[str, Any]:
     """Full debug output.
     
@@ -183,7 +186,8 @@ def _build_debug(
         "usage": usage,
         "context_info": {
             "message_count": len(messages),
-            "total_iterations": len(operations)
+            "total_iterations": len(operations),
+            **(context or {})
         },
         "transcript_snapshot": transcript_snapshot
     }
@@ -9,7 +9,8 @@ Handles:
 from typing import Any, Dict, List, Optional
 import requests
 import logging
-import json
+
+from .._call_llm.http_pool import get_session
 import time
 import random
 import string
@@ -53,7 +54,7 @@ def load_thread_history(
     try:
         LOG.info(f"Loading thread history from: {url}")
         
-        resp = requests.get(url, headers=headers, timeout=timeout)
+        resp = get_session().get(url, headers=headers, timeout=timeout)
         
         if resp.status_code == 404:
             return {
@@ -193,44 +194,18 @@ def call_llm_streaming(
 
 
 def fetch_mcp_tools(tool_names: List[str], mcp_url: str) -> List[Dict[str, Any]]:
-    """Fetch MCP tool specifications."""
-    url = f"{mcp_url}/tools"
-    
+    """Fetch MCP tool specifications (cached catalog, ETag-revalidated)."""
+    from .._call_llm.tools_catalog import get_prepared_tools
+
     try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-        all_tools = resp.json()
-        
-        tools_spec: List[Dict[str, Any]] = []
-        found_names: set = set()
-        
-        for item in all_tools or []:
-            if not isinstance(item, dict):
-                continue
-            
-            item_name = item.get("name")
-            if item_name in tool_names:
-                spec_str = item.get("json")
-                if not spec_str:
-                    continue
-                
-                try:
-                    spec = json.loads(spec_str)
-                except Exception:
-                    continue
-                
-                func_spec = spec.get("function") if isinstance(spec, dict) else None
-                if not isinstance(func_spec, dict):
-                    continue
-                
-                tools_spec.append({"type": "function", "function": func_spec})
-                found_names.add(item_name)
+        prepared = get_prepared_tools(tool_names, mcp_url)
+        found_names = set(prepared["name_to_reg"].values())
         
         missing = set(tool_names) - found_names
         if missing:
             raise ValueError(f"Tools not found in MCP: {list(missing)}")
         
-        return tools_spec
+        return prepared["tools"]
     
     except Exception as e:
         LOG.error(f"Failed to fetch MCP tools: {e}")
@@ -202,11 +202,54 @@ def _append_assistant_with_tools(
         })
 
 
+def message_chars(m: Dict[str, Any]) -> int:
+    """Character count of one message as used by estimate_tokens (content, tool_calls, tool results)."""
+    total_chars = 0
+    
+    # Content
+    content = m.get("content")
+    if isinstance(content, list):
+        for part in content:
+            if isinstance(part, dict) and part.get("type") == "text":
+                total_chars += len(part.get("text", ""))
+    elif isinstance(content, str):
+        total_chars += len(content)
+    
+    # Tool calls
+    tool_calls = m.get("tool_calls")
+    if isinstance(tool_calls, list):
+        for tc in tool_calls:
+            if isinstance(tc, dict):
+                fn = tc.get("function", {})
+                total_chars += len(fn.get("name", ""))
+                total_chars += len(fn.get("arguments", ""))
+                # Include functionOutput in estimation
+                total_chars += len(str(fn.get("functionOutput", "")))
+    
+    # Tool results
+    if m.get("role") == "tool":
+        content = m.get("content")
+        if isinstance(content, list):
+            for part in content:
+                if isinstance(part, dict):
+                    total_chars += len(part.get("text", ""))
+        elif isinstance(content, str):
+            total_chars += len(content)
+    
+    return total_chars
+
+
+def tokens_from_chars(total_chars: int, message_count: int) -> int:
+    """Formula shared by estimate_tokens and the incremental ContextWindow."""
+    return (total_chars // 4) + (message_count * 10)
+
+
 def estimate_tokens(messages: List[Dict[str, Any]]) -> int:
     """Rough estimation of token count for messages.
     
     Formula: (total_chars / 4) + (message_count * 10)
     Conservative estimate (4 chars/token typical for English).
+    Full rescan: inside the agent loop use context.ContextWindow (incremental).
     
     Args:
         messages: List of messages
@@ -214,41 +257,7 @@ def estimate_tokens(messages: List[Dict[str, Any]]) -> int:
     Returns:
         Estimated token count
     """
-    total_chars = 0
-    
-    for m in messages:
-        # Content
-        content = m.get("content")
-        if isinstance(content, list):
-            for part in content:
-                if isinstance(part, dict) and part.get("type") == "text":
-                    total_chars += len(part.get("text", ""))
-        elif isinstance(content, str):
-            total_chars += len(content)
-        
-        # Tool calls
-        tool_calls = m.get("tool_calls")
-        if isinstance(tool_calls, list):
-            for tc in tool_calls:
-                if isinstance(tc, dict):
-                    fn = tc.get("function", {})
-                    total_chars += len(fn.get("name", ""))
-                    total_chars += len(fn.get("arguments", ""))
-                    # Include functionOutput in estimation
-                    total_chars += len(str(fn.get("functionOutput", "")))
-        
-        # Tool results
-        if m.get("role") == "tool":
-            content = m.get("content")
-            if isinstance(content, list):
-                for part in content:
-                    if isinstance(part, dict):
-                        total_chars += len(part.get("text", ""))
-            elif isinstance(content, str):
-                total_chars += len(content)
-    
-    estimated = (total_chars // 4) + (len(messages) * 10)
-    return estimated
+    return tokens_from_chars(sum(message_chars(m) for m in messages), len(messages))
 
 
 # Required import for json.dumps in fallback
@@ -3,8 +3,11 @@ CoinGecko API client (no API key required for free tier)
 """
 import requests
 
+from ..._http_cache import get as cached_get
+
 
 BASE_URL = 'https://api.coingecko.com/api/v3'
+CACHE_TTL_SEC = 60  # CoinGecko refreshes prices about once a minute on the free tier
 
 
 def make_request(endpoint, params=None):
@@ -21,7 +24,7 @@ def make_request(endpoint, params=None):
     url = f"{BASE_URL}/{endpoint}"
     
     try:
-        response = requests.get(url, params=params, timeout=15)
+        response = cached_get(url, params=params, timeout=15, ttl=CACHE_TTL_SEC, tool='coingecko')
         response.raise_for_status()
         return response.json()
     except requests.exceptions.HTTPError as e:
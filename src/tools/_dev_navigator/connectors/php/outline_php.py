@@ -0,0 +1,36 @@
+import re
+from typing import List, Dict
+
+from ...services.anchors import make_anchor
+
+# Simple PHP outline extractor for classes/interfaces/traits and functions/methods
+TYPE_DECL = re.compile(r"^\s*(?:(?:abstract|final|readonly)\s+)*(class|interface|trait|enum)\s+([A-Za-z_][A-Za-z0-9_]*)\b")
+FUNC_DECL = re.compile(r"^\s*(?:(?:public|protected|private|static|abstract|final)\s+)*function\s+&?\s*([A-Za-z_][A-Za-z0-9_]*)\s*\(")
+
+MAX_ITEMS = 500
+
+
+def outline_file_php(text: str, relpath: str) -> List[Dict]:
+    items: List[Dict] = []
+    if not text:
+        return items
+    for i, line in enumerate(text.splitlines(), start=1):
+        if len(items) >= MAX_ITEMS:
+            break
+        m = TYPE_DECL.search(line)
+        if m:
+            items.append({
+                "name": m.group(2),
+                "kind": "class" if m.group(1) == "class" else m.group(1),
+                "anchor": make_anchor(relpath, i, 0)
+            })
+            continue
+        m = FUNC_DECL.search(line)
+        if m:
+            items.append({
+                "name": m.group(1),
+                "kind": "function",
+                "anchor": make_anchor(relpath, i, 0)
+            })
+    items.sort(key=lambda x: (x["anchor"]["start_line"], x.get("name","")))
+    return items
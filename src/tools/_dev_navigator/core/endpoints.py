@@ -7,7 +7,7 @@ from ..services.fs_scanner import iter_files, read_text_head
 from ..services.anchors import make_anchor
 from ..services.globber import allowed_by_globs
 from ..services.budget_broker import compute_effective_budgets
-from ..release_index import reader_paths as P
+from ..release_index import reader_pool as RP
 from ..release_index import reader_queries as Q
 from ..connectors.python.endpoints_fastapi import extract_endpoints as fe_fastapi
 from ..connectors.python.endpoints_flask import extract_endpoints as fe_flask
@@ -70,14 +70,14 @@ def run(p: Dict[str, Any]) -> Dict[str, Any]:
 
     # INDEX-FIRST: try reading endpoints from the release index if available
     if p.get("use_release_index", True):
-        db_path, err = P.resolve_index_db(root, p.get("release_tag"), p.get("commit_hash"))
+        db_path, err = RP.resolve_index_db(root, p.get("release_tag"), p.get("commit_hash"))
         if db_path:
-            conn = P._open_ro(db_path)
+            conn = RP.acquire_ro(db_path)
             try:
                 items_idx = Q.query_endpoints_all(conn, limit)
             finally:
                 try:
-                    conn.close()
+                    RP.release_ro(conn)
                 except Exception:
                     pass
             items_idx = [{
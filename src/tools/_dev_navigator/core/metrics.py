@@ -6,7 +6,7 @@ from ..services.lang_detect import language_from_path
 from ..services.budget_broker import compute_effective_budgets
 from ..connectors.python.sloc_estimator import estimate_sloc
 from ..connectors.python.outline_ast import outline_file
-from ..release_index import reader_paths as P
+from ..release_index import reader_pool as RP
 from ..release_index import reader_queries as Q
 
 
@@ -27,9 +27,9 @@ def run(p: Dict[str, Any]) -> Dict[str, Any]:
 
     # INDEX-FIRST fast path
     if p.get("use_release_index", True):
-        db_path, err = P.resolve_index_db(root, p.get("release_tag"), p.get("commit_hash"))
+        db_path, err = RP.resolve_index_db(root, p.get("release_tag"), p.get("commit_hash"))
         if db_path:
-            conn = P._open_ro(db_path)
+            conn = RP.acquire_ro(db_path)
             try:
                 dir_stats = Q.query_dir_stats_all(conn)
                 try:
@@ -38,7 +38,7 @@ def run(p: Dict[str, Any]) -> Dict[str, Any]:
                     func_count = 0
             finally:
                 try:
-                    conn.close()
+                    RP.release_ro(conn)
                 except Exception:
                     pass
             total_files = sum(int(r["files"]) for r in dir_stats)
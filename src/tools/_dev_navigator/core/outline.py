@@ -11,7 +11,8 @@ from ..services.lang_detect import language_from_path
 from ..connectors.python.outline_ast import outline_file as outline_py
 from ..connectors.javascript.outline_js import outline_file_js
 from ..connectors.go.outline_go import outline_file_go
-from ..release_index import reader_paths as P
+from ..connectors.php.outline_php import outline_file_php
+from ..release_index import reader_pool as RP
 from ..release_index import reader_queries as Q
 
 
@@ -27,14 +28,14 @@ def run(p: Dict[str, Any]) -> Dict[str, Any]:
 
     # INDEX-FIRST: outlines depuis l'index si disponible
     if p.get("use_release_index", True):
-        db_path, err = P.resolve_index_db(root, p.get("release_tag"), p.get("commit_hash"))
+        db_path, err = RP.resolve_index_db(root, p.get("release_tag"), p.get("commit_hash"))
         if db_path:
-            conn = P._open_ro(db_path)
+            conn = RP.acquire_ro(db_path)
             try:
                 items = Q.query_outlines(conn, limit)
             finally:
                 try:
-                    conn.close()
+                    RP.release_ro(conn)
                 except Exception:
                     pass
             page, total, next_c = paginate_list(items, limit, p.get("cursor"))
@@ -66,6 +67,8 @@ def run(p: Dict[str, Any]) -> Dict[str, Any]:
             outlines = outline_file_js(text, rel)
         elif lang == "go":
             outlines = outline_file_go(text, rel)
+        elif lang == "php":
+            outlines = outline_file_php(text, rel)
         # else: unsupported -> no outlines
         if outlines:
             items.append({"path": rel, "symbols": outlines})
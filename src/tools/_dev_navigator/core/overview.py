@@ -6,7 +6,7 @@ from ..services.lang_detect import language_from_path
 from ..services.budget_broker import compute_effective_budgets
 from ..connectors.python.sloc_estimator import estimate_sloc
 from ..connectors.python.outline_ast import outline_file
-from ..release_index import reader_paths as P
+from ..release_index import reader_pool as RP
 from ..release_index import reader_queries as Q
 
 DOC_CANDIDATES = ("README", "CHANGELOG", "LICENSE")
@@ -36,15 +36,15 @@ def run(p: Dict[str, Any]) -> Dict[str, Any]:
 
     # INDEX-FIRST: use index when available
     if p.get("use_release_index", True):
-        db_path, err = P.resolve_index_db(root, p.get("release_tag"), p.get("commit_hash"))
+        db_path, err = RP.resolve_index_db(root, p.get("release_tag"), p.get("commit_hash"))
         if db_path:
-            conn = P._open_ro(db_path)
+            conn = RP.acquire_ro(db_path)
             try:
                 files = Q.query_files_all(conn, limit=10000)
                 outlines = Q.query_outline_samples(conn, per_file=5, max_files=3)
             finally:
                 try:
-                    conn.close()
+                    RP.release_ro(conn)
                 except Exception:
                     pass
             # Languages by extension (best-effort)
@@ -9,7 +9,7 @@ from ..services.budget_broker import compute_effective_budgets
 from ..services.constants import DEFAULT_MAX_HITS_PER_FILE
 from ..services.anchors import make_anchor
 from ..services.search_text import search_in_file
-from ..release_index import reader_paths as P
+from ..release_index import reader_pool as RP
 from ..release_index import reader_queries as Q
 
 
@@ -34,14 +34,14 @@ def run(p: Dict[str, Any]) -> Dict[str, Any]:
 
     # INDEX-FIRST: try index lookup for symbols and paths (LIKE-based)
     if p.get("use_release_index", True):
-        db_path, err = P.resolve_index_db(root, p.get("release_tag"), p.get("commit_hash"))
+        db_path, err = RP.resolve_index_db(root, p.get("release_tag"), p.get("commit_hash"))
         if db_path:
-            conn = P._open_ro(db_path)
+            conn = RP.acquire_ro(db_path)
             try:
                 items = Q.query_search_symbols_paths(conn, pattern, limit)
             finally:
                 try:
-                    conn.close()
+                    RP.release_ro(conn)
                 except Exception:
                     pass
             page, total, next_c = paginate_list(items, limit, p.get("cursor"))
@@ -5,7 +5,7 @@ from ..services.budget_broker import compute_effective_budgets
 from ..services.fs_scanner import iter_files
 from ..services.globber import allowed_by_globs
 from ..connectors.python.tests_inventory import inventory_tests
-from ..release_index import reader_paths as P
+from ..release_index import reader_pool as RP
 from ..release_index import reader_queries as Q
 
 
@@ -20,14 +20,14 @@ def run(p: Dict[str, Any]) -> Dict[str, Any]:
 
     # INDEX-FIRST: list tests from the release index if available
     if p.get("use_release_index", True):
-        db_path, err = P.resolve_index_db(root, p.get("release_tag"), p.get("commit_hash"))
+        db_path, err = RP.resolve_index_db(root, p.get("release_tag"), p.get("commit_hash"))
         if db_path:
-            conn = P._open_ro(db_path)
+            conn = RP.acquire_ro(db_path)
             try:
                 files = Q.query_tests_files(conn, limit * 10)
             finally:
                 try:
-                    conn.close()
+                    RP.release_ro(conn)
                 except Exception:
                     pass
             items = [{"path": rel, "frameworks": ["pytest"], "anchor": {"path": rel, "start_line": 1, "start_col": 0}} for rel in files]
@@ -3,6 +3,7 @@ Dev Navigator Release Index Builder (implémentation Python v1)
 - Mode offline, lecture seule du repo, aucune dépendance réseau
 - Produit: ./sqlite3/<repo_slug>/<tag>__<shortsha>/index.db + manifest.json
 - Parcours Python minimal: symbols, calls, imports, endpoints (FastAPI/Flask/Django) + dir_stats
+- Autres langages (JS/TS, Go, PHP, routes YAML): outlines -> symbols, imports, endpoints via connectors
 - IMPORTANT: ne stocke PAS le code source; uniquement des métadonnées et positions (anchors)
 - NOUVEAU: ne scanne que les fichiers suivis par Git (git ls-files). Fallback os.walk avec exclusions élargies.
 """
@@ -11,15 +12,20 @@ import os, json, time, sqlite3, hashlib, subprocess
 from typing import Dict, Any, Tuple, List
 
 from .reader_paths import make_repo_slug
+from .reader_pool import invalidate as invalidate_reader_pool
 from .writer import insert_file, bulk_insert_symbols, bulk_link_container_symbols, bulk_insert_calls, bulk_insert_imports, bulk_insert_endpoints, upsert_dir_stats
 from .extract_python import extract_symbols_calls_imports
+from .extract_polyglot import extract_polyglot_facts
 from ..services.fs_scanner import is_binary_filename
+from ..services.lang_detect import language_from_path
 from ..connectors.python.endpoints_fastapi import extract_endpoints as fe_fastapi
 from ..connectors.python.endpoints_flask import extract_endpoints as fe_flask
 from ..connectors.python.endpoints_django import extract_endpoints as fe_django
 
 SCHEMA_VERSION = "1"
-CONNECTOR_API_VERSION = "1"
+CONNECTOR_API_VERSION = "2"
+
+POLYGLOT_LANGS = {"javascript", "typescript", "go", "php", "yaml"}
 
 EXCLUDE_DIRS = {
     '.git','node_modules','vendor','dist','build','.venv','venv','env','.mypy_cache',
@@ -161,6 +167,8 @@ def _iter_git_tracked_files(path: str):
 
 def _remove_if_exists(db_path: str):
     # Remove stale DB and WAL/SHM to ensure a fresh rebuild
+    # (pooled read-only handles on this file must be closed first, e.g. on Windows)
+    invalidate_reader_pool(db_path)
     for suffix in ("", "-wal", "-shm"):
         try:
             os.remove(db_path + suffix)
@@ -170,6 +178,51 @@ def _remove_if_exists(db_path: str):
             pass
 
 
+def _read_code(full: str, budgets: Dict[str, Any]) -> str:
+    try:
+        with open(full, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read(min(int(budgets.get('max_bytes_per_file', 65536)), 1_048_576))
+    except Exception:
+        return ""
+
+
+def _index_file(cur: sqlite3.Cursor, rel: str, full: str, size: int, mtime: int,
+                budgets: Dict[str, Any], dir_counters: Dict[str, Dict[str, int]]) -> None:
+    lang = language_from_path(rel)
+    file_id = insert_file(cur, rel, size, mtime, _hash_file(full), is_binary=0,
+                          is_test=1 if '/tests/' in rel or rel.startswith('tests/') else 0, lang=lang)
+
+    if rel.endswith('.py'):
+        # Python extraction: symbols, calls, imports + endpoints (FastAPI/Flask/Django)
+        code = _read_code(full, budgets)
+        facts = extract_symbols_calls_imports(code, rel)
+        ids = bulk_insert_symbols(cur, file_id, facts['symbols'])
+        bulk_link_container_symbols(cur, file_id, facts['symbols'], ids)
+        bulk_insert_calls(cur, file_id, facts['calls'], facts['symbols'], ids)
+        eps: List[Dict[str, Any]] = []
+        eps.extend(fe_fastapi(code, rel))
+        eps.extend(fe_flask(code, rel))
+        if os.path.basename(rel) == 'urls.py':
+            eps.extend(fe_django(code, rel))
+        bulk_insert_endpoints(cur, file_id, eps)
+        bulk_insert_imports(cur, file_id, facts['imports'])
+    elif lang in POLYGLOT_LANGS:
+        # JS/TS, Go, PHP (+ YAML routes): outlines as symbols, imports, endpoints
+        facts = extract_polyglot_facts(_read_code(full, budgets), rel)
+        if facts:
+            bulk_insert_symbols(cur, file_id, facts['symbols'])
+            bulk_insert_imports(cur, file_id, facts['imports'])
+            bulk_insert_endpoints(cur, file_id, facts['endpoints'])
+
+    # dir_stats
+    parts = rel.split(os.sep)
+    for d in range(1, min(len(parts), 5) + 1):
+        dpath = os.sep.join(parts[:d])
+        st_d = dir_counters.setdefault(dpath, {'files': 0, 'bytes': 0})
+        st_d['files'] += 1
+        st_d['bytes'] += int(size)
+
+
 def build_index(path: str, tag_name: str | None, commit_hash: str, analyzer_version: str,
                 config_fingerprint: str, budgets: Dict[str, Any]) -> Tuple[str, str]:
     repo_slug = make_repo_slug(path)
@@ -209,40 +262,7 @@ def build_index(path: str, tag_name: str | None, commit_hash: str, analyzer_vers
                     st = os.stat(full)
                 except OSError:
                     continue
-                file_id = insert_file(cur, rel, int(st.st_size), int(st.st_mtime), _hash_file(full), is_binary=0, is_test=1 if '/tests/' in rel or rel.startswith('tests/') else 0)
-
-                # Python extraction
-                if rel.endswith('.py'):
-                    try:
-                        with open(full, 'r', encoding='utf-8', errors='replace') as f:
-                            code = f.read(min(int(budgets.get('max_bytes_per_file', 65536)), 1_048_576))
-                    except Exception:
-                        code = ""
-                    facts = extract_symbols_calls_imports(code, rel)
-                    ids = bulk_insert_symbols(cur, file_id, facts['symbols'])
-                    bulk_link_container_symbols(cur, file_id, facts['symbols'], ids)
-                    bulk_insert_calls(cur, file_id, facts['calls'], facts['symbols'], ids)
-
-                    # Endpoints (FastAPI/Flask/Django)
-                    eps: List[Dict[str, Any]] = []
-                    eps.extend(fe_fastapi(code, rel))
-                    eps.extend(fe_flask(code, rel))
-                    if os.path.basename(rel) == 'urls.py':
-                        eps.extend(fe_django(code, rel))
-                    bulk_insert_endpoints(cur, file_id, eps)
-
-                # Imports (python only)
-                if rel.endswith('.py') and 'facts' in locals():
-                    bulk_insert_imports(cur, file_id, facts['imports'])
-
-                # dir_stats
-                parts = rel.split(os.sep)
-                for d in range(1, min(len(parts), 5) + 1):
-                    dpath = os.sep.join(parts[:d])
-                    st_d = dir_counters.setdefault(dpath, {'files': 0, 'bytes': 0})
-                    st_d['files'] += 1
-                    st_d['bytes'] += int(st.st_size)
-
+                _index_file(cur, rel, full, int(st.st_size), int(st.st_mtime), budgets, dir_counters)
                 scanned += 1
         except Exception:
             used_git = False
@@ -264,34 +284,7 @@ def build_index(path: str, tag_name: str | None, commit_hash: str, analyzer_vers
                         st = os.stat(full)
                     except OSError:
                         continue
-                    file_id = insert_file(cur, rel, int(st.st_size), int(st.st_mtime), _hash_file(full), is_binary=0, is_test=1 if '/tests/' in rel or rel.startswith('tests/') else 0)
-
-                    if rel.endswith('.py'):
-                        try:
-                            with open(full, 'r', encoding='utf-8', errors='replace') as f:
-                                code = f.read(min(int(budgets.get('max_bytes_per_file', 65536)), 1_048_576))
-                        except Exception:
-                            code = ""
-                        facts = extract_symbols_calls_imports(code, rel)
-                        ids = bulk_insert_symbols(cur, file_id, facts['symbols'])
-                        bulk_link_container_symbols(cur, file_id, facts['symbols'], ids)
-                        bulk_insert_calls(cur, file_id, facts['calls'], facts['symbols'], ids)
-                        eps: List[Dict[str, Any]] = []
-                        eps.extend(fe_fastapi(code, rel))
-                        eps.extend(fe_flask(code, rel))
-                        if os.path.basename(rel) == 'urls.py':
-                            eps.extend(fe_django(code, rel))
-                        bulk_insert_endpoints(cur, file_id, eps)
-                    if rel.endswith('.py') and 'facts' in locals():
-                        bulk_insert_imports(cur, file_id, facts['imports'])
-
-                    parts = rel.split(os.sep)
-                    for d in range(1, min(len(parts), 5) + 1):
-                        dpath = os.sep.join(parts[:d])
-                        st_d = dir_counters.setdefault(dpath, {'files': 0, 'bytes': 0})
-                        st_d['files'] += 1
-                        st_d['bytes'] += int(st.st_size)
-
+                    _index_file(cur, rel, full, int(st.st_size), int(st.st_mtime), budgets, dir_counters)
                     scanned += 1
                 if scanned >= max_files:
                     break
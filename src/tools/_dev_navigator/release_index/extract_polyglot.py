@@ -0,0 +1,128 @@
+"""
+Release index extraction for non-Python languages (JS/TS, Go, PHP, YAML routes)
+- Réutilise les connecteurs existants (outline_js, outline_go, outline_php, express, symfony, gateway YAML)
+- Produit le même format que extract_python: symbols (anchors), imports, endpoints
+- Regex head-only, sans dépendance externe; aucune donnée de code source stockée
+"""
+import re
+from typing import Dict, List, Optional
+
+from ..services.lang_detect import language_from_path
+from ..services.yaml_router_extractors import extract_yaml_gateway
+from ..connectors.javascript.outline_js import outline_file_js
+from ..connectors.javascript.endpoints_express import extract_endpoints_express as fe_express
+from ..connectors.go.outline_go import outline_file_go
+from ..connectors.php.outline_php import outline_file_php
+from ..connectors.php.endpoints_symfony import extract_endpoints_symfony as fe_symfony
+
+JS_IMPORT = re.compile(r"^\s*(?:import|export)\s+(?:[^'\"]*?\s+from\s+)?['\"]([^'\"]+)['\"]")
+JS_REQUIRE = re.compile(r"\brequire\(\s*['\"]([^'\"]+)['\"]\s*\)")
+GO_IMPORT_ONE = re.compile(r"^\s*import\s+(?:[A-Za-z_.]\w*\s+)?\"([^\"]+)\"")
+GO_IMPORT_ITEM = re.compile(r"^\s*(?:[A-Za-z_.]\w*\s+)?\"([^\"]+)\"")
+PHP_USE = re.compile(r"^use\s+(?:function\s+|const\s+)?\\?([A-Za-z_][A-Za-z0-9_\\]*)")
+PHP_INCLUDE = re.compile(r"\b(?:require|include)(?:_once)?\s*\(?\s*['\"]([^'\"]+)['\"]")
+
+OUTLINERS = {
+    "javascript": outline_file_js,
+    "typescript": outline_file_js,
+    "go": outline_file_go,
+    "php": outline_file_php,
+}
+
+
+def _imports_js(text: str) -> List[Dict]:
+    out: List[Dict] = []
+    for line in text.splitlines():
+        m = JS_IMPORT.search(line)
+        if m:
+            out.append({"from": None, "to_key": m.group(1), "kind": "import", "raw": line.strip()[:200]})
+        for r in JS_REQUIRE.finditer(line):
+            out.append({"from": None, "to_key": r.group(1), "kind": "require", "raw": line.strip()[:200]})
+    return out
+
+
+def _imports_go(text: str) -> List[Dict]:
+    out: List[Dict] = []
+    in_block = False
+    for line in text.splitlines():
+        s = line.strip()
+        if in_block:
+            if s.startswith(")"):
+                in_block = False
+                continue
+            m = GO_IMPORT_ITEM.match(line)
+        elif s.startswith("import ("):
+            in_block = True
+            continue
+        else:
+            m = GO_IMPORT_ONE.match(line)
+        if m:
+            out.append({"from": None, "to_key": m.group(1), "kind": "import", "raw": s[:200]})
+    return out
+
+
+def _imports_php(text: str) -> List[Dict]:
+    out: List[Dict] = []
+    for line in text.splitlines():
+        # Top-level `use` only (column 0); trait `use` inside classes is indented
+        m = PHP_USE.match(line)
+        if m:
+            out.append({"from": None, "to_key": m.group(1).replace("\\", "."), "kind": "use", "raw": line.strip()[:200]})
+            continue
+        m = PHP_INCLUDE.search(line)
+        if m:
+            out.append({"from": None, "to_key": m.group(1), "kind": "include", "raw": line.strip()[:200]})
+    return out
+
+
+IMPORTERS = {
+    "javascript": _imports_js,
+    "typescript": _imports_js,
+    "go": _imports_go,
+    "php": _imports_php,
+}
+
+
+def _symbols_from_outline(outline: List[Dict], relpath: str, lang: str) -> List[Dict]:
+    module = relpath.rsplit(".", 1)[0].replace("/", ".").replace("\\", ".")
+    symbols: List[Dict] = []
+    for it in outline:
+        fq = f"{module}.{it['name']}"
+        symbols.append({
+            "name": it["name"],
+            "fqname": fq,
+            "symbol_key": fq.lower(),
+            "kind": it.get("kind") or "function",
+            "lang": lang,
+            "anchor": it["anchor"],
+            "signature": None,
+            "container_kind": None,
+            "container_name": None,
+        })
+    return symbols
+
+
+def _endpoints(text: str, relpath: str, lang: Optional[str]) -> List[Dict]:
+    if lang in ("javascript", "typescript"):
+        return fe_express(text, relpath)
+    if lang == "php":
+        return fe_symfony(text, relpath)
+    if lang == "yaml":
+        # Same precedence as core/endpoints: Symfony routes first, then generic gateway
+        return fe_symfony(text, relpath) or extract_yaml_gateway(text, relpath)
+    return []
+
+
+def extract_polyglot_facts(text: str, relpath: str) -> Optional[Dict[str, List[Dict]]]:
+    """Facts for a non-Python file, or None when no connector applies."""
+    lang = language_from_path(relpath)
+    if lang not in OUTLINERS and lang != "yaml":
+        return None
+    outliner = OUTLINERS.get(lang)
+    importer = IMPORTERS.get(lang)
+    return {
+        "lang": lang,
+        "symbols": _symbols_from_outline(outliner(text, relpath), relpath, lang) if outliner else [],
+        "imports": importer(text) if importer else [],
+        "endpoints": _endpoints(text, relpath, lang),
+    }
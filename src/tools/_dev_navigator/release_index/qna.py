@@ -13,6 +13,7 @@ def run(p: Dict[str, Any]) -> Dict[str, Any]:
     # Lazy import to avoid hard dependency at module import time
     try:
         from . import reader_paths as P
+        from . import reader_pool as RP
         from . import reader_queries as Q
     except Exception as e:
         return {
@@ -23,7 +24,7 @@ def run(p: Dict[str, Any]) -> Dict[str, Any]:
             "truncated": False,
         }
 
-    db_path, err = P.resolve_index_db(p["path"], p.get("release_tag"), p.get("commit_hash"))
+    db_path, err = RP.resolve_index_db(p["path"], p.get("release_tag"), p.get("commit_hash"))
     if not db_path:
         return {
             "operation": op,
@@ -41,7 +42,7 @@ def run(p: Dict[str, Any]) -> Dict[str, Any]:
         if p.get("commit_hash") and manifest.get("commit_hash") and not manifest["commit_hash"].startswith(p["commit_hash"]):
             return error_response(op, "generation_changed", "Index commit mismatches requested commit", scope="tool", recoverable=True)
 
-    conn = P._open_ro(db_path)
+    conn = RP.acquire_ro(db_path)
     try:
         limit = int(p.get("limit", 20))
         if op == "symbol_info":
@@ -74,6 +75,6 @@ def run(p: Dict[str, Any]) -> Dict[str, Any]:
             return {"operation": op, "data": page, "returned_count": len(page), "total_count": total, "truncated": next_c is not None, "next_cursor": next_c}
     finally:
         try:
-            conn.close()
+            RP.release_ro(conn)
         except Exception:
             pass
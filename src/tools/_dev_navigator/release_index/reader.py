@@ -1,4 +1,5 @@
 from .reader_paths import make_repo_slug, resolve_index_db, _open_ro
+from .reader_pool import acquire_ro, release_ro, invalidate as invalidate_pool, pool_stats
 from .reader_queries import (
     query_symbol_info,
     query_find_callers,
@@ -0,0 +1,179 @@
+"""
+Release index reader pool (process-wide)
+- Cache de résolution (root, tag, commit) -> db_path, invalidé par mtime du dossier repo
+- LRU de connexions read-only, clé = (realpath(index.db), integrity_hash du manifest)
+- PRAGMA tunés lecture (mmap_size, cache_size, temp_store)
+- API: resolve_index_db / acquire_ro / release_ro (mêmes contrats que reader_paths)
+"""
+from __future__ import annotations
+import os, json, sqlite3, threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from . import reader_paths as P
+
+POOL_SIZE = max(1, int(os.getenv("DEVNAV_INDEX_POOL_SIZE", "8") or 8))
+MMAP_SIZE = int(os.getenv("DEVNAV_INDEX_MMAP_BYTES", str(256 * 1024 * 1024)) or 0)
+CACHE_KIB = int(os.getenv("DEVNAV_INDEX_CACHE_KIB", "32768") or 0)
+
+_lock = threading.Lock()
+_resolved: Dict[Tuple[str, str, str, str], Tuple[str, str, int]] = {}
+_manifests: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_pool: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+_borrowed: Dict[int, "_Entry"] = {}
+_stats = {"resolve_hits": 0, "resolve_misses": 0, "conn_hits": 0, "conn_opens": 0, "conn_transient": 0, "evictions": 0}
+
+
+class _Entry:
+    __slots__ = ("conn", "busy", "evicted")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.busy = threading.Lock()
+        self.evicted = False
+
+
+def _stat_sig(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+        return (int(st.st_mtime_ns), int(st.st_size))
+    except OSError:
+        return None
+
+
+def _repo_dir_of(db_path: str) -> str:
+    # <repo_dir>/<release>/index.db
+    return os.path.dirname(os.path.dirname(os.path.abspath(db_path)))
+
+
+def resolve_index_db(repo_path: str, release_tag: Optional[str], commit_hash: Optional[str]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """Cached variant of reader_paths.resolve_index_db (errors are never cached)."""
+    key = (os.getcwd(), os.path.abspath(repo_path), release_tag or "", commit_hash or "")
+    hit = _resolved.get(key)
+    if hit:
+        db_path, repo_dir, repo_mtime = hit
+        sig = _stat_sig(repo_dir)
+        if sig and sig[0] == repo_mtime and os.path.isfile(db_path):
+            _stats["resolve_hits"] += 1
+            return db_path, None
+        _resolved.pop(key, None)
+    _stats["resolve_misses"] += 1
+    db_path, err = P.resolve_index_db(repo_path, release_tag, commit_hash)
+    if db_path:
+        repo_dir = _repo_dir_of(db_path)
+        sig = _stat_sig(repo_dir)
+        if sig:
+            _resolved[key] = (db_path, repo_dir, sig[0])
+    return db_path, err
+
+
+def _integrity_hash(db_path: str) -> str:
+    """integrity_hash from manifest.json, re-read only when the manifest changes on disk."""
+    manifest_path = os.path.join(os.path.dirname(db_path), "manifest.json")
+    sig = _stat_sig(manifest_path)
+    if sig is None:
+        # No manifest: fall back to the db file signature
+        return "stat:%s:%s" % (_stat_sig(db_path) or (0, 0))
+    cached = _manifests.get(manifest_path)
+    if cached and cached[0] == sig:
+        return cached[1]
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            h = str(json.load(f).get("integrity_hash") or "")
+    except Exception:
+        h = ""
+    h = h or "stat:%s:%s" % sig
+    _manifests[manifest_path] = (sig, h)
+    return h
+
+
+def _open_tuned(db_path: str) -> sqlite3.Connection:
+    conn = P._open_ro(db_path)
+    try:
+        if MMAP_SIZE > 0:
+            conn.execute(f"PRAGMA mmap_size={MMAP_SIZE};")
+        if CACHE_KIB > 0:
+            conn.execute(f"PRAGMA cache_size=-{CACHE_KIB};")
+        conn.execute("PRAGMA temp_store=MEMORY;")
+    except Exception:
+        pass
+    return conn
+
+
+def _close_quiet(conn: sqlite3.Connection) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+def acquire_ro(db_path: str) -> sqlite3.Connection:
+    """Borrow a pooled read-only connection; must be returned with release_ro()."""
+    real = os.path.realpath(db_path)
+    key = (real, _integrity_hash(real))
+    evicted = []
+    with _lock:
+        entry = _pool.get(key)
+        if entry is not None:
+            _pool.move_to_end(key)
+        else:
+            # Same file rebuilt (new integrity hash) -> drop stale connections
+            for k in [k for k in _pool if k[0] == real]:
+                evicted.append(_pool.pop(k))
+            entry = _Entry(_open_tuned(real))
+            _pool[key] = entry
+            _stats["conn_opens"] += 1
+            while len(_pool) > POOL_SIZE:
+                evicted.append(_pool.popitem(last=False)[1])
+                _stats["evictions"] += 1
+        # Concurrent borrower on the same db: serve a transient connection instead of waiting
+        if entry.busy.acquire(blocking=False):
+            _borrowed[id(entry.conn)] = entry
+            conn = entry.conn
+            _stats["conn_hits"] += 1
+        else:
+            conn = None
+    for e in evicted:
+        _retire(e)
+    if conn is None:
+        _stats["conn_transient"] += 1
+        conn = _open_tuned(real)
+    return conn
+
+
+def _retire(entry: _Entry) -> None:
+    # evicted flag and busy lock are checked together under _lock (see release_ro)
+    with _lock:
+        entry.evicted = True
+        idle = entry.busy.acquire(blocking=False)
+    if idle:
+        # Out of the pool: nobody can borrow it any more, the busy lock stays held
+        _close_quiet(entry.conn)
+    # else: closed by release_ro() when the borrower is done
+
+
+def release_ro(conn: sqlite3.Connection) -> None:
+    with _lock:
+        entry = _borrowed.pop(id(conn), None)
+        if entry is not None:
+            retired = entry.evicted
+            entry.busy.release()
+    if entry is None or retired:
+        _close_quiet(conn)
+
+
+def invalidate(db_path: Optional[str] = None) -> None:
+    """Close pooled connections (all, or those on db_path) and drop resolution caches."""
+    real = os.path.realpath(db_path) if db_path else None
+    with _lock:
+        keys = [k for k in _pool if real is None or k[0] == real]
+        entries = [_pool.pop(k) for k in keys]
+        _resolved.clear()
+        _manifests.clear()
+    for e in entries:
+        _retire(e)
+
+
+def pool_stats() -> Dict[str, Any]:
+    with _lock:
+        return dict(_stats, pooled=len(_pool), pool_size=POOL_SIZE)
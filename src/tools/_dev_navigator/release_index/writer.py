@@ -3,10 +3,10 @@ import sqlite3
 
 
 def insert_file(cur: sqlite3.Cursor, relpath: str, size: int, mtime: int, content_hash: str,
-                is_binary: int = 0, is_test: int = 0, is_generated: int = 0) -> int:
+                is_binary: int = 0, is_test: int = 0, is_generated: int = 0, lang: Optional[str] = None) -> int:
     cur.execute(
-        "INSERT INTO files(relpath, size, mtime, content_hash, is_binary, is_test, is_generated) VALUES (?,?,?,?,?,?,?)",
-        (relpath, int(size), int(mtime), content_hash, int(is_binary), int(is_test), int(is_generated))
+        "INSERT INTO files(relpath, lang, size, mtime, content_hash, is_binary, is_test, is_generated) VALUES (?,?,?,?,?,?,?,?)",
+        (relpath, lang, int(size), int(mtime), content_hash, int(is_binary), int(is_test), int(is_generated))
     )
     return int(cur.lastrowid)
 
@@ -6,8 +6,9 @@ from __future__ import annotations
 import logging
 import sqlite3
 import time
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 try:
     from config import find_project_root
@@ -15,6 +16,7 @@ except Exception:
     find_project_root = lambda: Path.cwd()  # type: ignore
 
 from . import excel_reader
+from . import stream_reader
 from . import validators
 
 logger = logging.getLogger(__name__)
@@ -57,87 +59,146 @@ def import_excel_to_sqlite(
     if not deps_ok:
         return {"error": deps_err}
     
-    import pandas as pd
-    
     logger.info(f"Starting import: {excel_path.name} -> {db_name}.{table_name}")
     
-    # Read Excel data
-    try:
-        df = excel_reader.read_excel_data(
-            excel_path,
-            sheet_name,
-            skip_rows=skip_rows,
-            header_row=header_row
-        )
-    except Exception as e:
-        return {"error": f"Failed to read Excel file: {e}"}
-    
-    if len(df) == 0:
-        return {"error": "Excel sheet is empty"}
+    # Database path
+    db_path = SQLITE_DIR / f"{db_name}.db"
+    SQLITE_DIR.mkdir(parents=True, exist_ok=True)
     
-    # Prepare DataFrame for SQLite
+    # Stream rows: header + type sample, then the rest of the sheet straight into SQLite
     try:
-        df, name_mapping = excel_reader.prepare_dataframe_for_sqlite(
-            df,
-            column_mapping=column_mapping,
-            type_mapping=type_mapping
-        )
+        with stream_reader.open_sheet(excel_path, sheet_name) as (_, rows):
+            excel_columns, data = stream_reader.read_rows(rows, skip_rows=skip_rows, header_row=header_row)
+            sample, data = stream_reader.sample_rows(data)
+            if not sample:
+                return {"error": "Excel sheet is empty"}
+            
+            columns, name_mapping = _map_columns(excel_columns, column_mapping)
+            if not column_mapping:
+                logger.info(f"Auto-mapped columns: {name_mapping}")
+                for orig, new in name_mapping.items():
+                    if orig != new:
+                        warnings.append(f"Column '{orig}' renamed to '{new}'")
+            
+            types = stream_reader.infer_types(sample, len(columns))
+            forced = set()
+            for col, sqlite_type in (type_mapping or {}).items():
+                if col not in columns:
+                    logger.warning(f"Column '{col}' not found in sheet, skipping type mapping")
+                    continue
+                types[columns.index(col)] = sqlite_type
+                forced.add(col)
+            converters = [stream_reader.make_converter(t, c in forced) for c, t in zip(columns, types)]
+            
+            logger.info(f"Writing to database: {db_path}")
+            null_counts = [0] * len(columns)
+            
+            def converted():
+                for row in data:
+                    out = []
+                    for i, val in enumerate(row):
+                        if val is not None:
+                            val = converters[i](val)
+                        if val is None:
+                            null_counts[i] += 1
+                        out.append(val)
+                    yield out
+            
+            rows_inserted = _bulk_insert(db_path, table_name, columns, types, converted(), if_exists, batch_size)
+    except _TableExists as e:
+        return {"error": str(e)}
+    except sqlite3.Error as e:
+        return {"error": f"Failed to write to SQLite: {e}"}
     except Exception as e:
-        return {"error": f"Failed to prepare data: {e}"}
-    
-    # Log column mapping
-    if not column_mapping:
-        logger.info(f"Auto-mapped columns: {name_mapping}")
-        for orig, new in name_mapping.items():
-            if orig != new:
-                warnings.append(f"Column '{orig}' renamed to '{new}'")
+        return {"error": f"Failed to read Excel file: {e}"}
     
     # Check for NULL values
-    for col in df.columns:
-        null_count = df[col].isna().sum()
+    for col, null_count in zip(columns, null_counts):
         if null_count > 0:
-            pct = (null_count / len(df)) * 100
+            pct = (null_count / rows_inserted) * 100
             warnings.append(f"Column '{col}' contains {null_count} NULL values ({pct:.1f}%)")
     
-    # Database path
-    db_path = SQLITE_DIR / f"{db_name}.db"
-    SQLITE_DIR.mkdir(parents=True, exist_ok=True)
-    
-    logger.info(f"Writing to database: {db_path}")
-    
-    # Write to SQLite using pandas
-    try:
-        conn = sqlite3.connect(str(db_path))
-        
-        # Write data in batches
-        df.to_sql(
-            table_name,
-            conn,
-            if_exists=if_exists,
-            index=False,
-            chunksize=batch_size
-        )
-        
-        conn.close()
-        
-    except Exception as e:
-        return {"error": f"Failed to write to SQLite: {e}"}
-    
     duration = time.time() - start_time
     
-    logger.info(f"Import completed: {len(df)} rows in {duration:.2f}s")
+    logger.info(f"Import completed: {rows_inserted} rows in {duration:.2f}s")
     
     return {
         "success": True,
         "db": f"{db_name}.db",
         "table": table_name,
-        "rows_inserted": len(df),
-        "columns": list(df.columns),
+        "rows_inserted": rows_inserted,
+        "columns": columns,
         "duration_sec": round(duration, 2),
         "warnings": warnings
     }
 
 
+class _TableExists(Exception):
+    pass
+
+
+def _map_columns(
+    excel_columns: List[str],
+    column_mapping: Optional[Dict[str, str]]
+) -> Tuple[List[str], Dict[str, str]]:
+    """Column names for SQLite (explicit mapping, or sanitized + unique like prepare_dataframe_for_sqlite)."""
+    if column_mapping:
+        return [column_mapping.get(c, c) for c in excel_columns], column_mapping
+    sanitized = validators.ensure_unique_column_names(
+        [validators.sanitize_column_name(str(c)) for c in excel_columns]
+    )
+    return sanitized, dict(zip(excel_columns, sanitized))
+
+
+def _bulk_insert(
+    db_path: Path,
+    table_name: str,
+    columns: List[str],
+    types: List[str],
+    rows: Iterator[List[Any]],
+    if_exists: str,
+    batch_size: int
+) -> int:
+    """
+    Create/replace the table and insert rows with executemany in a single transaction.
+    PRAGMA synchronous=OFF for the load only (connection-scoped, reset when closed).
+    """
+    q = lambda name: '"' + str(name).replace('"', '""') + '"'
+    conn = sqlite3.connect(str(db_path), isolation_level=None)
+    try:
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("BEGIN")
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table_name,)
+        ).fetchone() is not None
+        if exists and if_exists == "fail":
+            raise _TableExists(f"Table '{table_name}' already exists")
+        if exists and if_exists == "replace":
+            conn.execute(f"DROP TABLE {q(table_name)}")
+            exists = False
+        if not exists:
+            cols_sql = ", ".join(f"{q(c)} {stream_reader.SQLITE_DECL.get(t, 'TEXT')}" for c, t in zip(columns, types))
+            conn.execute(f"CREATE TABLE {q(table_name)} ({cols_sql})")
+        
+        sql = f"INSERT INTO {q(table_name)} ({', '.join(q(c) for c in columns)}) VALUES ({', '.join('?' * len(columns))})"
+        total = 0
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            conn.executemany(sql, batch)
+            total += len(batch)
+        conn.execute("COMMIT")
+        return total
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
 def preview_excel(
     excel_path: Path,
     sheet_name: str | int,
@@ -222,11 +283,9 @@ def validate_mapping(
     if not deps_ok:
         return {"error": deps_err}
     
-    import pandas as pd
-    
-    # Read Excel columns
+    # Read Excel columns + a type sample (not the whole sheet)
     try:
-        df = excel_reader.read_excel_data(
+        df = excel_reader.read_excel_sample(
             excel_path,
             sheet_name,
             skip_rows=skip_rows,
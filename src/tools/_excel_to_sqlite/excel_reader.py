@@ -1,11 +1,13 @@
 """
 Excel reader using Pandas.
 Handles reading Excel files, detecting types, and preparing data for SQLite.
+Sheet sizes and previews are streamed (stream_reader); full DataFrames only via read_excel_data.
 """
 from __future__ import annotations
 
 import logging
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -16,6 +18,8 @@ try:
 except ImportError:
     PANDAS_AVAILABLE = False
 
+from . import stream_reader
+
 logger = logging.getLogger(__name__)
 
 
@@ -66,27 +70,11 @@ def get_excel_info(excel_path: Path) -> Dict[str, Any]:
     created = datetime.fromtimestamp(stat.st_ctime).isoformat()
     modified = datetime.fromtimestamp(stat.st_mtime).isoformat()
     
-    # Read Excel file to get sheet info
-    excel_file = pd.ExcelFile(excel_path)
-    sheets = []
-    
-    for sheet_name in excel_file.sheet_names:
-        try:
-            df = pd.read_excel(excel_path, sheet_name=sheet_name, nrows=0)
-            rows = pd.read_excel(excel_path, sheet_name=sheet_name).shape[0]
-            columns = len(df.columns)
-            sheets.append({
-                "name": sheet_name,
-                "rows": rows,
-                "columns": columns
-            })
-        except Exception as e:
-            logger.warning(f"Could not read sheet '{sheet_name}': {e}")
-            sheets.append({
-                "name": sheet_name,
-                "rows": 0,
-                "columns": 0
-            })
+    # Sheet sizes from workbook dimensions (no data read)
+    sheets = [
+        {"name": sh["name"], "rows": sh["rows"], "columns": sh["columns"]}
+        for sh in stream_reader.sheet_dimensions(excel_path)
+    ]
     
     return {
         "file": excel_path.name,
@@ -109,23 +97,10 @@ def get_sheet_names(excel_path: Path) -> List[Dict[str, Any]]:
     if not PANDAS_AVAILABLE:
         raise ImportError("pandas is required")
     
-    excel_file = pd.ExcelFile(excel_path)
-    sheets = []
-    
-    for idx, sheet_name in enumerate(excel_file.sheet_names):
-        try:
-            df = pd.read_excel(excel_path, sheet_name=sheet_name)
-            rows = len(df)
-        except Exception:
-            rows = 0
-        
-        sheets.append({
-            "index": idx,
-            "name": sheet_name,
-            "rows": rows
-        })
-    
-    return sheets
+    return [
+        {"index": sh["index"], "name": sh["name"], "rows": sh["rows"]}
+        for sh in stream_reader.sheet_dimensions(excel_path)
+    ]
 
 
 def read_excel_preview(
@@ -159,17 +134,12 @@ def read_excel_preview(
     
     logger.info(f"Reading preview from '{excel_path.name}', sheet '{sheet_name}'")
     
-    # Read full dataframe to get total rows
-    df_full = pd.read_excel(
-        excel_path,
-        sheet_name=sheet_name,
-        skiprows=skip_rows,
-        header=header_row
-    )
-    total_rows = len(df_full)
-    
-    # Read preview
-    df = df_full.head(max_rows)
+    # Stream only the preview rows; total from sheet dimensions
+    with stream_reader.open_sheet(excel_path, sheet_name) as (actual_sheet, rows):
+        names, data = stream_reader.read_rows(rows, skip_rows=skip_rows, header_row=header_row)
+        df = pd.DataFrame(list(islice(data, max_rows)), columns=names)
+    dims = {sh["name"]: sh for sh in stream_reader.sheet_dimensions(excel_path)}
+    total_rows = max(0, dims[actual_sheet]["rows"] - skip_rows - header_row)
     
     # Analyze columns
     columns = {}
@@ -201,12 +171,6 @@ def read_excel_preview(
             row_dict[str(col)] = _serialize_value(val)
         preview_rows.append(row_dict)
     
-    # Get actual sheet name (if index was provided)
-    actual_sheet = sheet_name
-    if isinstance(sheet_name, int):
-        excel_file = pd.ExcelFile(excel_path)
-        actual_sheet = excel_file.sheet_names[sheet_name]
-    
     return {
         "success": True,
         "file": excel_path.name,
@@ -252,6 +216,25 @@ def read_excel_data(
     return df
 
 
+def read_excel_sample(
+    excel_path: Path,
+    sheet_name: str | int,
+    skip_rows: int = 0,
+    header_row: int = 0,
+    max_rows: int = stream_reader.SAMPLE_ROWS
+) -> pd.DataFrame:
+    """
+    Read the header and the first max_rows data rows (streamed) into a DataFrame.
+    Used for type detection / mapping validation without loading the whole sheet.
+    """
+    if not PANDAS_AVAILABLE:
+        raise ImportError("pandas is required")
+    
+    with stream_reader.open_sheet(excel_path, sheet_name) as (_, rows):
+        names, data = stream_reader.read_rows(rows, skip_rows=skip_rows, header_row=header_row)
+        return pd.DataFrame(list(islice(data, max_rows)), columns=names)
+
+
 def detect_column_type(series: pd.Series) -> str:
     """
     Detect SQLite type for pandas Series.
@@ -0,0 +1,250 @@
+"""
+Streaming Excel reader (no full-sheet DataFrame).
+- openpyxl read_only/iter_rows by default; python-calamine when EXCEL_READER=calamine (faster, loads the sheet in native memory)
+- Row counts from sheet dimensions (<dimension> tag), not from reading data
+- Header/skip semantics follow pd.read_excel(skiprows=..., header=...)
+- Column types inferred from a sample of rows (EXCEL_TYPE_SAMPLE_ROWS)
+"""
+from __future__ import annotations
+
+import logging
+import os
+from contextlib import contextmanager
+from datetime import date, datetime, time as dtime
+from itertools import chain, islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import openpyxl
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+try:
+    from python_calamine import CalamineWorkbook
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_ROWS = max(1, int(os.getenv("EXCEL_TYPE_SAMPLE_ROWS", "1000")))
+
+# Inferred type -> SQLite declared type (same storage as the former pandas/to_sql path)
+SQLITE_DECL = {"INTEGER": "INTEGER", "REAL": "REAL", "BOOLEAN": "INTEGER", "DATETIME": "TEXT", "TEXT": "TEXT"}
+
+
+def _use_calamine() -> bool:
+    return CALAMINE_AVAILABLE and os.getenv("EXCEL_READER", "openpyxl").strip().lower() == "calamine"
+
+
+def _resolve_sheet(sheet_names: List[str], sheet_name: str | int) -> str:
+    if isinstance(sheet_name, int):
+        if sheet_name < 0 or sheet_name >= len(sheet_names):
+            raise ValueError(f"Sheet index {sheet_name} out of range ({len(sheet_names)} sheets)")
+        return sheet_names[sheet_name]
+    if sheet_name not in sheet_names:
+        raise ValueError(f"Worksheet named '{sheet_name}' not found")
+    return sheet_name
+
+
+def sheet_dimensions(excel_path: Path) -> List[Dict[str, Any]]:
+    """
+    Sheet sizes from workbook metadata (no cell data is read when the <dimension> tag is present).
+
+    Returns:
+        [{"index": int, "name": str, "rows": int, "columns": int}, ...]
+        rows = data rows below a first-row header (as len(pd.read_excel(...)) reported)
+    """
+    wb = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        sheets = []
+        for idx, ws in enumerate(wb.worksheets):
+            max_row, max_col = ws.max_row, ws.max_column
+            if max_row is None or max_col is None:
+                # No <dimension> tag: scan rows (streamed, nothing kept)
+                ws.calculate_dimension(force=True)
+                max_row, max_col = ws.max_row or 0, ws.max_column or 0
+            sheets.append({
+                "index": idx,
+                "name": ws.title,
+                "rows": max(0, max_row - 1),
+                "columns": max_col
+            })
+        return sheets
+    finally:
+        wb.close()
+
+
+def _norm(val: Any) -> Any:
+    if isinstance(val, float) and val.is_integer():
+        return int(val)
+    return val
+
+
+def _calamine_rows(sheet) -> Iterator[tuple]:
+    # Rows aligned on A1 like openpyxl, so skip_rows/header_row pick the same rows
+    start = sheet.start or (0, 0)
+    pad = (None,) * start[1]
+    rows = iter(sheet.iter_rows())
+    # Some python-calamine versions yield the leading empty rows, others start at the first used row
+    first = None
+    for _ in range(start[0]):
+        row = next(rows, None)
+        if row is None or any(v != "" for v in row):
+            first = row
+            break
+    blank = (None,) * (start[1] + (sheet.width or 0))
+    for _ in range(start[0]):
+        yield blank
+    # calamine: empty cells are "", all numbers are floats
+    for row in chain((first,) if first is not None else (), rows):
+        yield pad + tuple(None if v == "" else _norm(v) for v in row)
+
+
+@contextmanager
+def open_sheet(excel_path: Path, sheet_name: str | int) -> Iterator[Tuple[str, Iterator[tuple]]]:
+    """Yield (actual sheet name, row iterator of value tuples); the workbook is closed on exit."""
+    if _use_calamine():
+        wb = CalamineWorkbook.from_path(str(excel_path))
+        try:
+            name = _resolve_sheet(list(wb.sheet_names), sheet_name)
+            sheet = wb.get_sheet_by_name(name)
+            yield name, _calamine_rows(sheet)
+        finally:
+            wb.close()
+        return
+
+    wb = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        name = _resolve_sheet(wb.sheetnames, sheet_name)
+        rows = (tuple(_norm(v) for v in row) for row in wb[name].iter_rows(values_only=True))
+        yield name, rows
+    finally:
+        wb.close()
+
+
+def _header_names(raw: tuple) -> List[str]:
+    # pandas naming: "Unnamed: i" for empty cells, ".n" suffix for duplicates
+    names: List[str] = []
+    seen: Dict[str, int] = {}
+    for i, val in enumerate(raw):
+        name = f"Unnamed: {i}" if val is None or val == "" else str(val)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _data_rows(rows: Iterable[tuple], width: int) -> Iterator[tuple]:
+    # Interior blank rows are kept (NULL rows), trailing blank rows dropped (pd.read_excel behaviour)
+    blanks = 0
+    for row in rows:
+        if len(row) != width:
+            row = (row + (None,) * width)[:width]
+        if all(v is None for v in row):
+            blanks += 1
+            continue
+        if blanks:
+            yield from [(None,) * width] * blanks
+            blanks = 0
+        yield row
+
+
+def read_rows(rows: Iterator[tuple], skip_rows: int = 0, header_row: int = 0) -> Tuple[List[str], Iterator[tuple]]:
+    """Split a sheet row iterator into (column names, data rows)."""
+    rows = islice(rows, skip_rows, None)
+    header = next(islice(rows, header_row, None), None)
+    if header is None:
+        return [], iter(())
+    return _header_names(header), _data_rows(rows, len(header))
+
+
+def _value_kind(val: Any) -> str:
+    if isinstance(val, bool):
+        return "BOOLEAN"
+    if isinstance(val, int):
+        return "INTEGER"
+    if isinstance(val, float):
+        return "REAL"
+    if isinstance(val, (datetime, date)):
+        return "DATETIME"
+    return "TEXT"
+
+
+def infer_types(sample: List[tuple], width: int) -> List[str]:
+    """
+    Column types from sampled rows.
+
+    Returns:
+        ["INTEGER" | "REAL" | "TEXT" | "DATETIME" | "BOOLEAN", ...]
+    """
+    types = []
+    for col in range(width):
+        kinds = {_value_kind(row[col]) for row in sample if row[col] is not None}
+        if not kinds:
+            types.append("TEXT")
+        elif len(kinds) == 1:
+            types.append(kinds.pop())
+        elif kinds <= {"INTEGER", "REAL"}:
+            types.append("REAL")
+        else:
+            types.append("TEXT")
+    return types
+
+
+def sample_rows(data: Iterator[tuple], n: int = SAMPLE_ROWS) -> Tuple[List[tuple], Iterator[tuple]]:
+    """Buffer the first n rows for inference; returns (sample, iterator over all rows)."""
+    sample = list(islice(data, n))
+    return sample, chain(sample, data)
+
+
+def _to_int(val: Any) -> Optional[int]:
+    try:
+        f = float(val)
+        return int(f) if f.is_integer() else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(val: Any) -> Optional[float]:
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_datetime(val: Any) -> Optional[str]:
+    if isinstance(val, (datetime, date)):
+        return val.strftime('%Y-%m-%d %H:%M:%S')
+    try:
+        return datetime.fromisoformat(str(val).strip()).strftime('%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return None
+
+
+def make_converter(col_type: str, forced: bool):
+    """Converter for non-NULL values; forced=True coerces like the former type_mapping (errors -> NULL)."""
+    if forced:
+        if col_type == "INTEGER":
+            return _to_int
+        if col_type == "REAL":
+            return _to_float
+        if col_type == "DATETIME":
+            return _to_datetime
+        if col_type == "TEXT":
+            return lambda v: str(v) if not isinstance(v, (datetime, date)) else _to_datetime(v)
+
+    def convert(val: Any) -> Any:
+        if isinstance(val, bool):
+            return int(val)
+        if isinstance(val, (datetime, date)):
+            return val.strftime('%Y-%m-%d %H:%M:%S')
+        if isinstance(val, dtime):
+            return val.isoformat()
+        return val
+    return convert
@@ -0,0 +1,145 @@
+"""Content-addressed scene-analysis cache: (video hash, detection params) -> diffs, cuts, shots.
+
+The video hash samples the file (size + head/middle/tail blocks), so a renamed or copied
+video still hits; (path, size, mtime_ns) -> hash is memoized to avoid re-reading files.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .paths import project_root
+
+# Bump when detection/refine output changes for identical params
+ANALYSIS_VERSION = 1
+
+_SAMPLE_BYTES = 4 << 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (path)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS analyses (
+    video_hash TEXT NOT NULL,
+    params_key TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    meta BLOB NOT NULL,
+    series BLOB NOT NULL,
+    PRIMARY KEY (video_hash, params_key)
+) WITHOUT ROWID;
+"""
+
+# Per-frame series stored as float64 columns instead of JSON lists
+_SERIES_KEYS = ('diffs', 'r_values')
+
+
+def enabled() -> bool:
+    return os.getenv("FFMPEG_FRAMES_CACHE", "1").lower() not in ("0", "false", "no", "off")
+
+
+def db_path() -> str:
+    env = os.getenv("FFMPEG_FRAMES_CACHE_DB")
+    if env:
+        return os.path.expanduser(env)
+    return os.path.join(project_root(), "sqlite3", "ffmpeg_frames_cache.db")
+
+
+def connect() -> sqlite3.Connection:
+    p = db_path()
+    os.makedirs(os.path.dirname(p), exist_ok=True)
+    conn = sqlite3.connect(p, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _hash_file(path_abs: str, size: int) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    h.update(str(size).encode())
+    with open(path_abs, 'rb') as f:
+        if size <= 3 * _SAMPLE_BYTES:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        else:
+            for off in (0, size // 2 - _SAMPLE_BYTES // 2, size - _SAMPLE_BYTES):
+                f.seek(off)
+                h.update(f.read(_SAMPLE_BYTES))
+    return h.hexdigest()
+
+
+def video_hash(conn: sqlite3.Connection, path_abs: str) -> str:
+    st = os.stat(path_abs)
+    row = conn.execute("SELECT size, mtime_ns, hash FROM files WHERE path=?", (path_abs,)).fetchone()
+    if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+        return row[2]
+    digest = _hash_file(path_abs, st.st_size)
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO files VALUES (?,?,?,?)", (path_abs, st.st_size, st.st_mtime_ns, digest))
+    return digest
+
+
+def params_key(params: Dict[str, Any]) -> str:
+    raw = json.dumps({'v': ANALYSIS_VERSION, **params}, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _pack(analysis: Dict[str, Any]) -> tuple:
+    info = dict(analysis.get('info') or {})
+    pairs = {k: info.pop(k, None) or [] for k in _SERIES_KEYS}
+    has_debug = info.pop('frames_debug', None) is not None
+    times = np.array([t for t, _ in pairs['diffs']], dtype=np.float64)
+    diffs = np.array([d for _, d in pairs['diffs']], dtype=np.float64)
+    r = np.array([v for _, v in pairs['r_values']], dtype=np.float64)
+    meta = {**analysis, 'info': info, 'has_debug': has_debug, 'n': len(times), 'n_r': len(r)}
+    series = zlib.compress(np.concatenate([times, diffs, r]).tobytes(), 6)
+    return zlib.compress(json.dumps(meta).encode('utf-8'), 6), series
+
+
+def _unpack(meta_blob: bytes, series_blob: bytes) -> Dict[str, Any]:
+    meta = json.loads(zlib.decompress(meta_blob).decode('utf-8'))
+    n, n_r = meta.pop('n'), meta.pop('n_r')
+    has_debug = meta.pop('has_debug')
+    arr = np.frombuffer(zlib.decompress(series_blob), dtype=np.float64)
+    times, diffs, r = arr[:n], arr[n:2 * n], arr[2 * n:2 * n + n_r]
+    t_l, d_l = times.tolist(), diffs.tolist()
+    info = meta['info']
+    info['diffs'] = list(zip(t_l, d_l))
+    info['r_values'] = list(zip(t_l[:n_r], r.tolist()))
+    if has_debug:
+        sim = np.round((1.0 - diffs) * 100.0, 3).tolist()
+        info['frames_debug'] = [{'t': t, 'diff': d, 'similarity_pct': p} for t, d, p in zip(t_l, d_l, sim)]
+    # JSON turns tuples into lists
+    for k in ('cuts_coarse',):
+        meta[k] = [tuple(x) for x in meta.get(k) or []]
+    info['cuts'] = [tuple(x) for x in info.get('cuts') or []]
+    return meta
+
+
+def load(conn: sqlite3.Connection, video: str, key: str) -> Optional[Dict[str, Any]]:
+    row = conn.execute(
+        "SELECT meta, series FROM analyses WHERE video_hash=? AND params_key=?", (video, key)
+    ).fetchone()
+    if not row:
+        return None
+    try:
+        return _unpack(row[0], row[1])
+    except Exception:
+        return None  # unreadable entry: recompute
+
+
+def store(conn: sqlite3.Connection, video: str, key: str, analysis: Dict[str, Any]) -> None:
+    meta, series = _pack(analysis)
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO analyses VALUES (?,?,?,?,?)", (video, key, time.time(), meta, series))
@@ -0,0 +1,340 @@
+"""Vectorized frame-difference engine (NumPy) for scene detection.
+
+- Frames land in a preallocated ring buffer (pipe: readinto, PyAV: array copy);
+  L1 luma diffs are computed per batch, never per pixel in Python
+- EMA / median / moving average / percentile on arrays (same results as the list helpers in utils)
+- Long videos: analysis split into time ranges snapped to keyframes and run in parallel
+  (FFMPEG_FRAMES_WORKERS, from FFMPEG_FRAMES_PARALLEL_MIN_SEC of video), boundary diffs stitched
+"""
+from __future__ import annotations
+import math
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import av  # type: ignore
+    _HAS_PYAV = True
+except Exception:
+    _HAS_PYAV = False
+
+BATCH_FRAMES = 256
+WORKERS = max(1, int(os.getenv("FFMPEG_FRAMES_WORKERS", str(min(4, os.cpu_count() or 1)))))
+PARALLEL_MIN_SEC = float(os.getenv("FFMPEG_FRAMES_PARALLEL_MIN_SEC", "600"))
+# Each parallel range covers at least this much video (seek + decoder warm-up amortized)
+_MIN_RANGE_SEC = 60.0
+
+
+# --------------------
+# Batched diffs
+# --------------------
+
+class LumaDiffer:
+    """Ring buffer of gray frames; emits normalized L1 diffs between consecutive frames per batch.
+
+    Row 0 carries the last frame of the previous batch, rows 1..capacity receive new frames.
+    """
+
+    def __init__(self, frame_size: int, capacity: int = BATCH_FRAMES):
+        self.frame_size = frame_size
+        self.capacity = capacity
+        self.buf = np.empty((capacity + 1, frame_size), dtype=np.uint8)
+        self._fill = 0           # frames in rows 1..capacity
+        self._has_prev = False   # row 0 valid
+        self.first: Optional[np.ndarray] = None
+        self.frames = 0
+        self._out: List[np.ndarray] = []
+        self._norm = float(frame_size) * 255.0
+
+    def slot(self) -> np.ndarray:
+        """Next free row (write a frame into it, then call commit())."""
+        if self._fill == self.capacity:
+            self._flush()
+        return self.buf[self._fill + 1]
+
+    def commit(self) -> None:
+        if self.first is None:
+            self.first = self.buf[self._fill + 1].copy()
+        self._fill += 1
+        self.frames += 1
+
+    def push(self, frame: np.ndarray) -> None:
+        self.slot()[:] = frame.reshape(-1)
+        self.commit()
+
+    def _flush(self) -> None:
+        if self._fill == 0:
+            return
+        lo = 0 if self._has_prev else 1
+        block = self.buf[lo:self._fill + 1].astype(np.int16)
+        if len(block) > 1:
+            d = np.abs(np.diff(block, axis=0)).sum(axis=1, dtype=np.int64) / self._norm
+            self._out.append(d)
+        self.buf[0] = self.buf[self._fill]
+        self._has_prev = True
+        self._fill = 0
+
+    @property
+    def last(self) -> Optional[np.ndarray]:
+        if self._fill:
+            return self.buf[self._fill].copy()
+        return self.buf[0].copy() if self._has_prev else None
+
+    def diffs(self) -> np.ndarray:
+        self._flush()
+        return np.concatenate(self._out) if self._out else np.empty(0, dtype=np.float64)
+
+
+def pair_diff(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.abs(a.astype(np.int16) - b.astype(np.int16)).sum()) / (a.size * 255.0)
+
+
+# --------------------
+# Smoothing / stats (array versions of utils helpers)
+# --------------------
+
+def ema(x: np.ndarray, alpha: float) -> np.ndarray:
+    """y[0] = x[0]; y[k] = (1-alpha) y[k-1] + alpha x[k], computed in closed form per block."""
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if n == 0 or alpha >= 1.0:
+        return x.copy()
+    if alpha <= 0.0:
+        return np.full(n, x[0])
+    q = 1.0 - alpha
+    # Block length keeps q**-k within float64 range
+    block = max(1, min(4096, int(150 * math.log(10) / -math.log(q))))
+    y = np.empty(n)
+    y[0] = prev = x[0]
+    i = 1
+    while i < n:
+        seg = x[i:i + block]
+        m = len(seg)
+        k = np.arange(1, m + 1)
+        qk = q ** k
+        y[i:i + m] = qk * (prev + np.cumsum(alpha * seg / qk))
+        prev = y[i + m - 1]
+        i += m
+    return y
+
+
+def moving_average(x: np.ndarray, k: int) -> np.ndarray:
+    """Centered mean over [i-k//2, i+k//2], window shrunk at the edges."""
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if n == 0 or k <= 1:
+        return x.copy()
+    half = k // 2
+    cs = np.concatenate(([0.0], np.cumsum(x)))
+    idx = np.arange(n)
+    a = np.maximum(0, idx - half)
+    b = np.minimum(n, idx + half + 1)
+    return (cs[b] - cs[a]) / (b - a)
+
+
+def median_window(x: np.ndarray, k: int = 3) -> np.ndarray:
+    """Element [len//2] of the sorted window [i-k//2, i+k//2], window shrunk at the edges."""
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if n == 0 or k <= 1 or k > n:
+        return x.copy()
+    half = k // 2
+    out = np.empty(n)
+    win = np.lib.stride_tricks.sliding_window_view(x, 2 * half + 1)
+    out[half:n - half] = np.sort(win, axis=1)[:, half]
+    for i in list(range(min(half, n))) + list(range(max(half, n - half), n)):
+        w = np.sort(x[max(0, i - half):min(n, i + half + 1)])
+        out[i] = w[len(w) // 2]
+    return out
+
+
+def percentile(x: np.ndarray, p: float) -> float:
+    x = np.asarray(x, dtype=np.float64)
+    if len(x) == 0:
+        return 0.0
+    idx = max(0, min(len(x) - 1, int(p * (len(x) - 1))))
+    return float(np.partition(x, idx)[idx])
+
+
+# --------------------
+# Keyframes and ranges
+# --------------------
+
+def keyframe_times(path_abs: str) -> List[float]:
+    """Video keyframe timestamps from packet flags (demux only, no decoding)."""
+    cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+           '-show_entries', 'packet=pts_time,flags', '-of', 'csv=p=0', path_abs]
+    try:
+        out = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=120).stdout
+    except Exception:
+        return []
+    times = []
+    for line in out.decode('ascii', 'ignore').splitlines():
+        parts = line.split(',')
+        if len(parts) >= 2 and 'K' in parts[1]:
+            try:
+                times.append(float(parts[0]))
+            except ValueError:
+                pass
+    return sorted(times)
+
+
+def split_ranges(duration: float, workers: int, keyframes: Optional[List[float]] = None) -> List[Tuple[float, Optional[float]]]:
+    """[start, end) ranges for parallel analysis; boundaries snapped to keyframes when known. Last end is None (EOF)."""
+    n = min(workers, max(1, int(duration // _MIN_RANGE_SEC)))
+    if n <= 1 or duration <= 0:
+        return [(0.0, None)]
+    bounds = [duration * i / n for i in range(1, n)]
+    if keyframes:
+        kf = np.asarray(keyframes)
+        bounds = sorted({float(kf[np.abs(kf - b).argmin()]) for b in bounds})
+        bounds = [b for b in bounds if 0.0 < b < duration]
+    edges = [0.0] + bounds
+    return [(edges[i], edges[i + 1] if i + 1 < len(edges) else None) for i in range(len(edges))]
+
+
+class RangeResult:
+    __slots__ = ("times", "diffs", "first", "last", "first_t", "frames")
+
+    def __init__(self, times: np.ndarray, diffs: np.ndarray, first, last, first_t: Optional[float], frames: int):
+        self.times = times
+        self.diffs = diffs
+        self.first = first
+        self.last = last
+        self.first_t = first_t
+        self.frames = frames
+
+
+def stitch(parts: List[RangeResult]) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Concatenate per-range diffs, adding the diff across each range boundary."""
+    times: List[np.ndarray] = []
+    diffs: List[np.ndarray] = []
+    prev_last = None
+    frames = 0
+    for p in parts:
+        if p.frames == 0:
+            continue
+        if prev_last is not None and p.first is not None:
+            times.append(np.array([p.first_t]))
+            diffs.append(np.array([pair_diff(prev_last, p.first)]))
+        times.append(p.times)
+        diffs.append(p.diffs)
+        prev_last = p.last
+        frames += p.frames
+    if not times:
+        return np.empty(0), np.empty(0), 0
+    return np.concatenate(times), np.concatenate(diffs), frames
+
+
+def run_ranges(fn: Callable[[float, Optional[float]], RangeResult], duration: float, path_abs: str,
+               workers: int = WORKERS) -> Tuple[np.ndarray, np.ndarray, int, int]:
+    """Analyze the whole video, in parallel ranges when long enough.
+
+    Returns:
+        (times, diffs, frames_decoded, ranges_used)
+    """
+    if workers > 1 and duration >= PARALLEL_MIN_SEC:
+        ranges = split_ranges(duration, workers, keyframe_times(path_abs))
+    else:
+        ranges = [(0.0, None)]
+    if len(ranges) == 1:
+        times, diffs, frames = stitch([fn(0.0, None)])
+        return times, diffs, frames, 1
+    with ThreadPoolExecutor(max_workers=len(ranges)) as ex:
+        parts = list(ex.map(lambda r: fn(*r), ranges))
+    times, diffs, frames = stitch(parts)
+    return times, diffs, frames, len(ranges)
+
+
+# --------------------
+# Frame sources
+# --------------------
+
+def cli_range(path_abs: str, fps: float, scale_w: int, scale_h: int, start: float = 0.0, end: Optional[float] = None) -> RangeResult:
+    """ffmpeg CLI decode (fps filter, scaled gray) of [start, end) read with readinto into the ring buffer."""
+    cmd = ['ffmpeg', '-hide_banner', '-loglevel', 'error']
+    if start > 0:
+        cmd += ['-ss', f'{start:.6f}']
+    if end is not None:
+        cmd += ['-t', f'{end - start:.6f}']
+    cmd += ['-i', path_abs, '-an', '-vf', f'fps={fps},scale={scale_w}:{scale_h},format=gray',
+            '-f', 'rawvideo', '-']
+    frame_size = scale_w * scale_h
+    differ = LumaDiffer(frame_size)
+    p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=frame_size * 64)
+    try:
+        stdout = p.stdout
+        while True:
+            view = memoryview(differ.slot())
+            got = 0
+            while got < frame_size:
+                n = stdout.readinto(view[got:])
+                if not n:
+                    break
+                got += n
+            if got < frame_size:
+                break
+            differ.commit()
+    finally:
+        try:
+            p.kill()
+            p.wait(timeout=5)
+        except Exception:
+            pass
+    diffs = differ.diffs()
+    times = start + np.arange(1, len(diffs) + 1) / fps
+    return RangeResult(np.round(times, 6), diffs, differ.first, differ.last, round(start, 6), differ.frames)
+
+
+def _frame_time(frame, stream, fallback: float) -> float:
+    try:
+        if frame.pts is not None and stream.time_base is not None:
+            return float(frame.pts * stream.time_base)
+    except Exception:
+        pass
+    try:
+        return float(frame.time)
+    except Exception:
+        return fallback
+
+
+def pyav_range(path_abs: str, scale_w: int, scale_h: int, start: float = 0.0, end: Optional[float] = None) -> Tuple[RangeResult, float]:
+    """PyAV decode at native fps of frames with start <= t < end (seek to the keyframe before start).
+
+    Returns:
+        (RangeResult, stream average fps or 0.0)
+    """
+    differ = LumaDiffer(scale_w * scale_h)
+    times: List[float] = []
+    first_t = None
+    fps_est = 0.0
+    with av.open(path_abs) as container:
+        stream = container.streams.video[0]
+        stream.thread_type = 'AUTO'  # codec frame threading
+        try:
+            fps_est = float(stream.average_rate or 0.0)
+        except Exception:
+            fps_est = 0.0
+        if start > 0 and stream.time_base is not None:
+            container.seek(int(start / stream.time_base), stream=stream, backward=True, any_frame=False)
+        n = 0
+        for frame in container.decode(stream):
+            t = _frame_time(frame, stream, start + n / max(1.0, fps_est or 25.0))
+            n += 1
+            if t < start - 1e-6:
+                continue
+            if end is not None and t >= end - 1e-6:
+                break
+            arr = frame.reformat(width=scale_w, height=scale_h, format='gray').to_ndarray()
+            differ.push(arr)
+            if first_t is None:
+                first_t = t
+            else:
+                times.append(t)
+    diffs = differ.diffs()
+    res = RangeResult(np.round(np.asarray(times, dtype=np.float64), 6), diffs, differ.first, differ.last,
+                      round(first_t, 6) if first_t is not None else None, differ.frames)
+    return res, fps_est
@@ -1,17 +1,106 @@
 from __future__ import annotations
 import os
-from typing import List, Dict, Any
+import re
+import shutil
+import subprocess
+import uuid
+from typing import List, Dict, Any, Set, Tuple
 from .shell import run
 from .paths import project_root, ensure_dir
 
+# Timestamps per ffmpeg process: the select expression is evaluated for every decoded
+# frame, so long target lists are cut into consecutive groups (one pass overall)
+BATCH_TARGETS = max(1, int(os.getenv("FFMPEG_FRAMES_BATCH_TARGETS", "64")))
+# Decode past the last target of a group so a frame at/after it is always reached
+_TAIL_SEC = 2.0
+
+_SHOWINFO_RE = re.compile(r"\bn:\s*(\d+)\s+pts:\s*\S+\s+pts_time:\s*([-+0-9.eE]+)")
+
 
 def _safe_name(base: str) -> str:
     return base.replace(' ', '_')
 
 
+def _quality_args(image_format: str) -> List[str]:
+    # The mjpeg rate control would spread its bitrate over the whole batch; a lone frame
+    # (former one-seek-per-frame path) gets q=5, keep that so file quality is unchanged
+    if image_format.lower() in ('jpg', 'jpeg'):
+        return ['-q:v', '5']
+    return []
+
+
+def _grab_one(path_abs: str, t: float, ofile: str) -> bool:
+    cmd = f'ffmpeg -hide_banner -loglevel error -ss {t} -i "{path_abs}" -frames:v 1 -y "{ofile}"'
+    code, out, err = run(cmd)
+    return code == 0 and os.path.exists(ofile)
+
+
+def _grab_group(path_abs: str, group: List[Tuple[float, str]], image_format: str) -> Set[str]:
+    """One ffmpeg pass over [t_first, t_last]: select the first frame at/after each target
+    (same frame as `-ss t -frames:v 1`), then move it to the target file."""
+    start = group[0][0]
+    rel = [max(0.0, t - start) for t, _ in group]
+    # prev_selected_t is NAN before the first selection, and NAN comparisons are false
+    expr = '+'.join(f'gte(t,{r:.6f})*not(gte(prev_selected_t,{r:.6f}))' for r in sorted(set(rel)))
+    tmp = os.path.join(os.path.dirname(group[0][1]), f'.batch_{uuid.uuid4().hex}')
+    ensure_dir(tmp)
+    cmd = [
+        'ffmpeg', '-hide_banner', '-nostdin', '-loglevel', 'info',
+        '-ss', f'{start:.6f}', '-t', f'{rel[-1] + _TAIL_SEC:.6f}',
+        '-i', path_abs, '-an',
+        '-vf', f"select='{expr}',showinfo",
+        '-fps_mode', 'passthrough',
+        *_quality_args(image_format),
+        '-y', os.path.join(tmp, f'grab_%06d.{image_format}'),
+    ]
+    done: Set[str] = set()
+    try:
+        p = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if p.returncode != 0:
+            return done
+        picked = [float(m.group(2)) for m in _SHOWINFO_RE.finditer(p.stderr.decode('utf-8', 'ignore'))]
+        j = 0
+        for (t, ofile), r in zip(group, rel):
+            # Targets are sorted: each maps to the first selected frame at/after it
+            while j < len(picked) and picked[j] < r - 1e-6:
+                j += 1
+            if j >= len(picked):
+                break
+            src = os.path.join(tmp, f'grab_{j + 1:06d}.{image_format}')
+            if not os.path.exists(src):
+                continue
+            shutil.copyfile(src, ofile)
+            done.add(ofile)
+        return done
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def grab_frames(path_abs: str, targets: List[Tuple[float, str]], image_format: str, overwrite: bool) -> Set[str]:
+    """Write one frame per (t, output file) with a single sequential decoding pass.
+
+    Existing files are kept when overwrite is False. Returns the set of files present.
+    Groups that fail in batch mode fall back to one seek per target.
+    """
+    done: Set[str] = set()
+    todo: List[Tuple[float, str]] = []
+    for t, ofile in sorted(targets):
+        if not overwrite and os.path.exists(ofile):
+            done.add(ofile)
+        else:
+            todo.append((max(0.0, float(t)), ofile))
+    for i in range(0, len(todo), BATCH_TARGETS):
+        group = todo[i:i + BATCH_TARGETS]
+        got = _grab_group(path_abs, group, image_format)
+        for t, ofile in group:
+            if ofile in got or _grab_one(path_abs, t, ofile):
+                done.add(ofile)
+    return done
+
+
 def extract_frames_at_times(path_abs: str, outdir_abs: str, times: List[float], image_format: str, overwrite: bool) -> List[Dict[str, Any]]:
     ensure_dir(outdir_abs)
-    frames = []
+    targets: List[Tuple[float, str]] = []
     seen = set()
     for t in sorted(times):
         key = round(t, 3)
@@ -19,14 +108,12 @@ def extract_frames_at_times(path_abs: str, outdir_abs: str, times: List[float],
             continue
         seen.add(key)
         fname = f"frame_t{str(key).replace('.', '_')}.{image_format}"
-        ofile = os.path.join(outdir_abs, fname)
-        ow = "-y" if overwrite else "-n"
-        cmd = f'ffmpeg -hide_banner -loglevel error -ss {key} -i "{path_abs}" -frames:v 1 {ow} "{ofile}"'
-        code, out, err = run(cmd)
-        if code == 0 and os.path.exists(ofile):
-            rel_file = os.path.relpath(ofile, project_root())
-            frames.append({"t": float(key), "file": rel_file})
-    return frames
+        targets.append((key, os.path.join(outdir_abs, fname)))
+    done = grab_frames(path_abs, targets, image_format, overwrite)
+    return [
+        {"t": float(key), "file": os.path.relpath(ofile, project_root())}
+        for key, ofile in targets if ofile in done
+    ]
 
 
 def extract_shots_labeled(path_abs: str, outdir_abs: str, shots: List[Dict[str, Any]], image_format: str, overwrite: bool) -> List[Dict[str, Any]]:
@@ -35,25 +122,17 @@ def extract_shots_labeled(path_abs: str, outdir_abs: str, shots: List[Dict[str,
     Filenames: scene_{index:03d}_start.{ext} and scene_{index:03d}_end.{ext}
     """
     ensure_dir(outdir_abs)
-    frames: List[Dict[str, Any]] = []
+    entries: List[Tuple[float, str, str, str]] = []
     for s in shots:
         idx = s['index']
-        # start
-        name = _safe_name(f"scene_{idx:03d}_start")
-        ofile = os.path.join(outdir_abs, f"{name}.{image_format}")
-        ow = "-y" if overwrite else "-n"
-        cmd = f'ffmpeg -hide_banner -loglevel error -ss {s["start"]} -i "{path_abs}" -frames:v 1 {ow} "{ofile}"'
-        code, out, err = run(cmd)
-        if code == 0 and os.path.exists(ofile):
-            frames.append({"t": s['start'], "file": os.path.relpath(ofile, project_root()), "name": name, "kind": "start"})
-        # end
-        name = _safe_name(f"scene_{idx:03d}_end")
-        ofile = os.path.join(outdir_abs, f"{name}.{image_format}")
-        cmd = f'ffmpeg -hide_banner -loglevel error -ss {s["end"]} -i "{path_abs}" -frames:v 1 {ow} "{ofile}"'
-        code, out, err = run(cmd)
-        if code == 0 and os.path.exists(ofile):
-            frames.append({"t": s['end'], "file": os.path.relpath(ofile, project_root()), "name": name, "kind": "end"})
-    return frames
+        for kind in ('start', 'end'):
+            name = _safe_name(f"scene_{idx:03d}_{kind}")
+            entries.append((s[kind], os.path.join(outdir_abs, f"{name}.{image_format}"), name, kind))
+    done = grab_frames(path_abs, [(t, ofile) for t, ofile, _, _ in entries], image_format, overwrite)
+    return [
+        {"t": t, "file": os.path.relpath(ofile, project_root()), "name": name, "kind": kind}
+        for t, ofile, name, kind in entries if ofile in done
+    ]
 
 
 def extract_interval(path_abs: str, outdir_abs: str, interval: int, image_format: str, overwrite: bool, max_frames: int | None, duration: float) -> List[Dict[str, Any]]:
@@ -30,7 +30,8 @@ def route_operation(operation: str, **params) -> Dict[str, Any]:
             callsign_pattern=params.get("callsign_pattern"),
             max_results=params.get("max_results", 100),
             sort_by=params.get("sort_by", "distance"),
-            include_metadata=params.get("include_metadata", True)
+            include_metadata=params.get("include_metadata", True),
+            since=params.get("since")
         )
     
     return {"error": f"Unknown operation: {operation}"}
@@ -2,10 +2,15 @@
 from __future__ import annotations
 from typing import Dict, Any, List, Optional
 import fnmatch
+import math
+import os
+import re
 
-from .validators import validate_position, validate_radius, validate_filters
-from .utils import calculate_bbox, calculate_distance, detect_flight_phase, format_flight_data
-from .services.opensky import fetch_flights_in_bbox
+import numpy as np
+
+from .validators import validate_position, validate_radius, validate_filters, validate_since
+from .utils import calculate_bbox, detect_flight_phase
+from .services.snapshot import Snapshot, clamp_bbox, get_cache, get_snapshot
 
 
 def handle_track_flights(
@@ -22,7 +27,8 @@ def handle_track_flights(
     callsign_pattern: Optional[str] = None,
     max_results: int = 100,
     sort_by: str = "distance",
-    include_metadata: bool = True
+    include_metadata: bool = True,
+    since: Optional[float] = None
 ) -> Dict[str, Any]:
     """Handle track_flights operation.
     
@@ -41,6 +47,7 @@ def handle_track_flights(
         max_results: Max results limit
         sort_by: Sort field
         include_metaInclude flight phase analysis
+        since: Only aircraft updated after this unix time (adds a changes summary)
         
     Returns:
         Tracking results
@@ -55,6 +62,13 @@ def handle_track_flights(
     if not radius_result["valid"]:
         return {"error": radius_result["error"]}
     
+    # Validate changes-since timestamp
+    if since is not None:
+        since_result = validate_since(since)
+        if not since_result["valid"]:
+            return {"error": since_result["error"]}
+        since = since_result["since"]
+    
     # Validate filters
     filters_result = validate_filters(
         altitude_min=altitude_min,
@@ -70,65 +84,44 @@ def handle_track_flights(
     # Calculate bounding box
     bbox = calculate_bbox(latitude, longitude, radius_km)
     
-    # Fetch flights from OpenSky API
-    fetch_result = fetch_flights_in_bbox(
-        lamin=bbox["lamin"],
-        lomin=bbox["lomin"],
-        lamax=bbox["lamax"],
-        lomax=bbox["lomax"]
-    )
+    # Shared snapshot (one upstream fetch serves overlapping areas within the TTL)
+    fetch_result = get_snapshot(bbox)
     
     if not fetch_result["success"]:
         return {"error": fetch_result["error"]}
     
-    raw_flights = fetch_result.get("states", [])
-    if not raw_flights:
-        return {
-            "success": True,
-            "center": {"latitude": latitude, "longitude": longitude},
-            "radius_km": radius_km,
-            "filters_applied": _build_filters_summary(
-                altitude_min, altitude_max, on_ground_only, in_flight_only,
-                speed_min, speed_max, countries, callsign_pattern
-            ),
-            "flights_count": 0,
-            "flights": []
-        }
+    snap = fetch_result["snapshot"]
+    query_bbox = clamp_bbox(bbox)
+    idx = snap.select(query_bbox)
     
-    # Process and filter flights
-    processed_flights = []
+    # Distance from center (API bbox is rectangular, we want circular)
+    distances = _haversine_km(latitude, longitude, snap.lat[idx], snap.lon[idx])
+    in_radius = distances <= radius_km
+    idx, distances = idx[in_radius], distances[in_radius]
+    area_idx = idx
     
-    for raw_flight in raw_flights:
-        # Parse raw flight data (OpenSky format)
-        flight = _parse_opensky_flight(raw_flight)
-        if not flight:
-            continue
-        
-        # Calculate distance from center
-        distance_km = calculate_distance(
-            latitude, longitude,
-            flight["position"]["latitude"], flight["position"]["longitude"]
-        )
-        
-        # Skip if outside radius (API bbox is rectangular, we want circular)
-        if distance_km > radius_km:
-            continue
-        
-        flight["distance_km"] = round(distance_km, 2)
-        
-        # Apply filters
-        if not _apply_filters(
-            flight,
-            altitude_min=altitude_min,
-            altitude_max=altitude_max,
-            on_ground_only=on_ground_only,
-            in_flight_only=in_flight_only,
-            speed_min=speed_min,
-            speed_max=speed_max,
-            countries=countries,
-            callsign_pattern=callsign_pattern
-        ):
-            continue
+    # Apply filters
+    keep = _filter_mask(
+        snap, idx,
+        altitude_min=altitude_min,
+        altitude_max=altitude_max,
+        on_ground_only=on_ground_only,
+        in_flight_only=in_flight_only,
+        speed_min=speed_min,
+        speed_max=speed_max,
+        countries=countries,
+        callsign_pattern=callsign_pattern,
+        since=since
+    )
+    idx, distances = idx[keep], distances[keep]
+    
+    # Sort flights and limit results
+    order = _sort_order(snap, idx, np.round(distances, 2), sort_by)[:max_results]
+    
+    processed_flights = []
+    for i in order:
+        flight = _parse_opensky_flight(snap.states[idx[i]])
+        flight["distance_km"] = round(float(distances[i]), 2)
         
         # Add metadata if requested
         if include_metadata:
@@ -141,14 +134,7 @@ def handle_track_flights(
         
         processed_flights.append(flight)
     
-    # Sort flights
-    processed_flights = _sort_flights(processed_flights, sort_by)
-    
-    # Limit results
-    if len(processed_flights) > max_results:
-        processed_flights = processed_flights[:max_results]
-    
-    return {
+    result = {
         "success": True,
         "center": {"latitude": latitude, "longitude": longitude},
         "radius_km": radius_km,
@@ -158,8 +144,61 @@ def handle_track_flights(
             speed_min, speed_max, countries, callsign_pattern
         ),
         "flights_count": len(processed_flights),
-        "flights": processed_flights
+        "flights": processed_flights,
+        "snapshot": {
+            "time": snap.time,
+            "age_sec": round(snap.age_sec, 1),
+            "cache": fetch_result["cache"],
+            "bbox": dict(zip(("lamin", "lomin", "lamax", "lomax"), snap.bbox))
+        }
+    }
+    if fetch_result.get("upstream_error"):
+        result["snapshot"]["upstream_error"] = fetch_result["upstream_error"]
+    
+    if since is not None:
+        result["since"] = since
+        result["changes"] = _changes_since(snap, query_bbox, area_idx, latitude, longitude, radius_km, since)
+    
+    return result
+
+
+def _haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Vectorized calculate_distance from one point to many."""
+    lat1 = math.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlon = np.radians(lons) - math.radians(lon)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 6371.0 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def _changes_since(
+    snap: Snapshot,
+    bbox: tuple,
+    area_idx: np.ndarray,
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    since: float
+) -> Dict[str, Any]:
+    """Summary of what changed in the area since `since` (unix seconds).
+    
+    Returns:
+        updated count, and aircraft that left the area when an older snapshot is retained
+    """
+    changes: Dict[str, Any] = {
+        "updated": int((snap.last_contact[area_idx] > since).sum()),
+        "removed": None
     }
+    cache = get_cache()
+    base = cache.base_for(bbox, since) if cache is not None else None
+    if base is not None:
+        base_idx = base.select(bbox)
+        near = _haversine_km(latitude, longitude, base.lat[base_idx], base.lon[base_idx]) <= radius_km
+        gone = np.setdiff1d(base.icao24[base_idx[near]].astype(str), snap.icao24[area_idx].astype(str))
+        changes["removed"] = gone.tolist()
+        changes["base_time"] = base.time
+    return changes
 
 
 def _parse_opensky_flight(raw: List) -> Optional[Dict[str, Any]]:
@@ -202,8 +241,9 @@ def _parse_opensky_flight(raw: List) -> Optional[Dict[str, Any]]:
         return None
 
 
-def _apply_filters(
-    flight: Dict[str, Any],
+def _filter_mask(
+    snap: Snapshot,
+    idx: np.ndarray,
     altitude_min: Optional[float],
     altitude_max: Optional[float],
     on_ground_only: bool,
@@ -211,12 +251,16 @@ def _apply_filters(
     speed_min: Optional[float],
     speed_max: Optional[float],
     countries: Optional[List[str]],
-    callsign_pattern: Optional[str]
-) -> bool:
-    """Apply filters to flight.
+    callsign_pattern: Optional[str],
+    since: Optional[float] = None
+) -> np.ndarray:
+    """Apply filters to snapshot rows.
+    
+    Missing altitude/speed values pass the corresponding range filters.
     
     Args:
-        flight: Flight data
+        snap: Snapshot
+        idx: Candidate row indices
         altitude_min: Min altitude
         altitude_max: Max altitude
         on_ground_only: Ground only
@@ -225,67 +269,74 @@ def _apply_filters(
         speed_max: Max speed
         countries: Country list
         callsign_pattern: Callsign pattern
+        since: Only aircraft with a contact after this unix time
         
     Returns:
-        True if flight passes filters
+        Boolean mask over idx (True if flight passes filters)
     """
+    keep = np.ones(len(idx), dtype=bool)
+    
     # Ground filter
-    if on_ground_only and not flight.get("on_ground"):
-        return False
-    if in_flight_only and flight.get("on_ground"):
-        return False
-    
-    # Altitude filter
-    altitude = flight.get("altitude_m")
-    if altitude is not None:
-        if altitude_min is not None and altitude < altitude_min:
-            return False
-        if altitude_max is not None and altitude > altitude_max:
-            return False
+    if on_ground_only:
+        keep &= snap.on_ground[idx]
+    if in_flight_only:
+        keep &= ~snap.on_ground[idx]
+    
+    # Altitude filter (NaN comparisons are False, so unknown values are never rejected)
+    altitude = snap.altitude[idx]
+    if altitude_min is not None:
+        keep &= ~(altitude < altitude_min)
+    if altitude_max is not None:
+        keep &= ~(altitude > altitude_max)
     
     # Speed filter
-    speed = flight.get("speed_kmh")
-    if speed is not None:
-        if speed_min is not None and speed < speed_min:
-            return False
-        if speed_max is not None and speed > speed_max:
-            return False
+    speed = snap.speed_kmh[idx]
+    if speed_min is not None:
+        keep &= ~(speed < speed_min)
+    if speed_max is not None:
+        keep &= ~(speed > speed_max)
     
     # Country filter
     if countries:
-        country = flight.get("country", "")
-        if country not in countries:
-            return False
+        keep &= np.isin(snap.country[idx], countries)
     
     # Callsign pattern filter
     if callsign_pattern:
-        callsign = flight.get("callsign", "")
-        if not fnmatch.fnmatch(callsign, callsign_pattern):
-            return False
+        match = re.compile(fnmatch.translate(os.path.normcase(callsign_pattern))).match
+        keep &= np.fromiter(
+            (match(os.path.normcase(c)) is not None for c in snap.callsign[idx]),
+            dtype=bool, count=len(idx)
+        )
+    
+    # Changes-since filter
+    if since is not None:
+        keep &= snap.last_contact[idx] > since
     
-    return True
+    return keep
 
 
-def _sort_flights(flights: List[Dict[str, Any]], sort_by: str) -> List[Dict[str, Any]]:
+def _sort_order(snap: Snapshot, idx: np.ndarray, distances: np.ndarray, sort_by: str) -> np.ndarray:
     """Sort flights by specified field.
     
     Args:
-        flights: Flight list
+        snap: Snapshot
+        idx: Row indices (upstream order, ties keep it)
+        distances: Rounded distances for idx
         sort_by: Sort field
         
     Returns:
-        Sorted flight list
+        Positions into idx, sorted
     """
     if sort_by == "distance":
-        return sorted(flights, key=lambda f: f.get("distance_km", 999999))
+        return np.argsort(distances, kind="stable")
     elif sort_by == "altitude":
-        return sorted(flights, key=lambda f: f.get("altitude_m") or 0, reverse=True)
+        return np.argsort(-np.nan_to_num(snap.altitude[idx], nan=0.0), kind="stable")
     elif sort_by == "speed":
-        return sorted(flights, key=lambda f: f.get("speed_kmh") or 0, reverse=True)
+        return np.argsort(-np.nan_to_num(snap.speed_kmh[idx], nan=0.0), kind="stable")
     elif sort_by == "callsign":
-        return sorted(flights, key=lambda f: f.get("callsign", ""))
+        return np.argsort(snap.callsign[idx].astype(str), kind="stable")
     
-    return flights
+    return np.arange(len(idx))
 
 
 def _build_filters_summary(
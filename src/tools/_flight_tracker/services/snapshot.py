@@ -0,0 +1,224 @@
+"""Shared OpenSky state-vector snapshots.
+
+One upstream fetch serves every query whose bounding box lies inside a fresh snapshot
+(TTL = OpenSky refresh interval). When a fetch is needed, the requested box is merged
+with the other areas polled recently, as long as the union stays small, so agents
+polling overlapping areas share one call. Snapshots keep the state vectors as NumPy
+columns sorted by 1° grid cell, so sub-bbox selection, filters and sorting are vectorized.
+
+Environment:
+    FLIGHT_TRACKER_CACHE_TTL        snapshot lifetime in seconds (default: 10, 0 disables)
+    FLIGHT_TRACKER_MAX_UNION_DEG2   largest merged fetch area in square degrees (default: 400)
+"""
+from __future__ import annotations
+from typing import Dict, Any, List, Optional, Tuple
+import os
+import threading
+import time
+
+import numpy as np
+
+from .opensky import fetch_flights_in_bbox
+
+CELL_DEG = 1.0
+_ROWS = int(180 / CELL_DEG)
+_COLS = int(360 / CELL_DEG)
+ACTIVE_SEC = 60  # areas polled within this window are merged into the next fetch
+HISTORY = 12  # snapshots kept for stale fallback and "changes since" queries
+STALE_MAX_SEC = 120
+
+Bbox = Tuple[float, float, float, float]  # (lamin, lomin, lamax, lomax)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def clamp_bbox(bbox: Dict[str, float]) -> Bbox:
+    return (
+        max(-90.0, bbox["lamin"]), max(-180.0, bbox["lomin"]),
+        min(90.0, bbox["lamax"]), min(180.0, bbox["lomax"])
+    )
+
+
+def _contains(outer: Bbox, inner: Bbox) -> bool:
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and outer[2] >= inner[2] and outer[3] >= inner[3]
+
+
+def _union(a: Bbox, b: Bbox) -> Bbox:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _area(b: Bbox) -> float:
+    return max(0.0, b[2] - b[0]) * max(0.0, b[3] - b[1])
+
+
+def _column(states: List[List], i: int) -> np.ndarray:
+    return np.array([s[i] if s[i] is not None else np.nan for s in states], dtype=np.float64)
+
+
+def _cell_rows(lat: np.ndarray) -> np.ndarray:
+    return np.clip(np.floor((lat + 90.0) / CELL_DEG), 0, _ROWS - 1).astype(np.int64)
+
+
+def _cell_cols(lon: np.ndarray) -> np.ndarray:
+    return np.clip(np.floor((lon + 180.0) / CELL_DEG), 0, _COLS - 1).astype(np.int64)
+
+
+class Snapshot:
+    """One upstream response: raw state vectors plus columnar arrays and a grid index.
+
+    Rows are sorted by grid cell; `api_pos` keeps the upstream order so results can be
+    returned in the same order as an uncached fetch.
+    """
+
+    def __init__(self, bbox: Bbox, time_: Optional[int], states: List[List]):
+        self.bbox = bbox
+        self.time = time_
+        self.fetched_at = time.time()
+        valid = [s for s in states if s and len(s) >= 17 and s[5] is not None and s[6] is not None]
+        lat = np.array([s[6] for s in valid], dtype=np.float64)
+        lon = np.array([s[5] for s in valid], dtype=np.float64)
+        keys = _cell_rows(lat) * _COLS + _cell_cols(lon)
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.api_pos = order
+        self.states = [valid[i] for i in order]
+        self.lat = lat[order]
+        self.lon = lon[order]
+        self.altitude = _column(self.states, 7)
+        self.on_ground = np.array([bool(s[8]) for s in self.states], dtype=bool)
+        velocity = _column(self.states, 9)
+        self.speed_kmh = np.round(velocity * 3.6, 1)
+        self.last_contact = _column(self.states, 4)
+        self.icao24 = np.array([s[0] for s in self.states], dtype=object)
+        self.country = np.array([s[2] for s in self.states], dtype=object)
+        self.callsign = np.array([(s[1] or "").strip() for s in self.states], dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    @property
+    def age_sec(self) -> float:
+        return time.time() - self.fetched_at
+
+    def select(self, bbox: Bbox) -> np.ndarray:
+        """Row indices inside bbox, in upstream order."""
+        if not len(self.states):
+            return np.empty(0, dtype=np.int64)
+        r0, r1 = _cell_rows(np.array([bbox[0], bbox[2]]))
+        c0, c1 = _cell_cols(np.array([bbox[1], bbox[3]]))
+        # Cells of one grid row are contiguous keys: one searchsorted range per row
+        starts = np.arange(r0, r1 + 1) * _COLS
+        lo = np.searchsorted(self.keys, starts + c0, side="left")
+        hi = np.searchsorted(self.keys, starts + c1, side="right")
+        if not len(lo) or not (hi > lo).any():
+            return np.empty(0, dtype=np.int64)
+        idx = np.concatenate([np.arange(a, b) for a, b in zip(lo, hi) if b > a])
+        inside = (
+            (self.lat[idx] >= bbox[0]) & (self.lat[idx] <= bbox[2])
+            & (self.lon[idx] >= bbox[1]) & (self.lon[idx] <= bbox[3])
+        )
+        idx = idx[inside]
+        return idx[np.argsort(self.api_pos[idx], kind="stable")]
+
+
+class SnapshotCache:
+    """Process-wide snapshots with single-flight refresh and union-bbox fetches."""
+
+    def __init__(self, ttl_sec: float, max_union_deg2: float):
+        self.ttl_sec = ttl_sec
+        self.max_union_deg2 = max_union_deg2
+        self._snapshots: List[Snapshot] = []
+        self._active: Dict[Bbox, float] = {}
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self.stats = {"hits": 0, "fetches": 0, "stale_served": 0}
+
+    def _fresh(self, bbox: Bbox) -> Optional[Snapshot]:
+        for snap in reversed(self._snapshots):
+            if snap.age_sec <= self.ttl_sec and _contains(snap.bbox, bbox):
+                return snap
+        return None
+
+    def _fetch_bbox(self, bbox: Bbox) -> Bbox:
+        """Requested bbox merged with recently polled areas while the union stays small."""
+        now = time.time()
+        self._active = {b: t for b, t in self._active.items() if now - t <= ACTIVE_SEC}
+        self._active[bbox] = now
+        target = bbox
+        for other in sorted(self._active, key=lambda b: _area(_union(bbox, b))):
+            merged = _union(target, other)
+            if _area(merged) <= self.max_union_deg2:
+                target = merged
+        return target
+
+    def get(self, bbox: Bbox) -> Dict[str, Any]:
+        """Snapshot covering bbox: {"success", "snapshot", "cache"} or {"success": False, "error"}."""
+        with self._lock:
+            snap = self._fresh(bbox)
+            if snap is not None:
+                self._active[bbox] = time.time()
+                self.stats["hits"] += 1
+                return {"success": True, "snapshot": snap, "cache": "hit"}
+        with self._fetch_lock:
+            # Another caller may have refreshed while we waited
+            with self._lock:
+                snap = self._fresh(bbox)
+                if snap is not None:
+                    self.stats["hits"] += 1
+                    return {"success": True, "snapshot": snap, "cache": "hit"}
+                target = self._fetch_bbox(bbox)
+            result = fetch_flights_in_bbox(lamin=target[0], lomin=target[1], lamax=target[2], lomax=target[3])
+            with self._lock:
+                if not result["success"]:
+                    stale = next((s for s in reversed(self._snapshots)
+                                  if s.age_sec <= STALE_MAX_SEC and _contains(s.bbox, bbox)), None)
+                    if stale is None:
+                        return result
+                    self.stats["stale_served"] += 1
+                    return {"success": True, "snapshot": stale, "cache": "stale", "upstream_error": result["error"]}
+                snap = Snapshot(target, result.get("time"), result.get("states") or [])
+                self.stats["fetches"] += 1
+                self._snapshots.append(snap)
+                del self._snapshots[:-HISTORY]
+                return {"success": True, "snapshot": snap, "cache": "miss"}
+
+    def base_for(self, bbox: Bbox, since: float) -> Optional[Snapshot]:
+        """Latest retained snapshot taken at or before `since` that covers bbox."""
+        with self._lock:
+            for snap in reversed(self._snapshots):
+                if snap.time is not None and snap.time <= since and _contains(snap.bbox, bbox):
+                    return snap
+        return None
+
+
+_cache: Optional[SnapshotCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[SnapshotCache]:
+    """Shared cache, or None when FLIGHT_TRACKER_CACHE_TTL is 0."""
+    global _cache
+    ttl = _env_float("FLIGHT_TRACKER_CACHE_TTL", 10)
+    if ttl <= 0:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SnapshotCache(ttl, _env_float("FLIGHT_TRACKER_MAX_UNION_DEG2", 400))
+        return _cache
+
+
+def get_snapshot(bbox: Dict[str, float]) -> Dict[str, Any]:
+    """Snapshot covering an OpenSky bbox dict (lamin/lomin/lamax/lomax), cached when enabled."""
+    clamped = clamp_bbox(bbox)
+    cache = get_cache()
+    if cache is not None:
+        return cache.get(clamped)
+    result = fetch_flights_in_bbox(lamin=bbox["lamin"], lomin=bbox["lomin"], lamax=bbox["lamax"], lomax=bbox["lomax"])
+    if not result["success"]:
+        return result
+    return {"success": True, "snapshot": Snapshot(clamped, result.get("time"), result.get("states") or []), "cache": "off"}
@@ -53,6 +53,26 @@ def validate_radius(radius_km: float) -> Dict[str, Any]:
         return {"valid": False, "error": "Invalid radius value"}
 
 
+def validate_since(since: float) -> Dict[str, Any]:
+    """Validate changes-since timestamp.
+    
+    Args:
+        since: Unix timestamp in seconds
+        
+    Returns:
+        Validation result
+    """
+    try:
+        value = float(since)
+    except (ValueError, TypeError):
+        return {"valid": False, "error": "Invalid since value (expected unix timestamp in seconds)"}
+    
+    if value < 0:
+        return {"valid": False, "error": "since must be a positive unix timestamp"}
+    
+    return {"valid": True, "since": value}
+
+
 def validate_filters(
     altitude_min: Optional[float] = None,
     altitude_max: Optional[float] = None,
@@ -0,0 +1,40 @@
+"""Shared HTTP layer for tools calling external data APIs.
+
+Pooled connections, an HTTP response cache (memory + SQLite, ETag/Last-Modified
+revalidation, per-tool TTL overrides), coalescing of identical in-flight GETs and
+token-bucket rate limits per upstream host.
+
+Environment:
+    HTTP_CACHE                        0/false disables caching (pooling and rate limits stay on)
+    HTTP_CACHE_DB                     SQLite file (default: <project>/sqlite3/http_cache.db)
+    HTTP_CACHE_MEMORY_ITEMS           in-process LRU size (default: 512)
+    HTTP_CACHE_MEMORY_MB              in-process LRU body budget in MB (default: 64)
+    HTTP_CACHE_PURGE_INTERVAL_SEC     how often writes drop disk entries older than 7 days (default: 3600)
+    HTTP_CACHE_STALE_IF_ERROR_SEC     serve expired entries this long on upstream errors (default: 300)
+    HTTP_CACHE_TTL_<TOOL>             freshness override for one tool, e.g. HTTP_CACHE_TTL_COINGECKO=30
+    HTTP_RATE_LIMITS                  JSON {"host": [rate_per_sec, burst]} added to / replacing defaults
+    HTTP_RATE_LIMIT_MAX_WAIT_SEC      longest wait for a rate-limit slot before failing (default: 30)
+"""
+from typing import Any, Dict
+
+import requests
+
+from .client import HttpCache, RateLimitExceeded, get_client
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """Cached, rate-limited GET (see HttpCache.get)."""
+    return get_client().get(url, **kwargs)
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """Uncached request through the pooled session and host rate limit."""
+    return get_client().request(method, url, **kwargs)
+
+
+def stats() -> Dict[str, Any]:
+    """Hit/miss/revalidation counters per tool and rate-limit waits per host."""
+    return get_client().stats()
+
+
+__all__ = ["HttpCache", "RateLimitExceeded", "get", "request", "stats", "get_client"]
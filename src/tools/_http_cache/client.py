@@ -0,0 +1,356 @@
+"""Shared HTTP client: pooled session, response cache, request coalescing, per-host rate limits.
+
+`get()` returns a regular `requests.Response` (fresh from the network or rebuilt from the
+cache) with an extra `from_cache` attribute: None, "hit", "revalidated", "coalesced" or
+"stale". Callers keep their existing status-code / raise_for_status() / json() handling.
+"""
+from __future__ import annotations
+import hashlib
+import http.client
+import http.cookiejar
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from . import policy
+from .ratelimit import RateLimiter
+from .store import CacheEntry, ResponseStore, db_path
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = 32
+PURGE_AFTER_SEC = 7 * 86400
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+_COUNTERS = ("requests", "hits", "revalidated", "coalesced", "stale", "misses", "bypass", "errors")
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """The host's rate limit would delay this request longer than allowed."""
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def _enabled() -> bool:
+    return os.getenv("HTTP_CACHE", "1").lower() not in ("0", "false", "no", "off")
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        when = policy.http_date(value)
+        return max(0.0, when - time.time()) if when is not None else None
+
+
+def _cache_key(url: str, headers: Mapping[str, str]) -> str:
+    # Request headers are part of the key, so Vary and per-key auth never mix responses
+    normalized = sorted((k.lower(), str(v)) for k, v in headers.items())
+    return hashlib.sha256(json.dumps(["GET", url, normalized]).encode("utf-8")).hexdigest()
+
+
+def _redacted(url: str) -> str:
+    # Only scheme/host/path reach the disk: query strings may carry API keys
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+def _from_entry(entry: CacheEntry, url: str, source: str) -> requests.Response:
+    resp = requests.Response()
+    resp._content = entry.body
+    resp.status_code = entry.status
+    resp.headers = CaseInsensitiveDict(entry.headers)
+    resp.headers["Age"] = str(int(entry.age()))
+    resp.url = url
+    resp.encoding = get_encoding_from_headers(resp.headers)
+    resp.reason = http.client.responses.get(entry.status, "")
+    resp.from_cache = source
+    return resp
+
+
+def _clone(resp: requests.Response, source: str) -> requests.Response:
+    copy = requests.Response()
+    copy._content = resp.content
+    copy.status_code = resp.status_code
+    copy.headers = CaseInsensitiveDict(resp.headers)
+    copy.url = resp.url
+    copy.encoding = resp.encoding
+    copy.reason = resp.reason
+    copy.elapsed = resp.elapsed
+    copy.from_cache = source
+    return copy
+
+
+class _Call:
+    """One in-flight network request that identical concurrent requests wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Optional[requests.Response] = None
+        self.error: Optional[BaseException] = None
+
+
+class HttpCache:
+    def __init__(
+        self,
+        store: Optional[ResponseStore] = None,
+        limiter: Optional[RateLimiter] = None,
+        enabled: bool = True,
+        max_wait_sec: float = 30,
+        stale_if_error_sec: float = 300
+    ):
+        self.store = store if store is not None else ResponseStore()
+        self.limiter = limiter if limiter is not None else RateLimiter()
+        self.enabled = enabled
+        self.max_wait_sec = max_wait_sec
+        self.stale_if_error_sec = stale_if_error_sec
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Shared across tools: behave like stateless requests.get() calls
+        self.session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        self._inflight: Dict[str, _Call] = {}
+        self._inflight_lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+        self._host_metrics: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"requests": 0, "waits": 0, "wait_sec": 0.0, "rejected": 0, "throttled": 0})
+        self._metrics_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "HttpCache":
+        store = ResponseStore(
+            memory_items=int(_env_float("HTTP_CACHE_MEMORY_ITEMS", 512)),
+            memory_bytes=int(_env_float("HTTP_CACHE_MEMORY_MB", 64) * 1024 * 1024),
+            path=db_path() if _enabled() else None,
+            purge_after_sec=PURGE_AFTER_SEC,
+            purge_interval_sec=_env_float("HTTP_CACHE_PURGE_INTERVAL_SEC", 3600),
+        )
+        if _enabled():
+            store.purge(PURGE_AFTER_SEC)
+        return cls(
+            store=store,
+            limiter=RateLimiter.from_env(),
+            enabled=_enabled(),
+            max_wait_sec=_env_float("HTTP_RATE_LIMIT_MAX_WAIT_SEC", 30),
+            stale_if_error_sec=_env_float("HTTP_CACHE_STALE_IF_ERROR_SEC", 300),
+        )
+
+    # ---- metrics ----
+
+    def _count(self, tool: str, name: str) -> None:
+        with self._metrics_lock:
+            self._metrics[tool][name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        def with_rate(counters: Dict[str, float]) -> Dict[str, Any]:
+            served = counters["hits"] + counters["revalidated"] + counters["coalesced"] + counters["stale"]
+            cacheable = counters["requests"] - counters["bypass"]
+            return {**counters, "hit_rate": round(served / cacheable, 3) if cacheable else 0.0}
+
+        with self._metrics_lock:
+            tools = {tool: with_rate(dict(c)) for tool, c in sorted(self._metrics.items())}
+            totals = dict.fromkeys(_COUNTERS, 0)
+            for counters in self._metrics.values():
+                for name in _COUNTERS:
+                    totals[name] += counters[name]
+            hosts = {host: {**c, "wait_sec": round(c["wait_sec"], 3)}
+                     for host, c in sorted(self._host_metrics.items())}
+        return {
+            "enabled": self.enabled,
+            "db_path": self.store.path,
+            "memory_entries": len(self.store),
+            "memory_bytes": self.store.memory_size(),
+            "totals": with_rate(totals),
+            "tools": tools,
+            "hosts": hosts,
+        }
+
+    # ---- network ----
+
+    def _ttl(self, tool: str, ttl: Optional[float]) -> Optional[float]:
+        override = os.getenv(f"HTTP_CACHE_TTL_{tool.upper()}", "").strip()
+        if override:
+            try:
+                return float(override)
+            except ValueError:
+                pass
+        return ttl
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Rate-limited request through the pooled session."""
+        host = urlsplit(url).hostname or ""
+        bucket = self.limiter.bucket(host)
+        with self._metrics_lock:
+            self._host_metrics[host]["requests"] += 1
+        if bucket is not None:
+            wait = bucket.reserve(self.max_wait_sec)
+            if wait is None:
+                with self._metrics_lock:
+                    self._host_metrics[host]["rejected"] += 1
+                raise RateLimitExceeded(f"Rate limit for {host} exceeded (retry later)")
+            if wait > 0:
+                with self._metrics_lock:
+                    self._host_metrics[host]["waits"] += 1
+                    self._host_metrics[host]["wait_sec"] += wait
+                time.sleep(wait)
+        resp = self.session.request(method, url, **kwargs)
+        if resp.status_code in (429, 503) and bucket is not None:
+            delay = _retry_after(resp.headers.get("Retry-After"))
+            if delay is not None or resp.status_code == 429:
+                with self._metrics_lock:
+                    self._host_metrics[host]["throttled"] += 1
+                bucket.block(min(delay if delay is not None else 1.0 / bucket.rate, 3600.0))
+        return resp
+
+    def request(self, method: str, url: str, tool: Optional[str] = None, **kwargs) -> requests.Response:
+        """Uncached request (any method) through the pooled session and host rate limit."""
+        tool = tool or urlsplit(url).hostname or "unknown"
+        self._count(tool, "requests")
+        self._count(tool, "bypass")
+        try:
+            resp = self._send(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            self._count(tool, "errors")
+            raise
+        resp.from_cache = None
+        return resp
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: float = 15,
+        ttl: Optional[float] = None,
+        tool: Optional[str] = None
+    ) -> requests.Response:
+        """Cached GET.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            headers: Request headers (part of the cache key)
+            timeout: Network timeout in seconds
+            ttl: Freshness lifetime override in seconds (None = follow response headers,
+                0 = never cache); HTTP_CACHE_TTL_<TOOL> overrides it
+            tool: Calling tool name, for metrics and TTL overrides
+
+        Returns:
+            requests.Response with a `from_cache` attribute
+        """
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        tool = tool or urlsplit(full_url).hostname or "unknown"
+        ttl = self._ttl(tool, ttl)
+        if not self.enabled or ttl == 0:
+            return self.request("GET", full_url, tool=tool, headers=headers, timeout=timeout)
+
+        self._count(tool, "requests")
+        req_headers = dict(headers or {})
+        key = _cache_key(full_url, req_headers)
+        entry = self.store.get(key)
+        if entry is not None and entry.is_fresh() and \
+                "no-cache" not in policy.parse_cache_control(req_headers.get("Cache-Control")):
+            self._count(tool, "hits")
+            return _from_entry(entry, full_url, "hit")
+
+        with self._inflight_lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+        if not leader:
+            if not call.done.wait(timeout * 2 + self.max_wait_sec + 5):
+                self._count(tool, "errors")
+                raise requests.exceptions.Timeout(f"Timed out waiting for identical in-flight request to {url}")
+            if call.error is not None:
+                self._count(tool, "errors")
+                raise call.error
+            self._count(tool, "coalesced")
+            return _clone(call.response, "coalesced")
+
+        try:
+            call.response = self._fetch(full_url, key, entry, req_headers, timeout, ttl, tool)
+            return call.response
+        except BaseException as e:
+            call.error = e
+            self._count(tool, "errors")
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            call.done.set()
+
+    def _fetch(self, url: str, key: str, entry: Optional[CacheEntry], req_headers: Dict[str, str],
+               timeout: float, ttl: Optional[float], tool: str) -> requests.Response:
+        send_headers = dict(req_headers)
+        if entry is not None:
+            send_headers.update(policy.conditional_headers(entry.headers))
+        stale_ok = entry is not None and not policy.must_revalidate(entry.headers) and \
+            entry.age() - entry.lifetime <= self.stale_if_error_sec
+
+        request_time = time.time()
+        try:
+            resp = self._send("GET", url, headers=send_headers, timeout=timeout)
+            body = resp.content
+        except requests.exceptions.RequestException as e:
+            if stale_ok:
+                logger.info(f"Serving stale cached response for {_redacted(url)}: {e}")
+                self._count(tool, "stale")
+                return _from_entry(entry, url, "stale")
+            raise
+        response_time = time.time()
+
+        if resp.status_code == 304 and entry is not None:
+            headers = policy.merge_304(entry.headers, resp.headers)
+            entry = CacheEntry(key, entry.url, entry.status, headers, entry.body, response_time,
+                               policy.initial_age(resp.headers, request_time, response_time),
+                               policy.freshness_lifetime(headers, ttl))
+            self.store.put(entry)
+            self._count(tool, "revalidated")
+            return _from_entry(entry, url, "revalidated")
+
+        if resp.status_code >= 500 and stale_ok:
+            self._count(tool, "stale")
+            return _from_entry(entry, url, "stale")
+
+        if policy.storable(resp.status_code, req_headers, resp.headers):
+            headers = {k: v for k, v in resp.headers.items() if k.lower() not in _DROP_HEADERS}
+            new_entry = CacheEntry(key, _redacted(url), resp.status_code, headers, body, response_time,
+                                   policy.initial_age(resp.headers, request_time, response_time),
+                                   policy.freshness_lifetime(headers, ttl))
+            # Worth keeping if it can be reused as is or revalidated cheaply later
+            if new_entry.is_fresh() or policy.conditional_headers(headers):
+                self.store.put(new_entry)
+        self._count(tool, "misses")
+        resp.from_cache = None
+        return resp
+
+
+_client: Optional[HttpCache] = None
+_lock = threading.Lock()
+
+
+def get_client() -> HttpCache:
+    """Process-wide client, configured from HTTP_CACHE* / HTTP_RATE_LIMIT* variables on first use."""
+    global _client
+    with _lock:
+        if _client is None:
+            _client = HttpCache.from_env()
+        return _client
@@ -0,0 +1,112 @@
+"""HTTP caching rules (RFC 9111 subset for a private client cache).
+
+Storability, freshness lifetime, age and conditional-request headers. A tool TTL
+override replaces the server-provided freshness lifetime but never makes a `no-store`
+response storable.
+"""
+from __future__ import annotations
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+CACHEABLE_STATUS = {200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501}
+HEURISTIC_FRACTION = 0.1  # of (Date - Last-Modified), RFC 9111 section 4.2.2
+HEURISTIC_MAX_SEC = 86400
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Cache-Control directives as {name: argument or None} (names lowercased)."""
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition("=")
+        directives[name.strip().lower()] = arg.strip().strip('"') if arg else None
+    return directives
+
+
+def http_date(value: Optional[str]) -> Optional[float]:
+    """Epoch seconds from an HTTP-date header, or None."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def _seconds(value: Optional[str]) -> Optional[int]:
+    try:
+        return max(0, int(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def storable(status: int, request_headers: Mapping[str, str], response_headers: Mapping[str, str]) -> bool:
+    """Whether a GET response may be stored at all."""
+    if status not in CACHEABLE_STATUS:
+        return False
+    if "no-store" in parse_cache_control(request_headers.get("Cache-Control")):
+        return False
+    return "no-store" not in parse_cache_control(response_headers.get("Cache-Control"))
+
+
+def freshness_lifetime(headers: Mapping[str, str], ttl: Optional[float] = None) -> float:
+    """Seconds a stored response stays fresh: tool override, max-age, Expires, then heuristic."""
+    if ttl is not None:
+        return max(0.0, float(ttl))
+    cc = parse_cache_control(headers.get("Cache-Control"))
+    if "no-cache" in cc:
+        return 0.0
+    max_age = _seconds(cc.get("max-age"))
+    if max_age is not None:
+        return float(max_age)
+    date = http_date(headers.get("Date"))
+    expires = headers.get("Expires")
+    if expires is not None:
+        expires_at = http_date(expires)
+        # Invalid Expires values (e.g. "0") mean "already expired"
+        return max(0.0, expires_at - date) if expires_at is not None and date is not None else 0.0
+    last_modified = http_date(headers.get("Last-Modified"))
+    if date is not None and last_modified is not None and date > last_modified:
+        return min(HEURISTIC_MAX_SEC, HEURISTIC_FRACTION * (date - last_modified))
+    return 0.0
+
+
+def initial_age(headers: Mapping[str, str], request_time: float, response_time: float) -> float:
+    """Corrected initial age of a response when it was received (RFC 9111 section 4.2.3)."""
+    age_value = _seconds(headers.get("Age")) or 0
+    date = http_date(headers.get("Date"))
+    apparent_age = max(0.0, response_time - date) if date is not None else 0.0
+    return max(apparent_age, age_value + (response_time - request_time))
+
+
+def must_revalidate(headers: Mapping[str, str]) -> bool:
+    """True when a stale response must not be served on upstream errors."""
+    cc = parse_cache_control(headers.get("Cache-Control"))
+    return "must-revalidate" in cc or "proxy-revalidate" in cc
+
+
+def conditional_headers(headers: Mapping[str, str]) -> Dict[str, Any]:
+    """If-None-Match / If-Modified-Since validators for revalidating a stored response."""
+    out: Dict[str, Any] = {}
+    if headers.get("ETag"):
+        out["If-None-Match"] = headers["ETag"]
+    if headers.get("Last-Modified"):
+        out["If-Modified-Since"] = headers["Last-Modified"]
+    return out
+
+
+def merge_304(stored: Mapping[str, str], fresh: Mapping[str, str]) -> Dict[str, str]:
+    """Stored headers updated with those of a 304 response (RFC 9111 section 4.3.4)."""
+    merged = dict(stored)
+    lower = {k.lower(): k for k in merged}
+    for name, value in fresh.items():
+        if name.lower() in ("content-length", "content-encoding", "transfer-encoding"):
+            continue
+        existing = lower.get(name.lower())
+        if existing is not None:
+            del merged[existing]
+        merged[name] = value
+        lower[name.lower()] = name
+    return merged
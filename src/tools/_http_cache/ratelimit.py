@@ -0,0 +1,109 @@
+"""Token-bucket rate limits per upstream host.
+
+Limits apply to network requests only (cache hits are free) and are shared by every
+tool calling the same host. A 429/503 with Retry-After empties the host bucket for the
+announced delay so concurrent callers back off together.
+"""
+from __future__ import annotations
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# host suffix -> (requests per second, burst), from each provider's published free-tier limits
+DEFAULT_LIMITS: Dict[str, Tuple[float, float]] = {
+    "api.coingecko.com": (0.5, 5),             # ~30 calls/min on the public API
+    "open-meteo.com": (5.0, 10),               # 10k calls/day, no hard per-second limit
+    "smovengo.cloud": (1.0, 5),                # Vélib' feeds refresh once a minute
+    "newsapi.org": (1.0, 3),                   # 100 requests/day on the free tier
+    "content.guardianapis.com": (1.0, 1),      # 1 call/s, 500/day
+    "api.nytimes.com": (5 / 60, 2),            # 5 calls/min, 500/day
+    "www.googleapis.com": (5.0, 10),           # YouTube Data API (quota is per unit, not per call)
+    "reddit.com": (10 / 60, 5),                # ~10 unauthenticated requests/min
+    "opentdb.com": (0.2, 1),                   # 1 request per 5 s per IP
+    "export.arxiv.org": (1 / 3, 1),            # 1 request every 3 s
+    "eutils.ncbi.nlm.nih.gov": (3.0, 3),       # 3 requests/s without an API key
+    "api.crossref.org": (10.0, 10),            # polite pool
+    "api.archives-ouvertes.fr": (5.0, 5),
+}
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = max(1e-6, float(rate))
+        self.burst = max(1.0, float(burst))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float = float("inf")) -> Optional[float]:
+        """Take one token, borrowing against the future if needed.
+
+        Returns:
+            Seconds to wait before sending, or None (nothing taken) when that exceeds max_wait
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = 0.0 if self._tokens >= 1.0 else (1.0 - self._tokens) / self.rate
+            wait = max(wait, self._blocked_until - now)
+            if wait > max_wait:
+                return None
+            self._tokens -= 1.0
+            return wait
+
+    def block(self, seconds: float) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._blocked_until = max(self._blocked_until, now + seconds)
+            self._tokens = min(self._tokens, 0.0)
+
+
+class RateLimiter:
+    """Buckets keyed by the most specific configured host suffix; unknown hosts are unlimited."""
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        """Defaults updated from HTTP_RATE_LIMITS='{"host": [rate_per_sec, burst]}' (rate 0 = unlimited)."""
+        limits = dict(DEFAULT_LIMITS)
+        raw = os.getenv("HTTP_RATE_LIMITS", "").strip()
+        if raw:
+            try:
+                for host, spec in json.loads(raw).items():
+                    rate, burst = (spec, 1) if isinstance(spec, (int, float)) else (spec[0], spec[1])
+                    if float(rate) > 0:
+                        limits[host.lower()] = (float(rate), float(burst))
+                    else:
+                        limits.pop(host.lower(), None)
+            except (ValueError, TypeError, IndexError, AttributeError):
+                logger.warning("Ignoring invalid HTTP_RATE_LIMITS (expected JSON {host: [rate, burst]})")
+        return cls(limits)
+
+    def _rule(self, host: str) -> Optional[str]:
+        host = host.lower()
+        best = None
+        for suffix in self.limits:
+            if (host == suffix or host.endswith("." + suffix)) and (best is None or len(suffix) > len(best)):
+                best = suffix
+        return best
+
+    def bucket(self, host: str) -> Optional[TokenBucket]:
+        rule = self._rule(host)
+        if rule is None:
+            return None
+        with self._lock:
+            bucket = self._buckets.get(rule)
+            if bucket is None:
+                bucket = self._buckets[rule] = TokenBucket(*self.limits[rule])
+            return bucket
@@ -0,0 +1,192 @@
+"""Two-level response store: in-process LRU in front of a SQLite file shared across restarts."""
+from __future__ import annotations
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+# Bump when the stored entry format changes
+STORE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    stored_at REAL NOT NULL,
+    initial_age REAL NOT NULL,
+    lifetime REAL NOT NULL,
+    version INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    stored_at: float
+    initial_age: float
+    lifetime: float
+
+    def age(self, now: Optional[float] = None) -> float:
+        return self.initial_age + ((time.time() if now is None else now) - self.stored_at)
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return self.age(now) < self.lifetime
+
+
+def db_path() -> str:
+    env = os.getenv("HTTP_CACHE_DB")
+    if env:
+        return os.path.expanduser(env)
+    # _http_cache -> tools -> src -> project root
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+    return os.path.join(root, "sqlite3", "http_cache.db")
+
+
+class ResponseStore:
+    """LRU of recent entries backed by SQLite; disk errors degrade to memory-only."""
+
+    def __init__(self, memory_items: int = 512, max_body_bytes: int = 5 * 1024 * 1024,
+                 path: Optional[str] = None, memory_bytes: int = 64 * 1024 * 1024,
+                 purge_after_sec: Optional[float] = None, purge_interval_sec: float = 3600):
+        self.memory_items = memory_items
+        self.memory_bytes = memory_bytes
+        self.max_body_bytes = max_body_bytes
+        self.path = path
+        # Old disk rows are dropped from put() at most once per purge_interval_sec
+        self.purge_after_sec = purge_after_sec
+        self.purge_interval_sec = purge_interval_sec
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._memory_used = 0
+        self._last_purge = 0.0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_failed = False
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and not self._disk_failed and self.path:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(_SCHEMA)
+                self._conn = conn
+            except sqlite3.Error:
+                self._disk_failed = True
+        return self._conn
+
+    def _forget(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_used -= len(entry.body)
+
+    def _remember(self, entry: CacheEntry) -> None:
+        self._forget(entry.key)
+        self._memory[entry.key] = entry
+        self._memory_used += len(entry.body)
+        while self._memory and (len(self._memory) > self.memory_items
+                                or self._memory_used > self.memory_bytes):
+            _, old = self._memory.popitem(last=False)
+            self._memory_used -= len(old.body)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+            conn = self._db()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT url, status, headers, body, stored_at, initial_age, lifetime FROM responses "
+                    "WHERE key = ? AND version = ?", (key, STORE_VERSION)
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+            if row is None:
+                return None
+            try:
+                entry = CacheEntry(key, row[0], row[1], json.loads(row[2]), zlib.decompress(row[3]),
+                                   row[4], row[5], row[6])
+            except (ValueError, zlib.error):
+                return None
+            self._remember(entry)
+            return entry
+
+    def put(self, entry: CacheEntry) -> None:
+        if len(entry.body) > self.max_body_bytes:
+            return
+        with self._lock:
+            self._remember(entry)
+            conn = self._db()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO responses "
+                        "(key, url, status, headers, body, stored_at, initial_age, lifetime, version) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (entry.key, entry.url, entry.status, json.dumps(entry.headers),
+                         zlib.compress(entry.body, 6), entry.stored_at, entry.initial_age,
+                         entry.lifetime, STORE_VERSION)
+                    )
+            except sqlite3.Error:
+                pass
+            if (self.purge_after_sec is not None
+                    and time.time() - self._last_purge >= self.purge_interval_sec):
+                self._purge_locked(self.purge_after_sec)
+
+    def _purge_locked(self, older_than_sec: float) -> int:
+        now = time.time()
+        self._last_purge = now
+        cutoff = now - older_than_sec
+        for key in [k for k, e in self._memory.items() if e.stored_at < cutoff]:
+            self._forget(key)
+        conn = self._db()
+        if conn is None:
+            return 0
+        try:
+            with conn:
+                return conn.execute("DELETE FROM responses WHERE stored_at < ?", (cutoff,)).rowcount
+        except sqlite3.Error:
+            return 0
+
+    def purge(self, older_than_sec: float) -> int:
+        """Drop entries stored more than `older_than_sec` ago. Returns rows removed from disk."""
+        with self._lock:
+            return self._purge_locked(older_than_sec)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_used = 0
+            conn = self._db()
+            if conn is not None:
+                try:
+                    with conn:
+                        conn.execute("DELETE FROM responses")
+                except sqlite3.Error:
+                    pass
+
+    def memory_size(self) -> int:
+        """Total body bytes held in the in-process LRU."""
+        return self._memory_used
+
+    def __len__(self) -> int:
+        return len(self._memory)
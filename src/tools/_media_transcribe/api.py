@@ -1,6 +1,6 @@
 """API routing for media transcription operations."""
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Any, Dict, Iterator, Union
 import logging
 
 from .core import handle_get_info, handle_transcribe
@@ -8,7 +8,11 @@ from .core import handle_get_info, handle_transcribe
 logger = logging.getLogger(__name__)
 
 
-def route_operation(operation: str, **params) -> Dict[str, Any]:
+def _want_flag(value: Any) -> bool:
+    return bool(value) and str(value).lower() not in {"false", "0", "no", "off"}
+
+
+def route_operation(operation: str, **params) -> Union[Dict[str, Any], Iterator[Dict[str, Any]]]:
     """Route operation to appropriate handler with global error handling."""
     try:
         if operation == "get_info":
@@ -21,7 +25,8 @@ def route_operation(operation: str, **params) -> Dict[str, Any]:
                 chunk_duration=params.get("chunk_duration", 60),
                 include_segments=params.get("include_segments", False),
                 segment_limit=params.get("segment_limit", 100),
-                model=params.get("model")
+                model=params.get("model"),
+                stream=_want_flag(params.get("stream"))
             )
         else:
             return {"error": f"Unknown operation: {operation}"}
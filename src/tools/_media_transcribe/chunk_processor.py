@@ -1,47 +1,74 @@
 """Chunk processing for media transcription (audio/video sources)."""
 from __future__ import annotations
+import os
+import time
+import logging
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 from .audio_extractor import extract_audio_segment
 from .whisper_client import transcribe_audio_file
+from .scheduler import AdaptiveLimiter
 
+logger = logging.getLogger(__name__)
+
+MAX_RETRIES = max(0, int(os.getenv("MEDIA_TRANSCRIBE_RETRIES", "3")))
 
-def process_chunk(media_path: Path, start: float, end: float, index: int, whisper_model: Optional[str] = None) -> Dict[str, Any]:
-    """Extract audio segment and transcribe with Whisper API.
+
+def transcribe_chunk(
+    audio_path: Path,
+    start: float,
+    end: float,
+    index: int,
+    whisper_model: Optional[str] = None,
+    limiter: Optional[AdaptiveLimiter] = None,
+) -> Dict[str, Any]:
+    """Transcribe an already extracted chunk (retries transient Whisper errors).
 
     Args:
-        media_path: source media path (audio or video)
-        start: start time (seconds)
-        end: end time (seconds)
+        audio_path: chunk audio file (deleted afterwards)
+        start: chunk start time in the source (seconds)
+        end: chunk end time in the source (seconds)
         index: chunk index
         whisper_model: optional model hint for backend
+        limiter: adaptive concurrency gate shared by the chunks of one transcription
     """
-    duration = end - start
-
-    # Extract audio as mp3 16k mono
-    extract_result = extract_audio_segment(media_path, start, duration)
-    if not extract_result.get("success"):
-        return {
-            "index": index,
-            "error": f"Audio extraction failed at {start:.2f}s: {extract_result.get('error')}"
-        }
-
-    audio_path = Path(extract_result["audio_path"])
-
-    # Transcribe
-    transcribe_result = transcribe_audio_file(audio_path, whisper_model=whisper_model)
-
-    # Cleanup temp
+    attempts = 0
+    upload_seconds = 0.0
+    try:
+        size = audio_path.stat().st_size
+    except OSError:
+        size = 0
     try:
-        audio_path.unlink()
-    except Exception:
-        pass
+        while True:
+            attempts += 1
+            if limiter is not None:
+                limiter.acquire()
+            t0 = time.perf_counter()
+            transcribe_result = transcribe_audio_file(audio_path, whisper_model=whisper_model)
+            upload_seconds += time.perf_counter() - t0
+            retryable = not transcribe_result.get("success") and bool(transcribe_result.get("retryable"))
+            if limiter is not None:
+                limiter.release(ok=bool(transcribe_result.get("success")), throttled=retryable)
+            if not retryable or attempts > MAX_RETRIES:
+                break
+            backoff = min(30.0, 2.0 ** (attempts - 1))
+            logger.warning(f"Chunk {index} at {start:.2f}s: {transcribe_result.get('error', '')[:120]} - retry {attempts}/{MAX_RETRIES} in {backoff:.0f}s")
+            time.sleep(backoff)
+    finally:
+        # Cleanup temp
+        try:
+            audio_path.unlink()
+        except Exception:
+            pass
+
+    stats = {"attempts": attempts, "upload_seconds": upload_seconds, "audio_bytes": size}
 
     if not transcribe_result.get("success"):
         return {
             "index": index,
-            "error": f"Transcription failed at {start:.2f}s: {transcribe_result.get('error')}"
+            "error": f"Transcription failed at {start:.2f}s: {transcribe_result.get('error')}",
+            **stats
         }
 
     if transcribe_result.get("empty", False):
@@ -50,12 +77,37 @@ def process_chunk(media_path: Path, start: float, end: float, index: int, whispe
             "start": start,
             "end": end,
             "text": "",
-            "empty": True
+            "empty": True,
+            **stats
         }
 
     return {
         "index": index,
         "start": start,
         "end": end,
-        "text": transcribe_result["transcription"]
+        "text": transcribe_result["transcription"],
+        **stats
     }
+
+
+def process_chunk(media_path: Path, start: float, end: float, index: int, whisper_model: Optional[str] = None) -> Dict[str, Any]:
+    """Extract audio segment and transcribe with Whisper API.
+
+    Args:
+        media_path: source media path (audio or video)
+        start: start time (seconds)
+        end: end time (seconds)
+        index: chunk index
+        whisper_model: optional model hint for backend
+    """
+    duration = end - start
+
+    # Extract audio as mp3 16k mono
+    extract_result = extract_audio_segment(media_path, start, duration)
+    if not extract_result.get("success"):
+        return {
+            "index": index,
+            "error": f"Audio extraction failed at {start:.2f}s: {extract_result.get('error')}"
+        }
+
+    return transcribe_chunk(Path(extract_result["audio_path"]), start, end, index, whisper_model)
@@ -3,12 +3,15 @@ from __future__ import annotations
 import math
 import time
 import logging
-from typing import Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from typing import Dict, Any, Iterator, List, Union
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from .validators import validate_media_path, validate_time_range, validate_chunk_duration
 from .utils import abs_from_project, probe_media_info, format_time
-from .chunk_processor import process_chunk
+from .chunk_processor import transcribe_chunk
+from .scheduler import AdaptiveLimiter
+from .segmenter import SegmentWriter, SegmentError
 
 logger = logging.getLogger(__name__)
 
@@ -41,20 +44,8 @@ def handle_get_info(path: str) -> Dict[str, Any]:
     }
 
 
-def handle_transcribe(
-    path: str,
-    time_start: int = 0,
-    time_end: int = None,
-    chunk_duration: int = 60,
-    include_segments: bool = False,
-    segment_limit: int = 100,
-    model: str | None = None
-) -> Dict[str, Any]:
-    """Transcribe media by extracting audio chunks and calling Whisper in parallel."""
-    # Timing
-    t0 = time.time()
-    started_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t0))
-
+def _prepare(path: str, time_start: int, time_end: int | None, chunk_duration: int) -> Dict[str, Any]:
+    """Validate path/range/chunk size and probe the media. Returns {"error"} or the job context."""
     # 1) Validate path
     v = validate_media_path(path)
     if not v["valid"]:
@@ -87,41 +78,98 @@ def handle_transcribe(
     if not cv["valid"]:
         return {"error": cv["error"]}
 
-    # 6) Build chunks
+    # 6) Range to process
     actual_end = min(time_end, duration)
     dur_to_process = actual_end - time_start
     if dur_to_process <= 0:
         return {"error": "No duration to process (time_start >= time_end)"}
 
-    chunks = []
-    cur = time_start
-    idx = 0
-    while cur < actual_end:
-        ce = min(cur + chunk_duration, actual_end)
-        chunks.append({"index": idx, "start": cur, "end": ce})
-        cur = ce
-        idx += 1
-
-    logger.info(f"Transcribing: {path} ({format_time(time_start)} → {format_time(actual_end)}, chunk: {chunk_duration}s, {len(chunks)} chunks, parallel=3)")
-
-    # 7) Parallel processing
-    max_workers = 3
-    results = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        fut_map = {
-            executor.submit(process_chunk, media_path, c["start"], c["end"], c["index"], model): c for c in chunks
-        }
-        for fut in as_completed(fut_map):
-            r = fut.result()
-            if "error" in r:
-                for f in fut_map:
-                    f.cancel()
-                logger.error(f"Chunk processing failed: {r['error']}")
-                return {"error": r["error"]}
-            results.append(r)
+    return {
+        "path": path,
+        "media_path": media_path,
+        "info": info,
+        "time_start": time_start,
+        "actual_end": actual_end,
+        "dur_to_process": dur_to_process,
+        "chunk_duration": chunk_duration,
+        "n_chunks": int(math.ceil(dur_to_process / chunk_duration)),
+    }
+
+
+def _pipeline(writer: SegmentWriter, limiter: AdaptiveLimiter, model: str | None, stats: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Feed finished chunks to Whisper and yield chunk results in index order.
+
+    Results are yielded while FFmpeg is still writing later chunks. Stops after the first
+    result carrying "error" (chunk failure or FFmpeg failure).
+    """
+    pending: Dict[int, Future] = {}
+    order: deque = deque()
+
+    def ready() -> Iterator[Dict[str, Any]]:
+        while order and pending[order[0]].done():
+            yield pending.pop(order.popleft()).result()
 
-    # 8) Sort and assemble
-    results.sort(key=lambda x: x["index"]) 
+    with ThreadPoolExecutor(max_workers=limiter.maximum) as executor:
+        try:
+            try:
+                for idx, seg_path in writer.iter_ready():
+                    if stats.get("first_chunk_at") is None:
+                        stats["first_chunk_at"] = time.time()
+                    c_start, c_end = writer.chunk_bounds(idx)
+                    pending[idx] = executor.submit(transcribe_chunk, seg_path, c_start, c_end, idx, model, limiter)
+                    order.append(idx)
+                    # Fail fast: stop decoding once a chunk failed for good
+                    failed = next((f for f in pending.values() if f.done() and "error" in f.result()), None)
+                    if failed is not None:
+                        yield failed.result()
+                        return
+                    for r in ready():
+                        yield r
+            except SegmentError as e:
+                yield {"index": order[0] if order else 0, "error": str(e)}
+                return
+
+            while order:
+                r = pending.pop(order.popleft()).result()
+                yield r
+                if "error" in r:
+                    return
+        finally:
+            for f in pending.values():
+                f.cancel()
+
+
+def _progress(ctx: Dict[str, Any], results: List[Dict[str, Any]], t0: float, limiter: AdaptiveLimiter) -> Dict[str, Any]:
+    """Partial timing stats after each streamed chunk."""
+    elapsed = time.time() - t0
+    audio_done = sum(r["end"] - r["start"] for r in results)
+    rate = audio_done / elapsed if elapsed > 0 else 0.0
+    remaining = max(0.0, ctx["dur_to_process"] - audio_done)
+    return {
+        "chunks_done": len(results),
+        "chunks_total": ctx["n_chunks"],
+        "audio_seconds_done": round(audio_done, 2),
+        "elapsed_seconds": round(elapsed, 2),
+        "realtime_factor": round(rate, 1) if rate else None,
+        "eta_seconds": round(remaining / rate, 1) if rate else None,
+        "concurrency_limit": limiter.limit,
+    }
+
+
+def _assemble(
+    ctx: Dict[str, Any],
+    results: List[Dict[str, Any]],
+    writer: SegmentWriter,
+    limiter: AdaptiveLimiter,
+    stats: Dict[str, Any],
+    t0: float,
+    include_segments: bool,
+    segment_limit: int,
+) -> Dict[str, Any]:
+    """Build the final payload from chunk results (already in index order)."""
+    started_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t0))
+    dur_to_process = ctx["dur_to_process"]
+    info = ctx["info"]
 
     segments_all = []
     empty_chunks = 0
@@ -137,7 +185,7 @@ def handle_transcribe(
 
     full_text = " ".join(s["text"] for s in segments_all)
 
-    # 9) Timing and warnings
+    # Timing and warnings
     t1 = time.time()
     completed_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t1))
     proc_time = t1 - t0
@@ -147,7 +195,7 @@ def handle_transcribe(
         logger.warning(f"Large transcription: {len(full_text)} chars (may exceed LLM context)")
         warning = f"⚠️ Large transcription ({len(full_text)} chars) - consider splitting ranges"
 
-    # 10) Optional segments
+    # Optional segments
     if include_segments:
         total_count = len(segments_all)
         segments_returned = segments_all[:segment_limit]
@@ -157,22 +205,21 @@ def handle_transcribe(
         truncated = False
         total_count = len(segments_all)
 
-    # 11) Build result
     result: Dict[str, Any] = {
         "success": True,
-        "media_path": path,
-        "time_start": time_start,
-        "time_end": actual_end,
+        "media_path": ctx["path"],
+        "time_start": ctx["time_start"],
+        "time_end": ctx["actual_end"],
         "duration_processed": dur_to_process,
         "full_text": full_text,
         "metadata": {
             "total_segments": len(segments_all),
             "empty_segments": empty_chunks,
-            "media_duration_total": duration,
+            "media_duration_total": info["duration"],
             "audio_codec": info["audio_codec"],
-            "chunk_duration": chunk_duration,
+            "chunk_duration": ctx["chunk_duration"],
             "parallel_processing": True,
-            "max_workers": max_workers,
+            "max_workers": limiter.maximum,
             "text_length": len(full_text)
         },
         "timing": {
@@ -184,6 +231,23 @@ def handle_transcribe(
         }
     }
 
+    # Throughput (extraction overlaps transcription, so stage times do not add up to the total)
+    first_chunk_at = stats.get("first_chunk_at")
+    upload_total = sum(r.get("upload_seconds", 0.0) for r in results)
+    audio_bytes = sum(r.get("audio_bytes", 0) for r in results)
+    result["metrics"] = {
+        "chunks": len(results),
+        "extract_seconds": round(writer.extract_seconds or 0.0, 2),
+        "first_chunk_seconds": round(first_chunk_at - t0, 2) if first_chunk_at else None,
+        "upload_seconds_total": round(upload_total, 2),
+        "upload_seconds_avg": round(upload_total / len(results), 2) if results else 0,
+        "audio_bytes": audio_bytes,
+        "upload_kbps": round(audio_bytes * 8 / 1000 / upload_total, 1) if upload_total > 0 else None,
+        "retries": sum(r.get("attempts", 1) - 1 for r in results),
+        "realtime_factor": round(dur_to_process / proc_time, 1) if proc_time > 0 else None,
+        "concurrency": limiter.snapshot(),
+    }
+
     if include_segments:
         result["segments"] = segments_returned
         result["returned_count"] = len(segments_returned)
@@ -196,3 +260,96 @@ def handle_transcribe(
         result["warning"] = warning
 
     return result
+
+
+def _stream_events(ctx: Dict[str, Any], model: str | None, t0: float) -> Iterator[Dict[str, Any]]:
+    """SSE chunks: start, one transcript per audio chunk (index order), then terminal (or error)."""
+    limiter = AdaptiveLimiter()
+    writer = SegmentWriter(ctx["media_path"], ctx["time_start"], ctx["actual_end"], ctx["chunk_duration"])
+    stats: Dict[str, Any] = {}
+    results: List[Dict[str, Any]] = []
+    try:
+        yield {
+            "chunk_type": "start",
+            "media_path": ctx["path"],
+            "time_start": ctx["time_start"],
+            "time_end": ctx["actual_end"],
+            "chunk_duration": ctx["chunk_duration"],
+            "chunks_total": ctx["n_chunks"],
+        }
+        for r in _pipeline(writer, limiter, model, stats):
+            if "error" in r:
+                logger.error(f"Chunk processing failed: {r['error']}")
+                yield {
+                    "chunk_type": "error",
+                    "error": {"message": r["error"]},
+                    "index": r.get("index"),
+                    "progress": _progress(ctx, results, t0, limiter),
+                    "terminal": True,
+                }
+                return
+            results.append(r)
+            yield {
+                "chunk_type": "transcript",
+                "index": r["index"],
+                "start": r["start"],
+                "end": r["end"],
+                "text": r["text"],
+                "empty": bool(r.get("empty", False)),
+                "attempts": r.get("attempts", 1),
+                "upload_seconds": round(r.get("upload_seconds", 0.0), 2),
+                "progress": _progress(ctx, results, t0, limiter),
+            }
+        final = _assemble(ctx, results, writer, limiter, stats, t0, False, 0)
+        # The text was already streamed chunk by chunk
+        final.pop("full_text", None)
+        yield {"chunk_type": "terminal", **final}
+    except Exception as e:
+        logger.exception("media_transcribe stream failed")
+        yield {"chunk_type": "error", "error": {"message": str(e)[:200]}, "terminal": True}
+    finally:
+        writer.cleanup()
+
+
+def handle_transcribe(
+    path: str,
+    time_start: int = 0,
+    time_end: int = None,
+    chunk_duration: int = 60,
+    include_segments: bool = False,
+    segment_limit: int = 100,
+    model: str | None = None,
+    stream: bool = False
+) -> Union[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """Transcribe media: one FFmpeg pass writes all chunks, Whisper calls run with adaptive concurrency.
+
+    Chunks are uploaded as soon as FFmpeg finishes them (extraction and transcription overlap).
+    With stream=True, validation errors are still returned as a dict; otherwise a generator
+    yields each chunk transcript (in order, with partial timing) as soon as it is available.
+    """
+    t0 = time.time()
+
+    ctx = _prepare(path, time_start, time_end, chunk_duration)
+    if "error" in ctx:
+        return ctx
+
+    logger.info(f"Transcribing: {path} ({format_time(time_start)} → {format_time(ctx['actual_end'])}, chunk: {chunk_duration}s, {ctx['n_chunks']} chunks, single ffmpeg pass, adaptive parallelism{', streaming' if stream else ''})")
+
+    if stream:
+        return _stream_events(ctx, model, t0)
+
+    # Single ffmpeg pass (segment muxer); each finished chunk goes straight to Whisper
+    limiter = AdaptiveLimiter()
+    writer = SegmentWriter(ctx["media_path"], time_start, ctx["actual_end"], chunk_duration)
+    stats: Dict[str, Any] = {}
+    results: List[Dict[str, Any]] = []
+    try:
+        for r in _pipeline(writer, limiter, model, stats):
+            if "error" in r:
+                logger.error(f"Chunk processing failed: {r['error']}")
+                return {"error": r["error"]}
+            results.append(r)
+    finally:
+        writer.cleanup()
+
+    return _assemble(ctx, results, writer, limiter, stats, t0, include_segments, segment_limit)
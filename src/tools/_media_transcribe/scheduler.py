@@ -0,0 +1,58 @@
+"""Adaptive concurrency for Whisper uploads (AIMD).
+
+The limit grows by ~1 per round of successful uploads (additive increase) up to a cap
+and is halved when the backend throttles or fails transiently (429, 5xx, timeouts).
+"""
+from __future__ import annotations
+import os
+import threading
+from typing import Any, Dict
+
+MIN_WORKERS = max(1, int(os.getenv("MEDIA_TRANSCRIBE_MIN_WORKERS", "1")))
+INITIAL_WORKERS = max(MIN_WORKERS, int(os.getenv("MEDIA_TRANSCRIBE_WORKERS", "3")))
+MAX_WORKERS = max(INITIAL_WORKERS, int(os.getenv("MEDIA_TRANSCRIBE_MAX_WORKERS", "8")))
+
+
+class AdaptiveLimiter:
+    """Counting gate whose limit adapts to backend feedback."""
+
+    def __init__(self, initial: int = INITIAL_WORKERS, minimum: int = MIN_WORKERS, maximum: int = MAX_WORKERS):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.initial = initial
+        self._limit = float(initial)
+        self._active = 0
+        self._cond = threading.Condition()
+        self.peak_active = 0
+        self.throttled = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._active >= int(self._limit):
+                self._cond.wait()
+            self._active += 1
+            self.peak_active = max(self.peak_active, self._active)
+
+    def release(self, ok: bool, throttled: bool = False) -> None:
+        with self._cond:
+            self._active -= 1
+            if throttled:
+                self.throttled += 1
+                self._limit = max(float(self.minimum), self._limit / 2)
+            elif ok:
+                self._limit = min(float(self.maximum), self._limit + 1.0 / self._limit)
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "initial": self.initial,
+                "final": int(self._limit),
+                "max": self.maximum,
+                "peak_in_flight": self.peak_active,
+                "throttle_events": self.throttled,
+            }
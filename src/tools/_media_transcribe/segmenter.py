@@ -0,0 +1,134 @@
+"""Single-pass audio segmentation with the FFmpeg segment muxer.
+
+One ffmpeg process decodes the requested range once and writes every chunk
+(MP3 mono 16 kHz, same encoding as audio_extractor) into a private temp dir.
+Chunks are handed out as soon as ffmpeg moves on to the next one, so uploads
+start while the rest of the file is still being decoded.
+"""
+from __future__ import annotations
+import logging
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+from uuid import uuid4
+
+from .utils import ensure_media_tmp_dir
+
+logger = logging.getLogger(__name__)
+
+_POLL_SEC = 0.1
+
+
+class SegmentError(RuntimeError):
+    """FFmpeg failed (or timed out) while writing segments."""
+
+
+class SegmentWriter:
+    """Run `ffmpeg -f segment` over [start, end) and yield finished chunk files in order."""
+
+    def __init__(self, input_path: Path, start: float, end: float, chunk_duration: int, timeout: Optional[float] = None):
+        self.input_path = input_path
+        self.start = start
+        self.end = end
+        self.chunk_duration = chunk_duration
+        # Decoding is much faster than real time; leave room for slow disks/remote mounts
+        self.timeout = timeout if timeout is not None else 300 + (end - start)
+        self.out_dir = ensure_media_tmp_dir() / f"media_segments_{uuid4().hex}"
+        self.proc: Optional[subprocess.Popen] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.bytes_written = 0
+
+    def _cmd(self) -> list:
+        return [
+            'ffmpeg',
+            '-hide_banner', '-nostdin', '-loglevel', 'error',
+            '-y',
+            '-ss', str(self.start),
+            '-t', str(self.end - self.start),
+            '-i', str(self.input_path),
+            '-vn',
+            '-acodec', 'libmp3lame',
+            '-q:a', '2',
+            '-ar', '16000',
+            '-ac', '1',
+            '-f', 'segment',
+            '-segment_time', str(self.chunk_duration),
+            '-segment_format', 'mp3',
+            '-reset_timestamps', '1',
+            str(self.out_dir / 'chunk_%05d.mp3'),
+        ]
+
+    def _chunk_path(self, index: int) -> Path:
+        return self.out_dir / f"chunk_{index:05d}.mp3"
+
+    def chunk_bounds(self, index: int) -> Tuple[float, float]:
+        """Nominal [start, end) of a chunk in source time (MP3 frame cuts stay within ~72 ms)."""
+        s = self.start + index * self.chunk_duration
+        return s, min(s + self.chunk_duration, self.end)
+
+    def start_process(self) -> None:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.started_at = time.time()
+        try:
+            self.proc = subprocess.Popen(self._cmd(), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        except FileNotFoundError:
+            raise SegmentError("FFmpeg not found (install FFmpeg)")
+
+    def iter_ready(self) -> Iterator[Tuple[int, Path]]:
+        """Yield (index, path) of completed chunks, in order, while ffmpeg runs."""
+        if self.proc is None:
+            self.start_process()
+        index = 0
+        deadline = self.started_at + self.timeout
+        while True:
+            rc = self.proc.poll()
+            current = self._chunk_path(index)
+            # A chunk is complete once ffmpeg opened the next one, or exited
+            if current.exists() and (self._chunk_path(index + 1).exists() or rc is not None):
+                if rc not in (None, 0):
+                    break
+                size = current.stat().st_size
+                # Encoder padding can spill a few ms into an extra segment past the range end
+                if size > 0 and self.chunk_bounds(index)[0] < self.end:
+                    self.bytes_written += size
+                    yield index, current
+                else:
+                    current.unlink()
+                index += 1
+                continue
+            if rc is not None:
+                break
+            if time.time() > deadline:
+                self.stop()
+                raise SegmentError(f"FFmpeg timeout (>{int(self.timeout)}s for segment extraction)")
+            time.sleep(_POLL_SEC)
+
+        self.finished_at = time.time()
+        if self.proc.returncode != 0:
+            err = (self.proc.stderr.read() or b"").decode("utf-8", "replace").strip() if self.proc.stderr else ""
+            raise SegmentError(f"FFmpeg extraction failed: {err[:1000]}")
+        if index == 0:
+            raise SegmentError("FFmpeg produced no audio (no audio in range?)")
+
+    @property
+    def extract_seconds(self) -> Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def stop(self) -> None:
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.kill()
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                pass
+
+    def cleanup(self) -> None:
+        self.stop()
+        if self.proc is not None and self.proc.stderr:
+            self.proc.stderr.close()
+        shutil.rmtree(self.out_dir, ignore_errors=True)
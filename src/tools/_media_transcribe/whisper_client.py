@@ -48,7 +48,10 @@ def transcribe_audio_file(audio_path: Path, api_token: Optional[str] = None, whi
 
         if response.status_code != 200:
             logger.error(f"Whisper API error {response.status_code}: {response.text[:200]}")
-            return {"success": False, "error": f"Whisper API error {response.status_code}: {response.text}"}
+            # 429/5xx: transient, the caller may retry with less concurrency
+            retryable = response.status_code == 429 or response.status_code >= 500
+            return {"success": False, "error": f"Whisper API error {response.status_code}: {response.text}",
+                    "status_code": response.status_code, "retryable": retryable}
 
         try:
             data = response.json()
@@ -72,10 +75,10 @@ def transcribe_audio_file(audio_path: Path, api_token: Optional[str] = None, whi
 
     except requests.exceptions.Timeout:
         logger.error(f"Whisper API timeout (>5min) for {audio_path.name}")
-        return {"success": False, "error": "Whisper API timeout (>5 minutes)"}
+        return {"success": False, "error": "Whisper API timeout (>5 minutes)", "retryable": True}
     except requests.exceptions.RequestException as e:
         logger.error(f"HTTP request failed: {str(e)}")
-        return {"success": False, "error": f"HTTP request failed: {str(e)}"}
+        return {"success": False, "error": f"HTTP request failed: {str(e)}", "retryable": True}
     except Exception as e:
         logger.exception(f"Transcription error for {audio_path.name}")
         return {"success": False, "error": f"Transcription error: {str(e)}"}
@@ -1,18 +1,21 @@
 """
-RCON client using mcipc (session-per-command)
+RCON client on pooled persistent sessions (tick-paced batches, see rcon_pool)
 """
 import logging
 import time
 import re
 from typing import Optional, List
 
+from . import rcon_pool
+from .rcon_pool import RconProtocolError, RconSendError, TickPacer
+
 logger = logging.getLogger(__name__)
 
 # Import config with error handling
 try:
     from ..config import (
         RCON_HOST, RCON_PORT, RCON_PASSWORD, RCON_TIMEOUT,
-        CONNECTION_RETRY_COUNT, CONNECTION_RETRY_DELAY, BATCH_DELAY_MS
+        CONNECTION_RETRY_COUNT, CONNECTION_RETRY_DELAY
     )
 except ImportError as e:
     logger.error(f"Failed to import config: {e}")
@@ -22,7 +25,6 @@ except ImportError as e:
     RCON_TIMEOUT = 30
     CONNECTION_RETRY_COUNT = 3
     CONNECTION_RETRY_DELAY = 1
-    BATCH_DELAY_MS = 50
 
 class RconError(Exception):
     """RCON operation error"""
@@ -51,10 +53,11 @@ def _extract_top_compound(s: str) -> str:
     return s[start:]
 
 class RconClient:
-    """RCON client wrapper opening a short-lived session per command.
-    
-    Using mcipc.rcon.je.Client as a context manager ensures proper
-    auth/login and response handling, avoiding stale sockets/timeouts.
+    """RCON client on a pooled, authenticated session.
+
+    Inside a `with` block one session is held for all commands; otherwise each call
+    borrows a session from the pool. Connections are reused across tool calls and
+    re-established transparently when the server closed them.
     """
     
     def __init__(self, host: str = RCON_HOST, port: int = RCON_PORT, 
@@ -63,23 +66,42 @@ class RconClient:
         self.port = port
         self.password = password
         self.timeout = timeout
+        self._session: Optional[rcon_pool.RconSession] = None
+        self._hold = False
+        self.last_batch_stats: Optional[dict] = None
     
-    def execute(self, command: str) -> str:
-        """Execute a single command (opens a fresh RCON session)."""
+    def _acquire(self) -> rcon_pool.RconSession:
+        if self._session is not None:
+            return self._session
         try:
-            from mcipc.rcon.je import Client
-        except ImportError:
-            raise RconError("mcipc not installed. Run: pip install mcipc>=2.4.0")
-        
+            session = rcon_pool.acquire(self.host, self.port, self.password, self.timeout)
+        except (OSError, RconProtocolError) as e:
+            raise RconError(f"RCON connection failed: {e}")
+        if self._hold:
+            self._session = session
+        return session
+    
+    def _release(self, session: rcon_pool.RconSession) -> None:
+        if session is not self._session:
+            rcon_pool.release(session)
+    
+    def execute(self, command: str) -> str:
+        """Execute a single command on a pooled session.
+
+        Resent once after a reconnect only when the request could not be written; a
+        connection lost while waiting for the answer is not retried (the command may have run).
+        """
         cmd = command.lstrip('/')
         logger.debug(f"Executing: /{cmd}")
         start = time.time()
+        session = self._acquire()
         try:
-            with Client(self.host, self.port, passwd=self.password, timeout=self.timeout) as c:
-                if cmd == 'list' and hasattr(c, 'list'):
-                    response = c.list()
-                else:
-                    response = c.run(cmd)
+            try:
+                response = session.command(cmd)
+            except RconSendError as e:
+                # Idle pooled sockets may have been closed by the server
+                logger.debug(f"Retrying /{cmd} after reconnect: {e}")
+                response = session.command(cmd)
             elapsed = time.time() - start
             logger.debug(f"Command executed in {elapsed:.2f}s")
             return "" if response is None else str(response)
@@ -87,29 +109,59 @@ class RconClient:
             elapsed = time.time() - start
             logger.error(f"Command execution error after {elapsed:.2f}s: {e}")
             raise RconError(f"Command failed: {e}")
+        finally:
+            self._release(session)
     
-    def execute_batch(self, commands: list[str], delay_ms: int = BATCH_DELAY_MS) -> list[dict]:
-        results = []
-        delay_s = delay_ms / 1000.0
-        for i, cmd in enumerate(commands):
-            try:
-                response = self.execute(cmd)
-                results.append({
-                    "command": cmd,
-                    "response": response,
-                    "success": True,
-                    "index": i
-                })
-            except Exception as e:
-                results.append({
-                    "command": cmd,
-                    "response": str(e),
-                    "success": False,
-                    "index": i
-                })
-                logger.warning(f"Batch command {i} failed: {e}")
-            if i < len(commands) - 1 and delay_ms > 0:
-                time.sleep(delay_s)
+    def execute_batch(self, commands: list[str], delay_ms: Optional[int] = None) -> list[dict]:
+        """Execute commands in order on one session.
+
+        delay_ms None/0: back to back, pausing while the server tick time is over target.
+        delay_ms > 0: fixed pause between commands (explicit pacing).
+        Throughput stats are kept in `last_batch_stats`.
+        """
+        delay_ms = int(delay_ms or 0)
+        results: list[dict] = []
+        start = time.time()
+        pacer = TickPacer()
+        try:
+            session = self._acquire()
+        except RconError as e:
+            self.last_batch_stats = None
+            return [{"command": cmd, "response": str(e), "success": False, "index": i}
+                    for i, cmd in enumerate(commands)]
+        reconnects_before = session.reconnects
+        try:
+            if delay_ms:
+                delay_s = delay_ms / 1000.0
+                pairs = []
+                for i, cmd in enumerate(commands):
+                    pairs.extend(session.run([cmd], pacer, probe=False))
+                    if i < len(commands) - 1:
+                        time.sleep(delay_s)
+            else:
+                pairs = session.run(commands, pacer)
+        except Exception as e:
+            pairs = [(False, f"Batch aborted: {e}")] * len(commands)
+        finally:
+            self._release(session)
+        for i, (cmd, (ok, response)) in enumerate(zip(commands, pairs)):
+            results.append({
+                "command": cmd,
+                "response": response,
+                "success": ok,
+                "index": i
+            })
+            if not ok:
+                logger.warning(f"Batch command {i} failed: {response}")
+        elapsed = time.time() - start
+        self.last_batch_stats = {
+            "mode": "paced" if delay_ms else "adaptive",
+            "commands": len(commands),
+            "elapsed_sec": round(elapsed, 3),
+            "commands_per_sec": round(len(commands) / elapsed, 1) if elapsed > 0 else None,
+            "reconnects": session.reconnects - reconnects_before,
+            "rate": pacer.snapshot() if not delay_ms else None,
+        }
         return results
     
     def get_online_players(self) -> List[str]:
@@ -209,7 +261,13 @@ class RconClient:
             return False
     
     def __enter__(self):
+        # The session is taken from the pool on first use and kept until exit
+        self._hold = True
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self._hold = False
+        session, self._session = self._session, None
+        if session is not None:
+            rcon_pool.release(session)
         return False
@@ -0,0 +1,393 @@
+"""
+Persistent RCON sessions (raw protocol), pooled per server, with tick-paced batches
+
+Wire format (Source RCON, as used by Minecraft): <len:int32><id:int32><type:int32><body>\\0\\0
+Vanilla reads one packet per socket read and drops the connection when a read holds more
+or less than one packet, so a session keeps a single request in flight. Responses longer
+than 4096 characters are split into several packets carrying the same id.
+"""
+import logging
+import re
+import select
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from ..config import (
+        RCON_POOL_SIZE, RCON_POOL_IDLE_SEC, RCON_TARGET_MSPT, RCON_TICK_PROBE_SEC, RCON_MAX_LATENCY_MS,
+        CONNECTION_RETRY_COUNT, CONNECTION_RETRY_DELAY
+    )
+except ImportError as e:
+    logger.error(f"Failed to import config: {e}")
+    RCON_POOL_SIZE = 4
+    RCON_POOL_IDLE_SEC = 300
+    RCON_TARGET_MSPT = 40.0
+    RCON_TICK_PROBE_SEC = 1.0
+    RCON_MAX_LATENCY_MS = 500
+    CONNECTION_RETRY_COUNT = 3
+    CONNECTION_RETRY_DELAY = 1
+
+_LOGIN = 3
+_COMMAND = 2
+_RESPONSE = 0
+_HEADER = struct.Struct('<iii')
+_FRAGMENT_CHARS = 4096
+_MAX_PACKET = 1 << 20
+
+# Tick-time probes: vanilla 1.20.3+ then Paper; the first one that parses is kept per session
+_TICK_PROBES = (
+    ('tick query', re.compile(r"Average time per tick:\s*([\d.]+)\s*ms")),
+    ('mspt', re.compile(r"([\d.]+)/[\d.]+/[\d.]+")),
+)
+
+
+class RconProtocolError(Exception):
+    """Connection, authentication or framing error (the session is unusable)"""
+    pass
+
+
+class RconConnectError(RconProtocolError):
+    """The session could not be (re)established"""
+    pass
+
+
+class RconSendError(RconProtocolError):
+    """The request was not written to the socket (it did not reach the server)"""
+    pass
+
+
+class TickPacer:
+    """Pauses a batch while the server falls behind, from sampled tick time (fallback: latency).
+
+    Vanilla RCON reads one packet per socket read, so requests are never pipelined: commands
+    go one at a time on a persistent session, and throughput comes from not reconnecting.
+    """
+
+    def __init__(self, target_mspt: float = RCON_TARGET_MSPT):
+        self.target_mspt = target_mspt
+        self.throttle_events = 0
+        self.pause_sec = 0.0
+        self.mspt_last: Optional[float] = None
+        self.mspt_max: Optional[float] = None
+
+    def _pause(self, seconds: float) -> float:
+        self.throttle_events += 1
+        self.pause_sec += seconds
+        return seconds
+
+    def on_latency(self, seconds: float) -> float:
+        """Record a response time; returns how long to pause before the next command."""
+        if self.mspt_last is None and seconds * 1000 > RCON_MAX_LATENCY_MS:
+            return self._pause(min(1.0, seconds))
+        return 0.0
+
+    def on_tick_sample(self, mspt: float) -> float:
+        """Record a tick-time sample; returns how long to pause before sending more."""
+        self.mspt_last = mspt
+        self.mspt_max = mspt if self.mspt_max is None else max(self.mspt_max, mspt)
+        if mspt > self.target_mspt:
+            # Server is behind: give it roughly the ticks it is missing
+            return self._pause(min(1.0, (mspt - self.target_mspt) / 1000.0 * 10))
+        return 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "target_mspt": self.target_mspt,
+            "throttle_events": self.throttle_events,
+            "pause_sec": round(self.pause_sec, 3),
+            "mspt_last": self.mspt_last,
+            "mspt_max": self.mspt_max,
+        }
+
+
+class RconSession:
+    """One authenticated RCON socket; not thread-safe (the pool hands it to one user at a time)"""
+
+    def __init__(self, host: str, port: int, password: str, timeout: float):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.timeout = timeout
+        self.sock: Optional[socket.socket] = None
+        self._next_id = 1
+        self.last_used = 0.0
+        self.reconnects = 0
+        self._probe: Optional[int] = None  # index in _TICK_PROBES, -1 when none works
+
+    # -- connection ---------------------------------------------------------
+
+    def connect(self) -> None:
+        self.close()
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock = sock
+        try:
+            req = self._new_id()
+            self._send(req, _LOGIN, self.password)
+            rid, _, _ = self._recv()
+            if rid == -1:
+                raise RconProtocolError("RCON authentication failed (check rcon.password)")
+        except Exception:
+            self.close()
+            raise
+        self.last_used = time.time()
+
+    def reconnect(self) -> None:
+        last: Optional[Exception] = None
+        for attempt in range(max(1, CONNECTION_RETRY_COUNT)):
+            try:
+                self.connect()
+                self.reconnects += 1
+                return
+            except RconProtocolError as e:
+                raise RconConnectError(str(e))
+            except OSError as e:
+                last = e
+                time.sleep(CONNECTION_RETRY_DELAY * (attempt + 1))
+        raise RconConnectError(f"RCON reconnect failed: {last}")
+
+    def close(self) -> None:
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+    @property
+    def connected(self) -> bool:
+        return self.sock is not None
+
+    def alive(self) -> bool:
+        """Non-blocking check of an idle session before reuse.
+
+        Nothing should be readable on an idle RCON socket: readable means the server closed
+        or reset it (e.g. after a restart), or left stray data; either way it is not reusable.
+        """
+        if self.sock is None:
+            return False
+        try:
+            readable, _, _ = select.select([self.sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        return not readable
+
+    # -- framing ------------------------------------------------------------
+
+    def _new_id(self) -> int:
+        rid = self._next_id
+        self._next_id = 1 if rid >= 0x7FFFFFFE else rid + 1
+        return rid
+
+    @staticmethod
+    def _pack(rid: int, ptype: int, body: str) -> bytes:
+        payload = body.encode('utf-8') + b'\x00\x00'
+        return _HEADER.pack(len(payload) + 8, rid, ptype) + payload
+
+    def _send(self, rid: int, ptype: int, body: str) -> None:
+        self.sock.sendall(self._pack(rid, ptype, body))
+
+    def _read_exact(self, n: int) -> bytes:
+        buf = bytearray(n)
+        view = memoryview(buf)
+        got = 0
+        while got < n:
+            k = self.sock.recv_into(view[got:])
+            if not k:
+                raise RconProtocolError("RCON connection closed by server")
+            got += k
+        return bytes(buf)
+
+    def _recv(self, header_timeout: Optional[float] = None) -> Tuple[int, int, str]:
+        if header_timeout is not None:
+            # Short wait for a possible next fragment; never time out in the middle of a packet
+            self.sock.settimeout(header_timeout)
+            try:
+                head = self._read_exact(4)
+            finally:
+                self.sock.settimeout(self.timeout)
+        else:
+            head = self._read_exact(4)
+        (length,) = struct.unpack('<i', head)
+        if length < 10 or length > _MAX_PACKET:
+            raise RconProtocolError(f"Invalid RCON packet length {length}")
+        data = self._read_exact(length)
+        rid, ptype = struct.unpack('<ii', data[:8])
+        return rid, ptype, data[8:-2].decode('utf-8', 'replace')
+
+    # -- commands -----------------------------------------------------------
+
+    def _read_response(self, rid: int) -> str:
+        parts: List[str] = []
+        while True:
+            try:
+                # Only a 4096-char fragment pending: the answer may be complete already
+                got, _, body = self._recv(0.25 if parts else None)
+            except socket.timeout:
+                if not parts:
+                    raise
+                break
+            if got != rid:
+                continue  # stale answer from an earlier, abandoned request
+            parts.append(body)
+            if len(body) < _FRAGMENT_CHARS:
+                break
+        return ''.join(parts)
+
+    def command(self, cmd: str) -> str:
+        """Single request/response (fragmented responses are reassembled).
+
+        Raises RconSendError when the request was not written, so it never reached the
+        server and may be retried; any later failure may have run the command.
+        """
+        if not self.connected:
+            self.reconnect()
+        rid = self._new_id()
+        try:
+            self._send(rid, _COMMAND, cmd.lstrip('/'))
+        except OSError as e:
+            self.close()
+            raise RconSendError(f"RCON send failed: {e}")
+        try:
+            response = self._read_response(rid)
+        except (OSError, RconProtocolError):
+            self.close()
+            raise
+        self.last_used = time.time()
+        return response
+
+    def run(self, commands: List[str], pacer: TickPacer, probe: bool = True,
+            on_result: Optional[Callable[[int, bool, str], None]] = None) -> List[Tuple[bool, str]]:
+        """Run commands in order, one request in flight, paced by server tick time.
+
+        Returns [(ok, response)] in command order. A request that could not be sent is resent
+        once after a reconnect; a connection lost while waiting for the answer fails only that
+        command (it may or may not have run) and the session reconnects for the rest.
+        """
+        results: List[Tuple[bool, str]] = []
+        next_probe = time.monotonic() + RCON_TICK_PROBE_SEC
+
+        def finish(index: int, ok: bool, text: str) -> None:
+            results.append((ok, text))
+            if on_result is not None:
+                on_result(index, ok, text)
+
+        for index, cmd in enumerate(commands):
+            if probe and time.monotonic() >= next_probe:
+                pause = self._sample_tick(pacer)
+                if pause > 0:
+                    time.sleep(pause)
+                next_probe = time.monotonic() + RCON_TICK_PROBE_SEC
+            sent_at = time.monotonic()
+            try:
+                try:
+                    response = self.command(cmd)
+                except RconSendError as e:
+                    logger.debug(f"RCON: resending /{cmd} after reconnect: {e}")
+                    response = self.command(cmd)
+            except RconConnectError as e:
+                # Server unreachable: fail the rest without retrying each command
+                for rest in range(index, len(commands)):
+                    finish(rest, False, str(e))
+                break
+            except (OSError, RconProtocolError) as e:
+                logger.warning(f"RCON: connection lost during /{cmd}: {e}")
+                finish(index, False, f"Connection lost before response: {e}")
+                continue
+            finish(index, True, response)
+            pause = pacer.on_latency(time.monotonic() - sent_at)
+            if pause > 0:
+                time.sleep(pause)
+
+        self.last_used = time.time()
+        return results
+
+    def _sample_tick(self, pacer: TickPacer) -> float:
+        if self._probe == -1:
+            return 0.0
+        candidates = [self._probe] if self._probe is not None else list(range(len(_TICK_PROBES)))
+        for i in candidates:
+            cmd, pattern = _TICK_PROBES[i]
+            try:
+                resp = self.command(cmd)
+            except (OSError, RconProtocolError):
+                return 0.0
+            m = pattern.search(resp or '')
+            if m:
+                self._probe = i
+                return pacer.on_tick_sample(float(m.group(1)))
+        self._probe = -1
+        return 0.0
+
+
+# -- pool ---------------------------------------------------------------------
+
+_lock = threading.Lock()
+_idle: Dict[Tuple[str, int, str], List[RconSession]] = {}
+
+
+def acquire(host: str, port: int, password: str, timeout: float) -> RconSession:
+    """Idle pooled session for this server, or a new authenticated one."""
+    key = (host, port, password)
+    now = time.time()
+    while True:
+        with _lock:
+            stack = _idle.get(key) or []
+            session = stack.pop() if stack else None
+        if session is None:
+            break
+        # Dead sockets are dropped here: a command sent on one may or may not have run
+        if now - session.last_used <= RCON_POOL_IDLE_SEC and session.alive():
+            session.timeout = timeout
+            if session.sock is not None:
+                session.sock.settimeout(timeout)
+            return session
+        session.close()
+    session = RconSession(host, port, password, timeout)
+    session.connect()
+    return session
+
+
+def release(session: RconSession) -> None:
+    if not session.connected:
+        return
+    key = (session.host, session.port, session.password)
+    with _lock:
+        stack = _idle.setdefault(key, [])
+        if len(stack) < RCON_POOL_SIZE:
+            stack.append(session)
+            return
+    session.close()
+
+
+@contextmanager
+def pooled(host: str, port: int, password: str, timeout: float) -> Iterator[RconSession]:
+    session = acquire(host, port, password, timeout)
+    try:
+        yield session
+    except Exception:
+        session.close()  # state unknown after an error mid-exchange
+        raise
+    finally:
+        release(session)
+
+
+def close_all() -> int:
+    with _lock:
+        sessions = [s for stack in _idle.values() for s in stack]
+        _idle.clear()
+    for s in sessions:
+        s.close()
+    return len(sessions)
+
+
+def stats() -> dict:
+    with _lock:
+        return {f"{h}:{p}": len(stack) for (h, p, _), stack in _idle.items()}
@@ -19,6 +19,13 @@ CONNECTION_RETRY_COUNT = 3
 CONNECTION_RETRY_DELAY = 1  # seconds
 COMMAND_TIMEOUT = 30  # seconds
 
+# RCON session pool & batch pacing
+RCON_POOL_SIZE = 4  # idle sessions kept per server
+RCON_POOL_IDLE_SEC = 300  # idle sessions older than this are reconnected
+RCON_TARGET_MSPT = 40.0  # back off when the server tick time exceeds this (budget: 50 ms)
+RCON_TICK_PROBE_SEC = 1.0  # tick-time sampling period during batches
+RCON_MAX_LATENCY_MS = 500  # fallback congestion signal when tick time cannot be queried
+
 # Paths
 MODELS_DIR = "docs/models/"
 ALLOWED_MODEL_EXTENSIONS = [".fbx", ".obj", ".stl", ".glb", ".gltf"]
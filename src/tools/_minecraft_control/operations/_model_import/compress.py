@@ -1,7 +1,15 @@
 """
-Compression helpers: run-length encode along X per (y,z).
+Compression helpers: run-length encode along X per (y,z), or greedy 3D boxes.
 """
-from typing import Dict, Tuple, List
+from collections import defaultdict
+from typing import Dict, Tuple, List, Sequence
+
+import numpy as np
+
+from ...config import MAX_BLOCKS_PER_CHUNK
+
+# Dense working volume per slab (int16 cells); taller models are meshed in y-slabs
+GREEDY_MAX_CELLS = 16_000_000
 
 
 def rle_fill_commands(by_yz: Dict[Tuple[int, int], List[Tuple[int, str]]], CommandBuilder) -> List[str]:
@@ -27,3 +35,69 @@ def rle_fill_commands(by_yz: Dict[Tuple[int, int], List[Tuple[int, str]]], Comma
         if run_x1 is not None:
             commands.append(CommandBuilder.fill(run_x1, wy, wz, prev_x, wy, wz, run_blk))
     return commands
+
+
+def rle_fill_commands_arrays(coords: np.ndarray, block_ids: np.ndarray, names: Sequence[str], CommandBuilder) -> List[str]:
+    """rle_fill_commands for world coords (N, 3) and block ids."""
+    by_yz: Dict[Tuple[int, int], List[Tuple[int, str]]] = defaultdict(list)
+    for (wx, wy, wz), b in zip(np.asarray(coords).tolist(), np.asarray(block_ids).tolist()):
+        by_yz[(wy, wz)].append((wx, names[b]))
+    return rle_fill_commands(by_yz, CommandBuilder)
+
+
+def _first_false(ok: np.ndarray) -> int:
+    return len(ok) if ok.all() else int(np.argmin(ok))
+
+
+def _greedy_boxes(vol: np.ndarray, max_volume: int):
+    """Yield (y, z, x, dy, dz, dx, block_id) boxes covering every cell >= 0 of vol[y, z, x].
+
+    Seeds are visited in (y, z, x) order; each box grows along X, then Z, then Y while the
+    candidate face is uniform and unplaced. Placed cells are cleared in vol (modified in place).
+    """
+    H, D, W = vol.shape
+    flat = vol.reshape(-1)
+    plane = D * W
+    for seed in np.flatnonzero(flat >= 0).tolist():
+        b = flat[seed]
+        if b < 0:
+            continue  # already covered by an earlier box
+        y, rem = divmod(seed, plane)
+        z, x = divmod(rem, W)
+        dx = _first_false(vol[y, z, x:x + min(W - x, max_volume)] == b)
+        dz = _first_false((vol[y, z:z + min(D - z, max_volume // dx), x:x + dx] == b).all(axis=1))
+        lim_y = min(H - y, max_volume // (dx * dz))
+        dy = _first_false((vol[y:y + lim_y, z:z + dz, x:x + dx] == b).all(axis=(1, 2)))
+        vol[y:y + dy, z:z + dz, x:x + dx] = -1
+        yield y, z, x, dy, dz, dx, int(b)
+
+
+def greedy_box_fill_commands(coords: np.ndarray, block_ids: np.ndarray, names: Sequence[str], CommandBuilder,
+                             max_volume: int = MAX_BLOCKS_PER_CHUNK) -> List[str]:
+    """Build /fill commands from world coords (N, 3) and block ids by merging voxels into boxes.
+
+    Boxes never exceed max_volume blocks (the /fill limit) and are emitted bottom-up by
+    starting y. Covers exactly the given voxels; empty cells are left untouched.
+    """
+    coords = np.asarray(coords, dtype=np.int64).reshape(-1, 3)
+    if not len(coords):
+        return []
+    ids = np.asarray(block_ids, dtype=np.int16)
+    lo = coords.min(axis=0)
+    rel = coords - lo
+    size = rel.max(axis=0) + 1
+    width, height, depth = int(size[0]), int(size[1]), int(size[2])
+    slab = max(1, min(height, GREEDY_MAX_CELLS // max(width * depth, 1)))
+
+    commands: List[str] = []
+    for y0 in range(0, height, slab):
+        sel = (rel[:, 1] >= y0) & (rel[:, 1] < y0 + slab)
+        if not sel.any():
+            continue
+        r = rel[sel]
+        vol = np.full((min(slab, height - y0), depth, width), -1, dtype=np.int16)
+        vol[r[:, 1] - y0, r[:, 2], r[:, 0]] = ids[sel]
+        for y, z, x, dy, dz, dx, b in _greedy_boxes(vol, max_volume):
+            x1, y1, z1 = int(lo[0]) + x, int(lo[1]) + y0 + y, int(lo[2]) + z
+            commands.append(CommandBuilder.fill(x1, y1, z1, x1 + dx - 1, y1 + dy - 1, z1 + dz - 1, names[b]))
+    return commands
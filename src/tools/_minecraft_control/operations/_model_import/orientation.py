@@ -1,9 +1,11 @@
 """
 Orientation helpers for voxelized models.
 """
-from typing import Dict, Tuple
+from typing import Dict, Tuple, Union
 
-def decide_orientation(block_map: Dict[Tuple[int,int,int], str], orient: str) -> bool:
+from ...voxel.grid import VoxelGrid
+
+def decide_orientation(block_map: Union[VoxelGrid, Dict[Tuple[int,int,int], str]], orient: str) -> bool:
     """Return True if we should map z-up to y-up (use_z_up), else False.
     orient: 'auto' | 'y_up' | 'z_up_to_y'
     """
@@ -16,6 +18,9 @@ def decide_orientation(block_map: Dict[Tuple[int,int,int], str], orient: str) ->
         import numpy as _np
         if not block_map:
             return False
+        if isinstance(block_map, VoxelGrid):
+            _, vy_span, vz_span = (int(v) for v in block_map.spans())
+            return vz_span > (vy_span * 1.25)
         vs = _np.array(list(block_map.keys()), dtype=_np.int32)
         vy_span = int(vs[:, 1].max()) - int(vs[:, 1].min()) if vs.size else 0
         vz_span = int(vs[:, 2].max()) - int(vs[:, 2].min()) if vs.size else 0
@@ -27,8 +32,10 @@ def orient_coord(vx: int, vy: int, vz: int, use_z_up: bool) -> Tuple[int,int,int
     """Map z-up indices to y-up if needed."""
     return (int(vx), int(vz), int(vy)) if use_z_up else (int(vx), int(vy), int(vz))
 
-def apply_orientation(block_map: Dict[Tuple[int,int,int], str], use_z_up: bool) -> Dict[Tuple[int,int,int], str]:
-    """Return new dict with oriented voxel coordinates."""
+def apply_orientation(block_map: Union[VoxelGrid, Dict[Tuple[int,int,int], str]], use_z_up: bool):
+    """Return new grid (or dict) with oriented voxel coordinates."""
+    if isinstance(block_map, VoxelGrid):
+        return block_map.swap_yz() if use_z_up else block_map
     oriented: Dict[Tuple[int,int,int], str] = {}
     for (vx, vy, vz), blk in block_map.items():
         ox, oy, oz = orient_coord(vx, vy, vz, use_z_up)
@@ -1,13 +1,17 @@
 """
 Placement & anchoring helpers for voxel import.
 """
-from typing import Dict, Tuple, Callable
+from typing import Dict, Tuple, Callable, Union
+
+from ...voxel.grid import VoxelGrid
 
 Bounds = Tuple[int, int, int, int, int, int]  # (min_x, min_y, min_z, max_x, max_y, max_z)
 
 
-def compute_oriented_bounds(oriented: Dict[Tuple[int, int, int], str]) -> Bounds:
+def compute_oriented_bounds(oriented: Union[VoxelGrid, Dict[Tuple[int, int, int], str]]) -> Bounds:
     """Compute integer bounds of oriented voxel keys."""
+    if isinstance(oriented, VoxelGrid):
+        return oriented.bounds()
     min_x = min_y = min_z = 10 ** 9
     max_x = max_y = max_z = -10 ** 9
     for (x, y, z) in oriented.keys():
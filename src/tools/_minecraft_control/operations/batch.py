@@ -10,12 +10,12 @@ def batch_commands_op(params: dict, rcon, context: dict) -> dict:
     """Execute batch of commands
     
     Args:
-        params: {commands: list[str], delay_ms: int}
+        params: {commands: list[str], delay_ms: int (omit/0: adaptive rate)}
         rcon: RconClient
         context: Execution context
         
     Returns:
-        {success, executed_count, failed_count, results, time_ms, warnings}
+        {success, executed_count, failed_count, results, time_ms, commands_per_sec, throughput, warnings}
     """
     commands = params.get('commands', [])
     if not commands:
@@ -27,10 +27,13 @@ def batch_commands_op(params: dict, rcon, context: dict) -> dict:
     try:
         start_time = time.time()
         
-        delay_ms = params.get('delay_ms', 50)
+        delay_ms = int(params.get('delay_ms') or 0)
         limit = params.get('limit', 50)
         
-        logger.info(f"Executing batch of {len(commands)} commands with {delay_ms}ms delay")
+        if delay_ms:
+            logger.info(f"Executing batch of {len(commands)} commands with {delay_ms}ms delay")
+        else:
+            logger.info(f"Executing batch of {len(commands)} commands (adaptive rate)")
         
         # Execute batch
         results = rcon.execute_batch(commands, delay_ms=delay_ms)
@@ -40,6 +43,7 @@ def batch_commands_op(params: dict, rcon, context: dict) -> dict:
         failed = len(commands) - executed
         
         elapsed = (time.time() - start_time) * 1000
+        stats = getattr(rcon, 'last_batch_stats', None) or {}
         
         warnings = []
         if failed > 0:
@@ -60,6 +64,8 @@ def batch_commands_op(params: dict, rcon, context: dict) -> dict:
             "results": returned_results,
             "truncated": truncated,
             "time_ms": elapsed,
+            "commands_per_sec": stats.get('commands_per_sec'),
+            "throughput": stats,
             "warnings": warnings
         }
     
@@ -78,7 +78,7 @@ def spawn_entities_op(params: dict, rcon, context: dict) -> dict:
         
         # Execute batch
         logger.info(f"Spawning {count} {entity_type} entities (relative={relative}) with pattern '{pattern}'")
-        results = rcon.execute_batch(commands, delay_ms=params.get('delay_ms', 50))
+        results = rcon.execute_batch(commands, delay_ms=params.get('delay_ms'))
         
         spawned = sum(1 for r in results if r['success'])
         failed = len(commands) - spawned
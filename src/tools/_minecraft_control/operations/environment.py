@@ -54,7 +54,7 @@ def set_environment_op(params: dict, rcon, context: dict) -> dict:
         
         # Execute commands
         logger.info(f"Setting environment: {changes}")
-        results = rcon.execute_batch(commands, delay_ms=100)
+        results = rcon.execute_batch(commands)
         
         # Collect responses
         responses = [r['response'] for r in results if r['success']]
@@ -4,11 +4,12 @@ API for render_image operation (split version, <7KB files)
 import logging
 import os
 import time
-from typing import Dict, Tuple, List
+
+import numpy as np
 
 from .paths import get_images_base_dir, normalize_image_path, resolve_candidates
-from .palette_quant import select_palette, quantize_image
-from .placer import resolve_base_position, compute_world_coords, blocks_to_commands
+from .palette_quant import select_palette, quantize_image_indices
+from .placer import resolve_base_position, compute_world_coords, pixel_world_coords, blocks_to_commands
 
 logger = logging.getLogger(__name__)
 
@@ -74,34 +75,22 @@ def render_image_op(params: dict, rcon, context: dict) -> dict:
             mode, w, h, base_x, base_y, base_z, anchor, anchor_xz
         )
 
-        # Quantization -> blocks per pixel
+        # Quantization -> palette index per pixel
         palette, palette_mode = select_palette(params)
-        block_rows = quantize_image(im, palette, params)
+        idx, names = quantize_image_indices(im, palette, params)
 
         # Safety: never place 'air' from quantization; replace with safe fallback
         fallback_blk = 'white_concrete' if 'white_concrete' in palette else 'white_wool'
-        unique_blocks = set()
-        for y in range(len(block_rows)):
-            row = block_rows[y]
-            for x in range(len(row)):
-                blk = row[x]
-                if not blk or blk == 'air':
-                    row[x] = fallback_blk
-                unique_blocks.add(row[x])
-
-        # Assemble per (wy,wz)
-        by_yz: Dict[Tuple[int, int], List[Tuple[int, str]]] = {}
-        for y in range(h):
-            if mode == 'wall':
-                wy, wz = (start_y + (h - 1 - y), fixed_z)
-            else:
-                wy, wz = (start_y, (start_z if start_z is not None else base_z) + y)
-            row_items = [(start_x + x, block_rows[y][x]) for x in range(w)]
-            by_yz.setdefault((wy, wz), []).extend(row_items)
-
-        # Commands
+        names = [fallback_blk if (not n or n == 'air') else n for n in names]
+        unique_blocks = {names[i] for i in np.unique(idx).tolist()}
+
+        # Commands (pixels merged into greedy boxes, or X-runs)
+        compression = params.get('compression', 'greedy')
+        coords = pixel_world_coords(mode, w, h, start_x, start_y, base_z, fixed_z, start_z)
         commands = blocks_to_commands(
-            by_yz,
+            coords,
+            idx.reshape(-1),
+            names,
             bool(params.get('clear_area', False)),
             mode,
             start_x,
@@ -111,6 +100,7 @@ def render_image_op(params: dict, rcon, context: dict) -> dict:
             base_z,
             fixed_z,
             start_z,
+            compression,
         )
 
         # Safety cap
@@ -118,9 +108,10 @@ def render_image_op(params: dict, rcon, context: dict) -> dict:
         if len(commands) > MAX_CMDS:
             commands = commands[:MAX_CMDS]
 
-        delay = int(params.get('delay_ms', 50) or 50)
+        delay = int(params.get('delay_ms') or 0)
         logger.info(f"Rendering image {actual_path} as {mode}: {w}x{h} -> {len(commands)} fill commands")
         results = rcon.execute_batch(commands, delay_ms=delay)
+        stats = getattr(rcon, 'last_batch_stats', None) or {}
         executed = sum(1 for r in results if r['success'])
         failed = len(commands) - executed
 
@@ -142,10 +133,12 @@ def render_image_op(params: dict, rcon, context: dict) -> dict:
             "image_mapping": params.get('image_mapping', 'color'),
             "unique_blocks_used": sorted(unique_blocks),
             "fill_commands": len(commands),
+            "compression": compression,
             "executed_count": executed,
             "failed_count": failed,
             "spawn_position": {"x": base_x, "y": base_y, "z": base_z},
             "time_ms": elapsed,
+            "commands_per_sec": stats.get('commands_per_sec'),
             "warnings": warnings,
         }
 
@@ -3,7 +3,10 @@ Palette selection and quantization helpers for image rendering.
 """
 from typing import Dict, Tuple, List
 
+import numpy as np
+
 from ...utils.palette import get_palette, distance_rgb2
+from ...utils.dither import quantize_indices
 
 Palette = Dict[str, Tuple[int, int, int]]
 
@@ -39,47 +42,21 @@ def choose_block_fast(rgb: Tuple[int, int, int], palette: Palette) -> str:
     return best or 'stone'
 
 
-def quantize_image(im, palette: Palette, params: dict) -> List[List[str]]:
-    """Return block names per pixel (rows) based on params.distance and params.dither.
-    Falls back to fast RGB nearest if advanced path not available.
+def quantize_image_indices(im, palette: Palette, params: dict) -> Tuple[np.ndarray, List[str]]:
+    """Return (HxW palette indices, block names) based on params.distance and params.dither.
+    Whole-image batch mapping through the cached palette lookup table.
     """
     image_mapping = params.get('image_mapping', 'color')
     if image_mapping == 'single':
         w, h = im.size
-        blk = params.get('block_type', 'white_wool')
-        return [[blk for _ in range(w)] for _ in range(h)]
+        return np.zeros((h, w), dtype=np.uint8), [params.get('block_type', 'white_wool')]
 
     distance = (params.get('distance') or 'rgb').lower()
     dither = bool(params.get('dither', False))
+    return quantize_indices(np.asarray(im, dtype=np.uint8), palette, distance=distance, dither=dither)
 
-    use_advanced = dither or (distance == 'lab')
-    if not use_advanced:
-        # Fast path: per-pixel nearest in RGB
-        px = im.load()
-        w, h = im.size
-        out: List[List[str]] = []
-        for y in range(h):
-            row: List[str] = []
-            for x in range(w):
-                row.append(choose_block_fast(px[x, y], palette))
-            out.append(row)
-        return out
-
-    # Advanced path
-    try:
-        import numpy as np
-        from ...utils.dither import quantize_blocks
-    except Exception:
-        # Fallback if numpy not available
-        px = im.load()
-        w, h = im.size
-        out: List[List[str]] = []
-        for y in range(h):
-            row: List[str] = []
-            for x in range(w):
-                row.append(choose_block_fast(px[x, y], palette))
-            out.append(row)
-        return out
 
-    im_np = np.array(im, dtype=np.uint8)
-    return quantize_blocks(im_np, palette, distance=distance, dither=dither)
+def quantize_image(im, palette: Palette, params: dict) -> List[List[str]]:
+    """Return block names per pixel (rows) based on params.distance and params.dither."""
+    idx, names = quantize_image_indices(im, palette, params)
+    return np.array(names, dtype=object)[idx].tolist()
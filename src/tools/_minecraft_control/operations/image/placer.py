@@ -1,10 +1,12 @@
 """
 Placement and command generation for image rendering.
 """
-from typing import Dict, Tuple, List
+from typing import List, Sequence, Tuple
+
+import numpy as np
 
 from ...utils import CommandBuilder
-from .._model_import.compress import rle_fill_commands
+from .._model_import.compress import greedy_box_fill_commands, rle_fill_commands_arrays
 from .._model_import.placement import build_clear_area_commands
 
 
@@ -47,8 +49,23 @@ def compute_world_coords(mode: str, w: int, h: int, base_x: int, base_y: int, ba
         return start_x, start_y, None, start_z
 
 
-def blocks_to_commands(by_yz: Dict[Tuple[int, int], List[Tuple[int, str]]], clear_area: bool, mode: str,
-                       start_x: int, start_y: int, w: int, h: int, base_z: int, fixed_z: int | None, start_z: int | None) -> List[str]:
+def pixel_world_coords(mode: str, w: int, h: int, start_x: int, start_y: int, base_z: int,
+                       fixed_z: int | None, start_z: int | None) -> np.ndarray:
+    """World (x, y, z) of every pixel, row-major (H*W, 3). Row 0 is the image top."""
+    ys, xs = np.divmod(np.arange(h * w, dtype=np.int64), w)
+    wx = start_x + xs
+    if mode == 'wall':
+        wy = start_y + (h - 1 - ys)
+        wz = np.full_like(xs, fixed_z if fixed_z is not None else base_z)
+    else:
+        wy = np.full_like(xs, start_y)
+        wz = (start_z if start_z is not None else base_z) + ys
+    return np.column_stack((wx, wy, wz))
+
+
+def blocks_to_commands(coords: np.ndarray, block_ids: np.ndarray, names: Sequence[str], clear_area: bool, mode: str,
+                       start_x: int, start_y: int, w: int, h: int, base_z: int, fixed_z: int | None, start_z: int | None,
+                       compression: str = 'greedy') -> List[str]:
     commands: List[str] = []
     if clear_area:
         if mode == 'wall':
@@ -66,5 +83,6 @@ def blocks_to_commands(by_yz: Dict[Tuple[int, int], List[Tuple[int, str]]], clea
         world_bounds = (min_x, max_x, min_z, max_z, min_y, max_y)
         commands += build_clear_area_commands(world_bounds, CommandBuilder, lambda a, b: [(a, b)])
 
-    commands += rle_fill_commands(by_yz, CommandBuilder)
+    compress = rle_fill_commands_arrays if compression == 'rle' else greedy_box_fill_commands
+    commands += compress(coords, block_ids, names, CommandBuilder)
     return commands
@@ -1,15 +1,14 @@
 """
-Import 3D model operation (voxelized → blocks → compressed /fill)
+Import 3D model operation (voxelized → blocks → greedy-box /fill)
 """
 import logging
 import time
-from collections import defaultdict
 from ..voxel import load_3d_model, voxelize_model, map_voxels_to_blocks
 from ..utils import CommandBuilder, chunk_blocks
-from ._model_import.orientation import decide_orientation, orient_coord, apply_orientation
+from ._model_import.orientation import decide_orientation, apply_orientation
 from ._model_import.fit import fit_scale_from_bounds
 from ._model_import.placement import compute_oriented_bounds, compute_anchor_mappings, build_clear_area_commands
-from ._model_import.compress import rle_fill_commands
+from ._model_import.compress import rle_fill_commands_arrays, greedy_box_fill_commands
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +26,7 @@ def import_3d_model_op(params: dict, rcon, context: dict) -> dict:
     densify = bool(params.get('densify', False))
     clear_area = bool(params.get('clear_area', False))
     target_height = params.get('target_height')
+    compression = params.get('compression', 'greedy')  # greedy | rle
 
     try:
         start_time = time.time()
@@ -69,14 +69,7 @@ def import_3d_model_op(params: dict, rcon, context: dict) -> dict:
 
         # 6) Densify (optional & single)
         if mapping == 'single' and densify:
-            by_column = defaultdict(list)
-            for (x, y, z) in oriented.keys():
-                by_column[(x, z)].append(y)
-            for (x, z), ys in by_column.items():
-                y_min, y_max = min(ys), max(ys)
-                blk = next((oriented[(x, y, z)] for y in ys for (xx, yy, zz) in [(x, y, z)] if (x, y, z) in oriented), 'stone')
-                for y in range(y_min, y_max + 1):
-                    oriented[(x, y, z)] = blk
+            oriented = oriented.densify_columns()
 
         # 7) Anchoring & world mapping
         bounds = compute_oriented_bounds(oriented)
@@ -88,15 +81,12 @@ def import_3d_model_op(params: dict, rcon, context: dict) -> dict:
             logger.info("Clearing world-aligned bounding box with air before build")
             commands += build_clear_area_commands(world_bounds, CommandBuilder, chunk_blocks)
 
-        # 9) Build /fill commands per layer (bottom-up)
-        by_yz = defaultdict(list)  # (wy,wz)->[(wx, block)]
-        for (x, y, z), blk in oriented.items():
-            wx = x_world(x)
-            wy = y_base + y_diff(y)
-            wz = z_world(z)
-            by_yz[(wy, wz)].append((wx, blk))
-
-        commands += rle_fill_commands(by_yz, CommandBuilder)
+        # 9) Build /fill commands (bottom-up); anchor mappings are pure translations
+        world = oriented.translated((x_world(0), y_base + y_diff(0), z_world(0)))
+        compress = rle_fill_commands_arrays if compression == 'rle' else greedy_box_fill_commands
+        fill_commands = compress(world.coords, world.block_ids, world.block_names, CommandBuilder)
+        logger.info(f"Compressed {len(world)} blocks into {len(fill_commands)} /fill commands ({compression})")
+        commands += fill_commands
 
         # Cap & execute
         MAX_CMDS = 50000
@@ -104,9 +94,10 @@ def import_3d_model_op(params: dict, rcon, context: dict) -> dict:
             logger.warning(f"Command cap reached ({len(commands)}), truncating to {MAX_CMDS}")
             commands = commands[:MAX_CMDS]
 
-        delay = int(params.get('delay_ms', 50) or 50)
-        logger.info(f"Placing {len(commands)} /fill commands (delay={delay}ms) bottom-up")
+        delay = int(params.get('delay_ms') or 0)
+        logger.info(f"Placing {len(commands)} /fill commands ({f'delay={delay}ms' if delay else 'adaptive rate'}) bottom-up")
         results = rcon.execute_batch(commands, delay_ms=delay)
+        stats = getattr(rcon, 'last_batch_stats', None) or {}
         executed = sum(1 for r in results if r['success'])
         failed = len(commands) - executed
         elapsed = (time.time() - start_time) * 1000
@@ -121,6 +112,8 @@ def import_3d_model_op(params: dict, rcon, context: dict) -> dict:
             "voxels_count": len(voxel_grid),
             "blocks_mapped": len(oriented),
             "fill_commands": len(commands),
+            "compression": compression,
+            "compression_ratio": round(len(oriented) / max(len(fill_commands), 1), 2),
             "executed_count": executed,
             "failed_count": failed,
             "scale": scale,
@@ -131,6 +124,7 @@ def import_3d_model_op(params: dict, rcon, context: dict) -> dict:
             "anchor": anchor,
             "anchor_xz": anchor_xz,
             "time_ms": elapsed,
+            "commands_per_sec": stats.get('commands_per_sec'),
             "warnings": warnings
         }
 
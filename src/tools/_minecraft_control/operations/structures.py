@@ -57,7 +57,7 @@ def build_structure_op(params: dict, rcon, context: dict) -> dict:
         
         # Execute batch with throttling
         logger.info(f"Executing {len(commands)} fill commands")
-        results = rcon.execute_batch(commands, delay_ms=params.get('delay_ms', 50))
+        results = rcon.execute_batch(commands, delay_ms=params.get('delay_ms'))
         
         # Calculate blocks placed
         successful_chunks = sum(1 for r in results if r['success'])
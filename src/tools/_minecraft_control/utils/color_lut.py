@@ -0,0 +1,96 @@
+"""
+Palette lookup tables: exact nearest palette entry for every 24-bit RGB color.
+
+A table holds one slot per RGB value (16 MB) and is filled lazily: each call only
+computes distances for colors never seen before, so repeated renders with the same
+palette/metric are pure array indexing. The last _CACHED_LUTS tables are kept per
+(palette, distance), so cached tables never hold more than _CACHED_LUTS × 16 MB.
+"""
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+RGB = Tuple[int, int, int]
+
+_UNSET = 255  # slot not computed yet (palettes are limited to 255 entries)
+_CHUNK = 65536  # new colors per distance batch (bounds the (chunk, P) temporaries)
+_CACHED_LUTS = 2  # one render uses one palette/metric; 16 MB each
+
+
+def pack_rgb(rgb: np.ndarray) -> np.ndarray:
+    """(..., 3) uint8 → (...) int32 key 0xRRGGBB."""
+    c = rgb.astype(np.int32)
+    return (c[..., 0] << 16) | (c[..., 1] << 8) | c[..., 2]
+
+
+def unpack_rgb(keys: np.ndarray) -> np.ndarray:
+    k = keys.astype(np.int32)
+    return np.stack(((k >> 16) & 0xFF, (k >> 8) & 0xFF, k & 0xFF), axis=-1)
+
+
+class PaletteLUT:
+    """Nearest-color table for one palette and one distance metric ('rgb' | 'lab').
+
+    Ties go to the first palette entry, like a linear scan.
+    """
+
+    def __init__(self, items: Tuple[Tuple[str, RGB], ...], distance: str = "rgb"):
+        if len(items) >= _UNSET:
+            raise ValueError(f"palette too large for lookup table ({len(items)} entries)")
+        self.names: List[str] = [n for n, _ in items]
+        self.rgb = np.array([c for _, c in items], dtype=np.float64).reshape(-1, 3)
+        self.distance = distance
+        self._space = self._to_space(self.rgb)
+        self._norm2 = (self._space ** 2).sum(axis=1)
+        self._table = np.full(1 << 24, _UNSET, dtype=np.uint8)
+        self._lock = Lock()
+        self.filled = 0
+
+    def _to_space(self, rgb: np.ndarray) -> np.ndarray:
+        if self.distance == "lab":
+            from .dither import rgb_to_lab
+            return rgb_to_lab(rgb)
+        return rgb.astype(np.float64)
+
+    def nearest(self, rgb: np.ndarray) -> np.ndarray:
+        """Direct nearest search for (N, 3) float colors (values outside 0..255 allowed for RGB)."""
+        pts = np.asarray(rgb, dtype=np.float64).reshape(-1, 3)
+        if self.distance == "lab":
+            pts = np.clip(pts, 0.0, 255.0)
+        pts = self._to_space(pts)
+        # |p - c|^2 = |p|^2 - 2 p.c + |c|^2; |p|^2 does not change the argmin
+        d2 = self._norm2[None, :] - 2.0 * (pts @ self._space.T)
+        return d2.argmin(axis=1).astype(np.uint8)
+
+    def _fill(self, keys: np.ndarray) -> None:
+        for off in range(0, len(keys), _CHUNK):
+            k = keys[off:off + _CHUNK]
+            self._table[k] = self.nearest(unpack_rgb(k))
+        self.filled += len(keys)
+
+    def lookup(self, rgb: np.ndarray) -> np.ndarray:
+        """(..., 3) uint8 colors → (...) uint8 palette indices."""
+        keys = pack_rgb(np.asarray(rgb, dtype=np.uint8))
+        idx = self._table[keys]
+        missing = idx == _UNSET
+        if missing.any():
+            with self._lock:
+                new = np.unique(keys[missing])
+                new = new[self._table[new] == _UNSET]
+                if len(new):
+                    self._fill(new)
+            idx = self._table[keys]
+        return idx
+
+
+@lru_cache(maxsize=_CACHED_LUTS)
+def _cached_lut(items: Tuple[Tuple[str, RGB], ...], distance: str) -> PaletteLUT:
+    return PaletteLUT(items, distance)
+
+
+def get_lut(palette: Dict[str, RGB], distance: str = "rgb") -> PaletteLUT:
+    """Shared table for this palette/metric (insertion order matters for ties)."""
+    items = tuple((n, tuple(int(v) for v in c)) for n, c in palette.items())
+    return _cached_lut(items, "lab" if distance == "lab" else "rgb")
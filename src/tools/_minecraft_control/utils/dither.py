@@ -4,6 +4,8 @@ Image quantization utilities: palette selection, Lab distance, and optional Floy
 from typing import Dict, Tuple, List
 import numpy as np
 
+from .color_lut import PaletteLUT, get_lut
+
 RGB = Tuple[int, int, int]
 Palette = Dict[str, RGB]
 
@@ -68,6 +70,56 @@ def nearest_palette_index_lab(px: np.ndarray, pal_lab: np.ndarray) -> np.ndarray
 
 # --- Quantization with optional Floyd–Steinberg dithering ---
 
+def _floyd_steinberg(image_rgb: np.ndarray, lut: PaletteLUT) -> np.ndarray:
+    """Floyd–Steinberg in raster order, vectorized over anti-diagonal wavefronts.
+
+    Pixel (y, x) only receives error from (y, x-1) and (y-1, x-1..x+1), all of which
+    lie on earlier wavefronts t' = x' + 2*y' < t, so every pixel of a wavefront can be
+    quantized at once with the same result as the sequential scan.
+    """
+    h, w, _ = image_rgb.shape
+    work = image_rgb.astype(np.float64)
+    idx = np.empty((h, w), dtype=np.uint8)
+    pal = lut.rgb
+    for t in range(w + 2 * (h - 1)):
+        ys = np.arange(max(0, (t - w + 2) // 2), min(h - 1, t // 2) + 1)
+        xs = t - 2 * ys
+        current = work[ys, xs]
+        # Accumulated error pushes values off the 8-bit grid: exact search, not the table
+        q = lut.nearest(current)
+        idx[ys, xs] = q
+        err = current - pal[q]
+        # Distribute error (3/16 down-left, 5/16 down, 1/16 down-right, 7/16 right);
+        # right goes last so each pixel sums its error terms in raster-scan order
+        down = ys + 1 < h
+        m = down & (xs > 0)
+        work[ys[m] + 1, xs[m] - 1] += err[m] * (3 / 16)
+        work[ys[down] + 1, xs[down]] += err[down] * (5 / 16)
+        m = down & (xs + 1 < w)
+        work[ys[m] + 1, xs[m] + 1] += err[m] * (1 / 16)
+        m = xs + 1 < w
+        work[ys[m], xs[m] + 1] += err[m] * (7 / 16)
+    return idx
+
+
+def quantize_indices(
+    image_rgb: np.ndarray,
+    palette: Palette,
+    distance: str = "rgb",
+    dither: bool = False,
+) -> Tuple[np.ndarray, List[str]]:
+    """Return (HxW uint8 palette indices, block names) for an HxWx3 image.
+
+    Nearest colors come from the shared lookup table of this palette/metric.
+    """
+    if image_rgb.dtype != np.uint8:
+        image_rgb = image_rgb.astype(np.uint8)
+    lut = get_lut(palette, distance)
+    if dither and image_rgb.size:
+        return _floyd_steinberg(image_rgb, lut), lut.names
+    return lut.lookup(image_rgb), lut.names
+
+
 def quantize_blocks(
     image_rgb: np.ndarray,
     palette: Palette,
@@ -80,59 +132,6 @@ def quantize_blocks(
     distance: 'rgb' | 'lab'
     dither: Floyd–Steinberg error diffusion if True
     """
-    if image_rgb.dtype != np.uint8:
-        image_rgb = image_rgb.astype(np.uint8)
-
-    # Build palette arrays
-    block_names = list(palette.keys())
-    pal_rgb = np.array([palette[n] for n in block_names], dtype=np.float64)
-
-    if distance == "lab":
-        pal_lab = rgb_to_lab(pal_rgb)
-
-    h, w, _ = image_rgb.shape
-
-    if not dither:
-        # Vectorized nearest for speed
-        if distance == "lab":
-            px_lab = rgb_to_lab(image_rgb.reshape(-1, 3)).reshape(h, w, 3)
-            idx = nearest_palette_index_lab(px_lab, pal_lab)
-        else:
-            idx = nearest_palette_index_rgb(image_rgb, pal_rgb)
-        return [[block_names[idx[y, x]] for x in range(w)] for y in range(h)]
-
-    # Dithered path (Floyd–Steinberg)
-    work = image_rgb.astype(np.float64)
-    for y in range(h):
-        # Left-to-right pass
-        for x in range(w):
-            current = work[y, x]
-            if distance == "lab":
-                curr_lab = rgb_to_lab(current.reshape(1, 3)).reshape(3)
-                diffs = curr_lab[None, :] - pal_lab
-                d2 = np.sum(diffs * diffs, axis=1)
-                i = int(np.argmin(d2))
-            else:
-                diffs = current[None, :] - pal_rgb
-                d2 = np.sum(diffs * diffs, axis=1)
-                i = int(np.argmin(d2))
-            target = pal_rgb[i]
-            err = current - target
-            work[y, x] = target
-            # Distribute error
-            if x + 1 < w:
-                work[y, x + 1] += err * (7 / 16)
-            if y + 1 < h:
-                if x > 0:
-                    work[y + 1, x - 1] += err * (3 / 16)
-                work[y + 1, x] += err * (5 / 16)
-                if x + 1 < w:
-                    work[y + 1, x + 1] += err * (1 / 16)
-    work = np.clip(work, 0, 255).astype(np.uint8)
-    # Final nearest mapping to block names
-    if distance == "lab":
-        px_lab = rgb_to_lab(work.reshape(-1, 3)).reshape(h, w, 3)
-        idx = nearest_palette_index_lab(px_lab, pal_lab)
-    else:
-        idx = nearest_palette_index_rgb(work, pal_rgb)
-    return [[block_names[idx[y, x]] for x in range(w)] for y in range(h)]
+    idx, names = quantize_indices(image_rgb, palette, distance=distance, dither=dither)
+    lookup = np.array(names, dtype=object)
+    return lookup[idx].tolist()
@@ -2,11 +2,14 @@
 Voxel package (3D model processing)
 """
 from .voxelizer import voxelize_model, load_3d_model
-from .block_mapper import map_voxels_to_blocks, BLOCK_COLOR_PALETTE
+from .block_mapper import map_voxels_to_blocks, nearest_palette_indices, BLOCK_COLOR_PALETTE
+from .grid import VoxelGrid
 
 __all__ = [
     'voxelize_model',
     'load_3d_model',
     'map_voxels_to_blocks',
+    'nearest_palette_indices',
+    'VoxelGrid',
     'BLOCK_COLOR_PALETTE'
 ]
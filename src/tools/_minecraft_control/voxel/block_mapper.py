@@ -3,6 +3,12 @@ Block color palette and voxel-to-block mapping (extended for high-contrast image
 """
 import logging
 import math
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .grid import VoxelGrid
+from ..utils.color_lut import get_lut
 
 logger = logging.getLogger(__name__)
 
@@ -67,34 +73,41 @@ BLOCK_COLOR_PALETTE = {
 }
 
 
-def map_voxels_to_blocks(voxel_grid: dict, mapping_mode: str = "auto") -> dict:
+def nearest_palette_indices(colors, palette: Optional[Dict[str, Tuple[int, int, int]]] = None) -> Tuple[np.ndarray, List[str]]:
+    """Batch nearest-color lookup (Euclidean RGB, first palette entry wins ties).
+
+    Uses the shared per-palette lookup table, so repeated colors cost one index each.
+
+    Returns:
+        (indices (N,) int16 into names, names)
+    """
+    lut = get_lut(palette or BLOCK_COLOR_PALETTE, "rgb")
+    cols = np.asarray(colors, dtype=np.uint8).reshape(-1, 3)
+    return lut.lookup(cols).astype(np.int16), lut.names
+
+
+def map_voxels_to_blocks(voxel_grid: Union[VoxelGrid, dict], mapping_mode: str = "auto") -> Union[VoxelGrid, dict]:
     """Map voxel grid to Minecraft blocks.
 
     Args:
-        voxel_grid: Dict {(x,y,z): color_rgb_tuple}
+        voxel_grid: VoxelGrid, or legacy dict {(x,y,z): color_rgb_tuple}
         mapping_mode: "auto", "color", or "single"
 
     Returns:
-        Dict {(x,y,z): "block_type"}
+        VoxelGrid with block_ids set (same type as input: dict {(x,y,z): "block_type"} for dicts)
     """
+    if isinstance(voxel_grid, dict):
+        return map_voxels_to_blocks(VoxelGrid.from_dict(voxel_grid), mapping_mode).to_dict()
+
     if mapping_mode == "single":
         # Single block type for all voxels
-        return {pos: "stone" for pos in voxel_grid}
+        return voxel_grid.with_blocks(np.zeros(len(voxel_grid), dtype=np.int16), ["stone"])
 
     # Color-based mapping (choose closest block color in palette)
-    block_map = {}
-    color_cache = {}  # Cache color matches
-
-    for pos, color in voxel_grid.items():
-        if color in color_cache:
-            block_map[pos] = color_cache[color]
-        else:
-            block_type = find_closest_block(color)
-            color_cache[color] = block_type
-            block_map[pos] = block_type
-
-    logger.info(f"Mapped {len(block_map)} voxels to {len(set(block_map.values()))} unique blocks")
-    return block_map
+    ids, names = nearest_palette_indices(voxel_grid.colors)
+    mapped = voxel_grid.with_blocks(ids, names)
+    logger.info(f"Mapped {len(mapped)} voxels to {mapped.unique_blocks()} unique blocks")
+    return mapped
 
 
 def find_closest_block(rgb: tuple) -> str:
@@ -0,0 +1,116 @@
+"""
+Array-backed voxel grid: coordinates, colors and block ids kept as NumPy arrays.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+Bounds = Tuple[int, int, int, int, int, int]  # (min_x, min_y, min_z, max_x, max_y, max_z)
+
+_GRAY = (128, 128, 128)
+
+
+class VoxelGrid:
+    """Sparse voxel set stored column-wise.
+
+    coords:   (N, 3) int32 voxel indices (x, y, z), unique
+    colors:   (N, 3) uint8 RGB
+    block_ids: (N,) int16 indices into `block_names`, or None before mapping
+    """
+
+    def __init__(self, coords, colors=None, block_ids=None, block_names: Optional[List[str]] = None):
+        self.coords = np.asarray(coords, dtype=np.int32).reshape(-1, 3)
+        n = len(self.coords)
+        if colors is None:
+            colors = np.tile(np.array(_GRAY, dtype=np.uint8), (n, 1))
+        self.colors = np.asarray(colors, dtype=np.uint8).reshape(-1, 3)
+        self.block_ids = None if block_ids is None else np.asarray(block_ids, dtype=np.int16)
+        self.block_names: List[str] = list(block_names or [])
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def __bool__(self) -> bool:
+        return len(self.coords) > 0
+
+    # ---- conversions (dict API kept for callers of the old format) ----
+
+    @classmethod
+    def from_dict(cls, voxels: Dict[Tuple[int, int, int], tuple]) -> "VoxelGrid":
+        """Build from {(x,y,z): (r,g,b)} or {(x,y,z): "block"}."""
+        if not voxels:
+            return cls(np.empty((0, 3), dtype=np.int32))
+        coords = np.array(list(voxels.keys()), dtype=np.int32)
+        values = list(voxels.values())
+        if isinstance(values[0], str):
+            names, ids = np.unique(np.array(values), return_inverse=True)
+            return cls(coords, block_ids=ids, block_names=names.tolist())
+        return cls(coords, colors=np.array(values, dtype=np.uint8))
+
+    def to_dict(self) -> Dict[Tuple[int, int, int], object]:
+        """{(x,y,z): "block"} once mapped, else {(x,y,z): (r,g,b)}."""
+        keys = map(tuple, self.coords.tolist())
+        if self.block_ids is not None:
+            names = self.block_names
+            return {k: names[i] for k, i in zip(keys, self.block_ids.tolist())}
+        return {k: tuple(c) for k, c in zip(keys, self.colors.tolist())}
+
+    def with_blocks(self, block_ids, block_names: List[str]) -> "VoxelGrid":
+        return VoxelGrid(self.coords, self.colors, block_ids, block_names)
+
+    # ---- geometry ----
+
+    def bounds(self) -> Bounds:
+        lo = self.coords.min(axis=0)
+        hi = self.coords.max(axis=0)
+        return (int(lo[0]), int(lo[1]), int(lo[2]), int(hi[0]), int(hi[1]), int(hi[2]))
+
+    def spans(self) -> np.ndarray:
+        if not len(self.coords):
+            return np.zeros(3, dtype=np.int64)
+        return self.coords.max(axis=0).astype(np.int64) - self.coords.min(axis=0)
+
+    def swap_yz(self) -> "VoxelGrid":
+        """Map z-up indices to y-up."""
+        return VoxelGrid(self.coords[:, [0, 2, 1]], self.colors, self.block_ids, self.block_names)
+
+    def translated(self, offset) -> "VoxelGrid":
+        off = np.asarray(offset, dtype=np.int32).reshape(1, 3)
+        return VoxelGrid(self.coords + off, self.colors, self.block_ids, self.block_names)
+
+    def densify_columns(self) -> "VoxelGrid":
+        """Fill vertical gaps inside each (x, z) column with the column's lowest voxel."""
+        n = len(self.coords)
+        if n == 0:
+            return self
+        x, y, z = self.coords[:, 0], self.coords[:, 1], self.coords[:, 2]
+        order = np.lexsort((y, z, x))
+        xs, ys, zs = x[order], y[order], z[order]
+        new_col = np.ones(n, dtype=bool)
+        new_col[1:] = (xs[1:] != xs[:-1]) | (zs[1:] != zs[:-1])
+        first = np.flatnonzero(new_col)
+        last = np.append(first[1:], n) - 1
+        y_lo, y_hi = ys[first], ys[last]
+        heights = (y_hi - y_lo + 1).astype(np.int64)
+        col = np.repeat(np.arange(len(first)), heights)
+        step = np.arange(int(heights.sum())) - np.repeat(np.cumsum(heights) - heights, heights)
+        src = order[first][col]
+        coords = np.column_stack((xs[first][col], y_lo[col] + step, zs[first][col])).astype(np.int32)
+        block_ids = None if self.block_ids is None else self.block_ids[src]
+        return VoxelGrid(coords, self.colors[src], block_ids, self.block_names)
+
+    def dense_ids(self) -> Tuple[np.ndarray, Tuple[int, int, int]]:
+        """Dense int16 block-id volume indexed [y, z, x] (-1 = empty) and its (x, y, z) origin."""
+        if self.block_ids is None:
+            raise ValueError("voxel grid has no block ids (map palette first)")
+        lo = self.coords.min(axis=0)
+        rel = self.coords - lo
+        size = rel.max(axis=0) + 1
+        vol = np.full((int(size[1]), int(size[2]), int(size[0])), -1, dtype=np.int16)
+        vol[rel[:, 1], rel[:, 2], rel[:, 0]] = self.block_ids
+        return vol, (int(lo[0]), int(lo[1]), int(lo[2]))
+
+    def unique_blocks(self) -> int:
+        if self.block_ids is None or not len(self.block_ids):
+            return 0
+        return int(len(np.unique(self.block_ids)))
@@ -4,6 +4,7 @@
 import logging
 import os
 from ..config import MODELS_DIR, ALLOWED_MODEL_EXTENSIONS
+from .grid import VoxelGrid
 
 logger = logging.getLogger(__name__)
 # Silence verbose trimesh debug logs
@@ -164,15 +165,31 @@ def _precompute_face_colors(mesh):
 # Voxelization (fast path using trimesh.voxelized)
 # --------------------------
 
-def voxelize_model(mesh, resolution: float = 1.0, scale: float = 1.0) -> dict:
+_FALLBACK_MAX_VOXELS = 50000
+_BATCH = 8192
+
+
+def _colors_at(mesh, face_cols, world_pts):
+    """Batch color lookup: snap points to their nearest face (one closest_point call)."""
+    import numpy as np
+    n = len(world_pts)
+    if face_cols is None or n == 0:
+        return np.full((n, 3), 128, dtype=np.uint8)
+    from trimesh.proximity import closest_point
+    _, _, fids = closest_point(mesh, world_pts)
+    fids = np.clip(np.asarray(fids, dtype=np.int64), 0, len(face_cols) - 1)
+    return np.asarray(face_cols, dtype=np.uint8)[fids]
+
+
+def voxelize_model(mesh, resolution: float = 1.0, scale: float = 1.0) -> VoxelGrid:
     """Voxelize 3D mesh quickly using trimesh.voxelized.
 
     Returns:
-        Dict {(x, y, z): (r, g, b)} - voxel indices with colors
+        VoxelGrid - voxel indices (N, 3) with per-voxel colors (N, 3);
+        use `.to_dict()` for the legacy {(x, y, z): (r, g, b)} form
     """
     try:
         import numpy as np
-        from trimesh.proximity import closest_point
     except ImportError:
         raise ImportError("numpy required for voxelization")
 
@@ -191,33 +208,17 @@ def voxelize_model(mesh, resolution: float = 1.0, scale: float = 1.0) -> dict:
         if idx is None:
             mat = vg.matrix.astype(bool)
             idx = np.argwhere(mat)
-        voxel_dict: dict[tuple[int,int,int], tuple[int,int,int]] = {}
-
-        # Build world points for all voxels
-        if idx is not None and len(idx) > 0:
-            if origin is not None:
-                world_pts = origin + (idx + 0.5) * pitch
-            else:
-                bounds = mesh.bounds
-                min_bound = bounds[0]
-                world_pts = min_bound + (idx + 0.5) * resolution
-
-            # If we have face colors, snap each point to nearest face and assign its color
-            if face_cols is not None:
-                pts, dist, fids = closest_point(mesh, world_pts)
-                # Clamp face ids
-                fids = np.clip(fids, 0, len(face_cols) - 1)
-                colors = face_cols[fids]
-                for (vx, vy, vz), col in zip(idx, colors):
-                    voxel_dict[(int(vx), int(vy), int(vz))] = (int(col[0]), int(col[1]), int(col[2]))
-            else:
-                # Fallback grayscale
-                for i in idx:
-                    vx, vy, vz = int(i[0]), int(i[1]), int(i[2])
-                    voxel_dict[(vx, vy, vz)] = (128, 128, 128)
-
-        logger.info(f"Generated {len(voxel_dict)} voxels (fast voxelizer)")
-        return voxel_dict
+        idx = np.asarray(idx, dtype=np.int64).reshape(-1, 3)
+
+        # World points for all voxels, colored in one batch
+        if origin is not None:
+            world_pts = origin + (idx + 0.5) * pitch
+        else:
+            world_pts = mesh.bounds[0] + (idx + 0.5) * resolution
+        grid = VoxelGrid(idx, _colors_at(mesh, face_cols, world_pts))
+
+        logger.info(f"Generated {len(grid)} voxels (fast voxelizer)")
+        return grid
     except Exception as e:
         logger.warning(f"Fast voxelizer failed ({e}), falling back to batched contains()")
 
@@ -226,75 +227,44 @@ def voxelize_model(mesh, resolution: float = 1.0, scale: float = 1.0) -> dict:
     min_bound = bounds[0]
     max_bound = bounds[1]
     dims = (max_bound - min_bound) / max(resolution, 1e-6)
-    grid_dims = np.ceil(dims).astype(int)
+    grid_dims = np.maximum(np.ceil(dims).astype(int), 1)
 
     logger.info(f"Voxel grid dimensions: {grid_dims} (resolution={resolution})")
 
-    max_voxels = 50000
     total_voxels = int(grid_dims[0] * grid_dims[1] * grid_dims[2])
 
-    if total_voxels > max_voxels:
-        logger.warning(f"Voxel count {total_voxels} exceeds limit {max_voxels}, truncating by adjusting resolution")
-        scale_factor = (max_voxels / max(total_voxels, 1)) ** (1/3)
+    if total_voxels > _FALLBACK_MAX_VOXELS:
+        logger.warning(f"Voxel count {total_voxels} exceeds limit {_FALLBACK_MAX_VOXELS}, truncating by adjusting resolution")
+        scale_factor = (_FALLBACK_MAX_VOXELS / max(total_voxels, 1)) ** (1/3)
         resolution = resolution / max(scale_factor, 1e-6)
         dims = (max_bound - min_bound) / resolution
-        grid_dims = np.ceil(dims).astype(int)
+        grid_dims = np.maximum(np.ceil(dims).astype(int), 1)
         total_voxels = int(grid_dims[0] * grid_dims[1] * grid_dims[2])
         logger.info(f"Adjusted resolution: {resolution:.3f}, new grid: {grid_dims}")
 
-    voxel_dict: dict[tuple[int, int, int], tuple[int, int, int]] = {}
-
-    BATCH = 8192
-    points: list = []
-    coords: list = []
-
-    processed = 0
-    next_pct = 5
-
-    def maybe_log_progress():
-        nonlocal next_pct
-        if total_voxels <= 0:
-            return
-        pct = int(processed * 100 / total_voxels)
-        while pct >= next_pct and next_pct <= 100:
-            logger.info(f"Voxelization progress: {next_pct}% ({processed}/{total_voxels})")
-            next_pct += 5
-
-    # Precompute colors if available
-    import numpy as np  # ensure available here
-    has_face = face_cols is not None
-
-    def color_for_point(pt):
-        if has_face:
-            from trimesh.proximity import closest_point
-            _, _, fid = closest_point(mesh, pt.reshape(1, 3))
-            fid = int(max(0, min(int(fid[0]), len(face_cols) - 1)))
-            col = face_cols[fid]
-            return (int(col[0]), int(col[1]), int(col[2]))
-        return (128, 128, 128)
-
-    for x in range(int(grid_dims[0])):
-        for y in range(int(grid_dims[1])):
-            for z in range(int(grid_dims[2])):
-                world_pos = min_bound + (np.array([x + 0.5, y + 0.5, z + 0.5]) * resolution)
-                points.append(world_pos)
-                coords.append((x, y, z))
-                if len(points) >= BATCH:
-                    # Assign colors
-                    for (cx, cy, cz), pt in zip(coords, points):
-                        voxel_dict[(int(cx), int(cy), int(cz))] = color_for_point(pt)
-                    processed += len(coords)
-                    points = []
-                    coords = []
-                    maybe_log_progress()
-    # Flush remaining
-    for (cx, cy, cz), pt in zip(coords, points):
-        voxel_dict[(int(cx), int(cy), int(cz))] = color_for_point(pt)
-    processed += len(coords)
-
-    logger.info(f"Voxelization progress: 100% ({processed}/{total_voxels})")
-    logger.info(f"Generated {len(voxel_dict)} voxels (fallback)")
-    return voxel_dict
+    # All cell centers at once, x-major like the old triple loop
+    idx = np.indices(tuple(int(d) for d in grid_dims)).reshape(3, -1).T
+    world_pts = min_bound + (idx + 0.5) * resolution
+
+    # Keep only cells inside the mesh; meshes without a usable inside test keep the whole grid
+    keep = np.ones(len(idx), dtype=bool)
+    try:
+        next_pct = 5
+        for off in range(0, len(idx), _BATCH):
+            keep[off:off + _BATCH] = mesh.contains(world_pts[off:off + _BATCH])
+            pct = int(min(off + _BATCH, total_voxels) * 100 / max(total_voxels, 1))
+            while pct >= next_pct and next_pct <= 100:
+                logger.info(f"Voxelization progress: {next_pct}% ({min(off + _BATCH, total_voxels)}/{total_voxels})")
+                next_pct += 5
+        if not keep.any():
+            keep[:] = True
+    except Exception as e:
+        logger.warning(f"contains() unavailable ({e}), keeping every grid cell")
+        keep[:] = True
+
+    grid = VoxelGrid(idx[keep], _colors_at(mesh, face_cols, world_pts[keep]))
+    logger.info(f"Generated {len(grid)} voxels (fallback)")
+    return grid
 
 
 def _get_voxel_color(mesh, point) -> tuple:
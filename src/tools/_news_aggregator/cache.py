@@ -0,0 +1,64 @@
+"""Short-lived cache of normalized provider results.
+
+Keyed by (provider, method, query parameters), so repeated or paginated-again searches
+from agents skip the provider call and the normalization step. Provider results that
+arrive after their deadline are still stored, so the next identical call is complete.
+
+Environment:
+    NEWS_AGGREGATOR_CACHE_TTL   seconds a provider result is reused (default: 120, 0 disables)
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+MAX_ENTRIES = 256
+
+
+def _ttl() -> float:
+    try:
+        return float(os.getenv("NEWS_AGGREGATOR_CACHE_TTL", "") or 120)
+    except ValueError:
+        return 120.0
+
+
+def cache_key(provider: str, method: str, kwargs: Dict[str, Any]) -> str:
+    return json.dumps([provider, method, kwargs], sort_keys=True, default=str)
+
+
+class ResultCache:
+    """TTL + LRU map of successful provider results."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        ttl = _ttl()
+        if ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if time.time() - stored_at > ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return {**result, "articles": list(result["articles"]), "cached": True}
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        if _ttl() <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.time(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+result_cache = ResultCache()
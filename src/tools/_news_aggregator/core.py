@@ -1,6 +1,9 @@
 """Core handlers for news aggregator operations."""
-from typing import Dict, Any, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+import time
+from typing import Dict, Any, Iterator, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from .cache import cache_key, result_cache
 from .providers.newsapi_client import NewsAPIClient
 from .providers.nyt_client import NYTClient
 from .providers.guardian_client import GuardianClient
@@ -9,7 +12,8 @@ from .validators import (
     validate_country_required,
     validate_limit,
     validate_page,
-    validate_date_format
+    validate_date_format,
+    validate_provider_timeout
 )
 from .utils import (
     get_available_providers,
@@ -25,32 +29,64 @@ newsapi_client = NewsAPIClient()
 nyt_client = NYTClient()
 guardian_client = GuardianClient()
 
+# Seconds to wait for each provider before answering without it
+# (NYT allows 5 calls/min, so its calls may queue behind the shared rate limit)
+PROVIDER_TIMEOUTS = {"newsapi": 20.0, "nyt": 25.0, "guardian": 20.0}
+
+
+def _want_flag(value: Any) -> bool:
+    return bool(value) and str(value).lower() not in {"false", "0", "no", "off"}
+
+
+def _provider_timeout(provider_name: str, override: Optional[float]) -> float:
+    if override:
+        return float(override)
+    env = os.getenv("NEWS_AGGREGATOR_PROVIDER_TIMEOUT_SEC")
+    if env:
+        try:
+            return float(env)
+        except ValueError:
+            pass
+    return PROVIDER_TIMEOUTS.get(provider_name, 20.0)
+
+
+def _normalized_result(provider_name: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Cacheable per-provider result from a successful client response."""
+    articles = result.get("articles", [])
+    normalized = [normalize_article(a, provider_name) for a in articles]
+    
+    response = {
+        "provider": provider_name,
+        "status": "success",
+        "articles": normalized,
+        "count": len(normalized),
+        "total_results": result.get("totalResults", len(normalized))
+    }
+    
+    # Propagate debug info if present
+    if "debug_info" in result:
+        response["debug_info"] = result["debug_info"]
+    return response
+
 
 def _query_provider(provider_name: str, client, method: str, **kwargs) -> Dict[str, Any]:
-    """Query a single provider (used for parallel execution)."""
+    """Query a single provider (used for parallel execution).
+    
+    Successful results are normalized once and kept in the short-TTL result cache.
+    """
+    key = cache_key(provider_name, method, kwargs)
+    cached = result_cache.get(key)
+    if cached is not None:
+        return cached
     try:
         if method == "search":
             result = client.search(**kwargs)
-        elif method == "top_headlines":
-            result = client.top_headlines(**kwargs)
         else:
             result = {"success": False, "error": f"Unknown method: {method}"}
         
         if result.get("success"):
-            articles = result.get("articles", [])
-            normalized = [normalize_article(a, provider_name) for a in articles]
-            
-            response = {
-                "provider": provider_name,
-                "status": "success",
-                "articles": normalized,
-                "count": len(normalized)
-            }
-            
-            # Propagate debug info if present
-            if "debug_info" in result:
-                response["debug_info"] = result["debug_info"]
-            
+            response = _normalized_result(provider_name, result)
+            result_cache.put(key, response)
             return response
         else:
             return {
@@ -68,6 +104,171 @@ def _query_provider(provider_name: str, client, method: str, **kwargs) -> Dict[s
         }
 
 
+def _run_providers(query_tasks: List[Dict[str, Any]], timeout_override: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    """Query providers in parallel and yield each result as soon as it arrives.
+    
+    A provider past its deadline yields a 'timeout' result; its call keeps running in
+    the background and its articles land in the result cache for the next request.
+    """
+    executor = ThreadPoolExecutor(max_workers=len(query_tasks))
+    start = time.monotonic()
+    deadlines = {
+        task["provider"]: start + _provider_timeout(task["provider"], timeout_override)
+        for task in query_tasks
+    }
+    pending = {
+        executor.submit(
+            _query_provider,
+            task["provider"],
+            task["client"],
+            task["method"],
+            **task["kwargs"]
+        ): task["provider"]
+        for task in query_tasks
+    }
+    try:
+        while pending:
+            next_deadline = min(deadlines[name] for name in pending.values())
+            done, _ = wait(pending, timeout=max(0.0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            for future in done:
+                del pending[future]
+                yield future.result()
+            now = time.monotonic()
+            for future, name in list(pending.items()):
+                if now >= deadlines[name]:
+                    del pending[future]
+                    yield {
+                        "provider": name,
+                        "status": "timeout",
+                        "error": f"No response within {deadlines[name] - start:g}s",
+                        "articles": []
+                    }
+    finally:
+        executor.shutdown(wait=False)
+
+
+def _provider_stat(result: Dict[str, Any]) -> Dict[str, Any]:
+    if result["status"] == "success":
+        stat = {"status": "ok", "articles": result["count"]}
+        if result.get("cached"):
+            stat["cached"] = True
+        return stat
+    return {
+        "status": result["status"],
+        "reason": result.get("error", "Unknown")[:100]  # Truncate error
+    }
+
+
+def _merge_results(
+    query_tasks: List[Dict[str, Any]],
+    results: Dict[str, Dict[str, Any]],
+    sort_by: str,
+    page: int,
+    limit: int
+) -> Dict[str, Any]:
+    """Final search response from per-provider results (merged in provider order, not arrival order)."""
+    all_articles = []
+    provider_stats = {}
+    debug_infos = {}
+    for task in query_tasks:
+        result = results.get(task["provider"])
+        if result is None:
+            continue
+        provider_stats[result["provider"]] = _provider_stat(result)
+        if result["status"] == "success":
+            all_articles.extend(result["articles"])
+            # Capture debug info if present
+            if "debug_info" in result:
+                debug_infos[result["provider"]] = result["debug_info"]
+    
+    # Check if we got any results
+    if not all_articles:
+        errors = {p: s.get("reason") for p, s in provider_stats.items() if s.get("status") != "ok"}
+        response = {
+            "success": True,
+            "articles": [],
+            "returned_count": 0,
+            "total_available": 0,
+            "providers": provider_stats
+        }
+        
+        # Add debug infos if any
+        if debug_infos:
+            response["debug"] = debug_infos
+        
+        if errors:
+            response["provider_errors"] = errors
+        
+        return response
+    
+    # Deduplicate and sort
+    unique_articles = deduplicate_articles(all_articles)
+    sorted_articles = sort_articles(unique_articles, sort_by)
+    
+    # Apply pagination and truncation
+    total_available = len(sorted_articles)
+    start_idx = (page - 1) * limit
+    end_idx = start_idx + limit
+    paginated = sorted_articles[start_idx:end_idx]
+    
+    # Build response with anti-flood protection
+    response = {
+        "success": True,
+        "articles": paginated,
+        "returned_count": len(paginated),
+        "total_available": total_available,
+        "page": page,
+        "limit": limit,
+        "providers": provider_stats  # Simplified metadata
+    }
+    
+    # Add debug info if present
+    if debug_infos:
+        response["debug"] = debug_infos
+    
+    # Add truncation warning if needed
+    if total_available > limit:
+        response["truncated"] = True
+        response["warning"] = f"Results limited to {limit} articles per page (anti-flood policy). Use 'page' parameter to see more. Total: {total_available}"
+    
+    return response
+
+
+def _stream_search(
+    query_tasks: List[Dict[str, Any]],
+    sort_by: str,
+    limit: int,
+    timeout_override: Optional[float]
+) -> Iterator[Dict[str, Any]]:
+    """SSE chunks: start, one per provider as it answers (new unique articles), then terminal.
+    
+    The whole stream is one page: at most `limit` articles across all provider chunks.
+    """
+    try:
+        yield {"chunk_type": "start", "providers": [task["provider"] for task in query_tasks]}
+        seen = set()
+        results = {}
+        remaining = limit
+        for result in _run_providers(query_tasks, timeout_override):
+            results[result["provider"]] = result
+            chunk = {"chunk_type": "provider", "provider": result["provider"], **_provider_stat(result)}
+            if result["status"] == "success":
+                fresh = sort_articles(deduplicate_articles(result["articles"], seen), sort_by)[:remaining]
+                remaining -= len(fresh)
+                chunk["articles"] = fresh
+                chunk["new_articles"] = len(fresh)
+            yield chunk
+        final = _merge_results(query_tasks, results, sort_by, 1, limit)
+        # Articles were already streamed provider by provider
+        final.pop("articles", None)
+        final["returned_count"] = limit - remaining
+        if final.get("truncated"):
+            final["warning"] = f"Results limited to {limit} articles (anti-flood policy). Use 'page' without stream to see more. Total: {final['total_available']}"
+        yield {"chunk_type": "terminal", **final}
+    except Exception as e:
+        yield {"chunk_type": "error", "error": {"message": str(e)[:200]}, "terminal": True}
+
+
 def handle_search_news(
     query: str = None,
     from_date: str = None,
@@ -78,9 +279,15 @@ def handle_search_news(
     providers: list = None,
     limit: int = 20,
     page: int = 1,
+    stream: bool = False,
+    provider_timeout_sec: float = None,
     **params
-) -> Dict[str, Any]:
-    """Search news across multiple providers with PARALLEL requests."""
+) -> Union[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """Search news across multiple providers with PARALLEL requests.
+    
+    Each provider has its own deadline; with stream=True a generator of SSE chunks is
+    returned so each provider's articles are delivered as soon as it answers.
+    """
     
     # Validate required parameters
     query_validation = validate_query_required(query)
@@ -104,6 +311,14 @@ def handle_search_news(
     if not to_date_validation["valid"]:
         return {"error": to_date_validation["error"]}
     
+    timeout_validation = validate_provider_timeout(provider_timeout_sec)
+    if not timeout_validation["valid"]:
+        return {"error": timeout_validation["error"]}
+    
+    # A stream is a single page: providers answer in any order, so later pages cannot be cut from it
+    if _want_flag(stream) and page and page > 1:
+        return {"error": "Parameter 'page' is not supported with stream=true (the stream returns the first 'limit' articles)"}
+    
     # Determine which providers to use
     available = get_available_providers()
     
@@ -186,95 +401,12 @@ def handle_search_news(
             }
         })
     
-    # Execute queries in PARALLEL
-    all_articles = []
-    provider_stats = {}
-    debug_infos = {}
-    
-    with ThreadPoolExecutor(max_workers=len(query_tasks)) as executor:
-        # Submit all tasks
-        future_to_task = {
-            executor.submit(
-                _query_provider,
-                task["provider"],
-                task["client"],
-                task["method"],
-                **task["kwargs"]
-            ): task["provider"]
-            for task in query_tasks
-        }
-        
-        # Collect results as they complete
-        for future in as_completed(future_to_task):
-            result = future.result()
-            provider_name = result["provider"]
-            
-            if result["status"] == "success":
-                all_articles.extend(result["articles"])
-                provider_stats[provider_name] = {
-                    "status": "ok",
-                    "articles": result["count"]
-                }
-                # Capture debug info if present
-                if "debug_info" in result:
-                    debug_infos[provider_name] = result["debug_info"]
-            else:
-                provider_stats[provider_name] = {
-                    "status": "error",
-                    "reason": result.get("error", "Unknown")[:100]  # Truncate error
-                }
-    
-    # Check if we got any results
-    if not all_articles:
-        errors = {p: s.get("reason") for p, s in provider_stats.items() if s.get("status") == "error"}
-        response = {
-            "success": True,
-            "articles": [],
-            "returned_count": 0,
-            "total_available": 0,
-            "providers": provider_stats
-        }
-        
-        # Add debug infos if any
-        if debug_infos:
-            response["debug"] = debug_infos
-        
-        if errors:
-            response["provider_errors"] = errors
-        
-        return response
-    
-    # Deduplicate and sort
-    unique_articles = deduplicate_articles(all_articles)
-    sorted_articles = sort_articles(unique_articles, sort_by)
-    
-    # Apply pagination and truncation
-    total_available = len(sorted_articles)
-    start_idx = (page - 1) * limit
-    end_idx = start_idx + limit
-    paginated = sorted_articles[start_idx:end_idx]
-    
-    # Build response with anti-flood protection
-    response = {
-        "success": True,
-        "articles": paginated,
-        "returned_count": len(paginated),
-        "total_available": total_available,
-        "page": page,
-        "limit": limit,
-        "providers": provider_stats  # Simplified metadata
-    }
+    if _want_flag(stream):
+        return _stream_search(query_tasks, sort_by, limit, provider_timeout_sec)
     
-    # Add debug info if present
-    if debug_infos:
-        response["debug"] = debug_infos
-    
-    # Add truncation warning if needed
-    if total_available > limit:
-        response["truncated"] = True
-        response["warning"] = f"Results limited to {limit} articles per page (anti-flood policy). Use 'page' parameter to see more. Total: {total_available}"
-    
-    return response
+    # Execute queries in PARALLEL
+    results = {result["provider"]: result for result in _run_providers(query_tasks, provider_timeout_sec)}
+    return _merge_results(query_tasks, results, sort_by, page, limit)
 
 
 def handle_top_headlines(
@@ -307,23 +439,27 @@ def handle_top_headlines(
             "error": "NEWS_API_KEY not configured. Get free key at https://newsapi.org/register"
         }
     
-    # Query NewsAPI
+    # Query NewsAPI (through the result cache)
     try:
-        result = newsapi_client.top_headlines(
-            country=country,
-            category=category,
-            query=query,
-            sources=sources,
-            page=page,
-            page_size=limit
-        )
-        
-        if not result.get("success"):
-            return result
+        kwargs = {
+            "country": country,
+            "category": category,
+            "query": query,
+            "sources": sources,
+            "page": page,
+            "page_size": limit
+        }
+        key = cache_key("newsapi", "top_headlines", kwargs)
+        result = result_cache.get(key)
+        if result is None:
+            raw = newsapi_client.top_headlines(**kwargs)
+            if not raw.get("success"):
+                return raw
+            result = _normalized_result("newsapi", raw)
+            result_cache.put(key, result)
         
-        articles = result.get("articles", [])
-        normalized = [normalize_article(a, "newsapi") for a in articles]
-        total_available = result.get("totalResults", len(normalized))
+        normalized = result["articles"]
+        total_available = result["total_results"]
         
         # Build response with anti-flood protection
         response = {
@@ -335,6 +471,9 @@ def handle_top_headlines(
             "limit": limit
         }
         
+        if result.get("cached"):
+            response["cached"] = True
+        
         # Add debug info if present and no articles found
         if "debug_info" in result and total_available == 0:
             response["debug"] = result["debug_info"]
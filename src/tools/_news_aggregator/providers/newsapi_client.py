@@ -3,6 +3,10 @@ import os
 import requests
 from typing import Dict, Any, List
 
+from ..._http_cache import get as cached_get
+
+CACHE_TTL_SEC = 300  # repeated queries within a few minutes reuse the same results (and daily quota)
+
 
 class NewsAPIClient:
     """Client for NewsAPI.org (https://newsapi.org/)"""
@@ -32,7 +36,7 @@ class NewsAPIClient:
         print(f"   Parameters: {debug_params}")
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = cached_get(url, params=params, timeout=30, ttl=CACHE_TTL_SEC, tool="news_aggregator")
             
             # DEBUG: Log response status
             print(f"   Response status: {response.status_code}")
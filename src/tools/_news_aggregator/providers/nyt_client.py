@@ -3,6 +3,10 @@ import os
 import requests
 from typing import Dict, Any
 
+from ..._http_cache import get as cached_get
+
+CACHE_TTL_SEC = 300  # repeated queries within a few minutes reuse the same results (and daily quota)
+
 
 class NYTClient:
     """Client for New York Times Article Search API."""
@@ -27,7 +31,7 @@ class NYTClient:
         params["api-key"] = self.api_key
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = cached_get(url, params=params, timeout=30, ttl=CACHE_TTL_SEC, tool="news_aggregator")
             
             if response.status_code == 401:
                 return {
@@ -1,6 +1,10 @@
 """Utilities for news aggregator."""
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Query parameters that only track the click, not the article
+TRACKING_PARAMS = {"fbclid", "gclid", "cmpid", "ocid", "smid", "smtyp", "ref", "cid"}
 
 
 def get_available_providers() -> Dict[str, bool]:
@@ -99,15 +103,41 @@ def normalize_article(raw: Dict[str, Any], provider: str) -> Dict[str, Any]:
     }
 
 
-def deduplicate_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Remove duplicate articles by URL."""
-    seen_urls = set()
+def normalize_url(url: str) -> str:
+    """Canonical form of an article URL for duplicate detection.
+    
+    Ignores scheme, 'www.', host case, fragment, trailing slash and tracking
+    parameters (utm_*, fbclid, ...), so syndicated copies of one article match.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    ))
+    path = parts.path.rstrip("/")
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+def deduplicate_articles(articles: List[Dict[str, Any]], seen: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+    """Remove duplicate articles by normalized URL (first occurrence wins).
+    
+    Args:
+        articles: Normalized articles
+        seen: Normalized URLs already emitted (updated in place), for incremental dedup
+    """
+    seen_urls = set() if seen is None else seen
     unique_articles = []
     
     for article in articles:
         url = article.get("url", "")
-        if url and url not in seen_urls:
-            seen_urls.add(url)
+        if not url:
+            continue
+        key = normalize_url(url)
+        if key not in seen_urls:
+            seen_urls.add(key)
             unique_articles.append(article)
     
     return unique_articles
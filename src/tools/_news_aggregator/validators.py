@@ -62,3 +62,13 @@ def validate_date_format(date_str, param_name):
         return {"valid": False, "error": f"Parameter '{param_name}' must contain valid numbers"}
     
     return {"valid": True}
+
+
+def validate_provider_timeout(timeout):
+    """Validate per-provider timeout in seconds."""
+    if timeout is not None:
+        if isinstance(timeout, bool) or not isinstance(timeout, (int, float)):
+            return {"valid": False, "error": "Parameter 'provider_timeout_sec' must be a number"}
+        if timeout < 1 or timeout > 120:
+            return {"valid": False, "error": "Parameter 'provider_timeout_sec' must be between 1 and 120 seconds"}
+    return {"valid": True}
@@ -3,11 +3,17 @@ Open-Meteo API client (no API key required - 100% free)
 """
 import requests
 
+from ..._http_cache import get as cached_get
+
 
 FORECAST_BASE_URL = 'https://api.open-meteo.com/v1'
 AIR_QUALITY_BASE_URL = 'https://air-quality-api.open-meteo.com/v1'
 GEOCODING_BASE_URL = 'https://geocoding-api.open-meteo.com/v1'
 
+# Model runs update at most every 15 min; place names practically never change
+FORECAST_TTL_SEC = 900
+GEOCODING_TTL_SEC = 7 * 86400
+
 
 def make_forecast_request(params):
     """
@@ -22,7 +28,7 @@ def make_forecast_request(params):
     url = f"{FORECAST_BASE_URL}/forecast"
     
     try:
-        response = requests.get(url, params=params, timeout=15)
+        response = cached_get(url, params=params, timeout=15, ttl=FORECAST_TTL_SEC, tool='open_meteo')
         response.raise_for_status()
         return response.json()
     except requests.exceptions.HTTPError as e:
@@ -51,7 +57,7 @@ def make_air_quality_request(params):
     url = f"{AIR_QUALITY_BASE_URL}/air-quality"
     
     try:
-        response = requests.get(url, params=params, timeout=15)
+        response = cached_get(url, params=params, timeout=15, ttl=FORECAST_TTL_SEC, tool='open_meteo')
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -71,7 +77,7 @@ def make_geocoding_request(params):
     url = f"{GEOCODING_BASE_URL}/search"
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = cached_get(url, params=params, timeout=10, ttl=GEOCODING_TTL_SEC, tool='open_meteo')
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
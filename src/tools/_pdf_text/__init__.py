@@ -0,0 +1,13 @@
+"""Shared PDF page-text layer for pdf_search and pdf2text (internal).
+
+- Persistent page-text cache (SQLite, zstd-compressed when `zstandard` is installed)
+  keyed by (resolved path, size, mtime_ns, page)
+- Cache misses extracted in a process pool across pages and files
+- Optional FTS5 full-text index over page text (pdf_search index/query)
+"""
+from __future__ import annotations
+
+from .pages import page_counts, page_texts, iter_page_texts, cache_stats
+from .index import build_index, query_index, IndexUnavailable
+
+__all__ = ["page_counts", "page_texts", "iter_page_texts", "cache_stats", "build_index", "query_index", "IndexUnavailable"]
@@ -0,0 +1,181 @@
+"""SQLite page-text cache: (path, size, mtime_ns, page) -> compressed text.
+
+Bounded by PDF_TEXT_CACHE_MAX_MB (compressed bytes, default 1024): past it, the least
+recently used documents are dropped with their pages.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import zstandard
+    _ZC = zstandard.ZstdCompressor(level=3)
+    _ZD = zstandard.ZstdDecompressor()
+except Exception:  # optional dependency
+    zstandard = None
+    _ZC = _ZD = None
+
+try:
+    from config import find_project_root
+except Exception:
+    find_project_root = lambda: Path.cwd()  # type: ignore
+
+# Key of one PDF version: (resolved path, size, mtime_ns)
+DocKey = Tuple[str, int, int]
+
+_MAX_BYTES = max(1, int(os.getenv("PDF_TEXT_CACHE_MAX_MB", "1024"))) * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    page_count INTEGER NOT NULL,
+    last_used REAL NOT NULL DEFAULT 0,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (path, size, mtime_ns)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS pages (
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    page INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    text BLOB NOT NULL,
+    PRIMARY KEY (path, size, mtime_ns, page)
+) WITHOUT ROWID;
+"""
+
+
+def db_path() -> Path:
+    env = os.getenv("PDF_TEXT_CACHE_DB")
+    if env:
+        return Path(env).expanduser()
+    return find_project_root() / "sqlite3" / "pdf_text_cache.db"
+
+
+def doc_key(path: Path) -> DocKey:
+    st = path.stat()
+    return (str(path), st.st_size, st.st_mtime_ns)
+
+
+def _encode(text: str) -> Tuple[str, bytes]:
+    raw = text.encode("utf-8")
+    if _ZC is not None:
+        return "zstd", _ZC.compress(raw)
+    return "zlib", zlib.compress(raw, 6)
+
+
+def _decode(codec: str, blob: bytes) -> Optional[str]:
+    if codec == "zstd":
+        if _ZD is None:
+            return None  # written by an install with zstandard: treat as a miss
+        return _ZD.decompress(blob).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(blob).decode("utf-8")
+    return bytes(blob).decode("utf-8")
+
+
+def connect() -> sqlite3.Connection:
+    p = db_path()
+    p.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(p), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    # Caches created before the size bound: add the LRU columns and count existing pages
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(docs)")}
+    with conn:
+        if "last_used" not in cols:
+            conn.execute("ALTER TABLE docs ADD COLUMN last_used REAL NOT NULL DEFAULT 0")
+        if "bytes" not in cols:
+            conn.execute("ALTER TABLE docs ADD COLUMN bytes INTEGER NOT NULL DEFAULT 0")
+            conn.execute(
+                "UPDATE docs SET bytes=(SELECT COALESCE(SUM(length(p.text)), 0) FROM pages p "
+                "WHERE p.path=docs.path AND p.size=docs.size AND p.mtime_ns=docs.mtime_ns)"
+            )
+    return conn
+
+
+def get_page_counts(conn: sqlite3.Connection, keys: Iterable[DocKey]) -> Dict[DocKey, int]:
+    out: Dict[DocKey, int] = {}
+    for key in keys:
+        row = conn.execute(
+            "SELECT page_count FROM docs WHERE path=? AND size=? AND mtime_ns=?", key
+        ).fetchone()
+        if row:
+            out[key] = row[0]
+    return out
+
+
+def put_page_counts(conn: sqlite3.Connection, counts: Dict[DocKey, int]) -> None:
+    with conn:
+        for (path, size, mtime_ns), n in counts.items():
+            # Older versions of the same file are dropped with their pages
+            conn.execute("DELETE FROM docs WHERE path=? AND (size!=? OR mtime_ns!=?)", (path, size, mtime_ns))
+            conn.execute("DELETE FROM pages WHERE path=? AND (size!=? OR mtime_ns!=?)", (path, size, mtime_ns))
+            conn.execute(
+                "INSERT OR IGNORE INTO docs (path, size, mtime_ns, page_count, last_used) VALUES (?,?,?,?,?)",
+                (path, size, mtime_ns, n, time.time()),
+            )
+
+
+def get_pages(conn: sqlite3.Connection, key: DocKey, pages: List[int]) -> Dict[int, str]:
+    out: Dict[int, str] = {}
+    wanted = set(pages)
+    if not wanted:
+        return out
+    # One range scan on the primary key, filtered in Python
+    rows = conn.execute(
+        "SELECT page, codec, text FROM pages WHERE path=? AND size=? AND mtime_ns=? AND page BETWEEN ? AND ?",
+        (*key, min(wanted), max(wanted)),
+    )
+    for page, codec, blob in rows:
+        if page in wanted:
+            text = _decode(codec, blob)
+            if text is not None:
+                out[page] = text
+    if out:
+        with conn:
+            conn.execute("UPDATE docs SET last_used=? WHERE path=? AND size=? AND mtime_ns=?", (time.time(), *key))
+    return out
+
+
+def put_pages(conn: sqlite3.Connection, items: Iterable[Tuple[DocKey, int, str]]) -> int:
+    rows = [(*key, page, *_encode(text)) for key, page, text in items]
+    if rows:
+        added: Dict[DocKey, int] = {}
+        for path, size, mtime_ns, _, _, blob in rows:
+            k = (path, size, mtime_ns)
+            added[k] = added.get(k, 0) + len(blob)
+        now = time.time()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO pages VALUES (?,?,?,?,?,?)", rows)
+            conn.executemany(
+                "UPDATE docs SET bytes=bytes+?, last_used=? WHERE path=? AND size=? AND mtime_ns=?",
+                [(n, now, *k) for k, n in added.items()],
+            )
+            _evict(conn, _MAX_BYTES)
+    return len(rows)
+
+
+def _evict(conn: sqlite3.Connection, max_bytes: int) -> None:
+    # Called inside the write transaction: drop least recently used documents past the budget
+    total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM docs").fetchone()[0]
+    if total <= max_bytes:
+        return
+    victims = []
+    for path, size, mtime_ns, n in conn.execute(
+        "SELECT path, size, mtime_ns, bytes FROM docs ORDER BY last_used"
+    ).fetchall():
+        if total <= max_bytes:
+            break
+        victims.append((path, size, mtime_ns))
+        total -= n
+    conn.executemany("DELETE FROM pages WHERE path=? AND size=? AND mtime_ns=?", victims)
+    conn.executemany("DELETE FROM docs WHERE path=? AND size=? AND mtime_ns=?", victims)
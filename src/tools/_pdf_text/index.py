@@ -0,0 +1,269 @@
+"""SQLite FTS5 full-text index over PDF page text (pdf_search index/query operations).
+
+- files: one row per indexed PDF version (path, size, mtime_ns, page count, pages that failed)
+- page_fts: FTS5 table, one row per page; rowid = (file id << _PAGE_BITS) | page index,
+  so all pages of a file are replaced/removed with one rowid range
+- Prefix indexes for 2/3-char prefixes: short "term*" queries do not expand over the whole vocabulary
+- Incremental: unchanged files (same size/mtime_ns) are skipped, changed files re-indexed,
+  files that disappeared under an indexed directory removed; a file with pages that failed
+  to extract is searchable on its other pages and retried on the next build
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from . import cache
+from .pages import page_counts, page_texts
+
+logger = logging.getLogger(__name__)
+
+_PAGE_BITS = 20  # up to ~1M pages per file
+_BATCH_PAGES = max(1, int(os.getenv("PDF_SEARCH_INDEX_BATCH_PAGES", "1000")))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    page_count INTEGER NOT NULL,
+    indexed_at REAL NOT NULL,
+    failed_pages INTEGER NOT NULL DEFAULT 0
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS page_fts USING fts5(
+    text,
+    prefix = '2 3',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+class IndexUnavailable(RuntimeError):
+    """SQLite build without FTS5."""
+
+
+def index_db_path() -> Path:
+    env = os.getenv("PDF_SEARCH_INDEX_DB")
+    if env:
+        return Path(env).expanduser()
+    return cache.db_path().parent / "pdf_search_index.db"
+
+
+def connect() -> sqlite3.Connection:
+    p = index_db_path()
+    p.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(p), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    try:
+        conn.executescript(_SCHEMA)
+    except sqlite3.OperationalError as e:
+        conn.close()
+        raise IndexUnavailable(f"SQLite FTS5 is not available: {e}") from e
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(files)")}
+    if "failed_pages" not in cols:
+        with conn:
+            conn.execute("ALTER TABLE files ADD COLUMN failed_pages INTEGER NOT NULL DEFAULT 0")
+    return conn
+
+
+def _rowid_range(file_id: int) -> Tuple[int, int]:
+    lo = file_id << _PAGE_BITS
+    return lo, lo + (1 << _PAGE_BITS) - 1
+
+
+def _drop_file(conn: sqlite3.Connection, file_id: int) -> None:
+    conn.execute("DELETE FROM page_fts WHERE rowid BETWEEN ? AND ?", _rowid_range(file_id))
+    conn.execute("DELETE FROM files WHERE id=?", (file_id,))
+
+
+def _under(path: str, roots: List[str]) -> bool:
+    return any(path == r or path.startswith(r.rstrip(os.sep) + os.sep) for r in roots)
+
+
+def build_index(files: List[Path], roots: List[Path], max_files: Optional[int] = None) -> Dict[str, Any]:
+    """Add/refresh the given PDFs in the index and prune deleted files under roots.
+
+    Args:
+        files: PDFs found under the targets (resolved paths)
+        roots: Targets that were scanned (directories or files), used for pruning
+        max_files: Index at most this many new/changed files in this call (rest reported as remaining)
+
+    Returns:
+        Counters (indexed, unchanged, removed, pages_indexed, remaining, errors, ...)
+    """
+    t0 = time.perf_counter()
+    errors: List[Dict[str, str]] = []
+    conn = connect()
+    try:
+        known = {p: (fid, size, mtime, failed) for fid, p, size, mtime, failed in conn.execute(
+            "SELECT id, path, size, mtime_ns, failed_pages FROM files")}
+
+        # Prune: indexed under a scanned root, no longer on disk
+        listed = {str(f) for f in files}
+        root_strs = [str(r) for r in roots]
+        removed = 0
+        with conn:
+            for p, (fid, _, _, _) in list(known.items()):
+                if p not in listed and _under(p, root_strs) and not os.path.isfile(p):
+                    _drop_file(conn, fid)
+                    del known[p]
+                    removed += 1
+
+        changed: List[Tuple[Path, cache.DocKey]] = []
+        for f in files:
+            try:
+                key = cache.doc_key(f)
+            except OSError as e:
+                errors.append({"file": str(f), "error": f"Failed to open PDF: {e}"})
+                continue
+            prev = known.get(key[0])
+            if prev is None or prev[1:3] != key[1:] or prev[3]:
+                changed.append((f, key))
+        unchanged = len(files) - len(changed) - len(errors)
+        remaining = 0
+        if max_files is not None and len(changed) > max_files:
+            remaining = len(changed) - max_files
+            changed = changed[:max_files]
+
+        counts = page_counts([f for f, _ in changed])
+        todo: List[Tuple[Path, cache.DocKey, int]] = []
+        for f, key in changed:
+            info = counts.get(f) or {}
+            if "error" in info:
+                errors.append({"file": str(f), "error": info["error"]})
+                continue
+            todo.append((f, key, info["pages"]))
+
+        indexed = pages_indexed = 0
+        for batch in _batches(todo):
+            texts = page_texts({f: list(range(n)) for f, _, n in batch}, store=False)
+            # One transaction per batch: an interrupted build keeps finished batches
+            with conn:
+                for f, (path, size, mtime_ns), n in batch:
+                    prev = known.get(path)
+                    if prev is not None:
+                        _drop_file(conn, prev[0])
+                    results = texts.get(f, {})
+                    # Failed or missing pages: the file is re-indexed by the next build
+                    failed = n - sum(1 for _, err in results.values() if not err)
+                    cur = conn.execute(
+                        "INSERT INTO files (path, size, mtime_ns, page_count, indexed_at, failed_pages) "
+                        "VALUES (?,?,?,?,?,?)",
+                        (path, size, mtime_ns, n, time.time(), failed),
+                    )
+                    base = cur.lastrowid << _PAGE_BITS
+                    rows = []
+                    for i, (text, err) in sorted(results.items()):
+                        if err:
+                            errors.append({"file": path, "error": err})
+                        elif text.strip():
+                            rows.append((base | i, text))
+                    conn.executemany("INSERT INTO page_fts (rowid, text) VALUES (?,?)", rows)
+                    indexed += 1
+                    pages_indexed += len(rows)
+
+        total_files, total_pages = conn.execute(
+            "SELECT count(*), coalesce(sum(page_count), 0) FROM files").fetchone()
+    finally:
+        conn.close()
+
+    logger.info(f"PDF index: {indexed} indexed, {unchanged} unchanged, {removed} removed, {remaining} remaining")
+    return {
+        "indexed": indexed,
+        "unchanged": unchanged,
+        "removed": removed,
+        "remaining": remaining,
+        "pages_indexed": pages_indexed,
+        "index_files": total_files,
+        "index_pages": total_pages,
+        "errors": errors,
+        "elapsed_ms": int((time.perf_counter() - t0) * 1000),
+        "db": str(index_db_path()),
+    }
+
+
+def _batches(todo: List[Tuple[Path, cache.DocKey, int]]) -> Iterable[List[Tuple[Path, cache.DocKey, int]]]:
+    batch: List[Tuple[Path, cache.DocKey, int]] = []
+    pages = 0
+    for item in todo:
+        batch.append(item)
+        pages += item[2]
+        if pages >= _BATCH_PAGES:
+            yield batch
+            batch, pages = [], 0
+    if batch:
+        yield batch
+
+
+def _quote_terms(query: str) -> str:
+    # Plain-text fallback: every whitespace-separated term as an FTS5 string (implicit AND)
+    terms = [t for t in query.split() if any(ch.isalnum() for ch in t)]
+    return " ".join('"' + t.replace('"', '""') + '"' for t in terms) or '""'
+
+
+def query_index(query: str, roots: Optional[List[Path]] = None, limit: int = 50,
+                snippet_tokens: int = 16) -> Dict[str, Any]:
+    """Ranked (bm25) page hits for an FTS5 query.
+
+    Args:
+        query: FTS5 query (terms, "phrases", AND/OR/NOT, prefix*); invalid syntax is retried as plain terms
+        roots: Restrict hits to files under these paths
+        limit: Max hits returned
+        snippet_tokens: Tokens of context in snippets (FTS5 caps at 64)
+
+    Returns:
+        {"total_hits": int, "results": [{"file", "page", "anchor", "score", "snippet"}], "fts_query": str}
+    """
+    t0 = time.perf_counter()
+    where = "page_fts MATCH ?"
+    filters: List[Any] = []
+    if roots:
+        clauses = []
+        for r in roots:
+            r = str(r)
+            clauses.append("(f.path = ? OR substr(f.path, 1, ?) = ?)")
+            prefix = r.rstrip(os.sep) + os.sep
+            filters.extend([r, len(prefix), prefix])
+        where += " AND (" + " OR ".join(clauses) + ")"
+
+    join = f"FROM page_fts JOIN files f ON f.id = (page_fts.rowid >> {_PAGE_BITS}) WHERE {where}"
+    tokens = max(1, min(64, int(snippet_tokens)))
+    sql = (
+        f"SELECT f.path, page_fts.rowid & {(1 << _PAGE_BITS) - 1}, bm25(page_fts), "
+        f"snippet(page_fts, 0, '[', ']', '…', {tokens}) {join} ORDER BY rank LIMIT ?"
+    )
+
+    conn = connect()
+    try:
+        fts_query = query
+        try:
+            rows = conn.execute(sql, (fts_query, *filters, limit)).fetchall()
+        except sqlite3.OperationalError:
+            fts_query = _quote_terms(query)
+            rows = conn.execute(sql, (fts_query, *filters, limit)).fetchall()
+        if len(rows) < limit:
+            total = len(rows)
+        else:
+            total = conn.execute(f"SELECT count(*) {join}", (fts_query, *filters)).fetchone()[0]
+    finally:
+        conn.close()
+
+    results = [{
+        "file": path,
+        "page": page + 1,
+        "anchor": f"{Path(path).as_uri()}#page={page + 1}",
+        "score": round(-score, 4),
+        "snippet": snip.replace("\n", " ").strip(),
+    } for path, page, score, snip in rows]
+    return {
+        "total_hits": total,
+        "results": results,
+        "fts_query": fts_query,
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000, 2),
+    }
@@ -0,0 +1,202 @@
+"""Page counts and page texts with cache + process-pool extraction."""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import cache
+
+logger = logging.getLogger(__name__)
+
+_WORKERS = max(1, int(os.getenv("PDF_TEXT_WORKERS", str(min(4, os.cpu_count() or 1)))))
+_CHUNK_PAGES = max(1, int(os.getenv("PDF_TEXT_CHUNK_PAGES", "16")))
+# Pages held in memory at once by iter_page_texts (enough to keep every worker busy)
+_BATCH_PAGES = max(_CHUNK_PAGES, int(os.getenv("PDF_TEXT_BATCH_PAGES", "256")))
+# Below this many units of work, extract in-process (pool round-trip not worth it)
+_INLINE_MAX = 8
+
+_pool_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_pid: Optional[int] = None
+_stats = {"page_hits": 0, "page_misses": 0, "count_hits": 0, "count_misses": 0, "pool_tasks": 0}
+
+# (text, error) for one page: exactly one of them is set
+PageResult = Tuple[Optional[str], Optional[str]]
+
+
+def _count_worker(path: str) -> Tuple[Optional[int], Optional[str]]:
+    from pypdf import PdfReader
+    try:
+        return len(PdfReader(path).pages), None
+    except Exception as e:
+        return None, f"Failed to open PDF: {e}"
+
+
+def _extract_worker(path: str, pages: List[int]) -> Dict[int, PageResult]:
+    from pypdf import PdfReader
+    try:
+        reader = PdfReader(path)
+    except Exception as e:
+        return {i: (None, f"Failed to open PDF: {e}") for i in pages}
+    out: Dict[int, PageResult] = {}
+    for i in pages:
+        try:
+            out[i] = (reader.pages[i].extract_text() or "", None)
+        except Exception as e:
+            out[i] = (None, f"Failed to extract text from page {i+1}: {e}")
+    return out
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool, _pool_pid
+    if _WORKERS <= 1:
+        return None
+    pid = os.getpid()
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            try:
+                # spawn: safe from threaded servers (no forked locks)
+                _pool = ProcessPoolExecutor(max_workers=_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+                _pool_pid = pid
+            except Exception as e:
+                logger.warning(f"PDF text process pool unavailable ({e}), extracting in-process")
+                return None
+        return _pool
+
+
+def _reset_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _run(fn, jobs: List[Tuple[Any, ...]], units: int) -> List[Any]:
+    """Run fn(*job) for each job: in the process pool when worth it (units = files or pages), otherwise inline."""
+    pool = _get_pool() if len(jobs) > 1 and units > _INLINE_MAX else None
+    if pool is not None:
+        try:
+            _stats["pool_tasks"] += len(jobs)
+            futures = [pool.submit(fn, *job) for job in jobs]
+            return [f.result() for f in futures]
+        except Exception as e:  # BrokenProcessPool, pickling issues...
+            logger.warning(f"PDF text pool failed ({e}), retrying in-process")
+            _reset_pool()
+    return [fn(*job) for job in jobs]
+
+
+def page_counts(files: List[Path]) -> Dict[Path, Dict[str, Any]]:
+    """Number of pages per file: {path: {"pages": n}} or {path: {"error": msg}}."""
+    out: Dict[Path, Dict[str, Any]] = {}
+    keys: Dict[Path, cache.DocKey] = {}
+    for f in files:
+        try:
+            keys[f] = cache.doc_key(f)
+        except OSError as e:
+            out[f] = {"error": f"Failed to open PDF: {e}"}
+
+    conn = cache.connect()
+    try:
+        known = cache.get_page_counts(conn, keys.values())
+        missing = [f for f, k in keys.items() if k not in known]
+        _stats["count_hits"] += len(keys) - len(missing)
+        _stats["count_misses"] += len(missing)
+        fresh: Dict[cache.DocKey, int] = {}
+        for f, (n, err) in zip(missing, _run(_count_worker, [(str(f),) for f in missing], len(missing))):
+            if err:
+                out[f] = {"error": err}
+            else:
+                fresh[keys[f]] = n
+        if fresh:
+            cache.put_page_counts(conn, fresh)
+        known.update(fresh)
+    finally:
+        conn.close()
+
+    for f, k in keys.items():
+        if k in known:
+            out[f] = {"pages": known[k]}
+    return out
+
+
+def page_texts(wanted: Dict[Path, List[int]], store: bool = True) -> Dict[Path, Dict[int, PageResult]]:
+    """Texts of the requested 0-based pages per file (cache first, misses extracted in parallel).
+
+    Args:
+        wanted: {path: [page_index, ...]}
+        store: Write extracted pages to the cache (False for bulk consumers such as the FTS index)
+
+    Returns:
+        {path: {page_index: (text, error)}}; failed pages are not cached
+    """
+    out: Dict[Path, Dict[int, PageResult]] = {f: {} for f in wanted}
+    jobs: List[Tuple[str, List[int]]] = []
+    job_keys: List[Tuple[Path, cache.DocKey]] = []
+
+    conn = cache.connect()
+    try:
+        for f, pages in wanted.items():
+            try:
+                key = cache.doc_key(f)
+            except OSError as e:
+                out[f] = {i: (None, f"Failed to open PDF: {e}") for i in pages}
+                continue
+            hits = cache.get_pages(conn, key, pages)
+            _stats["page_hits"] += len(hits)
+            for i, text in hits.items():
+                out[f][i] = (text, None)
+            missing = [i for i in pages if i not in hits]
+            _stats["page_misses"] += len(missing)
+            for n in range(0, len(missing), _CHUNK_PAGES):
+                jobs.append((str(f), missing[n:n + _CHUNK_PAGES]))
+                job_keys.append((f, key))
+
+        extracted: List[Tuple[cache.DocKey, int, str]] = []
+        for (f, key), res in zip(job_keys, _run(_extract_worker, jobs, sum(len(j[1]) for j in jobs))):
+            for i, (text, err) in res.items():
+                out[f][i] = (text, err)
+                if err is None:
+                    extracted.append((key, i, text))
+        if store:
+            cache.put_pages(conn, extracted)
+    finally:
+        conn.close()
+    return out
+
+
+def iter_page_texts(wanted: Dict[Path, List[int]],
+                    batch_pages: int = _BATCH_PAGES) -> Iterator[Tuple[Path, List[Tuple[int, PageResult]]]]:
+    """page_texts() in bounded batches: yields (path, [(page_index, (text, error)), ...]).
+
+    Files and pages come out in the requested order; a large file is split across
+    several yields. At most about batch_pages page texts are in memory at once.
+    """
+    batch: List[Tuple[Path, List[int]]] = []
+    size = 0
+
+    def flush():
+        texts = page_texts({f: pages for f, pages in batch})
+        for f, pages in batch:
+            file_texts = texts.get(f, {})
+            yield f, [(i, file_texts.get(i, (None, f"Failed to extract text from page {i+1}"))) for i in pages]
+
+    for f, pages in wanted.items():
+        for n in range(0, len(pages), batch_pages):
+            piece = pages[n:n + batch_pages]
+            batch.append((f, piece))
+            size += len(piece)
+            if size >= batch_pages:
+                yield from flush()
+                batch, size = [], 0
+    if batch:
+        yield from flush()
+
+
+def cache_stats() -> Dict[str, Any]:
+    return dict(_stats, db=str(cache.db_path()), workers=_WORKERS)
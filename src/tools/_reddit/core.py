@@ -6,6 +6,10 @@ import re
 from datetime import datetime, timedelta
 import time
 
+from .._http_cache import get as cached_get
+
+CACHE_TTL_SEC = 120  # listings move fast; short reuse still absorbs repeated calls
+
 
 class RedditIntelligence:
     """Reddit intelligence and analysis tool - Core functionality"""
@@ -41,7 +45,7 @@ class RedditIntelligence:
             if not url.endswith('.json'):
                 url += '.json'
             
-            response = requests.get(url, headers=self.headers, timeout=15)
+            response = cached_get(url, headers=self.headers, timeout=15, ttl=CACHE_TTL_SEC, tool='reddit_intelligence')
             response.raise_for_status()
             
             return response.json()
@@ -64,7 +68,7 @@ class RedditIntelligence:
                     't': time_filter
                 }
                 
-                response = requests.get(url, headers=self.headers, params=params, timeout=15)
+                response = cached_get(url, headers=self.headers, params=params, timeout=15, ttl=CACHE_TTL_SEC, tool='reddit_intelligence')
             else:
                 # Get subreddit posts
                 url = f"{self.base_url}/r/{subreddit}/{sort}.json"
@@ -73,7 +77,7 @@ class RedditIntelligence:
                     't': time_filter
                 }
                 
-                response = requests.get(url, headers=self.headers, params=params, timeout=15)
+                response = cached_get(url, headers=self.headers, params=params, timeout=15, ttl=CACHE_TTL_SEC, tool='reddit_intelligence')
             
             response.raise_for_status()
             data = response.json()
@@ -124,7 +128,7 @@ class RedditIntelligence:
             url = f"{self.base_url}/r/{subreddit}/comments/{post_id}.json"
             params = {'limit': limit}
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=15)
+            response = cached_get(url, headers=self.headers, params=params, timeout=15, ttl=CACHE_TTL_SEC, tool='reddit_intelligence')
             response.raise_for_status()
             data = response.json()
             
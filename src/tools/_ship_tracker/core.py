@@ -1,7 +1,8 @@
 """Core logic for ship tracking operations."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from .services.aisstream import AISStreamClient, get_port_coordinates
+from .services.collector import get_collector
 from .validators import (
     validate_track_ships_params,
     validate_ship_details_params,
@@ -16,6 +17,28 @@ from .utils import (
 )
 
 
+def _ships_in_area(latitude: float, longitude: float, radius_km: float, timeout: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Raw ships in an area: from the background collector when it covers the area, else live.
+    
+    Returns:
+        (ships sorted by distance, source info)
+    """
+    collector = get_collector()
+    if collector is not None and collector.ready and collector.covers(latitude, longitude, radius_km):
+        ships = collector.index.within(latitude, longitude, radius_km)
+        return ships[:AISStreamClient.MAX_SHIPS_TO_COLLECT], {"source": "collector", "collector": collector.stats()}
+    
+    client = AISStreamClient()
+    ships = client.get_ships_in_area(
+        latitude=latitude,
+        longitude=longitude,
+        radius_km=radius_km,
+        max_results=500,  # Internal limit for WebSocket collection
+        timeout=timeout
+    )
+    return ships, {"source": "live"}
+
+
 def handle_track_ships(**params) -> Dict[str, Any]:
     """Handle track_ships operation.
     
@@ -39,15 +62,13 @@ def handle_track_ships(**params) -> Dict[str, Any]:
     """
     try:
         validated = validate_track_ships_params(params)
-        client = AISStreamClient()
         
-        # Get ships in area (raw WebSocket data)
-        ships_raw = client.get_ships_in_area(
-            latitude=validated["latitude"],
-            longitude=validated["longitude"],
-            radius_km=validated["radius_km"],
-            max_results=500,  # Internal limit for WebSocket collection
-            timeout=validated["timeout"]
+        # Get ships in area (collector index or raw WebSocket data)
+        ships_raw, source_info = _ships_in_area(
+            validated["latitude"],
+            validated["longitude"],
+            validated["radius_km"],
+            validated["timeout"]
         )
         
         # Apply filters
@@ -108,6 +129,8 @@ def handle_track_ships(**params) -> Dict[str, Any]:
                 },
                 "timestamp": ship.get("timestamp")
             }
+            if "age_sec" in ship:
+                enriched_ship["age_sec"] = ship["age_sec"]
             
             filtered_ships.append(enriched_ship)
         
@@ -133,6 +156,7 @@ def handle_track_ships(**params) -> Dict[str, Any]:
             },
             "radius_km": validated["radius_km"],
             "timeout_seconds": validated["timeout"],
+            **source_info,
             "total_detected": len(ships_raw),  # Raw WebSocket count
             "matched_filters": len(filtered_ships),  # Post-filtering count
             "returned": len(returned_ships),  # Actually returned count
@@ -177,11 +201,21 @@ def handle_get_ship_details(**params) -> Dict[str, Any]:
     """
     try:
         validated = validate_ship_details_params(params)
-        client = AISStreamClient()
         
-        # NOTE: This listens globally (no bbox) which is inefficient but necessary
-        # Recommended: Use longer timeout (30-60s) for better chances of finding the ship
-        ship = client.get_ship_by_mmsi(validated["mmsi"], timeout=validated["timeout"])
+        ship = None
+        source = "live"
+        collector = get_collector()
+        if collector is not None:
+            ship = collector.index.get(validated["mmsi"])
+            if ship is not None:
+                ship["last_position_update"] = ship.get("timestamp")
+                source = "collector"
+        
+        if ship is None and (collector is None or collector.mode == "stream"):
+            client = AISStreamClient()
+            # NOTE: This listens globally (no bbox) which is inefficient but necessary
+            # Recommended: Use longer timeout (30-60s) for better chances of finding the ship
+            ship = client.get_ship_by_mmsi(validated["mmsi"], timeout=validated["timeout"])
         
         if not ship:
             return {
@@ -222,7 +256,9 @@ def handle_get_ship_details(**params) -> Dict[str, Any]:
                 "draught_m": ship.get("draught")
             },
             "timestamp": ship.get("timestamp"),
-            "last_position_update": ship.get("last_position_update")
+            "last_position_update": ship.get("last_position_update"),
+            "age_sec": ship.get("age_sec"),
+            "source": source
         }
         
     except ValueError as e:
@@ -13,6 +13,7 @@ import logging
 import websocket
 from typing import Dict, Any, List, Optional
 from ..utils import haversine_distance
+from .ship_index import parse_position_report
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -85,53 +86,20 @@ class AISStreamClient:
             try:
                 data = json.loads(message)
                 
-                # AISStream sends different message types
-                if data.get("MessageType") == "PositionReport":
-                    metadata = data.get("MetaData", {})
-                    mmsi = metadata.get("MMSI")
-                    
-                    if not mmsi:
-                        return
-                    
-                    # Extract position report data
-                    msg = data.get("Message", {}).get("PositionReport", {})
-                    
-                    ship_lat = msg.get("Latitude")
-                    ship_lon = msg.get("Longitude")
-                    
-                    if ship_lat is None or ship_lon is None:
-                        return
-                    
-                    # Calculate distance from center
-                    distance = haversine_distance(latitude, longitude, ship_lat, ship_lon)
-                    
-                    if distance > radius_km:
-                        return
-                    
-                    # Build ship data
-                    ship = {
-                        "mmsi": mmsi,
-                        "name": metadata.get("ShipName", "Unknown").strip(),
-                        "ship_type": msg.get("ShipType", 0),
-                        "latitude": ship_lat,
-                        "longitude": ship_lon,
-                        "speed": msg.get("Sog", 0),  # Speed over ground in knots
-                        "heading": msg.get("TrueHeading"),
-                        "course": msg.get("Cog"),  # Course over ground
-                        "navigation_status": msg.get("NavigationalStatus", 15),
-                        "destination": metadata.get("Destination", "Unknown").strip(),
-                        "eta": metadata.get("ETA"),
-                        "length": metadata.get("Dimension", {}).get("A", 0) + metadata.get("Dimension", {}).get("B", 0),
-                        "width": metadata.get("Dimension", {}).get("C", 0) + metadata.get("Dimension", {}).get("D", 0),
-                        "draught": msg.get("Draught"),
-                        "callsign": metadata.get("CallSign", "").strip(),
-                        "imo": metadata.get("IMO"),
-                        "timestamp": metadata.get("time_utc"),
-                        "distance_km": round(distance, 2)
-                    }
-                    
-                    # Deduplicate by MMSI (keep latest)
-                    ships_by_mmsi[mmsi] = ship
+                ship = parse_position_report(data)
+                if ship is None:
+                    return
+                
+                # Calculate distance from center
+                distance = haversine_distance(latitude, longitude, ship["latitude"], ship["longitude"])
+                
+                if distance > radius_km:
+                    return
+                
+                ship["distance_km"] = round(distance, 2)
+                
+                # Deduplicate by MMSI (keep latest)
+                ships_by_mmsi[ship["mmsi"]] = ship
                     
             except Exception as e:
                 # Silent fail on parse errors (don't break the stream)
@@ -204,36 +172,15 @@ class AISStreamClient:
             try:
                 data = json.loads(message)
                 
-                if data.get("MessageType") == "PositionReport":
-                    metadata = data.get("MetaData", {})
+                ship = parse_position_report(data)
+                
+                if ship is not None and ship["mmsi"] == mmsi:
+                    ship["last_position_update"] = ship["timestamp"]
+                    ship_found = ship
                     
-                    if metadata.get("MMSI") == mmsi:
-                        msg = data.get("Message", {}).get("PositionReport", {})
-                        
-                        ship_found = {
-                            "mmsi": mmsi,
-                            "name": metadata.get("ShipName", "Unknown").strip(),
-                            "ship_type": msg.get("ShipType", 0),
-                            "latitude": msg.get("Latitude"),
-                            "longitude": msg.get("Longitude"),
-                            "speed": msg.get("Sog", 0),
-                            "heading": msg.get("TrueHeading"),
-                            "course": msg.get("Cog"),
-                            "navigation_status": msg.get("NavigationalStatus", 15),
-                            "destination": metadata.get("Destination", "Unknown").strip(),
-                            "eta": metadata.get("ETA"),
-                            "length": metadata.get("Dimension", {}).get("A", 0) + metadata.get("Dimension", {}).get("B", 0),
-                            "width": metadata.get("Dimension", {}).get("C", 0) + metadata.get("Dimension", {}).get("D", 0),
-                            "draught": msg.get("Draught"),
-                            "callsign": metadata.get("CallSign", "").strip(),
-                            "imo": metadata.get("IMO"),
-                            "timestamp": metadata.get("time_utc"),
-                            "last_position_update": metadata.get("time_utc")
-                        }
-                        
-                        logger.info(f"Found ship MMSI {mmsi}")
-                        # Close immediately when found
-                        ws.close()
+                    logger.info(f"Found ship MMSI {mmsi}")
+                    # Close immediately when found
+                    ws.close()
             except Exception as e:
                 logger.debug(f"Error in get_ship_by_mmsi: {e}")
         
@@ -0,0 +1,254 @@
+"""Background AIS collector feeding an in-memory ShipIndex.
+
+Keeps one AISStream subscription open (reconnecting with backoff), or replays a local
+fixture feed, so queries are answered from memory instead of opening a WebSocket and
+listening for `timeout` seconds per call. Disabled unless configured.
+
+Environment:
+    AIS_COLLECTOR               1/true: keep a background AISStream subscription open
+    AIS_COLLECTOR_FIXTURE       JSONL file of AISStream messages to replay instead (no API key needed)
+    AIS_COLLECTOR_BBOXES        JSON list of [[lat1, lon1], [lat2, lon2]] boxes (default: whole world)
+    AIS_COLLECTOR_TTL_SEC       positions older than this are dropped (default: 900)
+    AIS_COLLECTOR_WARMUP_SEC    serve queries from memory after listening this long (default: 180)
+    AIS_COLLECTOR_REPLAY_SPEED  fixture pacing vs. message timestamps (default: 0 = as fast as possible)
+"""
+
+import os
+import json
+import math
+import time
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from .ship_index import ShipIndex, parse_position_report
+
+logger = logging.getLogger(__name__)
+
+WS_URL = "wss://stream.aisstream.io/v0/stream"
+EVICT_INTERVAL_SEC = 30
+MAX_BACKOFF_SEC = 60
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def _parse_time(value: Any) -> Optional[float]:
+    """Epoch seconds from AISStream 'time_utc' ("2024-01-01 12:00:00.123 +0000 UTC" or ISO)."""
+    if not isinstance(value, str) or len(value) < 19:
+        return None
+    try:
+        return datetime.strptime(value[:19].replace("T", " "), "%Y-%m-%d %H:%M:%S").timestamp()
+    except ValueError:
+        return None
+
+
+class AISCollector:
+    """One long-lived AIS source (stream or fixture) and the index it fills."""
+
+    def __init__(
+        self,
+        api_key: str = "",
+        fixture: Optional[str] = None,
+        bboxes: Optional[List[List[List[float]]]] = None,
+        ttl_sec: float = 900,
+        warmup_sec: float = 180,
+        replay_speed: float = 0.0
+    ):
+        self.api_key = api_key
+        self.fixture = fixture
+        self.bboxes = bboxes
+        self.warmup_sec = warmup_sec
+        self.replay_speed = replay_speed
+        self.index = ShipIndex(ttl_sec=ttl_sec)
+        self.mode = "fixture" if fixture else "stream"
+        self.state = "idle"
+        self.messages = 0
+        self.reconnects = 0
+        self.started_at: Optional[float] = None
+        self._ready_at: Optional[float] = None
+        self._last_evict = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._ws = None
+
+    @classmethod
+    def from_env(cls) -> Optional["AISCollector"]:
+        """Collector configured from AIS_COLLECTOR_* variables, or None when disabled."""
+        fixture = os.getenv("AIS_COLLECTOR_FIXTURE", "").strip() or None
+        enabled = os.getenv("AIS_COLLECTOR", "").strip().lower() in ("1", "true", "yes", "on")
+        api_key = os.getenv("AISSTREAM_API_KEY", "").strip()
+        if not fixture and not (enabled and api_key):
+            return None
+        bboxes = None
+        raw = os.getenv("AIS_COLLECTOR_BBOXES", "").strip()
+        if raw:
+            try:
+                bboxes = json.loads(raw)
+            except ValueError:
+                logger.warning("Ignoring invalid AIS_COLLECTOR_BBOXES (expected JSON list of boxes)")
+        return cls(
+            api_key=api_key,
+            fixture=os.path.expanduser(fixture) if fixture else None,
+            bboxes=bboxes,
+            ttl_sec=_env_float("AIS_COLLECTOR_TTL_SEC", 900),
+            warmup_sec=_env_float("AIS_COLLECTOR_WARMUP_SEC", 180),
+            replay_speed=_env_float("AIS_COLLECTOR_REPLAY_SPEED", 0.0),
+        )
+
+    # ---- lifecycle ----
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.started_at = time.time()
+        target = self._run_fixture if self.fixture else self._run_stream
+        self._thread = threading.Thread(target=target, name="ais_collector", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._ws is not None:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    @property
+    def ready(self) -> bool:
+        """True once the index is complete enough to answer instead of a live query."""
+        return self._ready_at is not None and time.time() >= self._ready_at
+
+    def covers(self, latitude: float, longitude: float, radius_km: float) -> bool:
+        """True when the search area lies inside the subscribed bounding boxes."""
+        if not self.bboxes:
+            return True
+        lat_delta = radius_km / 111.0
+        lon_delta = radius_km / (111.0 * max(1e-6, abs(math.cos(math.radians(latitude)))))
+        for (lat1, lon1), (lat2, lon2) in self.bboxes:
+            if (min(lat1, lat2) <= latitude - lat_delta and latitude + lat_delta <= max(lat1, lat2)
+                    and min(lon1, lon2) <= longitude - lon_delta and longitude + lon_delta <= max(lon1, lon2)):
+                return True
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "state": self.state,
+            "ready": self.ready,
+            "ships_indexed": len(self.index),
+            "messages": self.messages,
+            "reconnects": self.reconnects,
+            "uptime_sec": round(time.time() - self.started_at, 1) if self.started_at else 0,
+        }
+
+    # ---- ingestion ----
+
+    def ingest(self, data: Dict[str, Any]) -> None:
+        ship = parse_position_report(data)
+        if ship is None:
+            return
+        self.messages += 1
+        now = time.time()
+        self.index.upsert(ship, now)
+        if now - self._last_evict >= EVICT_INTERVAL_SEC:
+            self._last_evict = now
+            self.index.evict(now)
+
+    def _run_fixture(self) -> None:
+        self.state = "replaying"
+        prev_ts: Optional[float] = None
+        try:
+            with open(self.fixture, "r", encoding="utf-8") as f:
+                for line in f:
+                    if self._stop.is_set():
+                        break
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        data = json.loads(line)
+                    except ValueError:
+                        continue
+                    if self.replay_speed > 0:
+                        ts = _parse_time(data.get("MetaData", {}).get("time_utc"))
+                        if ts is not None and prev_ts is not None and ts > prev_ts:
+                            self._stop.wait((ts - prev_ts) / self.replay_speed)
+                        prev_ts = ts if ts is not None else prev_ts
+                    self.ingest(data)
+            self.state = "replayed"
+        except OSError as e:
+            logger.warning(f"AIS fixture replay failed: {e}")
+            self.state = "error"
+        # A replayed feed is as complete as it will get
+        self._ready_at = time.time()
+
+    def _run_stream(self) -> None:
+        try:
+            import websocket
+        except ImportError:
+            logger.warning("AIS collector needs websocket-client (pip install websocket-client)")
+            self.state = "error"
+            return
+
+        backoff = 1.0
+
+        def on_open(ws):
+            nonlocal backoff
+            backoff = 1.0
+            self.state = "connected"
+            if self._ready_at is None:
+                self._ready_at = time.time() + self.warmup_sec
+            subscribe_message = {
+                "APIKey": self.api_key,
+                "BoundingBoxes": self.bboxes or [[[-90, -180], [90, 180]]],
+                "FilterMessageTypes": ["PositionReport"]
+            }
+            ws.send(json.dumps(subscribe_message))
+            logger.info("AIS collector subscribed")
+
+        def on_message(ws, message):
+            try:
+                self.ingest(json.loads(message))
+            except Exception as e:
+                logger.debug(f"Error parsing AIS message: {e}")
+
+        def on_error(ws, error):
+            logger.debug(f"AIS collector WebSocket error: {error}")
+
+        while not self._stop.is_set():
+            self.state = "connecting"
+            self._ws = websocket.WebSocketApp(WS_URL, on_open=on_open, on_message=on_message, on_error=on_error)
+            self._ws.run_forever(ping_interval=30, ping_timeout=10)
+            if self._stop.is_set():
+                break
+            self.state = "reconnecting"
+            self.reconnects += 1
+            logger.info(f"AIS collector disconnected, reconnecting in {backoff:.0f}s")
+            self._stop.wait(backoff)
+            backoff = min(MAX_BACKOFF_SEC, backoff * 2)
+        self.state = "stopped"
+
+
+_collector: Optional[AISCollector] = None
+_collector_checked = False
+_lock = threading.Lock()
+
+
+def get_collector() -> Optional[AISCollector]:
+    """Process-wide collector, started on first use; None when not configured."""
+    global _collector, _collector_checked
+    with _lock:
+        if not _collector_checked:
+            _collector_checked = True
+            _collector = AISCollector.from_env()
+            if _collector is not None:
+                _collector.start()
+        return _collector
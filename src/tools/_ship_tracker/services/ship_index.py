@@ -0,0 +1,157 @@
+"""In-memory index of the latest AIS position per ship.
+
+Ships are bucketed in a fixed lat/lon grid (cell_deg degrees), so an area query only
+visits the cells overlapping the search bounding box instead of every ship. Entries
+older than the TTL are ignored by queries and dropped by `evict()`.
+"""
+
+import math
+import threading
+import time
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from ..utils import haversine_distance
+
+
+def parse_position_report(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Build a ship record from an AISStream PositionReport message.
+
+    Args:
+        data: Decoded AISStream message
+
+    Returns:
+        Ship record or None if the message is not a usable position report
+    """
+    if data.get("MessageType") != "PositionReport":
+        return None
+    metadata = data.get("MetaData", {})
+    mmsi = metadata.get("MMSI")
+    if not mmsi:
+        return None
+    msg = data.get("Message", {}).get("PositionReport", {})
+    lat = msg.get("Latitude")
+    lon = msg.get("Longitude")
+    if lat is None or lon is None:
+        return None
+    dimension = metadata.get("Dimension", {})
+    return {
+        "mmsi": mmsi,
+        "name": metadata.get("ShipName", "Unknown").strip(),
+        "ship_type": msg.get("ShipType", 0),
+        "latitude": lat,
+        "longitude": lon,
+        "speed": msg.get("Sog", 0),  # Speed over ground in knots
+        "heading": msg.get("TrueHeading"),
+        "course": msg.get("Cog"),  # Course over ground
+        "navigation_status": msg.get("NavigationalStatus", 15),
+        "destination": metadata.get("Destination", "Unknown").strip(),
+        "eta": metadata.get("ETA"),
+        "length": dimension.get("A", 0) + dimension.get("B", 0),
+        "width": dimension.get("C", 0) + dimension.get("D", 0),
+        "draught": msg.get("Draught"),
+        "callsign": metadata.get("CallSign", "").strip(),
+        "imo": metadata.get("IMO"),
+        "timestamp": metadata.get("time_utc"),
+    }
+
+
+class ShipIndex:
+    """Latest position per MMSI, bucketed by grid cell, with TTL expiry."""
+
+    def __init__(self, cell_deg: float = 0.5, ttl_sec: float = 900):
+        """Initialize an empty index.
+
+        Args:
+            cell_deg: Grid cell size in degrees
+            ttl_sec: Positions older than this are considered stale
+        """
+        self.cell_deg = cell_deg
+        self.ttl_sec = ttl_sec
+        self._rows = int(math.ceil(180 / cell_deg))
+        self._cols = int(math.ceil(360 / cell_deg))
+        self._ships: Dict[int, Dict[str, Any]] = {}
+        self._seen: Dict[int, float] = {}
+        self._cell_of: Dict[int, Tuple[int, int]] = {}
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ships)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        row = min(self._rows - 1, max(0, int((lat + 90) // self.cell_deg)))
+        col = int((lon + 180) // self.cell_deg) % self._cols
+        return row, col
+
+    def upsert(self, ship: Dict[str, Any], now: Optional[float] = None) -> None:
+        """Insert or replace the record of ship['mmsi']."""
+        now = time.time() if now is None else now
+        mmsi = ship["mmsi"]
+        cell = self._cell(ship["latitude"], ship["longitude"])
+        with self._lock:
+            old = self._cell_of.get(mmsi)
+            if old != cell:
+                if old is not None:
+                    self._discard_from_cell(mmsi, old)
+                self._cells.setdefault(cell, set()).add(mmsi)
+                self._cell_of[mmsi] = cell
+            self._ships[mmsi] = ship
+            self._seen[mmsi] = now
+
+    def _discard_from_cell(self, mmsi: int, cell: Tuple[int, int]) -> None:
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(mmsi)
+            if not members:
+                del self._cells[cell]
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Drop stale entries. Returns the number of ships removed."""
+        cutoff = (time.time() if now is None else now) - self.ttl_sec
+        with self._lock:
+            stale = [m for m, t in self._seen.items() if t < cutoff]
+            for mmsi in stale:
+                self._discard_from_cell(mmsi, self._cell_of.pop(mmsi))
+                del self._ships[mmsi]
+                del self._seen[mmsi]
+        return len(stale)
+
+    def get(self, mmsi: int, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Fresh record for an MMSI, with its age in seconds, or None."""
+        now = time.time() if now is None else now
+        with self._lock:
+            seen = self._seen.get(mmsi)
+            if seen is None or now - seen > self.ttl_sec:
+                return None
+            return {**self._ships[mmsi], "age_sec": round(now - seen, 1)}
+
+    def within(self, latitude: float, longitude: float, radius_km: float,
+               now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Fresh ships within radius_km of a point, nearest first (adds distance_km)."""
+        now = time.time() if now is None else now
+        lat_delta = radius_km / 111.0
+        cos_lat = abs(math.cos(math.radians(latitude)))
+        lon_delta = 180.0 if cos_lat < 1e-6 else min(180.0, radius_km / (111.0 * cos_lat))
+        row_lo, _ = self._cell(max(-90.0, latitude - lat_delta), 0.0)
+        row_hi, _ = self._cell(min(90.0, latitude + lat_delta), 0.0)
+        if lon_delta >= 180.0:
+            cols = range(self._cols)
+        else:
+            col_lo = int((longitude - lon_delta + 180) // self.cell_deg)
+            col_hi = int((longitude + lon_delta + 180) // self.cell_deg)
+            cols = sorted({c % self._cols for c in range(col_lo, col_hi + 1)})
+
+        found: List[Dict[str, Any]] = []
+        with self._lock:
+            for row in range(row_lo, row_hi + 1):
+                for col in cols:
+                    for mmsi in self._cells.get((row, col), ()):
+                        seen = self._seen[mmsi]
+                        if now - seen > self.ttl_sec:
+                            continue
+                        ship = self._ships[mmsi]
+                        distance = haversine_distance(latitude, longitude, ship["latitude"], ship["longitude"])
+                        if distance <= radius_km:
+                            found.append({**ship, "distance_km": round(distance, 2), "age_sec": round(now - seen, 1)})
+        found.sort(key=lambda s: s["distance_km"])
+        return found
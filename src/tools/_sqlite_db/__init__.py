@@ -0,0 +1,6 @@
+"""sqlite_db internals: connection cache and server-side cursors."""
+from __future__ import annotations
+
+from . import connections, cursors
+
+__all__ = ["connections", "cursors"]
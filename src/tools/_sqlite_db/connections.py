@@ -0,0 +1,225 @@
+"""Per-database connection cache for sqlite_db.
+
+One connection per (db file, read_only), reused across calls instead of
+sqlite3.connect() on every operation:
+- Tuned once at open: busy_timeout, mmap_size; WAL + synchronous=NORMAL only when
+  SQLITE_DB_WAL=1 (opt-in: WAL is persistent in the file and adds -wal/-shm side files)
+- Shared across executor threads (check_same_thread=False), one call at a time per
+  connection (lock); a failed call rolls back so no transaction leaks to the next caller
+- Pinned (refcount) from lookup until the block exits: eviction, invalidation and
+  close_path never close a pinned connection, they retire it and its last user closes it
+- Revalidated against the file identity (st_dev, st_ino): a deleted/replaced DB file
+  gets a fresh connection
+- Never handed over with caller state: an authorizer flags PRAGMA assignments, ATTACH/DETACH
+  and TEMP objects, and a flagged connection is closed when its block exits
+- LRU-bounded (SQLITE_DB_CONN_CACHE); idle connections are closed on eviction
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MAX_CONNS = max(1, int(os.getenv("SQLITE_DB_CONN_CACHE", "8")))
+_MMAP_BYTES = max(0, int(os.getenv("SQLITE_DB_MMAP_BYTES", str(256 * 1024 * 1024))))
+_BUSY_TIMEOUT_MS = max(0, int(os.getenv("SQLITE_DB_BUSY_TIMEOUT_MS", "5000")))
+_WAL = os.getenv("SQLITE_DB_WAL", "0").strip().lower() in {"1", "true", "yes", "on"}
+
+Key = Tuple[str, bool]
+
+
+# Statements leaving per-connection state behind (TEMP objects, attached DBs)
+_STATEFUL_ACTIONS = frozenset({
+    sqlite3.SQLITE_ATTACH, sqlite3.SQLITE_DETACH,
+    sqlite3.SQLITE_CREATE_TEMP_TABLE, sqlite3.SQLITE_CREATE_TEMP_INDEX,
+    sqlite3.SQLITE_CREATE_TEMP_TRIGGER, sqlite3.SQLITE_CREATE_TEMP_VIEW,
+})
+# PRAGMAs whose argument names an object to inspect rather than a value to assign
+_INSPECT_PRAGMAS = frozenset({
+    "table_info", "table_xinfo", "table_list", "index_list", "index_info", "index_xinfo",
+    "foreign_key_list", "foreign_key_check", "integrity_check", "quick_check",
+})
+
+
+class _Entry:
+    __slots__ = ("conn", "lock", "ident", "last_used", "users", "retired", "dirty")
+
+    def __init__(self, conn: sqlite3.Connection, ident: Optional[Tuple[int, int]]):
+        self.conn = conn
+        self.lock = threading.RLock()
+        self.ident = ident
+        self.last_used = time.monotonic()
+        self.users = 0  # pins, guarded by _cache_lock
+        self.retired = False
+        self.dirty = False  # caller changed connection state: not reusable
+        conn.set_authorizer(self._authorize)
+
+    def _authorize(self, action: int, arg1: Optional[str], arg2: Optional[str],
+                   dbname: Optional[str], source: Optional[str]) -> int:
+        if action in _STATEFUL_ACTIONS or (action == sqlite3.SQLITE_PRAGMA and arg2 is not None
+                                           and (arg1 or "").lower() not in _INSPECT_PRAGMAS):
+            self.dirty = True
+        return sqlite3.SQLITE_OK
+
+
+_cache: Dict[Key, _Entry] = {}
+_cache_lock = threading.Lock()
+_stats = {"opened": 0, "reused": 0, "evicted": 0, "invalidated": 0, "reset": 0}
+
+
+def _ident(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+        return (st.st_dev, st.st_ino)
+    except OSError:
+        return None
+
+
+def open_connection(path: Path, read_only: bool = False) -> sqlite3.Connection:
+    """New tuned connection (not cached); usable from any thread."""
+    if read_only:
+        conn = sqlite3.connect(f"file:{path.as_posix()}?mode=ro", uri=True, check_same_thread=False)
+    else:
+        conn = sqlite3.connect(str(path), check_same_thread=False)
+    conn.execute(f"PRAGMA busy_timeout={_BUSY_TIMEOUT_MS}")
+    if _MMAP_BYTES:
+        conn.execute(f"PRAGMA mmap_size={_MMAP_BYTES}")
+    if not read_only and _WAL:
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.OperationalError as e:  # e.g. DB locked by another writer: keep default journal
+            logger.debug("WAL not enabled for %s: %s", path.name, e)
+    _stats["opened"] += 1
+    return conn
+
+
+def _close_entry(entry: _Entry) -> None:
+    try:
+        entry.conn.close()
+    except Exception:
+        pass
+
+
+def _retire_locked(entry: _Entry) -> None:
+    # Called with _cache_lock held, entry already out of _cache: a pinned entry is closed by its last user
+    if entry.users:
+        entry.retired = True
+    else:
+        _close_entry(entry)
+
+
+def _evict_locked() -> None:
+    # Called with _cache_lock held: drop least recently used unpinned connections
+    for key, entry in sorted(_cache.items(), key=lambda kv: kv[1].last_used):
+        if len(_cache) <= _MAX_CONNS:
+            return
+        if entry.users:
+            continue
+        del _cache[key]
+        _close_entry(entry)
+        _stats["evicted"] += 1
+
+
+def _get_entry(path: Path, read_only: bool) -> _Entry:
+    key = (str(path), read_only)
+    ident = _ident(path)
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and entry.ident != ident:
+            del _cache[key]
+            _retire_locked(entry)
+            _stats["invalidated"] += 1
+            entry = None
+        if entry is None:
+            entry = _Entry(open_connection(path, read_only), _ident(path))
+            entry.users = 1
+            _cache[key] = entry
+            _evict_locked()
+        else:
+            entry.users += 1
+            _stats["reused"] += 1
+        entry.last_used = time.monotonic()
+        return entry
+
+
+def _release(entry: _Entry) -> None:
+    with _cache_lock:
+        entry.users -= 1
+        if entry.retired and not entry.users:
+            _close_entry(entry)
+        elif len(_cache) > _MAX_CONNS:
+            # Entries pinned when the cache overflowed are evictable now
+            _evict_locked()
+
+
+def _retire_dirty(entry: _Entry, key: Key) -> None:
+    with _cache_lock:
+        if _cache.get(key) is entry:
+            del _cache[key]
+        if not entry.retired:
+            entry.retired = True
+            _stats["reset"] += 1
+
+
+def _acquire(path: Path, read_only: bool) -> _Entry:
+    # Pinned and locked entry; one left dirty by the previous holder is skipped (already uncached)
+    while True:
+        entry = _get_entry(path, read_only)
+        entry.lock.acquire()
+        if not entry.dirty:
+            return entry
+        entry.lock.release()
+        _release(entry)
+
+
+@contextmanager
+def connection(path: Path, read_only: bool = False) -> Iterator[sqlite3.Connection]:
+    """Cached connection for the DB file, held exclusively for the duration of the block."""
+    entry = _acquire(path, read_only)
+    try:
+        try:
+            conn = entry.conn
+            conn.row_factory = None
+            try:
+                yield conn
+            except BaseException:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                raise
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+                if entry.dirty:
+                    _retire_dirty(entry, (str(path), read_only))
+        finally:
+            entry.lock.release()
+    finally:
+        _release(entry)
+
+
+def close_path(path: Path) -> int:
+    """Close cached connections of one DB file (before delete). Returns count closed.
+
+    A connection still in use is closed by its current user when its block exits.
+    """
+    closed = 0
+    with _cache_lock:
+        for key in [k for k in _cache if k[0] == str(path)]:
+            _retire_locked(_cache.pop(key))
+            closed += 1
+    return closed
+
+
+def stats() -> Dict[str, Any]:
+    with _cache_lock:
+        return dict(_stats, cached=len(_cache), max=_MAX_CONNS, mmap_bytes=_MMAP_BYTES, wal=_WAL)
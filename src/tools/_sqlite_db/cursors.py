@@ -0,0 +1,217 @@
+"""Server-side cursors and row streaming for sqlite_db.
+
+- A cursor keeps its own read-only connection. On a WAL database the statement stays
+  open and pages are read with fetchmany(); otherwise an open statement would hold the
+  SHARED lock (and block writers) until the cursor expires, so each fetch runs the query
+  for one page (LIMIT/OFFSET) and resets it
+- Cursors expire after SQLITE_DB_CURSOR_TTL seconds without a fetch; at most
+  SQLITE_DB_MAX_CURSORS are open (least recently used closed first)
+- stream_rows() yields row chunks for the generator path of /execute
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .connections import open_connection
+
+logger = logging.getLogger(__name__)
+
+_TTL_SEC = max(1.0, float(os.getenv("SQLITE_DB_CURSOR_TTL", "300")))
+_MAX_CURSORS = max(1, int(os.getenv("SQLITE_DB_MAX_CURSORS", "16")))
+
+
+def _execute(conn: sqlite3.Connection, sql: str, params: Any) -> sqlite3.Cursor:
+    cur = conn.cursor()
+    if params is None:
+        cur.execute(sql)
+    else:
+        cur.execute(sql, params)
+    return cur
+
+
+def _page_query(sql: str, params: Any, limit: int, offset: int) -> Tuple[Optional[str], Any]:
+    """Wrap a SELECT/WITH query to read one page; PRAGMA cannot be wrapped (None)."""
+    body = sql.strip().rstrip(";")
+    if not body.lower().startswith(("select", "with")):
+        return None, None
+    if isinstance(params, dict):
+        return (f"SELECT * FROM ({body}\n) LIMIT :_page_limit OFFSET :_page_offset",
+                {**params, "_page_limit": limit, "_page_offset": offset})
+    return f"SELECT * FROM ({body}\n) LIMIT ? OFFSET ?", [*(params or ()), limit, offset]
+
+
+class ServerCursor:
+    """SELECT on a dedicated read-only connection, paged with fetchmany().
+
+    hold=None keeps the statement open only when the database is in WAL mode;
+    stream_rows() holds it (True) since the stream is read through without pauses.
+    """
+
+    def __init__(self, db: str, path: Path, sql: str, params: Any, hold: Optional[bool] = None):
+        self.id = uuid.uuid4().hex[:16]
+        self.db = db
+        self.path = str(path)
+        self.lock = threading.Lock()
+        self.offset = 0
+        self.last_used = time.monotonic()
+        self._sql = sql
+        self._params = params
+        self._conn = open_connection(path, read_only=True)
+        try:
+            if hold is None:
+                hold = self._conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+            self.hold = hold
+            self._cur: Optional[sqlite3.Cursor] = _execute(self._conn, sql, params)
+            self.columns: List[str] = [c[0] for c in self._cur.description or []]
+            if not hold:
+                # Reset now: the first page is read by fetch() like the others
+                self._cur.close()
+                self._cur = None
+        except Exception:
+            self._conn.close()
+            raise
+        self._ahead: Optional[tuple] = None
+        self.closed = False
+
+    def _fetch_page(self, n: int) -> List[tuple]:
+        # n + 1 rows from the current offset, statement reset afterwards (no lock kept)
+        sql, params = _page_query(self._sql, self._params, n + 1, self.offset)
+        if sql is None:
+            cur = _execute(self._conn, self._sql, self._params)
+            try:
+                if self.offset:
+                    cur.fetchmany(self.offset)
+                return cur.fetchmany(n + 1)
+            finally:
+                cur.close()
+        cur = _execute(self._conn, sql, params)
+        try:
+            return cur.fetchall()
+        finally:
+            cur.close()
+
+    def fetch(self, n: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Next n rows as dicts and whether more rows remain."""
+        with self.lock:
+            if self.closed:
+                return [], False
+            self.last_used = time.monotonic()
+            if self._cur is None:
+                raw = self._fetch_page(n)
+                more = len(raw) > n
+                del raw[n:]
+            else:
+                raw = self._cur.fetchmany(n + 1 if self._ahead is None else n)
+                if self._ahead is not None:
+                    raw.insert(0, self._ahead)
+                self._ahead = raw.pop() if len(raw) > n else None
+                more = self._ahead is not None
+            cols = self.columns
+            rows = [dict(zip(cols, r)) for r in raw]
+            self.offset += len(rows)
+            return rows, more
+
+    def close(self) -> None:
+        with self.lock:
+            if not self.closed:
+                self.closed = True
+                try:
+                    if self._cur is not None:
+                        self._cur.close()
+                    self._conn.close()
+                except Exception:
+                    pass
+
+
+_cursors: Dict[str, ServerCursor] = {}
+_lock = threading.Lock()
+
+
+def _reap_locked() -> None:
+    now = time.monotonic()
+    for cid, c in list(_cursors.items()):
+        if c.closed or now - c.last_used > _TTL_SEC:
+            del _cursors[cid]
+            c.close()
+    while len(_cursors) >= _MAX_CURSORS:
+        cid, c = min(_cursors.items(), key=lambda kv: kv[1].last_used)
+        logger.info("sqlite_db: closing cursor %s (max %d open)", cid, _MAX_CURSORS)
+        del _cursors[cid]
+        c.close()
+
+
+def open_cursor(db: str, path: Path, sql: str, params: Any) -> ServerCursor:
+    cursor = ServerCursor(db, path, sql, params)
+    with _lock:
+        _reap_locked()
+        _cursors[cursor.id] = cursor
+    return cursor
+
+
+def get_cursor(cursor_id: str) -> Optional[ServerCursor]:
+    with _lock:
+        _reap_locked()
+        return _cursors.get(cursor_id)
+
+
+def close_cursor(cursor_id: str) -> bool:
+    with _lock:
+        c = _cursors.pop(cursor_id, None)
+    if c is None:
+        return False
+    c.close()
+    return True
+
+
+def close_path(path: Path) -> int:
+    """Close cursors open on one DB file (before delete)."""
+    with _lock:
+        doomed = [cid for cid, c in _cursors.items() if c.path == str(path)]
+        items = [_cursors.pop(cid) for cid in doomed]
+    for c in items:
+        c.close()
+    return len(items)
+
+
+def open_cursor_count() -> int:
+    with _lock:
+        return len(_cursors)
+
+
+def stream_rows(db: str, path: Path, sql: str, params: Any, batch: int) -> Iterator[Dict[str, Any]]:
+    """Execute now (errors raise to the caller), then yield chunks lazily.
+
+    Chunks: {"chunk_type": "columns"}, {"chunk_type": "rows"} per batch,
+    {"chunk_type": "terminal"} (or "error" with terminal=True).
+    """
+    cursor = ServerCursor(db, path, sql, params, hold=True)
+
+    def gen() -> Iterator[Dict[str, Any]]:
+        t0 = time.perf_counter()
+        try:
+            yield {"chunk_type": "columns", "db": db, "columns": cursor.columns}
+            more = True
+            while more:
+                start = cursor.offset
+                rows, more = cursor.fetch(batch)
+                if rows:
+                    yield {"chunk_type": "rows", "offset": start, "rows": rows}
+            yield {
+                "chunk_type": "terminal",
+                "row_count": cursor.offset,
+                "duration_ms": int((time.perf_counter() - t0) * 1000),
+            }
+        except Exception as e:
+            logger.error("sqlite_db stream failed after %d rows: %s", cursor.offset, e)
+            yield {"chunk_type": "error", "error": {"message": str(e)[:200]}, "row_count": cursor.offset, "terminal": True}
+        finally:
+            cursor.close()
+
+    return gen()
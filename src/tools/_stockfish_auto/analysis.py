@@ -4,6 +4,7 @@ Per-move annotation analysis for Stockfish Auto-75
 import io
 from typing import Dict, Any, List, Optional, Tuple
 from .services.engine import Engine, StockfishNotFound
+from .services.engine_pool import pooled
 from .core import _auto_threads, _auto_hash_mb, _quality_movetime_ms, _mk_options, _format_infos
 
 
@@ -24,7 +25,6 @@ def _score_to_cp(score: Optional[Dict[str, Any]]) -> Optional[int]:
 
 
 def _eval_position_with_engine(eng: Engine, fen: str, movetime_ms: int, played_uci: Optional[str] = None) -> Tuple[Optional[int], Dict[str, Any]]:
-    eng.new_game()
     eng.position(startpos=False, fen=fen, moves=None)
     res = eng.go(movetime_ms=movetime_ms, searchmoves=[played_uci] if played_uci else None)
     infos = res.get('infos', [])
@@ -57,69 +57,67 @@ def analyze_game(analyze: Dict[str, Any], quality: str = 'balanced', resource_ta
         threads = _auto_threads(resource_target_percent)
         hash_mb = _auto_hash_mb(resource_target_percent)
         options = _mk_options(threads, hash_mb, 1)
-        eng = Engine()
-        eng.start()
-        eng.set_options(options)
 
         game = chess_pgn.read_game(io.StringIO(pgn))
         if game is None:
-            eng.close()
             return {'error': 'Invalid PGN'}
 
-        board = game.board()
-        total_events = 0
-        returned_events: List[Dict[str, Any]] = []
-        movetime = _quality_movetime_ms(quality)
+        # One lease for the whole game: plies share the engine and its hash table
+        with pooled(options) as pe:
+            eng = pe.engine
+            board = game.board()
+            total_events = 0
+            returned_events: List[Dict[str, Any]] = []
+            movetime = _quality_movetime_ms(quality)
 
-        ply = 0
-        for move in game.mainline_moves():
-            if ply >= max_moves:
-                break
-            fen_before = board.fen()
-            uci = move.uci()
-            san = board.san(move)
-            best_cp, best_res = _eval_position_with_engine(eng, fen_before, movetime_ms=movetime)
-            played_cp, played_res = _eval_position_with_engine(eng, fen_before, movetime_ms=movetime, played_uci=uci)
+            ply = 0
+            for move in game.mainline_moves():
+                if ply >= max_moves:
+                    break
+                fen_before = board.fen()
+                uci = move.uci()
+                san = board.san(move)
+                best_cp, best_res = _eval_position_with_engine(eng, fen_before, movetime_ms=movetime)
+                played_cp, played_res = _eval_position_with_engine(eng, fen_before, movetime_ms=movetime, played_uci=uci)
 
-            classification = None
-            drop = None
-            if best_cp is not None and played_cp is not None:
-                drop = best_cp - played_cp
-                if drop >= blunder_cp:
-                    classification = 'blunder'
-                elif drop >= inacc_cp:
-                    classification = 'inaccuracy'
+                classification = None
+                drop = None
+                if best_cp is not None and played_cp is not None:
+                    drop = best_cp - played_cp
+                    if drop >= blunder_cp:
+                        classification = 'blunder'
+                    elif drop >= inacc_cp:
+                        classification = 'inaccuracy'
 
-            if classification:
-                total_events += 1
-                if len(returned_events) < limit:
-                    returned_events.append({
-                        'ply': ply + 1,
-                        'move_number': (ply // 2) + 1,
-                        'side': 'w' if board.turn else 'b',
-                        'played': {
-                            'uci': uci,
-                            'san': san,
-                            'eval_cp': played_cp,
-                            'pv': played_res.get('infos', [{}])[0].get('pv') if played_res.get('infos') else []
-                        },
-                        'best': {
-                            'eval_cp': best_cp,
-                            'bestmove': best_res.get('bestmove'),
-                            'pv': best_res.get('infos', [{}])[0].get('pv') if best_res.get('infos') else []
-                        },
-                        'drop_cp': drop,
-                        'classification': classification,
-                    })
-            board.push(move)
-            ply += 1
+                if classification:
+                    total_events += 1
+                    if len(returned_events) < limit:
+                        returned_events.append({
+                            'ply': ply + 1,
+                            'move_number': (ply // 2) + 1,
+                            'side': 'w' if board.turn else 'b',
+                            'played': {
+                                'uci': uci,
+                                'san': san,
+                                'eval_cp': played_cp,
+                                'pv': played_res.get('infos', [{}])[0].get('pv') if played_res.get('infos') else []
+                            },
+                            'best': {
+                                'eval_cp': best_cp,
+                                'bestmove': best_res.get('bestmove'),
+                                'pv': best_res.get('infos', [{}])[0].get('pv') if best_res.get('infos') else []
+                            },
+                            'drop_cp': drop,
+                            'classification': classification,
+                        })
+                board.push(move)
+                ply += 1
 
-        eng.close()
         truncated = total_events > len(returned_events)
         return {
             'engine': {
-                'threads': threads,
-                'hash_mb': hash_mb,
+                'threads': pe.options.get('Threads', threads),
+                'hash_mb': pe.options.get('Hash', hash_mb),
                 'quality': quality,
                 'movetime_ms': movetime,
                 'multipv': 1
@@ -4,7 +4,7 @@ Routing for Stockfish Auto-75
 from typing import Dict, Any
 from . import core, validators
 
-OPERATIONS = ['evaluate_position', 'analyze_game']
+OPERATIONS = ['evaluate_position', 'analyze_game', 'analyze_pgn']
 
 
 def execute_operation(operation: str, **params) -> Dict[str, Any]:
@@ -18,6 +18,7 @@ def execute_operation(operation: str, **params) -> Dict[str, Any]:
         handlers = {
             'evaluate_position': lambda: core.evaluate_position(**validated),
             'analyze_game': lambda: core.analyze_game(**validated),
+            'analyze_pgn': lambda: core.analyze_pgn(**validated),
         }
         return handlers[operation]()
     except Exception as e:
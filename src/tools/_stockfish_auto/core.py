@@ -3,9 +3,13 @@ Core logic for Stockfish Auto-75 (UCI invocation, local engine required)
 """
 import multiprocessing
 import io
+import sqlite3
 import time
+from contextlib import ExitStack
 from typing import Dict, Any, List, Optional, Tuple
+from .services import eval_cache
 from .services.engine import Engine, StockfishNotFound
+from .services.engine_pool import pooled, game_key, stats as pool_stats
 
 
 def _auto_threads(target_percent: int) -> int:
@@ -31,6 +35,11 @@ def _quality_movetime_ms(quality: str) -> int:
     return {'fast': 1000, 'balanced': 2000, 'deep': 5000}[quality]
 
 
+def _bulk_movetime_ms(quality: str) -> int:
+    # Per-position budget for analyze_pgn (many positions, warm engine)
+    return {'fast': 100, 'balanced': 300, 'deep': 1000}[quality]
+
+
 def _mk_options(threads: int, hash_mb: int, multipv: int) -> Dict[str, Any]:
     return {
         'Threads': threads,
@@ -78,32 +87,90 @@ def _score_to_cp(score: Optional[Dict[str, Any]]) -> Optional[int]:
     return None
 
 
-def evaluate_position(position: Dict[str, Any], limit: int = 3, quality: str = 'balanced', resource_target_percent: int = 75, searchmoves: Optional[List[str]] = None, **kwargs) -> Dict[str, Any]:
+def _open_cache(use_cache: bool) -> Optional[sqlite3.Connection]:
+    if not use_cache or not eval_cache.enabled():
+        return None
+    try:
+        return eval_cache.connect()
+    except (sqlite3.Error, OSError):
+        return None  # cache is best-effort: analyze without it
+
+
+def _cache_load(conn: Optional[sqlite3.Connection], epd: Optional[str], skey: str, multipv: int,
+                depth: Optional[int], movetime_ms: Optional[int]) -> Optional[Dict[str, Any]]:
+    if conn is None or not epd:
+        return None
+    try:
+        return eval_cache.load(conn, epd, skey, multipv, depth=depth, movetime_ms=movetime_ms)
+    except sqlite3.Error:
+        return None
+
+
+def _cache_store(conn: Optional[sqlite3.Connection], epd: Optional[str], skey: str, multipv: int,
+                 res: Dict[str, Any], search_ms: int) -> None:
+    if conn is None or not epd or not res.get('infos'):
+        return
+    try:
+        eval_cache.store(conn, epd, skey, multipv, res, search_ms)
+    except sqlite3.Error:
+        pass
+
+
+def _search_limits(quality: str, depth: Optional[int], movetime_ms: Optional[int], default_ms: int) -> Tuple[Optional[int], Optional[int]]:
+    """(depth, movetime_ms) for `go`: explicit values win, else the quality preset."""
+    if depth is None and movetime_ms is None:
+        return None, default_ms
+    return depth, movetime_ms
+
+
+def evaluate_position(position: Dict[str, Any], limit: int = 3, quality: str = 'balanced', resource_target_percent: int = 75, searchmoves: Optional[List[str]] = None,
+                      depth: Optional[int] = None, movetime_ms: Optional[int] = None, use_cache: bool = True, **kwargs) -> Dict[str, Any]:
     t0 = time.time()
+    cache = None
     try:
         threads = _auto_threads(resource_target_percent)
         hash_mb = _auto_hash_mb(resource_target_percent)
         options = _mk_options(threads, hash_mb, limit)
-        eng = Engine()
-        eng.start()
-        eng.set_options(options)
         startpos = bool(position.get('startpos', True))
         fen: Optional[str] = position.get('fen')
         moves: Optional[List[str]] = position.get('moves')
-        eng.new_game()
-        eng.position(startpos=startpos, fen=fen, moves=moves)
-        res = eng.go(movetime_ms=_quality_movetime_ms(quality), searchmoves=searchmoves)
-        eng.close()
+        go_depth, go_ms = _search_limits(quality, depth, movetime_ms, _quality_movetime_ms(quality))
+        engine_info: Dict[str, Any] = {
+            'threads': threads,
+            'hash_mb': hash_mb,
+            'quality': quality,
+            'movetime_ms': go_ms,
+            'depth': go_depth,
+            'multipv': limit,
+        }
+
+        cache = _open_cache(use_cache)
+        epd = eval_cache.position_key(startpos, fen, moves) if cache is not None else None
+        skey = eval_cache.search_key(searchmoves)
+        res = _cache_load(cache, epd, skey, limit, go_depth, go_ms)
+        if res is not None:
+            engine_info.update({'cache': 'hit', 'cached_depth': eval_cache.result_depth(res), 'pool': pool_stats()})
+        else:
+            with pooled(options, game_key(startpos, fen, moves)) as pe:
+                t_search = time.time()
+                pe.engine.position(startpos=startpos, fen=fen, moves=moves)
+                res = pe.engine.go(movetime_ms=go_ms, depth=go_depth, searchmoves=searchmoves)
+                search_ms = int((time.time() - t_search) * 1000)
+            # Measured time: with both depth and movetime set the search may stop early at the depth
+            _cache_store(cache, epd, skey, limit, res, search_ms)
+            engine_info.update({
+                'threads': pe.options.get('Threads', threads),
+                'hash_mb': pe.options.get('Hash', hash_mb),
+                'warm': pe.warm,
+                'hash_reused': pe.reused_tt,
+                'search_ms': search_ms,
+                'cache': 'miss' if cache is not None and epd else 'off',
+                'pool': pool_stats(),
+            })
         infos = res.get('infos', [])
         formatted = _format_infos(infos, limit)
         return {
-            'engine': {
-                'threads': threads,
-                'hash_mb': hash_mb,
-                'quality': quality,
-                'movetime_ms': _quality_movetime_ms(quality),
-                'multipv': limit
-            },
+            'engine': engine_info,
             'bestmove': res.get('bestmove'),
             'result': formatted,
             'elapsed_ms': int((time.time() - t0) * 1000)
@@ -116,18 +183,33 @@ def evaluate_position(position: Dict[str, Any], limit: int = 3, quality: str = '
         }
     except Exception as e:
         return {'error': f'Engine error: {str(e)}', 'elapsed_ms': int((time.time() - t0) * 1000)}
+    finally:
+        if cache is not None:
+            cache.close()
+
 
+def _eval_position_with_engine(eng: Engine, fen: str, movetime_ms: int, played_uci: Optional[str] = None,
+                               cache: Optional[sqlite3.Connection] = None) -> Tuple[Optional[int], Dict[str, Any]]:
+    searchmoves = [played_uci] if played_uci else None
+    epd = eval_cache.position_key(False, fen, None) if cache is not None else None
+    skey = eval_cache.search_key(searchmoves)
+    res = _cache_load(cache, epd, skey, 1, None, movetime_ms)
+    if res is None:
+        # Positions of one game share the lease: no ucinewgame, the hash table carries over
+        eng.position(startpos=False, fen=fen, moves=None)
+        t_search = time.time()
+        # Ensure quick return: no min floor, short timeout
+        res = eng.go(
+            movetime_ms=movetime_ms,
+            searchmoves=searchmoves,
+            timeout_s=(movetime_ms / 1000.0) + 2.0,
+            min_floor_s=0.0,
+        )
+        _cache_store(cache, epd, skey, 1, res, int((time.time() - t_search) * 1000))
+    return _primary_cp(res), res
 
-def _eval_position_with_engine(eng: Engine, fen: str, movetime_ms: int, played_uci: Optional[str] = None) -> Tuple[Optional[int], Dict[str, Any]]:
-    eng.new_game()
-    eng.position(startpos=False, fen=fen, moves=None)
-    # Ensure quick return: no min floor, short timeout
-    res = eng.go(
-        movetime_ms=movetime_ms,
-        searchmoves=[played_uci] if played_uci else None,
-        timeout_s=(movetime_ms / 1000.0) + 2.0,
-        min_floor_s=0.0,
-    )
+
+def _primary_cp(res: Dict[str, Any]) -> Optional[int]:
     infos = res.get('infos', [])
     info = None
     for i in infos:
@@ -136,12 +218,12 @@ def _eval_position_with_engine(eng: Engine, fen: str, movetime_ms: int, played_u
             break
     if not info and infos:
         info = infos[0]
-    cp = _score_to_cp(info.get('score') if info else None)
-    return cp, res
+    return _score_to_cp(info.get('score') if info else None)
 
 
-def analyze_game(analyze: Dict[str, Any], quality: str = 'balanced', resource_target_percent: int = 75, **kwargs) -> Dict[str, Any]:
+def analyze_game(analyze: Dict[str, Any], quality: str = 'balanced', resource_target_percent: int = 75, use_cache: bool = True, **kwargs) -> Dict[str, Any]:
     t0 = time.time()
+    cache = None
     pgn = analyze.get('pgn')
     max_moves = int(analyze.get('max_moves', 200))
     blunder_cp = int(analyze.get('blunder_threshold_cp', 150))
@@ -161,104 +243,104 @@ def analyze_game(analyze: Dict[str, Any], quality: str = 'balanced', resource_ta
         threads = _auto_threads(resource_target_percent)
         hash_mb = _auto_hash_mb(resource_target_percent)
         options = _mk_options(threads, hash_mb, 1)
-        eng = Engine()
-        eng.start()
-        eng.set_options(options)
+        cache = _open_cache(use_cache)
 
         game = chess_pgn.read_game(io.StringIO(pgn))
         if game is None:
-            eng.close()
             return {'error': 'Invalid PGN', 'elapsed_ms': int((time.time() - t0) * 1000)}
 
-        board = game.board()
-        # Stage A: quick scan all plies with small movetime to find top hotspots
-        quick_ms = 200 if quality == 'fast' else 300
-        candidates: List[Dict[str, Any]] = []
-        ply = 0
-        for move in game.mainline_moves():
-            if ply >= max_moves:
-                break
-            # If we are very close to budget, stop scanning
-            if (time.time() - t0) >= budget_s * 0.6:  # keep time for deep pass
-                break
-            fen_before = board.fen()
-            uci = move.uci()
-            # best eval
-            best_cp, _ = _eval_position_with_engine(eng, fen_before, movetime_ms=quick_ms)
-            # played eval (approx by eval after move)
-            board.push(move)
-            fen_after = board.fen()
-            played_cp, _ = _eval_position_with_engine(eng, fen_after, movetime_ms=quick_ms)
-            board.pop()
-            if best_cp is not None and played_cp is not None:
-                drop = best_cp - played_cp
-                candidates.append({
-                    'ply': ply + 1,
-                    'fen': fen_before,
-                    'uci': uci,
-                    'drop_est': drop,
-                })
-            board.push(move)
-            ply += 1
-        # Rewind board to start for deep pass
-        # Re-parse to clean iterator state
-        game = chess_pgn.read_game(io.StringIO(pgn))
-        board = game.board()
-
-        # Stage B: deep analyze top-K by estimated drop
-        candidates.sort(key=lambda x: x['drop_est'] if x['drop_est'] is not None else -999999, reverse=True)
-        K = min(limit, max(1, len(candidates)))
-        remaining_s = max(0.0, budget_s - (time.time() - t0))
-        deep_ms_each = max(200, int((remaining_s * 1000) / max(1, K * 2)))  # 2 calls per hotspot (best + played)
-
-        returned_events: List[Dict[str, Any]] = []
-        counted = 0
-        for c in candidates[:K]:
-            if (time.time() - t0) >= budget_s:
-                break
-            fen_before = c['fen']
-            # deep best
-            best_cp, best_res = _eval_position_with_engine(eng, fen_before, movetime_ms=deep_ms_each)
-            # find SAN for reporting
-            # Recompute move SAN by playing moves up to ply (lightweight)
-            # For speed, we skip SAN resolution; keep UCI only in deep pass.
-            played_cp, played_res = _eval_position_with_engine(eng, fen_before, movetime_ms=deep_ms_each, played_uci=c['uci'])
-            classification = None
-            drop = None
-            if best_cp is not None and played_cp is not None:
-                drop = best_cp - played_cp
-                if drop >= blunder_cp:
-                    classification = 'blunder'
-                elif drop >= inacc_cp:
-                    classification = 'inaccuracy'
-            if classification:
-                returned_events.append({
-                    'ply': c['ply'],
-                    'played': {
-                        'uci': c['uci'],
-                        'eval_cp': played_cp,
-                        'pv': played_res.get('infos', [{}])[0].get('pv') if played_res.get('infos') else []
-                    },
-                    'best': {
-                        'eval_cp': best_cp,
-                        'bestmove': best_res.get('bestmove'),
-                        'pv': best_res.get('infos', [{}])[0].get('pv') if best_res.get('infos') else []
-                    },
-                    'drop_cp': drop,
-                    'classification': classification,
-                })
-                counted += 1
-            if counted >= limit:
-                break
+        # One lease for the whole game: plies share the engine and its hash table
+        with pooled(options) as pe:
+            eng = pe.engine
+            board = game.board()
+            # Stage A: quick scan all plies with small movetime to find top hotspots
+            quick_ms = 200 if quality == 'fast' else 300
+            candidates: List[Dict[str, Any]] = []
+            ply = 0
+            for move in game.mainline_moves():
+                if ply >= max_moves:
+                    break
+                # If we are very close to budget, stop scanning
+                if (time.time() - t0) >= budget_s * 0.6:  # keep time for deep pass
+                    break
+                fen_before = board.fen()
+                uci = move.uci()
+                # best eval
+                best_cp, _ = _eval_position_with_engine(eng, fen_before, movetime_ms=quick_ms, cache=cache)
+                # played eval (approx by eval after move)
+                board.push(move)
+                fen_after = board.fen()
+                played_cp, _ = _eval_position_with_engine(eng, fen_after, movetime_ms=quick_ms, cache=cache)
+                board.pop()
+                if best_cp is not None and played_cp is not None:
+                    drop = best_cp - played_cp
+                    candidates.append({
+                        'ply': ply + 1,
+                        'fen': fen_before,
+                        'uci': uci,
+                        'drop_est': drop,
+                    })
+                board.push(move)
+                ply += 1
+            # Rewind board to start for deep pass
+            # Re-parse to clean iterator state
+            game = chess_pgn.read_game(io.StringIO(pgn))
+            board = game.board()
+
+            # Stage B: deep analyze top-K by estimated drop
+            candidates.sort(key=lambda x: x['drop_est'] if x['drop_est'] is not None else -999999, reverse=True)
+            K = min(limit, max(1, len(candidates)))
+            remaining_s = max(0.0, budget_s - (time.time() - t0))
+            deep_ms_each = max(200, int((remaining_s * 1000) / max(1, K * 2)))  # 2 calls per hotspot (best + played)
+
+            returned_events: List[Dict[str, Any]] = []
+            counted = 0
+            for c in candidates[:K]:
+                if (time.time() - t0) >= budget_s:
+                    break
+                fen_before = c['fen']
+                # deep best
+                best_cp, best_res = _eval_position_with_engine(eng, fen_before, movetime_ms=deep_ms_each, cache=cache)
+                # find SAN for reporting
+                # Recompute move SAN by playing moves up to ply (lightweight)
+                # For speed, we skip SAN resolution; keep UCI only in deep pass.
+                played_cp, played_res = _eval_position_with_engine(eng, fen_before, movetime_ms=deep_ms_each, played_uci=c['uci'], cache=cache)
+                classification = None
+                drop = None
+                if best_cp is not None and played_cp is not None:
+                    drop = best_cp - played_cp
+                    if drop >= blunder_cp:
+                        classification = 'blunder'
+                    elif drop >= inacc_cp:
+                        classification = 'inaccuracy'
+                if classification:
+                    returned_events.append({
+                        'ply': c['ply'],
+                        'played': {
+                            'uci': c['uci'],
+                            'eval_cp': played_cp,
+                            'pv': played_res.get('infos', [{}])[0].get('pv') if played_res.get('infos') else []
+                        },
+                        'best': {
+                            'eval_cp': best_cp,
+                            'bestmove': best_res.get('bestmove'),
+                            'pv': best_res.get('infos', [{}])[0].get('pv') if best_res.get('infos') else []
+                        },
+                        'drop_cp': drop,
+                        'classification': classification,
+                    })
+                    counted += 1
+                if counted >= limit:
+                    break
 
-        eng.close()
         return {
             'engine': {
-                'threads': threads,
-                'hash_mb': hash_mb,
+                'threads': pe.options.get('Threads', threads),
+                'hash_mb': pe.options.get('Hash', hash_mb),
                 'quality': quality,
                 'movetime_ms': deep_ms_each,
-                'multipv': 1
+                'multipv': 1,
+                'warm': pe.warm,
             },
             'result': {
                 'annotated_events_returned': len(returned_events),
@@ -281,3 +363,146 @@ def analyze_game(analyze: Dict[str, Any], quality: str = 'balanced', resource_ta
         }
     except Exception as e:
         return {'error': f'Engine error: {str(e)}', 'elapsed_ms': int((time.time() - t0) * 1000)}
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def analyze_pgn(analyze: Dict[str, Any], limit: int = 1, quality: str = 'balanced', resource_target_percent: int = 75,
+                depth: Optional[int] = None, movetime_ms: Optional[int] = None, use_cache: bool = True, **kwargs) -> Dict[str, Any]:
+    """Evaluate every position of every game in a PGN.
+
+    Cached positions are answered from the evaluation cache; the others are searched
+    back to back on one warm engine lease per game (hash table kept across plies).
+    """
+    t0 = time.time()
+    cache = None
+    pgn = analyze.get('pgn')
+    max_games = int(analyze.get('max_games', 20))
+    max_moves = int(analyze.get('max_moves', 300))
+    budget_s = int(analyze.get('max_time_sec', 120))
+
+    try:
+        from chess import pgn as chess_pgn
+    except Exception:
+        return {
+            'error': 'python-chess is required for analyze_pgn. Please install: pip install python-chess',
+            'hint': 'This is only needed for PGN parsing.',
+            'elapsed_ms': int((time.time() - t0) * 1000)
+        }
+    try:
+        threads = _auto_threads(resource_target_percent)
+        hash_mb = _auto_hash_mb(resource_target_percent)
+        options = _mk_options(threads, hash_mb, limit)
+        go_depth, go_ms = _search_limits(quality, depth, movetime_ms, _bulk_movetime_ms(quality))
+        timeout_s = (go_ms / 1000.0) + 2.0 if go_depth is None else 180.0
+        cache = _open_cache(use_cache)
+
+        stream = io.StringIO(pgn)
+        games: List[Dict[str, Any]] = []
+        totals = {'positions': 0, 'cache_hits': 0, 'searched': 0, 'search_ms': 0}
+        truncated = False
+        while len(games) < max_games and not truncated:
+            game = chess_pgn.read_game(stream)
+            if game is None:
+                break
+            board = game.board()
+            mainline = list(game.mainline_moves())
+            moves = mainline[:max_moves]
+            positions: List[Dict[str, Any]] = []
+            hits = 0
+            pe = None
+            # Lease lazily: a fully cached game never touches an engine
+            with ExitStack() as stack:
+                for i in range(len(moves) + 1):
+                    if (time.time() - t0) >= budget_s:
+                        truncated = True
+                        break
+                    epd = board.epd()
+                    res = _cache_load(cache, epd, '', limit, go_depth, go_ms)
+                    cached = res is not None
+                    if cached:
+                        hits += 1
+                    else:
+                        if pe is None:
+                            pe = stack.enter_context(pooled(options))
+                        t_search = time.time()
+                        pe.engine.position(startpos=False, fen=board.fen(), moves=None)
+                        res = pe.engine.go(movetime_ms=go_ms, depth=go_depth, timeout_s=timeout_s, min_floor_s=0.0)
+                        search_ms = int((time.time() - t_search) * 1000)
+                        totals['search_ms'] += search_ms
+                        _cache_store(cache, epd, '', limit, res, search_ms)
+                    formatted = _format_infos(res.get('infos', []), limit)
+                    top = formatted['lines'][0] if formatted['lines'] else {}
+                    entry: Dict[str, Any] = {
+                        'ply': i,
+                        'fen': board.fen(),
+                        'move': None,
+                        'eval_cp': _primary_cp(res),
+                        'score': top.get('score'),
+                        'wdl': top.get('wdl'),
+                        'depth': top.get('depth'),
+                        'bestmove': res.get('bestmove'),
+                        'pv': top.get('pv'),
+                        'cached': cached,
+                    }
+                    if limit > 1:
+                        entry['lines'] = formatted['lines']
+                    if i < len(moves):
+                        move = moves[i]
+                        entry['move'] = {'uci': move.uci(), 'san': board.san(move)}
+                        board.push(move)
+                    positions.append(entry)
+
+            # Scores are side-to-move: the mover's loss is eval before + eval after
+            for cur, nxt in zip(positions, positions[1:]):
+                a, b = cur['eval_cp'], nxt['eval_cp']
+                if a is not None and b is not None and abs(a) < 100000 and abs(b) < 100000:
+                    cur['cp_loss'] = max(0, a + b)
+
+            totals['positions'] += len(positions)
+            totals['cache_hits'] += hits
+            totals['searched'] += len(positions) - hits
+            games.append({
+                'index': len(games),
+                'headers': {k: game.headers.get(k) for k in ('Event', 'Date', 'White', 'Black', 'Result')},
+                'plies_total': len(mainline),
+                'plies_analyzed': max(0, len(positions) - 1),
+                'cache_hits': hits,
+                'searched': len(positions) - hits,
+                'warm': pe.warm if pe is not None else None,
+                'positions': positions,
+            })
+
+        if not games:
+            return {'error': 'Invalid PGN', 'elapsed_ms': int((time.time() - t0) * 1000)}
+        return {
+            'engine': {
+                'threads': threads,
+                'hash_mb': hash_mb,
+                'quality': quality,
+                'movetime_ms': go_ms,
+                'depth': go_depth,
+                'multipv': limit,
+                'cache': 'on' if cache is not None else 'off',
+                'pool': pool_stats(),
+            },
+            'result': {
+                'games_returned': len(games),
+                'truncated': truncated or chess_pgn.read_game(stream) is not None,
+                'games': games,
+                'stats': totals,
+            },
+            'elapsed_ms': int((time.time() - t0) * 1000)
+        }
+    except StockfishNotFound as e:
+        return {
+            'error': str(e),
+            'hint': 'Install Stockfish locally (e.g. brew install stockfish) or set STOCKFISH_PATH to the binary path.',
+            'elapsed_ms': int((time.time() - t0) * 1000)
+        }
+    except Exception as e:
+        return {'error': f'Engine error: {str(e)}', 'elapsed_ms': int((time.time() - t0) * 1000)}
+    finally:
+        if cache is not None:
+            cache.close()
@@ -56,8 +56,9 @@ class Engine:
         )
         self._reader = threading.Thread(target=self._read_loop, daemon=True)
         self._reader.start()
+        start = self._mark()
         self.cmd('uci')
-        self._wait_for('uciok', 3.0)
+        self._wait_for('uciok', 3.0, start)
 
     def close(self) -> None:
         try:
@@ -65,9 +66,40 @@ class Engine:
                 self.cmd('quit')
                 self._stop.set()
                 self.proc.terminate()
+                self.proc.wait(timeout=2.0)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
         except Exception:
             pass
 
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def ping(self, timeout: float = 2.0) -> bool:
+        """isready/readyok round trip; False if the engine is dead or unresponsive."""
+        if not self.alive:
+            return False
+        try:
+            self._sync(timeout)
+            return True
+        except Exception:
+            return False
+
+    def clear_output(self) -> None:
+        """Drop buffered output (long-lived engines would otherwise grow it forever)."""
+        with self._lock:
+            self.lines.clear()
+
+    def _mark(self) -> int:
+        with self._lock:
+            return len(self.lines)
+
+    def _sync(self, timeout: float = 5.0) -> None:
+        start = self._mark()
+        self.cmd('isready')
+        self._wait_for('readyok', timeout, start)
+
     def cmd(self, s: str) -> None:
         if not self.proc or not self.proc.stdin:
             raise RuntimeError('Engine not started')
@@ -84,9 +116,9 @@ class Engine:
             with self._lock:
                 self.lines.append(line.rstrip('\n'))
 
-    def _wait_for(self, token: str, timeout: float) -> None:
+    def _wait_for(self, token: str, timeout: float, start: int = 0) -> None:
         deadline = time.time() + timeout
-        idx = 0
+        idx = start
         while time.time() < deadline:
             with self._lock:
                 new = self.lines[idx:]
@@ -102,13 +134,11 @@ class Engine:
             if v is None:
                 continue
             self.cmd(f"setoption name {k} value {v}")
-        self.cmd('isready')
-        self._wait_for('readyok', 5.0)
+        self._sync(5.0)
 
     def new_game(self) -> None:
         self.cmd('ucinewgame')
-        self.cmd('isready')
-        self._wait_for('readyok', 5.0)
+        self._sync(5.0)
 
     def position(self, startpos: bool, fen: Optional[str], moves: Optional[List[str]]) -> None:
         if startpos:
@@ -121,8 +151,7 @@ class Engine:
             cmd += ' moves ' + ' '.join(moves)
         self.cmd(cmd)
         # Ensure engine ready after setting the position (sync)
-        self.cmd('isready')
-        self._wait_for('readyok', 5.0)
+        self._sync(5.0)
 
     def go(self, movetime_ms: Optional[int] = None, depth: Optional[int] = None, searchmoves: Optional[List[str]] = None, timeout_s: float = 180.0, min_floor_s: float = 120.0) -> Dict[str, Any]:
         """
@@ -0,0 +1,180 @@
+"""
+Warm Stockfish engine pool.
+
+Engines stay alive between calls (no spawn + uci handshake per request) and keep
+their hash table. Each lease starts with `ucinewgame` unless the requested position
+continues the game the engine searched last (same root, previous moves as prefix),
+in which case the transposition table is reused. Engines are health-checked
+(process alive + isready) before reuse and discarded after any error.
+
+Environment:
+  STOCKFISH_POOL_SIZE      idle engines kept (default 2)
+  STOCKFISH_POOL_IDLE_SEC  idle engines older than this are closed (default 600)
+  STOCKFISH_THREADS        override auto Threads
+  STOCKFISH_HASH_MB        override auto Hash (MB)
+"""
+from __future__ import annotations
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .engine import Engine
+
+POOL_SIZE = int(os.environ.get('STOCKFISH_POOL_SIZE', '2') or 2)
+POOL_IDLE_SEC = float(os.environ.get('STOCKFISH_POOL_IDLE_SEC', '600') or 600)
+HEALTH_TIMEOUT_S = 2.0
+
+# Options whose change forces Stockfish to reallocate (and clear) its tables
+_HEAVY_OPTIONS = ('Threads', 'Hash')
+
+
+def env_overrides() -> Dict[str, int]:
+    out: Dict[str, int] = {}
+    for key, env in (('Threads', 'STOCKFISH_THREADS'), ('Hash', 'STOCKFISH_HASH_MB')):
+        v = os.environ.get(env)
+        if v and v.strip().isdigit() and int(v) > 0:
+            out[key] = int(v)
+    return out
+
+
+def game_key(startpos: bool, fen: Optional[str], moves: Optional[List[str]]) -> Tuple[str, Tuple[str, ...]]:
+    """(root, moves) lineage of a position; root is 'startpos' or the FEN."""
+    root = 'startpos' if startpos else ' '.join((fen or '').split())
+    return root, tuple(moves or ())
+
+
+def _continues(prev: Optional[Tuple[str, Tuple[str, ...]]], cur: Tuple[str, Tuple[str, ...]]) -> bool:
+    if prev is None or prev[0] != cur[0]:
+        return False
+    return cur[1][:len(prev[1])] == prev[1]
+
+
+class PooledEngine:
+    """Engine plus the state the pool needs to reuse it safely."""
+
+    def __init__(self) -> None:
+        self.engine = Engine()
+        self.engine.start()
+        self.options: Dict[str, Any] = {}
+        self.last_game: Optional[Tuple[str, Tuple[str, ...]]] = None
+        self.created = time.time()
+        self.last_used = self.created
+        self.searches = 0
+        self.warm = False  # True when leased from the idle pool
+        self.reused_tt = False
+
+    def apply_options(self, options: Dict[str, Any]) -> None:
+        changed = {k: v for k, v in options.items() if v is not None and self.options.get(k) != v}
+        if not changed:
+            return
+        self.engine.set_options(changed)
+        self.options.update(changed)
+        if any(k in changed for k in _HEAVY_OPTIONS):
+            self.last_game = None  # tables were reallocated
+
+    def prepare(self, game: Optional[Tuple[str, Tuple[str, ...]]]) -> None:
+        """ucinewgame unless `game` continues the last searched game."""
+        self.reused_tt = game is not None and _continues(self.last_game, game)
+        if not self.reused_tt:
+            self.engine.new_game()
+        self.last_game = game
+
+    def close(self) -> None:
+        self.engine.close()
+
+
+_lock = threading.Lock()
+_idle: List[PooledEngine] = []
+_stats = {'spawned': 0, 'reused': 0, 'discarded': 0, 'tt_reuse': 0}
+
+
+def _healthy(pe: PooledEngine, now: float) -> bool:
+    if now - pe.last_used > POOL_IDLE_SEC:
+        return False
+    return pe.engine.ping(HEALTH_TIMEOUT_S)
+
+
+def acquire(options: Dict[str, Any], game: Optional[Tuple[str, Tuple[str, ...]]] = None) -> PooledEngine:
+    """Healthy idle engine (preferring one that last searched `game`, then same Threads/Hash), or a new one."""
+    options = {**options, **env_overrides()}
+    heavy = tuple(options.get(k) for k in _HEAVY_OPTIONS)
+    now = time.time()
+    while True:
+        with _lock:
+            if not _idle:
+                pe = None
+            else:
+                def rank(c: PooledEngine) -> Tuple[bool, bool, float]:
+                    same_game = game is not None and _continues(c.last_game, game)
+                    same_heavy = tuple(c.options.get(k) for k in _HEAVY_OPTIONS) == heavy
+                    return same_game, same_heavy, c.last_used
+                pe = max(_idle, key=rank)
+                _idle.remove(pe)
+        if pe is None:
+            break
+        if _healthy(pe, now):
+            _stats['reused'] += 1
+            pe.warm = True
+            pe.engine.clear_output()
+            pe.apply_options(options)
+            return pe
+        _stats['discarded'] += 1
+        pe.close()
+    pe = PooledEngine()
+    _stats['spawned'] += 1
+    pe.apply_options(options)
+    return pe
+
+
+def release(pe: PooledEngine) -> None:
+    pe.last_used = time.time()
+    if not pe.engine.alive:
+        return
+    with _lock:
+        if len(_idle) < POOL_SIZE:
+            _idle.append(pe)
+            return
+    pe.close()
+
+
+def discard(pe: PooledEngine) -> None:
+    _stats['discarded'] += 1
+    pe.close()
+
+
+@contextmanager
+def pooled(options: Dict[str, Any], game: Optional[Tuple[str, Tuple[str, ...]]] = None) -> Iterator[PooledEngine]:
+    """Lease an engine prepared for `game` (ucinewgame unless it continues the previous search)."""
+    pe = acquire(options, game)
+    try:
+        pe.prepare(game)
+        if pe.reused_tt:
+            _stats['tt_reuse'] += 1
+        yield pe
+    except BaseException:
+        discard(pe)  # state unknown after an error or interrupt mid-search
+        raise
+    else:
+        pe.searches += 1
+        release(pe)
+
+
+def close_all() -> int:
+    with _lock:
+        engines = list(_idle)
+        _idle.clear()
+    for pe in engines:
+        pe.close()
+    return len(engines)
+
+
+def stats() -> Dict[str, Any]:
+    with _lock:
+        idle = len(_idle)
+    return {'idle': idle, 'pool_size': POOL_SIZE, **_stats}
+
+
+atexit.register(close_all)
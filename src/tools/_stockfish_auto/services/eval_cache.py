@@ -0,0 +1,135 @@
+"""
+Persistent position-evaluation cache: (normalized FEN, searchmoves, multipv) -> engine result.
+
+Positions are keyed by EPD (placement, side, castling, legal en-passant square), so the
+same position reached through different move orders, games or sources (chess_com /
+lichess PGNs, puzzles, worker moves) shares one entry. One row per key keeps the
+deepest search seen: deeper results replace shallower ones, and a request is served
+when a row with at least the requested depth / search time and MultiPV exists.
+"""
+from __future__ import annotations
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+# Bump when the stored result format changes
+CACHE_VERSION = 1
+
+_START_EPD = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq -'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS evals (
+    epd TEXT NOT NULL,
+    search_key TEXT NOT NULL,
+    multipv INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    search_ms INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (epd, search_key, multipv)
+) WITHOUT ROWID;
+"""
+
+
+def enabled() -> bool:
+    return os.getenv("STOCKFISH_EVAL_CACHE", "1").lower() not in ("0", "false", "no", "off")
+
+
+def db_path() -> str:
+    env = os.getenv("STOCKFISH_EVAL_CACHE_DB")
+    if env:
+        return os.path.expanduser(env)
+    # services -> _stockfish_auto -> tools -> src -> project root
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..'))
+    return os.path.join(root, "sqlite3", "stockfish_eval_cache.db")
+
+
+def connect() -> sqlite3.Connection:
+    p = db_path()
+    os.makedirs(os.path.dirname(p), exist_ok=True)
+    conn = sqlite3.connect(p, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def position_key(startpos: bool, fen: Optional[str], moves: Optional[List[str]]) -> Optional[str]:
+    """EPD of the position after `moves`, or None when it cannot be computed.
+
+    Applying moves needs python-chess; bare FEN / startpos positions are normalized without it.
+    """
+    try:
+        import chess
+    except Exception:
+        if moves:
+            return None
+        if startpos:
+            return _START_EPD
+        parts = (fen or '').split()
+        return ' '.join(parts[:4]) if len(parts) >= 4 else None
+    try:
+        board = chess.Board() if startpos else chess.Board(fen)
+        for m in moves or []:
+            board.push_uci(m)
+        return board.epd()
+    except Exception:
+        return None
+
+
+def search_key(searchmoves: Optional[List[str]]) -> str:
+    return ' '.join(sorted(searchmoves or []))
+
+
+def result_depth(res: Dict[str, Any]) -> int:
+    depths = [i.get('depth') or 0 for i in res.get('infos') or [] if i.get('multipv', 1) == 1]
+    return max(depths or [0])
+
+
+def _trim(res: Dict[str, Any], multipv: int) -> Dict[str, Any]:
+    infos = [i for i in res.get('infos') or [] if (i.get('multipv') or 1) <= multipv]
+    return {**res, 'infos': infos}
+
+
+def load(conn: sqlite3.Connection, epd: str, skey: str, multipv: int,
+         depth: Optional[int] = None, movetime_ms: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """Deepest cached result covering the request (>= depth, or >= movetime when no depth)."""
+    rows = conn.execute(
+        "SELECT multipv, depth, search_ms, result FROM evals "
+        "WHERE epd=? AND search_key=? AND multipv>=? AND version=? ORDER BY depth DESC, search_ms DESC",
+        (epd, skey, multipv, CACHE_VERSION),
+    ).fetchall()
+    for mpv, d, ms, raw in rows:
+        if depth is not None:
+            if d < depth:
+                continue
+        elif movetime_ms is not None and ms < movetime_ms:
+            continue
+        try:
+            res = json.loads(raw)
+        except Exception:
+            continue  # unreadable entry: recompute
+        with conn:
+            conn.execute("UPDATE evals SET hits=hits+1 WHERE epd=? AND search_key=? AND multipv=?", (epd, skey, mpv))
+        return _trim(res, multipv)
+    return None
+
+
+def store(conn: sqlite3.Connection, epd: str, skey: str, multipv: int, res: Dict[str, Any], search_ms: int) -> None:
+    """Insert, or replace a shallower entry for the same key (never downgrade)."""
+    depth = result_depth(res)
+    with conn:
+        conn.execute(
+            "INSERT INTO evals (epd, search_key, multipv, depth, search_ms, version, result, created_at) "
+            "VALUES (?,?,?,?,?,?,?,?) "
+            "ON CONFLICT(epd, search_key, multipv) DO UPDATE SET "
+            "depth=excluded.depth, search_ms=excluded.search_ms, version=excluded.version, "
+            "result=excluded.result, created_at=excluded.created_at "
+            "WHERE excluded.depth > evals.depth OR evals.version != excluded.version "
+            "OR (excluded.depth = evals.depth AND excluded.search_ms > evals.search_ms)",
+            (epd, skey, multipv, depth, int(search_ms), CACHE_VERSION, json.dumps(res), time.time()),
+        )
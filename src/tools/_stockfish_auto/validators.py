@@ -15,6 +15,20 @@ def _validate_searchmoves(val: Any) -> List[str]:
     return val
 
 
+def _validate_search(p: Dict[str, Any]) -> None:
+    """Optional explicit search limits and cache switch (shared by the operations)."""
+    for key, mn, mx in (('depth', 1, 60), ('movetime_ms', 50, 600000)):
+        if p.get(key) is None:
+            p.pop(key, None)
+            continue
+        v = int(p[key])
+        if v < mn or v > mx:
+            raise ValueError(f"'{key}' must be {mn}..{mx}")
+        p[key] = v
+    if 'use_cache' in p and not isinstance(p['use_cache'], bool):
+        raise ValueError("'use_cache' must be a boolean")
+
+
 def validate_params(operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
     p = dict(params)
     if operation == 'evaluate_position':
@@ -30,6 +44,10 @@ def validate_params(operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
             pos['startpos'] = False
         elif not startpos:
             raise ValueError("Provide 'fen' or set 'startpos'=true")
+        moves = pos.get('moves')
+        if isinstance(moves, str):
+            # Workers pass the move list as one space-separated string
+            pos['moves'] = moves.split()
         p['position'] = pos
         limit = int(p.get('limit', 3))
         if limit < 1 or limit > 5:
@@ -46,6 +64,7 @@ def validate_params(operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
         sm = _validate_searchmoves(p.get('searchmoves'))
         if sm:
             p['searchmoves'] = sm
+        _validate_search(p)
     elif operation == 'analyze_game':
         analyze = p.get('analyze', {})
         if not isinstance(analyze, dict) or not analyze.get('pgn'):
@@ -69,6 +88,34 @@ def validate_params(operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
         quality = p.get('quality', 'balanced')
         if quality not in {'fast', 'balanced', 'deep'}:
             raise ValueError("'quality' must be one of: fast, balanced, deep")
+        if 'use_cache' in p and not isinstance(p['use_cache'], bool):
+            raise ValueError("'use_cache' must be a boolean")
+    elif operation == 'analyze_pgn':
+        analyze = p.get('analyze', {})
+        if not isinstance(analyze, dict) or not analyze.get('pgn'):
+            raise ValueError("'analyze.pgn' is required")
+        for key, mn, mx, d in [
+            ('max_games', 1, 500, 20),
+            ('max_moves', 1, 1000, 300),
+            ('max_time_sec', 1, 1800, 120),
+        ]:
+            v = int(analyze.get(key, d))
+            if v < mn or v > mx:
+                raise ValueError(f"'analyze.{key}' must be {mn}..{mx}")
+            analyze[key] = v
+        p['analyze'] = analyze
+        limit = int(p.get('limit', 1))
+        if limit < 1 or limit > 5:
+            raise ValueError("'limit' must be 1..5")
+        p['limit'] = limit
+        rtp = int(p.get('resource_target_percent', 75))
+        if rtp < 10 or rtp > 100:
+            raise ValueError("'resource_target_percent' must be 10..100")
+        p['resource_target_percent'] = rtp
+        quality = p.get('quality', 'balanced')
+        if quality not in {'fast', 'balanced', 'deep'}:
+            raise ValueError("'quality' must be one of: fast, balanced, deep")
+        _validate_search(p)
     else:
         raise ValueError(f"Unknown operation: {operation}")
     return p
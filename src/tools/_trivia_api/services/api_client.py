@@ -6,9 +6,14 @@ import requests
 import time
 from typing import Dict, Any, Optional
 
+from ..._http_cache import get as cached_get
+
 
 BASE_URL = "https://opentdb.com"
 RATE_LIMIT_DELAY = 5  # seconds to wait on rate limit
+HEADERS = {"User-Agent": "Dragonfly-MCP-Server/1.16.0"}
+CATEGORIES_TTL_SEC = 86400
+COUNTS_TTL_SEC = 3600
 
 
 class TriviaAPIError(Exception):
@@ -19,33 +24,24 @@ class TriviaAPIError(Exception):
 class TriviaAPIClient:
     """HTTP client for Open Trivia Database API"""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "Dragonfly-MCP-Server/1.16.0"
-        })
-        self.last_request_time = 0
-    
-    def _rate_limit(self):
-        """Enforce rate limiting between requests"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < 1.0:  # At least 1 second between requests
-            time.sleep(1.0 - elapsed)
-        self.last_request_time = time.time()
-    
     def _make_request(
         self,
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
-        retry_on_rate_limit: bool = True
+        retry_on_rate_limit: bool = True,
+        ttl: float = 0
     ) -> Dict[str, Any]:
         """
         Make HTTP GET request to API
         
+        Requests go through the shared HTTP layer, which spaces calls to opentdb.com
+        (1 request / 5 s per IP) across all callers.
+        
         Args:
             endpoint: API endpoint path
             params: Query parameters
             retry_on_rate_limit: Whether to retry on rate limit error
+            ttl: Seconds the response may be reused (0 = always fetch, e.g. random questions)
         
         Returns:
             JSON response data
@@ -53,12 +49,10 @@ class TriviaAPIClient:
         Raises:
             TriviaAPIError: On API errors
         """
-        self._rate_limit()
-        
         url = f"{BASE_URL}{endpoint}"
         
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            response = cached_get(url, params=params, headers=HEADERS, timeout=10, ttl=ttl, tool="trivia_api")
             response.raise_for_status()
             data = response.json()
             
@@ -69,7 +63,7 @@ class TriviaAPIClient:
                 # Rate limit (code 5)
                 if code == 5 and retry_on_rate_limit:
                     time.sleep(RATE_LIMIT_DELAY)
-                    return self._make_request(endpoint, params, retry_on_rate_limit=False)
+                    return self._make_request(endpoint, params, retry_on_rate_limit=False, ttl=ttl)
                 
                 # Other error codes
                 elif code != 0:
@@ -109,7 +103,7 @@ class TriviaAPIClient:
         Returns:
             API response with categories
         """
-        return self._make_request("/api_category.php")
+        return self._make_request("/api_category.php", ttl=CATEGORIES_TTL_SEC)
     
     def get_category_count(self, category_id: int) -> Dict[str, Any]:
         """
@@ -121,7 +115,7 @@ class TriviaAPIClient:
         Returns:
             API response with counts
         """
-        return self._make_request("/api_count.php", params={"category": category_id})
+        return self._make_request("/api_count.php", params={"category": category_id}, ttl=COUNTS_TTL_SEC)
     
     def get_global_count(self) -> Dict[str, Any]:
         """
@@ -130,7 +124,7 @@ class TriviaAPIClient:
         Returns:
             API response with global counts
         """
-        return self._make_request("/api_count_global.php")
+        return self._make_request("/api_count_global.php", ttl=COUNTS_TTL_SEC)
     
     def create_session_token(self) -> Dict[str, Any]:
         """
@@ -4,6 +4,8 @@ from typing import Dict, Any, Optional
 import os
 import logging
 
+from .._http_cache import get as cached_get
+
 logger = logging.getLogger(__name__)
 
 # Open Data URLs (no authentication required)
@@ -18,6 +20,8 @@ STATION_STATUS_URL = os.getenv(
 )
 
 DEFAULT_TIMEOUT = 30
+INFO_TTL_SEC = 3600  # station list changes rarely
+STATUS_TTL_SEC = 60  # feed regenerated every minute
 
 
 def fetch_station_information() -> Dict[str, Any]:
@@ -27,14 +31,14 @@ def fetch_station_information() -> Dict[str, Any]:
         Dict with 'success' (bool) and 'data' or 'error'
     """
     try:
-        import requests
-        
         logger.info(f"Fetching station information from {STATION_INFO_URL}")
         
-        response = requests.get(
+        response = cached_get(
             STATION_INFO_URL,
             timeout=DEFAULT_TIMEOUT,
-            headers={"User-Agent": "Dragonfly-MCP-Velib/1.0"}
+            headers={"User-Agent": "Dragonfly-MCP-Velib/1.0"},
+            ttl=INFO_TTL_SEC,
+            tool="velib"
         )
         
         if response.status_code != 200:
@@ -86,14 +90,14 @@ def fetch_station_status(station_code: Optional[str] = None) -> Dict[str, Any]:
         Dict with 'success' (bool) and 'data' or 'error'
     """
     try:
-        import requests
-        
         logger.info(f"Fetching station status from {STATION_STATUS_URL}" + (f" for station {station_code}" if station_code else " (all stations)"))
         
-        response = requests.get(
+        response = cached_get(
             STATION_STATUS_URL,
             timeout=DEFAULT_TIMEOUT,
-            headers={"User-Agent": "Dragonfly-MCP-Velib/1.0"}
+            headers={"User-Agent": "Dragonfly-MCP-Velib/1.0"},
+            ttl=STATUS_TTL_SEC,
+            tool="velib"
         )
         
         if response.status_code != 200:
@@ -4,6 +4,10 @@ import os
 import requests
 from typing import Dict, Any, List, Optional
 
+from ..._http_cache import get as cached_get
+
+CACHE_TTL_SEC = 900  # search results and view counts drift slowly; saves API quota units
+
 
 class YouTubeAPIClient:
     """Client for YouTube Data API v3."""
@@ -78,7 +82,7 @@ class YouTubeAPIClient:
             params["publishedBefore"] = published_before
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = cached_get(url, params=params, timeout=30, ttl=CACHE_TTL_SEC, tool="youtube_search")
             response.raise_for_status()
             data = response.json()
             
@@ -151,7 +155,7 @@ class YouTubeAPIClient:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = cached_get(url, params=params, timeout=30, ttl=CACHE_TTL_SEC, tool="youtube_search")
             response.raise_for_status()
             data = response.json()
             
@@ -194,7 +198,7 @@ class YouTubeAPIClient:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = cached_get(url, params=params, timeout=30, ttl=CACHE_TTL_SEC, tool="youtube_search")
             response.raise_for_status()
             data = response.json()
             
@@ -269,7 +273,7 @@ class YouTubeAPIClient:
             params["videoCategoryId"] = category_id
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = cached_get(url, params=params, timeout=30, ttl=CACHE_TTL_SEC, tool="youtube_search")
             response.raise_for_status()
             data = response.json()
             
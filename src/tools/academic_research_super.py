@@ -6,10 +6,12 @@ Réponses compactes et schéma unifié pour préserver le contexte LLM
 """
 
 import json
-import urllib.request
+import time
 import urllib.parse
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from functools import partial
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 import re
@@ -52,6 +54,12 @@ class AcademicResearchSuper:
         self.last_request: Dict[str, Any] = {}
 
     # ------------------- Utils -------------------
+    HTTP_CACHE_TTL_SEC = 3600  # search results are stable within the hour
+
+    # Per-provider deadlines (seconds) when sources are queried concurrently;
+    # PubMed chains esearch + esummary. ACADEMIC_RS_PROVIDER_TIMEOUT_SEC / provider_timeout_sec override.
+    PROVIDER_TIMEOUTS = {'arxiv': 20.0, 'pubmed': 20.0, 'crossref': 15.0, 'hal': 15.0}
+
     MONTHS = {
         'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
         'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
@@ -106,18 +114,23 @@ class AcademicResearchSuper:
         return out
 
     def _http_get(self, url: str, timeout: int = 30, expect_json: bool = False) -> Any:
-        """HTTP GET with increased timeout for arXiv stability"""
-        req = urllib.request.Request(url, headers=self.headers)
+        """HTTP GET with increased timeout for arXiv stability.
+
+        Goes through the shared HTTP layer: responses are cached for HTTP_CACHE_TTL_SEC and
+        calls are spaced per host (arXiv asks for one request every 3 seconds).
+        """
+        from ._http_cache import get as cached_get
         try:
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                data = resp.read()
-                text = data.decode('utf-8', errors='replace')
-                if expect_json:
-                    try:
-                        return json.loads(text)
-                    except Exception:
-                        return {}
-                return text
+            resp = cached_get(url, headers=self.headers, timeout=timeout,
+                              ttl=self.HTTP_CACHE_TTL_SEC, tool='academic_research_super')
+            resp.raise_for_status()
+            text = resp.content.decode('utf-8', errors='replace')
+            if expect_json:
+                try:
+                    return json.loads(text)
+                except Exception:
+                    return {}
+            return text
         except Exception as e:
             logger.warning(f"HTTP GET failed for {url}: {e}")
             raise
@@ -125,18 +138,30 @@ class AcademicResearchSuper:
     def _norm_str(self, s: str) -> str:
         return (s or '').strip().lower()
 
-    def _make_key(self, it: Dict[str, Any]) -> str:
-        doi = self._norm_str(it.get('doi', ''))
+    DOI_PREFIX_RE = re.compile(r"^(https?://(dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+
+    def _norm_doi(self, it: Dict[str, Any]) -> str:
+        return self.DOI_PREFIX_RE.sub('', self._norm_str(it.get('doi', '')))
+
+    def _dedup_keys(self, it: Dict[str, Any]) -> List[str]:
+        """Identity keys of a record (DOI, URL, title + year); records sharing any key are merged
+        unless both have a DOI and the DOIs differ."""
+        keys: List[str] = []
+        doi = self._norm_doi(it)
         if doi:
-            return f"doi::{doi}"
+            keys.append(f"doi::{doi}")
         url = self._norm_str(it.get('url', ''))
         if url:
-            return f"url::{url}"
-        title = self._norm_str(it.get('title', ''))
+            keys.append(f"url::{url}")
+        title = re.sub(r'[\W_]+', ' ', self._norm_str(it.get('title', ''))).strip()
         pubdate = self._norm_str(it.get('publication_date', ''))
-        if title or pubdate:
-            return f"title::{title}|date::{pubdate}"
-        return f"idx::{id(it)}"
+        if title:
+            # Providers format dates differently (ISO timestamp, YYYY-MM-DD, '2025 Sep'): compare years
+            dt = self._parse_any_date(it.get('publication_date') or '')
+            keys.append(f"title::{title}|year::{dt.year if dt else pubdate}")
+        elif pubdate and not keys:
+            keys.append(f"title::|date::{pubdate}")
+        return keys
 
     def _merge_items(self, a: Dict[str, Any], b: Dict[str, Any], include_abstracts: bool) -> Dict[str, Any]:
         out = dict(a)
@@ -166,18 +191,36 @@ class AcademicResearchSuper:
         return out
 
     def _deduplicate_and_merge(self, items: List[Dict[str, Any]], include_abstracts: bool) -> List[Dict[str, Any]]:
-        by_key: Dict[str, Dict[str, Any]] = {}
+        # Hash index: every identity key of a kept record -> its positions in `merged`
+        # (a generic title such as "Editorial" can belong to several records with distinct DOIs)
+        merged: List[Dict[str, Any]] = []
+        index: Dict[str, List[int]] = {}
         for it in items:
-            key = self._make_key(it)
-            if key in by_key:
-                by_key[key] = self._merge_items(by_key[key], it, include_abstracts)
-            else:
+            keys = self._dedup_keys(it)
+            doi = self._norm_doi(it)
+            pos = None
+            for k in keys:
+                for cand in index.get(k, ()):
+                    other = self._norm_doi(merged[cand])
+                    if not doi or not other or doi == other:
+                        pos = cand
+                        break
+                if pos is not None:
+                    break
+            if pos is None:
                 # ensure abstract removed when not included
                 cur = dict(it)
                 if not include_abstracts:
                     cur['abstract'] = ''
-                by_key[key] = cur
-        return list(by_key.values())
+                pos = len(merged)
+                merged.append(cur)
+            else:
+                merged[pos] = self._merge_items(merged[pos], it, include_abstracts)
+            for k in keys:
+                slots = index.setdefault(k, [])
+                if pos not in slots:
+                    slots.append(pos)
+        return merged
 
     # ------------------- arXiv -------------------
     def _arxiv_build_url(self, query: str, start: int, max_results: int) -> str:
@@ -434,6 +477,62 @@ class AcademicResearchSuper:
         q = f'authFullName_s:"{author_name}"'
         return self._hal_search(query=q, max_results=max_results)
 
+    # ------------------- Fan-out concurrent -------------------
+    def _provider_timeout(self, source: str, override: Optional[float]) -> float:
+        if override:
+            return float(override)
+        env = os.getenv('ACADEMIC_RS_PROVIDER_TIMEOUT_SEC')
+        if env:
+            try:
+                return float(env)
+            except ValueError:
+                pass
+        return self.PROVIDER_TIMEOUTS.get(source, 20.0)
+
+    def _fan_out(
+        self,
+        calls: Dict[str, Callable[[], Dict[str, Any]]],
+        notes: List[str],
+        timeout_override: Optional[float] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Query providers concurrently, each against its own deadline.
+
+        Returns the items of every provider that answered in time. Errors and timeouts are
+        reported in notes (in source order); a provider past its deadline keeps running in the
+        background and its response still lands in the HTTP cache for the next call.
+        """
+        items: Dict[str, List[Dict[str, Any]]] = {}
+        failures: Dict[str, str] = {}
+        if not calls:
+            return items
+        executor = ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix='academic_rs')
+        start = time.monotonic()
+        deadlines = {src: start + self._provider_timeout(src, timeout_override) for src in calls}
+        pending = {executor.submit(fn): src for src, fn in calls.items()}
+        try:
+            while pending:
+                next_deadline = min(deadlines[src] for src in pending.values())
+                done, _ = wait(pending, timeout=max(0.0, next_deadline - time.monotonic()),
+                               return_when=FIRST_COMPLETED)
+                for fut in done:
+                    src = pending.pop(fut)
+                    try:
+                        items[src] = (fut.result() or {}).get('items', [])
+                    except Exception as e:
+                        logger.error(f"{src} error: {e}")
+                        failures[src] = f"{src} error: {str(e)}"
+                now = time.monotonic()
+                for fut, src in list(pending.items()):
+                    if now >= deadlines[src]:
+                        del pending[fut]
+                        waited = deadlines[src] - start
+                        logger.warning(f"{src} timed out after {waited:g}s")
+                        failures[src] = f"{src} timed out after {waited:g}s (partial results from other sources)"
+        finally:
+            executor.shutdown(wait=False)
+        notes.extend(failures[src] for src in calls if src in failures)
+        return items
+
     # ------------------- Limiteurs de taille -------------------
     def _truncate_text(self, s: str, limit: int) -> str:
         if not isinstance(s, str):
@@ -470,30 +569,45 @@ class AcademicResearchSuper:
             notes.append(f"Results truncated: {total_before_truncation} found, returning {max_total_items} (max limit)")
             results = results[:max_total_items]
         
-        # 3) Limite bytes globale. On coupe des items jusqu'à passer sous la limite.
-        def payload_size(cur_results: List[Dict[str, Any]]) -> int:
+        # 3) Limite bytes globale. Chaque item est encodé une seule fois ; la taille du payload
+        #    pour les n premiers items = enveloppe(n) + somme des tailles + séparateurs ", ".
+        def envelope_size(n: int) -> int:
             payload = {
-                'results': cur_results,
+                'results': [],
                 'total_count': total_before_truncation,
-                'returned_count': len(cur_results),
+                'returned_count': n,
                 'notes': notes or None,
             }
+            return len(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+
+        def item_size(it: Dict[str, Any]) -> int:
             try:
-                enc = json.dumps(payload, ensure_ascii=False).encode('utf-8')
-                return len(enc)
+                return len(json.dumps(it, ensure_ascii=False).encode('utf-8'))
             except Exception:
                 return 10**9
-        
-        while results and payload_size(results) > max_bytes:
-            results = results[:-1]
-        
-        if payload_size(results) > max_bytes:
+
+        def fitting_prefix(cur_results: List[Dict[str, Any]]) -> Tuple[int, int]:
+            """(n, bytes) for the longest prefix of cur_results that fits in max_bytes."""
+            used = 0
+            n = 0
+            for it in cur_results:
+                extra = item_size(it) + (2 if n else 0)
+                if envelope_size(n + 1) + used + extra > max_bytes:
+                    break
+                used += extra
+                n += 1
+            return n, envelope_size(n) + used
+
+        n, size = fitting_prefix(results)
+        if n == 0 and results:
             # Si même un seul résultat dépasse, tronque davantage les abstracts
             for it in results:
                 if 'abstract' in it and isinstance(it['abstract'], str):
                     it['abstract'] = self._truncate_text(it['abstract'], max(200, max_abstract_chars // 2))
-        
-        if payload_size(results) > max_bytes:
+            n, size = fitting_prefix(results)
+        results = results[:n]
+
+        if size > max_bytes:
             logger.warning(f"Payload still exceeds max_bytes ({max_bytes}) after truncation")
             notes.append("Payload exceeds max_bytes despite truncation; consider lowering max_results or max_abstract_chars")
         
@@ -517,6 +631,8 @@ class AcademicResearchSuper:
         if not include_abstracts:
             max_abstract_chars = 0
         max_bytes = int(params.get('max_bytes') or os.getenv('ACADEMIC_RS_MAX_BYTES', '200000'))  # ~200KB
+        provider_timeout = params.get('provider_timeout_sec')
+        provider_timeout = float(provider_timeout) if provider_timeout else None
 
         if operation == 'search_papers':
             collected: List[Dict[str, Any]] = []
@@ -531,48 +647,48 @@ class AcademicResearchSuper:
                 notes.append("submittedDate filter detected and applied client-side")
                 logger.info("submittedDate filter applied")
 
-            lower_sources = [s.lower() for s in sources]
-            for s in lower_sources:
-                try:
-                    if s == 'arxiv':
-                        data = self._arxiv_search(query=clean_query or query, max_results=max_results)
-                    elif s == 'pubmed':
-                        data = self._pubmed_search(query=clean_query or query, max_results=max_results)
-                    elif s == 'crossref':
-                        data = self._crossref_search(query=clean_query or query, max_results=max_results)
-                    elif s == 'hal':
-                        data = self._hal_search(query=clean_query or query, max_results=max_results)
-                    else:
-                        logger.warning(f"Unsupported source: {s}")
-                        notes.append(f"Unsupported source: {s}")
-                        continue
-                    items = data.get('items', [])
-
-                    # Year filter
-                    if year_from or year_to:
-                        y_from = int(year_from) if year_from else None
-                        y_to = int(year_to) if year_to else None
-                        kept = []
-                        for it in items:
-                            dt = self._parse_any_date(it.get('publication_date') or '')
-                            if dt is None:
-                                kept.append(it)
-                                continue
-                            if y_from is not None and dt.year < y_from:
-                                continue
-                            if y_to is not None and dt.year > y_to:
-                                continue
+            search_fns = {
+                'arxiv': self._arxiv_search,
+                'pubmed': self._pubmed_search,
+                'crossref': self._crossref_search,
+                'hal': self._hal_search,
+            }
+            calls: Dict[str, Callable[[], Dict[str, Any]]] = {}
+            for s in (s.lower() for s in sources):
+                if s not in search_fns:
+                    logger.warning(f"Unsupported source: {s}")
+                    notes.append(f"Unsupported source: {s}")
+                    continue
+                calls[s] = partial(search_fns[s], query=clean_query or query, max_results=max_results)
+
+            by_source = self._fan_out(calls, notes, provider_timeout)
+            for s in calls:
+                items = by_source.get(s)
+                if items is None:
+                    continue
+
+                # Year filter
+                if year_from or year_to:
+                    y_from = int(year_from) if year_from else None
+                    y_to = int(year_to) if year_to else None
+                    kept = []
+                    for it in items:
+                        dt = self._parse_any_date(it.get('publication_date') or '')
+                        if dt is None:
                             kept.append(it)
-                        items = kept
+                            continue
+                        if y_from is not None and dt.year < y_from:
+                            continue
+                        if y_to is not None and dt.year > y_to:
+                            continue
+                        kept.append(it)
+                    items = kept
 
-                    # Cutoff filter (NOW-XDAYS)
-                    if cutoff is not None:
-                        items = self._filter_by_cutoff(items, cutoff)
+                # Cutoff filter (NOW-XDAYS)
+                if cutoff is not None:
+                    items = self._filter_by_cutoff(items, cutoff)
 
-                    collected.extend(items)
-                except Exception as e:
-                    logger.error(f"{s} error: {e}")
-                    notes.append(f"{s} error: {str(e)}")
+                collected.extend(items)
 
             # Déduplication + fusion multi-sources
             unique_results = self._deduplicate_and_merge(collected, include_abstracts=include_abstracts)
@@ -607,27 +723,23 @@ class AcademicResearchSuper:
             
             notes: List[str] = []
             collected: List[Dict[str, Any]] = []
-            lower_sources = [s.lower() for s in sources]
-            
-            for s in lower_sources:
-                try:
-                    if s == 'arxiv':
-                        data = self._arxiv_search_by_author(author_name=author_name, max_results=max_results)
-                    elif s == 'pubmed':
-                        data = self._pubmed_search_by_author(author_name=author_name, max_results=max_results)
-                    elif s == 'crossref':
-                        data = self._crossref_search_by_author(author_name=author_name, max_results=max_results)
-                    elif s == 'hal':
-                        data = self._hal_search_by_author(author_name=author_name, max_results=max_results)
-                    else:
-                        logger.warning(f"Unsupported source: {s}")
-                        notes.append(f"Unsupported source: {s}")
-                        continue
-                    items = data.get('items', [])
-                    collected.extend(items)
-                except Exception as e:
-                    logger.error(f"{s} error: {e}")
-                    notes.append(f"{s} error: {str(e)}")
+            author_fns = {
+                'arxiv': self._arxiv_search_by_author,
+                'pubmed': self._pubmed_search_by_author,
+                'crossref': self._crossref_search_by_author,
+                'hal': self._hal_search_by_author,
+            }
+            calls: Dict[str, Callable[[], Dict[str, Any]]] = {}
+            for s in (s.lower() for s in sources):
+                if s not in author_fns:
+                    logger.warning(f"Unsupported source: {s}")
+                    notes.append(f"Unsupported source: {s}")
+                    continue
+                calls[s] = partial(author_fns[s], author_name=author_name, max_results=max_results)
+
+            by_source = self._fan_out(calls, notes, provider_timeout)
+            for s in calls:
+                collected.extend(by_source.get(s) or [])
 
             # Déduplication + tri
             unique_results = self._deduplicate_and_merge(collected, include_abstracts=include_abstracts)
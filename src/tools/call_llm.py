@@ -1,5 +1,6 @@
 from typing import Any, Dict, List
 from ._call_llm.core import execute_call_llm
+from ._call_llm.http_pool import track_connections, attach_connection_stats
 import os
 from ._call_llm.file_utils import _file_to_data_url, _image_part_from_url
 import traceback
@@ -74,14 +75,16 @@ def run(operation: str = "run", **params) -> Dict[str, Any]:
         tool_names = params.pop("tool_names", None)
         promptSystem = params.pop("promptSystem", None)
 
-        result = execute_call_llm(
-            messages=messages,
-            model=model,
-            max_tokens=max_tokens,
-            tool_names=tool_names,
-            promptSystem=promptSystem,
-            debug=debug,
-        )
+        with track_connections() as conns:
+            result = execute_call_llm(
+                messages=messages,
+                model=model,
+                max_tokens=max_tokens,
+                tool_names=tool_names,
+                promptSystem=promptSystem,
+                debug=debug,
+            )
+        attach_connection_stats(result, conns)
         if debug and isinstance(result, dict):
             if "debug" in result and isinstance(result["debug"], dict):
                 result["debug"].setdefault("call_llm_tool", {})
@@ -2,6 +2,7 @@ from typing import Any, Dict
 import json
 import os
 from ._call_llm_agent.core import execute_agent
+from ._call_llm.http_pool import track_connections, attach_connection_stats
 
 
 def run(operation: str = "run", **params) -> Dict[str, Any]:
@@ -14,7 +15,9 @@ def run(operation: str = "run", **params) -> Dict[str, Any]:
     Le LLM continue d'appeler des tools jusqu'à avoir toutes les
     informations nécessaires (finish_reason="stop").
     """
-    return execute_agent(**params)
+    with track_connections() as conns:
+        result = execute_agent(**params)
+    return attach_connection_stats(result, conns)
 
 
 def spec() -> Dict[str, Any]:
@@ -42,7 +42,10 @@ def run(**params) -> Any:
     try:
         # Import directly from agent module to bypass __init__ cache
         from src.tools._chat_agent.agent import execute_chat_agent
-        return execute_chat_agent(**params)
+        from src.tools._call_llm.http_pool import track_connections, attach_connection_stats
+        with track_connections() as conns:
+            result = execute_chat_agent(**params)
+        return attach_connection_stats(result, conns)
     except Exception as e:
         return {
             "error": f"chat_agent failed: {e}",
@@ -5,11 +5,14 @@ ffmpeg_frames MCP Tool (native frame-by-frame + moving average + hysteresis, sta
 - Raffinement: natif (PyAV) dans une fenêtre ±0.5s (fallback: pas de raffinement)
 - Export: 2 images par plan (start/end)
 - Debug: frames_debug (t, diff, similarity_pct), avg_similarity_pct, diffs, r_values, thresholds
+- Cache: analyse (diffs, cuts, plans) par hash vidéo + paramètres (sqlite3/ffmpeg_frames_cache.db)
+- Extraction: une seule passe de décodage pour toutes les images (select)
 """
 from __future__ import annotations
 import os, json, time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from ._ffmpeg import paths as ffpaths
+from ._ffmpeg import cache as ffcache
 from ._ffmpeg import detect as ffdetect
 from ._ffmpeg import native as ffnative
 from ._ffmpeg import extract as ffextract
@@ -51,6 +54,90 @@ def run(operation: str = None, **params):
     overwrite = bool(params.get('overwrite', True))
     image_format = 'jpg'
 
+    analysis, cache_hit = _cached_analysis(path_abs)
+    duration = analysis['duration']
+    avg_fps = analysis['avg_fps']
+    min_scene_sec = analysis['min_scene_sec']
+    used_native = analysis['used_native']
+    info = analysis['info']
+    cuts_coarse = analysis['cuts_coarse']
+    cuts_pruned = analysis['cuts_pruned']
+    refined = analysis['refined']
+    shots = analysis['shots']
+
+    frames = ffextract.extract_shots_labeled(path_abs, outdir_abs, shots, image_format, overwrite)
+
+    # Debug manifest riche
+    exec_time = round(time.monotonic() - t0, 3)
+    try:
+        durations = [round(s['end'] - s['start'], 6) for s in shots]
+        if durations:
+            sorted_d = sorted(durations)
+            mid = sorted_d[len(sorted_d)//2]
+            stats = {
+                'min': min(durations),
+                'median': mid,
+                'max': max(durations),
+                'count_over_15s': sum(1 for d in durations if d > 15.0)
+            }
+        else:
+            stats = {'min': 0.0, 'median': 0.0, 'max': 0.0, 'count_over_15s': 0}
+        man = {
+            'avg_fps_probe': avg_fps,
+            'native_analyzed_fps': info.get('analyzed_fps'),
+            'used_native': used_native,
+            'min_scene_sec': min_scene_sec,
+            'thresholds': info.get('thresholds'),
+            'avg_similarity_pct': info.get('avg_similarity_pct'),
+            'coarse_frames_analyzed': info.get('frames_analyzed'),
+            'coarse_time_sec': info.get('time_sec'),
+            'analysis_cache_hit': cache_hit,
+            'frames_debug': info.get('frames_debug'),  # frame-by-frame: t, diff, similarity_pct
+            'diffs': info.get('diffs'),        # capped
+            'r_values': info.get('r_values'),  # capped residuals
+            'cuts_coarse': cuts_coarse,
+            'cuts_pruned': cuts_pruned,
+            'cuts_refined': refined,
+            'scenes': [{'index': s['index'], 'start': s['start'], 'end': s['end']} for s in shots],
+            'scene_duration_stats': stats,
+            'exec_time_sec': exec_time
+        }
+        os.makedirs(outdir_abs, exist_ok=True)
+        with open(os.path.join(outdir_abs, 'debug.json'), 'w') as f:
+            json.dump(man, f)
+    except Exception:
+        pass
+
+    return {
+        'success': True,
+        'mode_used': 'native_frame_by_frame_ma_hysteresis_refine_v1' if used_native else 'legacy_coarse_cli_hysteresis_no_refine',
+        'duration': duration,
+        'avg_fps_probe': avg_fps,
+        'native_analyzed_fps': info.get('analyzed_fps'),
+        'min_scene_sec': min_scene_sec,
+        'scenes_count': len(refined),
+        'cache_hit': cache_hit,
+        'frames': frames,
+        'output_dir': output_dir,
+        'exec_time_sec': exec_time
+    }
+
+
+def _analysis_params() -> Dict[str, Any]:
+    return {
+        'scale': [_SIM_SCALE_W, _SIM_SCALE_H],
+        'threshold': _SIM_THRESHOLD,
+        'hard_cut': _HARD_CUT_THRESHOLD,
+        'min_scene_frames': _MIN_SCENE_FRAMES,
+        'ma_window': _MA_WINDOW,
+        'refine_window': _REFINE_WINDOW_SEC,
+        # CLI fallback results must not shadow a native analysis once PyAV is installed
+        'native': ffnative._HAS_PYAV,
+    }
+
+
+def _analyze(path_abs: str) -> Dict[str, Any]:
+    """Probe, detect, prune, refine and build shots (the decoding part of the tool)."""
     duration = ffdetect.probe_duration(path_abs)
     avg_fps = ffdetect.get_avg_fps(path_abs)
     min_scene_sec = max(0.02, _MIN_SCENE_FRAMES / max(1.0, avg_fps))
@@ -63,6 +150,7 @@ def run(operation: str = None, **params):
         scale_h=_SIM_SCALE_H,
         ma_window=_MA_WINDOW,
         threshold_floor=_SIM_THRESHOLD,
+        duration=duration,
     )
     if info.get('error') or not info.get('frames_analyzed'):
         # Fallback legacy coarse (CLI)
@@ -95,74 +183,57 @@ def run(operation: str = None, **params):
         )
     else:
         # No native refine available: keep coarse times as refined
+        strength = dict(cuts_coarse)
         refined = [{
             'time': round(t, 6),
-            'best_diff': s,
+            'best_diff': strength.get(t, 0.0),
             'window_start': max(0.0, t - _REFINE_WINDOW_SEC),
             'fps': None,
             'local_diffs': []
-        } for (t, s) in cuts_pruned]
+        } for t in cuts_pruned]
 
     cuts = [x['time'] for x in refined]
 
-    # 4) Build scenes and export strictly start/end per scene
+    # 4) Build scenes (start/end per scene)
     shots = ffts.build_shots_with_labels(cuts, duration, 0, end_eps=0.05)
-    frames = ffextract.extract_shots_labeled(path_abs, outdir_abs, shots, image_format, overwrite)
-
-    # Debug manifest riche
-    exec_time = round(time.monotonic() - t0, 3)
-    try:
-        durations = [round(s['end'] - s['start'], 6) for s in shots]
-        if durations:
-            sorted_d = sorted(durations)
-            mid = sorted_d[len(sorted_d)//2]
-            stats = {
-                'min': min(durations),
-                'median': mid,
-                'max': max(durations),
-                'count_over_15s': sum(1 for d in durations if d > 15.0)
-            }
-        else:
-            stats = {'min': 0.0, 'median': 0.0, 'max': 0.0, 'count_over_15s': 0}
-        man = {
-            'avg_fps_probe': avg_fps,
-            'native_analyzed_fps': info.get('analyzed_fps'),
-            'used_native': used_native,
-            'min_scene_sec': min_scene_sec,
-            'thresholds': info.get('thresholds'),
-            'avg_similarity_pct': info.get('avg_similarity_pct'),
-            'coarse_frames_analyzed': info.get('frames_analyzed'),
-            'coarse_time_sec': info.get('time_sec'),
-            'frames_debug': info.get('frames_debug'),  # frame-by-frame: t, diff, similarity_pct
-            'diffs': info.get('diffs'),        # capped
-            'r_values': info.get('r_values'),  # capped residuals
-            'cuts_coarse': cuts_coarse,
-            'cuts_pruned': cuts_pruned,
-            'cuts_refined': refined,
-            'scenes': [{'index': s['index'], 'start': s['start'], 'end': s['end']} for s in shots],
-            'scene_duration_stats': stats,
-            'exec_time_sec': exec_time
-        }
-        os.makedirs(outdir_abs, exist_ok=True)
-        with open(os.path.join(outdir_abs, 'debug.json'), 'w') as f:
-            json.dump(man, f)
-    except Exception:
-        pass
-
     return {
-        'success': True,
-        'mode_used': 'native_frame_by_frame_ma_hysteresis_refine_v1' if used_native else 'legacy_coarse_cli_hysteresis_no_refine',
         'duration': duration,
-        'avg_fps_probe': avg_fps,
-        'native_analyzed_fps': info.get('analyzed_fps'),
+        'avg_fps': avg_fps,
         'min_scene_sec': min_scene_sec,
-        'scenes_count': len(cuts),
-        'frames': frames,
-        'output_dir': output_dir,
-        'exec_time_sec': exec_time
+        'used_native': used_native,
+        'info': info,
+        'cuts_coarse': cuts_coarse,
+        'cuts_pruned': cuts_pruned,
+        'refined': refined,
+        'shots': shots,
     }
 
 
+def _cached_analysis(path_abs: str) -> Tuple[Dict[str, Any], bool]:
+    """Analysis from the content-addressed cache (video hash + params), computed on miss."""
+    if not ffcache.enabled():
+        return _analyze(path_abs), False
+    try:
+        conn = ffcache.connect()
+    except Exception:
+        return _analyze(path_abs), False
+    try:
+        video = ffcache.video_hash(conn, path_abs)
+        key = ffcache.params_key(_analysis_params())
+        hit = ffcache.load(conn, video, key)
+        if hit is not None:
+            return hit, True
+        analysis = _analyze(path_abs)
+        if analysis['info'].get('frames_analyzed'):
+            try:
+                ffcache.store(conn, video, key, analysis)
+            except Exception:
+                pass
+        return analysis, False
+    finally:
+        conn.close()
+
+
 def spec():
     """Load and return the canonical JSON spec (source of truth)."""
     here = os.path.dirname(__file__)
@@ -15,15 +15,15 @@ Example:
     }
 """
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Union
 
 # Import from package implementation (with _)
 from ._media_transcribe.api import route_operation
 from ._media_transcribe import spec as _spec
 
 
-def run(operation: str = None, **params) -> Dict[str, Any]:
-    """Execute media transcription operation."""
+def run(operation: str = None, **params) -> Union[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """Execute media transcription operation (generator of SSE chunks when stream=True)."""
     op = (operation or params.get("operation") or "transcribe").strip().lower()
     if not params.get("path"):
         return {"error": "Parameter 'path' is required"}
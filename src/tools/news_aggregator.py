@@ -16,7 +16,8 @@ def run(operation: str = None, **params):
         **params: Operation parameters
         
     Returns:
-        Dict with operation result or error
+        Dict with operation result or error (generator of SSE chunks for
+        search_news with stream=True)
     """
     # Extract operation
     op = (operation or params.get("operation", "")).strip().lower()
@@ -4,6 +4,7 @@ PDF to Text Tool - Extract text from given pages of a PDF file.
 - Output: plain text per page and concatenated text
 - Pages syntax: '1' (page1), '1-3' (1..3), '1,3,5', '2-'
 - Paths are resolved from project root (pyproject/.git/src) if relative
+- Page texts are cached (shared with pdf_search, see tools._pdf_text); misses extracted in a process pool
 """
 from __future__ import annotations
 
@@ -25,6 +26,11 @@ except Exception:
     except Exception:
         find_project_root = lambda: Path.cwd()  # type: ignore
 
+try:
+    from tools._pdf_text import page_counts, page_texts
+except ImportError:
+    from ._pdf_text import page_counts, page_texts
+
 PROJECT_ROOT = find_project_root()
 _SPEC_DIR = Path(__file__).resolve().parent.parent / "tool_specs"
 
@@ -83,8 +89,10 @@ def run(path: str, pages: str | None = None, limit: int = 50) -> Dict[str, Any]:
         limit = 500
 
     try:
-        reader = PdfReader(str(pdf_path))
-        total_pages = len(reader.pages)
+        info = page_counts([pdf_path])[pdf_path]
+        if "error" in info:
+            return {"success": False, "error": info["error"]}
+        total_pages = info["pages"]
         selected_indices = _parse_pages(pages, total_pages)
 
         total_selected = len(selected_indices)
@@ -92,12 +100,12 @@ def run(path: str, pages: str | None = None, limit: int = 50) -> Dict[str, Any]:
         if truncated:
             selected_indices = selected_indices[:limit]
 
+        texts = page_texts({pdf_path: selected_indices})[pdf_path]
         pages_text: List[Dict[str, Any]] = []
         for i in selected_indices:
-            try:
-                txt = reader.pages[i].extract_text() or ""
-            except Exception as e:
-                txt = f"<ERROR extracting page {i+1}: {e}>"
+            txt, err = texts.get(i, (None, "no text returned"))
+            if err:
+                txt = f"<ERROR: {err}>"
             pages_text.append({"page": i + 1, "text": txt})
 
         joined = "\n\n".join(p["text"] for p in pages_text)
@@ -7,6 +7,9 @@ PDF Search Tool - Search text inside one or multiple PDF files.
   - up to 50 first detailed matches (file/page/snippet)
   - per-file recap and pages scanned
 - Relative paths are resolved from the project root (folder with pyproject.toml/.git/src)
+- Page texts come from a persistent SQLite cache (keyed by path/size/mtime/page); misses are extracted in a process pool
+- operation="index": build/refresh an SQLite FTS5 index over page text for files/directory trees (incremental)
+- operation="query": ranked (bm25) hits from that index with snippets and page anchors, no PDF parsing
 """
 from __future__ import annotations
 
@@ -27,6 +30,11 @@ try:
 except Exception:  # pragma: no cover - dependency might be missing at import-time
     PdfReader = None
 
+try:
+    from tools._pdf_text import page_counts, iter_page_texts, build_index, query_index, IndexUnavailable
+except ImportError:
+    from ._pdf_text import page_counts, iter_page_texts, build_index, query_index, IndexUnavailable
+
 logger = logging.getLogger(__name__)
 
 PROJECT_ROOT = find_project_root()
@@ -182,14 +190,24 @@ def run(
     regex: bool = False,
     recursive: bool = True,
     context: int = 80,
+    max_files: Optional[int] = None,
 ) -> Dict[str, Any]:
-    """Search for a query inside PDF files.
+    """Search for a query inside PDF files, or build/query the full-text index.
 
     Behavior: returns total_matches across full scan and up to 50 first detailed results.
     """
 
-    if operation != "search":
-        return {"error": "Unknown operation: search"}
+    if operation not in ("search", "index", "query"):
+        return {"error": f"Unknown operation: {operation}. Use 'search', 'index' or 'query'"}
+
+    target_list: List[str] = []
+    if paths and isinstance(paths, list):
+        target_list.extend([str(p) for p in paths])
+    if path and isinstance(path, str):
+        target_list.append(path)
+
+    if operation == "index":
+        return _run_index(target_list, recursive, max_files)
 
     if query is None or (isinstance(query, str) and query.strip() == ""):
         return {"error": "query is required"}
@@ -199,11 +217,8 @@ def run(
         logger.warning(f"context={context} out of range [0, 500], clamping")
         context = max(0, min(500, context))
 
-    target_list: List[str] = []
-    if paths and isinstance(paths, list):
-        target_list.extend([str(p) for p in paths])
-    if path and isinstance(path, str):
-        target_list.append(path)
+    if operation == "query":
+        return _run_query(query, target_list, context)
 
     if not target_list:
         return {"error": "path or paths is required"}
@@ -227,25 +242,23 @@ def run(
     total_matches = 0
     total_pages_scanned = 0
 
+    # Page selection per file (page counts cached), then page texts in bounded batches:
+    # cache hits are read from SQLite, misses extracted in parallel (tools._pdf_text)
+    counts = page_counts(files)
+    wanted: Dict[Path, List[int]] = {}
     for f in files:
-        file_matches = 0
-        pages_scanned_here = 0
-        try:
-            reader = PdfReader(str(f))
-        except Exception as e:
-            err_msg = f"Failed to open PDF: {e}"
-            logger.error(f"{f}: {err_msg}")
-            errors.append({"file": str(f), "error": err_msg})
+        info = counts.get(f) or {}
+        if "error" in info:
+            logger.error(f"{f}: {info['error']}")
+            errors.append({"file": str(f), "error": info["error"]})
             continue
+        wanted[f] = _merge_page_selections(pages, pages_list, info["pages"])
 
-        total_pages = len(reader.pages)
-        page_indices = _merge_page_selections(pages, pages_list, total_pages)
-
-        for idx in page_indices:
-            try:
-                text = reader.pages[idx].extract_text() or ""
-            except Exception as e:
-                err_msg = f"Failed to extract text from page {idx+1}: {e}"
+    # file -> [matches, pages scanned]; a large file may arrive in several batches
+    file_counts: Dict[Path, List[int]] = {f: [0, 0] for f in wanted}
+    for f, page_results in iter_page_texts(wanted):
+        for idx, (text, err_msg) in page_results:
+            if err_msg:
                 logger.error(f"{f}: {err_msg}")
                 errors.append({"file": str(f), "error": err_msg})
                 continue
@@ -253,7 +266,7 @@ def run(
             matches = _find_all(text, query, regex=regex, case_sensitive=case_sensitive)
             mcount = len(matches)
             total_matches += mcount
-            file_matches += mcount
+            file_counts[f][0] += mcount
 
             if len(results) < MAX_RESULTS and mcount:
                 for (s, e, mtxt) in matches:
@@ -266,7 +279,9 @@ def run(
                         "match": mtxt,
                         "snippet": snippet,
                     })
-            pages_scanned_here += 1
+            file_counts[f][1] += 1
+
+    for f, (file_matches, pages_scanned_here) in file_counts.items():
         per_file.append({
             "file": str(f),
             "matches": file_matches,
@@ -305,5 +320,56 @@ def run(
     return response
 
 
+def _run_index(target_list: List[str], recursive: bool, max_files: Optional[int]) -> Dict[str, Any]:
+    if not target_list:
+        return {"error": "path or paths is required"}
+    if PdfReader is None:
+        return {"error": "pypdf is not installed. Please add 'pypdf' to your dependencies and install."}
+    if max_files is not None and max_files < 1:
+        return {"error": "max_files must be >= 1"}
+
+    roots = [_resolve_target(t) for t in target_list]
+    files = _list_pdf_files(target_list, recursive=recursive)
+    logger.info(f"Indexing {len(files)} PDF file(s) from {len(roots)} path(s)")
+    try:
+        stats = build_index(files, roots, max_files=max_files)
+    except IndexUnavailable as e:
+        return {"error": str(e)}
+
+    response: Dict[str, Any] = {"files_found": len(files), **stats}
+    if not stats["errors"]:
+        response.pop("errors")
+    if stats["remaining"]:
+        response["message"] = f"{stats['remaining']} file(s) left to index. Run 'index' again to continue."
+    return response
+
+
+def _run_query(query: str, target_list: List[str], context: int) -> Dict[str, Any]:
+    roots = [_resolve_target(t) for t in target_list] or None
+    try:
+        # FTS5 snippets are sized in tokens: ~5 chars per token, 64 max
+        res = query_index(query, roots=roots, limit=MAX_RESULTS, snippet_tokens=max(4, context // 5))
+    except IndexUnavailable as e:
+        return {"error": str(e)}
+
+    logger.info(f"Index query '{query}': {res['total_hits']} page hits in {res['elapsed_ms']} ms")
+    response: Dict[str, Any] = {
+        "total_hits": res["total_hits"],
+        "returned_count": len(res["results"]),
+        "results": res["results"],
+    }
+    if res["fts_query"] != query:
+        response["fts_query"] = res["fts_query"]
+    if res["total_hits"] > MAX_RESULTS:
+        response["truncated"] = True
+        response["message"] = (
+            f"Found {res['total_hits']} matching pages. Showing top {MAX_RESULTS} by relevance. "
+            f"Refine query (phrases, AND/NOT) or restrict path."
+        )
+    elif not res["total_hits"]:
+        response["message"] = "No hits. The index only covers PDFs added with operation='index'."
+    return response
+
+
 def spec() -> Dict[str, Any]:
     return _load_spec_json("pdf_search")
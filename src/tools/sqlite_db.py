@@ -13,6 +13,8 @@ Operations:
 - execute(db, query, params?, many?, return_rows?, limit?, read_only?) -> run SQL and return rows/metrics
 - exec/ query are aliases of execute for convenience
 - executescript(db, script, read_only?) -> run multiple statements in one call
+- execute(..., cursor=True) -> first page + cursor_id; fetch(cursor_id, limit?) -> next page; close_cursor(cursor_id)
+- execute(..., stream=True) -> generator of row chunks (streamed by /execute), no row cap
 
 Notes:
 - The parameter "db" and "name" refer to the logical DB name (with or without .db).
@@ -22,6 +24,9 @@ Notes:
 - Case-insensitive matching: "alain" will match both "worker_alain.db" and "worker_Alain.db"
 - read_only (bool, default False): when True, only SELECT/PRAGMA/WITH queries are allowed and the
   connection is opened in SQLite RO mode (URI). executemany/executescript are disabled in read-only.
+- Connections are cached per DB file (mmap, busy timeout, opt-in WAL; see tools._sqlite_db.connections).
+  Cursors (SELECT/PRAGMA/WITH only) hold a dedicated read-only connection and expire when idle;
+  without WAL each fetch re-runs the query for one page so writers are not blocked between fetches.
 """
 from __future__ import annotations
 
@@ -29,7 +34,7 @@ import re
 import sqlite3
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 import json
 
 try:
@@ -38,6 +43,11 @@ except Exception:
     from pathlib import Path as _P
     find_project_root = lambda: _P.cwd()  # type: ignore
 
+try:
+    from tools._sqlite_db import connections, cursors
+except ImportError:
+    from ._sqlite_db import connections, cursors
+
 PROJECT_ROOT = find_project_root()
 BASE_DIR = PROJECT_ROOT / "sqlite3"
 BASE_DIR.mkdir(parents=True, exist_ok=True)
@@ -102,23 +112,26 @@ def _ensure_dir() -> Dict[str, Any]:
     return {"base_dir": str(BASE_DIR)}
 
 
-def _want_read_only(params: Dict[str, Any]) -> bool:
+def _want_flag(params: Dict[str, Any], key: str) -> bool:
     try:
-        v = params.get("read_only")
+        v = params.get(key)
         return bool(v) and str(v).lower() not in {"false","0","no","off"}
     except Exception:
         return False
 
 
-def _connect(path: Path, read_only: bool = False) -> sqlite3.Connection:
-    if read_only:
-        # Open with SQLite URI mode=ro
-        uri = f"file:{path.as_posix()}?mode=ro"
-        return sqlite3.connect(uri, uri=True)
-    return sqlite3.connect(str(path))
+def _want_read_only(params: Dict[str, Any]) -> bool:
+    return _want_flag(params, "read_only")
+
 
+def _page_size(params: Dict[str, Any], default: int = 100) -> int:
+    try:
+        return max(1, min(int(params.get("limit", default)), 1000))
+    except (TypeError, ValueError):
+        return default
 
-def run(operation: str, **params) -> Dict[str, Any]:
+
+def run(operation: str, **params) -> Union[Dict[str, Any], Iterator[Dict[str, Any]]]:
     op = (operation or "").lower().strip()
 
     if op == "ensure_dir":
@@ -143,16 +156,13 @@ def run(operation: str, **params) -> Dict[str, Any]:
         _ensure_dir()
         try:
             must_init = not path.exists()
-            conn = _connect(path, read_only=False)
-            try:
+            with connections.connection(path, read_only=False) as conn:
                 if schema and isinstance(schema, str):
                     if len(schema) > 51200:
                         logger.warning("create_db: schema too large (%d bytes, max 50KB)", len(schema))
                         return {"error": "schema exceeds 50KB limit"}
                     conn.executescript(schema)
                     conn.commit()
-            finally:
-                conn.close()
             logger.info("create_db: %s %s", 'created' if must_init else 'opened', path.name)
             return {"db": path.name, "path": str(path), "created": must_init}
         except Exception as e:
@@ -173,7 +183,14 @@ def run(operation: str, **params) -> Dict[str, Any]:
             logger.warning("delete_db: invalid name '%s': %s", name, e)
             return {"error": str(e)}
         try:
+            cursors.close_path(path)
+            connections.close_path(path)
             path.unlink()
+            # WAL side files (left by a crashed writer or a still-open external connection)
+            for suffix in ("-wal", "-shm"):
+                side = path.with_name(path.name + suffix)
+                if side.exists():
+                    side.unlink()
             logger.info("delete_db: deleted %s", path.name)
             return {"deleted": path.name}
         except Exception as e:
@@ -194,13 +211,9 @@ def run(operation: str, **params) -> Dict[str, Any]:
             logger.warning("get_tables: invalid db '%s': %s", db, e)
             return {"error": str(e)}
         try:
-            conn = _connect(path, read_only=True)  # harmless read-only for introspection
-            conn.row_factory = _row_factory
-            cur = conn.cursor()
-            cur.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-            rows = cur.fetchall()
-            cur.close(); conn.close()
-            tables = [r.get("name") for r in rows]
+            with connections.connection(path, read_only=True) as conn:  # harmless read-only for introspection
+                rows = conn.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name").fetchall()
+            tables = [r[0] for r in rows]
             logger.info("get_tables: %d tables in %s", len(tables), path.name)
             return {"db": path.name, "tables": tables, "count": len(tables)}
         except Exception as e:
@@ -224,12 +237,9 @@ def run(operation: str, **params) -> Dict[str, Any]:
             logger.warning("describe: invalid db '%s': %s", db, e)
             return {"error": str(e)}
         try:
-            conn = _connect(path, read_only=True)
-            conn.row_factory = _row_factory
-            cur = conn.cursor()
-            cur.execute(f"PRAGMA table_info({table})")
-            rows = cur.fetchall()
-            cur.close(); conn.close()
+            with connections.connection(path, read_only=True) as conn:
+                conn.row_factory = _row_factory
+                rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
             logger.info("describe: %d columns in %s (%s)", len(rows), table, path.name)
             return {"db": path.name, "table": table, "columns": rows}
         except Exception as e:
@@ -240,8 +250,8 @@ def run(operation: str, **params) -> Dict[str, Any]:
         db = params.get("db"); sql = params.get("query"); many = bool(params.get("many", False))
         sql_params = params.get("params")
         return_rows_param = params.get("return_rows")
-        limit_param = params.get("limit", 100)
         ro = _want_read_only(params)
+        use_cursor = _want_flag(params, "cursor"); stream = _want_flag(params, "stream")
         if not isinstance(db, str) or not db.strip():
             logger.warning("execute: missing or invalid 'db' parameter")
             return {"error": "db is required (string)"}
@@ -257,6 +267,8 @@ def run(operation: str, **params) -> Dict[str, Any]:
                 return {"error": "read-only mode: executemany disabled"}
             if not _is_select_like(sql):
                 return {"error": "read-only mode: only SELECT/PRAGMA/WITH allowed"}
+        if (use_cursor or stream) and (many or not _is_select_like(sql)):
+            return {"error": "cursor/stream: only a single SELECT/PRAGMA/WITH query is allowed"}
         try:
             path = _db_path(db, must_exist=True)
         except FileNotFoundError as e:
@@ -265,50 +277,99 @@ def run(operation: str, **params) -> Dict[str, Any]:
         except Exception as e:
             logger.warning("execute: invalid db '%s': %s", db, e)
             return {"error": str(e)}
-        try:
-            conn = _connect(path, read_only=ro)
-            conn.row_factory = _row_factory
-            cur = conn.cursor()
+
+        if stream:
+            # Generator: /execute streams the chunks, rows are never all in memory
             try:
-                if many:
-                    cur.executemany(sql, sql_params if isinstance(sql_params, (list, tuple)) else [])  # type: ignore[arg-type]
-                    conn.commit()
-                    rows = []; columns: List[str] = []
-                    logger.info("execute: executemany completed (%d rows affected)", cur.rowcount)
-                else:
-                    if sql_params is None:
-                        cur.execute(sql)
+                return cursors.stream_rows(path.name, path, sql, sql_params, _page_size(params))
+            except Exception as e:
+                logger.error("execute (stream) failed: %s", e)
+                return {"error": f"execute failed: {e}"}
+
+        if use_cursor:
+            try:
+                c = cursors.open_cursor(path.name, path, sql, sql_params)
+                rows, has_more = c.fetch(_page_size(params))
+            except Exception as e:
+                logger.error("execute (cursor) failed: %s", e)
+                return {"error": f"execute failed: {e}"}
+            result = {"db": path.name, "columns": c.columns, "rows": rows, "returned_count": len(rows), "has_more": has_more}
+            if has_more:
+                result["cursor_id"] = c.id
+            else:
+                cursors.close_cursor(c.id)
+            logger.info("execute: cursor query returned %d rows (more: %s)", len(rows), has_more)
+            return result
+
+        try:
+            with connections.connection(path, read_only=ro) as conn:
+                cur = conn.cursor()
+                try:
+                    total_count = 0
+                    if many:
+                        cur.executemany(sql, sql_params if isinstance(sql_params, (list, tuple)) else [])  # type: ignore[arg-type]
+                        conn.commit()
+                        rows = []; columns: List[str] = []
+                        logger.info("execute: executemany completed (%d rows affected)", cur.rowcount)
                     else:
-                        cur.execute(sql, sql_params)
-                    if (return_rows_param is None and _is_select_like(sql)) or bool(return_rows_param):
-                        all_rows = cur.fetchall()
-                        columns = [c[0] for c in cur.description or []]
-                        total_count = len(all_rows)
-                        actual_limit = min(limit_param, 1000)
-                        rows = all_rows[:actual_limit]
-                        if total_count > actual_limit:
-                            logger.warning("execute: truncated results from %d to %d rows", total_count, actual_limit)
-                            truncated = True
+                        if sql_params is None:
+                            cur.execute(sql)
+                        else:
+                            cur.execute(sql, sql_params)
+                        if (return_rows_param is None and _is_select_like(sql)) or bool(return_rows_param):
+                            columns = [c[0] for c in cur.description or []]
+                            actual_limit = _page_size(params)
+                            # Build dicts for the returned page only; the rest is counted, not kept
+                            rows = [dict(zip(columns, r)) for r in cur.fetchmany(actual_limit)]
+                            total_count = len(rows) + sum(1 for _ in cur)
+                            if total_count > actual_limit:
+                                logger.warning("execute: truncated results from %d to %d rows", total_count, actual_limit)
                         else:
-                            truncated = False
+                            rows = []; columns = []
+                        conn.commit()
+                        logger.info("execute: query completed (%d rows returned)", len(rows))
+                    result: Dict[str, Any] = {"db": path.name}
+                    if rows:
+                        result.update({"columns": columns, "rows": rows, "returned_count": len(rows)})
+                        if total_count > len(rows):
+                            result.update({"truncated": True, "total_count": total_count, "warning": f"Results truncated: {total_count} found, returning {len(rows)} (limit: {actual_limit}). Use cursor=true to page through all rows"})
                     else:
-                        rows = []; columns = []; truncated = False
-                    conn.commit()
-                    logger.info("execute: query completed (%d rows returned)", len(rows))
-                result: Dict[str, Any] = {"db": path.name}
-                if rows:
-                    result.update({"columns": columns, "rows": rows, "returned_count": len(rows)})
-                    if 'total_count' in locals() and total_count > len(rows):
-                        result.update({"truncated": True, "total_count": total_count, "warning": f"Results truncated: {total_count} found, returning {len(rows)} (limit: {actual_limit})"})
-                else:
-                    result.update({"rowcount": getattr(cur, 'rowcount', 0), "lastrowid": getattr(cur, 'lastrowid', None)})
-                return result
-            finally:
-                cur.close(); conn.close()
+                        result.update({"rowcount": getattr(cur, 'rowcount', 0), "lastrowid": getattr(cur, 'lastrowid', None)})
+                    return result
+                finally:
+                    cur.close()
         except Exception as e:
             logger.error("execute failed: %s", e)
             return {"error": f"execute failed: {e}"}
 
+    if op == "fetch":
+        cursor_id = params.get("cursor_id")
+        if not isinstance(cursor_id, str) or not cursor_id.strip():
+            logger.warning("fetch: missing or invalid 'cursor_id' parameter")
+            return {"error": "cursor_id is required (string)"}
+        c = cursors.get_cursor(cursor_id)
+        if c is None:
+            return {"error": f"cursor '{cursor_id}' not found (exhausted, closed or expired)"}
+        try:
+            offset = c.offset
+            rows, has_more = c.fetch(_page_size(params))
+        except Exception as e:
+            cursors.close_cursor(cursor_id)
+            logger.error("fetch failed for cursor %s: %s", cursor_id, e)
+            return {"error": f"fetch failed: {e}"}
+        if not has_more:
+            cursors.close_cursor(cursor_id)
+        return {
+            "db": c.db, "cursor_id": cursor_id, "columns": c.columns, "rows": rows,
+            "returned_count": len(rows), "offset": offset, "has_more": has_more,
+        }
+
+    if op == "close_cursor":
+        cursor_id = params.get("cursor_id")
+        if not isinstance(cursor_id, str) or not cursor_id.strip():
+            return {"error": "cursor_id is required (string)"}
+        return {"cursor_id": cursor_id, "closed": cursors.close_cursor(cursor_id)}
+
     if op == "executescript":
         db = params.get("db"); script = params.get("script"); ro = _want_read_only(params)
         if ro:
@@ -331,15 +392,11 @@ def run(operation: str, **params) -> Dict[str, Any]:
             logger.warning("executescript: invalid db '%s': %s", db, e)
             return {"error": str(e)}
         try:
-            conn = _connect(path, read_only=False)
-            cur = conn.cursor()
-            try:
-                cur.executescript(script)
+            with connections.connection(path, read_only=False) as conn:
+                conn.executescript(script)
                 conn.commit()
-                logger.info("executescript: script executed successfully on %s", path.name)
-                return {"db": path.name}
-            finally:
-                cur.close(); conn.close()
+            logger.info("executescript: script executed successfully on %s", path.name)
+            return {"db": path.name}
         except Exception as e:
             logger.error("executescript failed for '%s': %s", path.name, e)
             return {"error": f"executescript failed: {e}"}